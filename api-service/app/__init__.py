@@ -0,0 +1,4 @@
+import time
+
+# Start of the import phase of the startup timeline (app.core.timeline)
+IMPORT_STARTED = time.perf_counter()
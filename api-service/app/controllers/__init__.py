@@ -2,8 +2,16 @@
 Controllers with business logic.
 """
 
+from .admin_controller import AdminController
+from .feedback_controller import FeedbackController
 from .health_controller import HealthController
+from .job_controller import JobController
 from .prediction_controller import PredictionController
 
-__all__ = ["HealthController", "PredictionController"]
-
+__all__ = [
+    "HealthController",
+    "PredictionController",
+    "JobController",
+    "AdminController",
+    "FeedbackController",
+]
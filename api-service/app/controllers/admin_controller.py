@@ -0,0 +1,83 @@
+"""
+Controller for operational (admin) endpoints.
+"""
+
+from typing import Any, Dict
+
+from fastapi import HTTPException, status
+
+from ..services import memory_report
+
+
+class AdminController:
+    """Controller for model monitoring."""
+
+    @staticmethod
+    def get_model_registry(model_registry) -> Dict[str, Any]:
+        """Return the routing policy and statistics of every model version."""
+        return model_registry.stats()
+
+    @staticmethod
+    def get_scheduler(inference_scheduler) -> Dict[str, Any]:
+        """Return per-lane counters and latencies of the inference scheduler.
+
+        Raises:
+            HTTPException: If the scheduler is disabled
+        """
+        if inference_scheduler is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Inference scheduling is disabled. Set SCHEDULER_ENABLED=true.",
+            )
+        return inference_scheduler.stats()
+
+    @staticmethod
+    def get_tenants(tenant_directory, tenant_pool) -> Dict[str, Any]:
+        """Return configured tenants and the classifier pool counters."""
+        return {
+            "tenants": list(tenant_directory.tenants.values()),
+            "pool": tenant_pool.stats(),
+        }
+
+    @staticmethod
+    def get_memory(classifier, sinks, model_registry, micro_batcher, tenant_pool, tracer):
+        """Return process, model artifact, cache and queue memory of this worker."""
+        return {
+            **memory_report(
+                classifier,
+                sinks,
+                model_registry=model_registry,
+                micro_batcher=micro_batcher,
+                tenant_pool=tenant_pool,
+            ),
+            "tracemalloc": tracer.status(),
+        }
+
+    @staticmethod
+    def get_memory_diff(tracer, top: int, group_by: str) -> Dict[str, Any]:
+        """Return the allocation sites that grew most since the baseline snapshot.
+
+        Raises:
+            HTTPException: If no baseline snapshot was taken
+        """
+        diff = tracer.diff(top=top, group_by=group_by)
+        if diff is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="No baseline snapshot. POST /api/v1/admin/memory/snapshot first.",
+            )
+        return diff
+
+    @staticmethod
+    def get_drift_report(classifier) -> Dict[str, Any]:
+        """Return the drift of live traffic against the training statistics.
+
+        Raises:
+            HTTPException: If drift monitoring is disabled
+        """
+        if classifier.drift_monitor is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Drift monitoring is disabled. Set DRIFT_ENABLED=true.",
+            )
+        return classifier.drift_monitor.report()
@@ -0,0 +1,52 @@
+"""
+Controller for user feedback.
+"""
+
+from typing import Any, Dict
+
+from fastapi import HTTPException, status
+
+
+class FeedbackController:
+    """Controller for labelled feedback and incremental model updates."""
+
+    @staticmethod
+    def _check_enabled(settings) -> None:
+        if not settings.feedback_enabled:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Feedback is disabled. Set FEEDBACK_ENABLED=true.",
+            )
+
+    @staticmethod
+    def submit(feedback_log, classifier, feedback: Dict[str, Any], settings) -> Dict[str, Any]:
+        """Queue a labelled message for the next background update.
+
+        Raises:
+            HTTPException: If feedback is disabled or the queue is full
+        """
+        FeedbackController._check_enabled(settings)
+        if not feedback_log.record(
+            feedback["message"], feedback["label"], model_version=classifier.model_version
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Feedback queue is full, retry later",
+            )
+        return {"status": "queued", "model_version": classifier.model_version}
+
+    @staticmethod
+    def get_stats(feedback_trainer, feedback_log, classifier, settings) -> Dict[str, Any]:
+        """Return stored feedback counters and the outcome of the last update.
+
+        Raises:
+            HTTPException: If feedback is disabled
+        """
+        FeedbackController._check_enabled(settings)
+        log_stats = feedback_log.stats()
+        return {
+            **feedback_trainer.stats(),
+            "queued": log_stats["queued"],
+            "dropped": log_stats["dropped"],
+            "model_version": classifier.model_version,
+        }
@@ -5,17 +5,48 @@ Controller for system health check.
 from datetime import datetime
 from typing import Any, Dict
 
+from fastapi import HTTPException, status
+
 
 class HealthController:
     """Controller for system health status."""
 
     @staticmethod
-    def get_health_status(classifier) -> Dict[str, Any]:
-        """Return service health status."""
+    def get_health_status(classifier, audit_log=None, drain_coordinator=None) -> Dict[str, Any]:
+        """Return service health status (and audit, cache and pre-filter counters when enabled)."""
+        draining = drain_coordinator is not None and not drain_coordinator.ready
         return {
-            "status": "healthy",
+            "status": "draining" if draining else "healthy",
             "timestamp": datetime.now(),
             "model_loaded": classifier.is_loaded,
             "version": "1.0.0",
+            "audit": audit_log.stats() if audit_log is not None else None,
+            "prediction_cache": (
+                classifier.prediction_cache.stats()
+                if classifier.prediction_cache is not None
+                else None
+            ),
+            "prefilter": (
+                classifier.prefilter.stats() if classifier.prefilter is not None else None
+            ),
+            "drain": drain_coordinator.stats() if drain_coordinator is not None else None,
         }
 
+    @staticmethod
+    def get_readiness(classifier, drain_coordinator) -> Dict[str, Any]:
+        """Return readiness to receive traffic.
+
+        Raises:
+            HTTPException: 503 while the model is not loaded or the worker drains
+        """
+        if not classifier.is_loaded:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Model not loaded"
+            )
+        if not drain_coordinator.ready:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Worker is {drain_coordinator.state}",
+            )
+        return {"status": "ready", "model_loaded": True, "drain": drain_coordinator.stats()}
+
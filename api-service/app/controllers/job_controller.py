@@ -0,0 +1,86 @@
+"""
+Controller for batch job operations.
+"""
+
+import json
+from typing import Any, Dict, Iterator
+
+from fastapi import HTTPException, status
+
+
+class JobController:
+    """Controller for asynchronous batch classification jobs."""
+
+    @staticmethod
+    def _check_enabled(settings) -> None:
+        if not settings.jobs_enabled:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Batch jobs are disabled. Set JOBS_ENABLED=true.",
+            )
+
+    @staticmethod
+    def _status(job: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "total": job["total"],
+            "processed": job["processed"],
+            "progress": round(job["processed"] / job["total"], 4) if job["total"] else 1.0,
+            "spam_count": job["spam_count"],
+            "threshold": job["threshold"],
+            "error": job["error"],
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+        }
+
+    @staticmethod
+    def create_job(store, runner, job_data: Dict[str, Any], settings) -> Dict[str, Any]:
+        """Store a new job and wake the workers.
+
+        Args:
+            store: JobStore instance
+            runner: JobRunner instance
+            job_data: Messages and threshold
+            settings: Application settings with job limits
+
+        Raises:
+            HTTPException: If jobs are disabled or the job is too large
+        """
+        JobController._check_enabled(settings)
+        messages = job_data["messages"]
+        if len(messages) > settings.jobs_max_messages:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Job exceeds {settings.jobs_max_messages} messages",
+            )
+
+        job = store.create_job(messages, job_data.get("threshold", 0.5))
+        runner.notify()
+        return JobController._status(job)
+
+    @staticmethod
+    def get_job(store, job_id: str, settings) -> Dict[str, Any]:
+        """Return job progress.
+
+        Raises:
+            HTTPException: If jobs are disabled or the job does not exist
+        """
+        JobController._check_enabled(settings)
+        job = store.get_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+        return JobController._status(job)
+
+    @staticmethod
+    def stream_results(store, job_id: str, offset: int) -> Iterator[str]:
+        """Yield stored results as NDJSON lines, starting at message index offset."""
+        for seq, is_spam, probability in store.iter_results(job_id, offset=offset):
+            yield json.dumps(
+                {
+                    "index": seq,
+                    "prediction": "spam" if is_spam else "ham",
+                    "is_spam": is_spam,
+                    "probability_spam": round(probability, 4),
+                }
+            ) + "\n"
@@ -2,7 +2,8 @@
 Controller for spam prediction operations.
 """
 
-from typing import Any, Dict
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, status
 
@@ -16,16 +17,185 @@ class PredictionController:
         return classifier.get_model_info()
 
     @staticmethod
-    def classify_email(classifier, email_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def select_classifier(
+        tenant_directory,
+        tenant_pool,
+        classifier,
+        api_key: Optional[str],
+        tenant_id: Optional[str],
+        threshold: float,
+        threshold_set: bool,
+    ) -> Tuple[Any, float, Optional[str]]:
+        """Return (classifier, threshold, tenant id) for the request's tenant.
+
+        Requests without tenant credentials, and tenants without their own
+        models directory, use the primary classifier. A tenant's default
+        threshold applies unless the request sets one.
+
+        Raises:
+            HTTPException: If the tenant is unknown or its model cannot be loaded
+        """
+        try:
+            tenant = tenant_directory.resolve(api_key, tenant_id)
+        except KeyError:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Unknown API key or tenant"
+            )
+        if tenant is None:
+            return classifier, threshold, None
+
+        selected = classifier
+        if tenant["models_dir"] is not None:
+            try:
+                selected = await tenant_pool.acquire(tenant["models_dir"])
+            except Exception as e:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail=f"Model of tenant {tenant['tenant_id']} could not be loaded: {str(e)}",
+                )
+        if not threshold_set and tenant["threshold"] is not None:
+            threshold = tenant["threshold"]
+        return selected, threshold, tenant["tenant_id"]
+
+    @staticmethod
+    def classify_email(
+        classifier, email_data: Dict[str, Any], audit_log=None
+    ) -> Dict[str, Any]:
         """Classify email as spam or ham.
 
         Args:
             classifier: Classifier instance
             email_data: Email data (message and optionally threshold)
+            audit_log: Optional AuditLog recording the decision
 
         Raises:
             HTTPException: If model is not loaded or an error occurs
         """
+        threshold = email_data.get("threshold", 0.5)
+        return PredictionController._audited(
+            audit_log,
+            "predict",
+            email_data.get("message", ""),
+            threshold,
+            lambda: PredictionController._run(
+                classifier, classifier.classify, email_data, threshold=threshold
+            ),
+        )
+
+    @staticmethod
+    def classify_long_email(
+        classifier, email_data: Dict[str, Any], settings, audit_log=None
+    ) -> Dict[str, Any]:
+        """Classify a long email within the configured token budget.
+
+        Args:
+            classifier: Classifier instance
+            email_data: Email data (message, threshold, max_tokens, truncation)
+            settings: Application settings with long-message limits
+            audit_log: Optional AuditLog recording the decision
+
+        Raises:
+            HTTPException: If model is not loaded or an error occurs
+        """
+        max_tokens = min(
+            email_data.get("max_tokens") or settings.long_message_max_tokens,
+            settings.long_message_max_tokens,
+        )
+        threshold = email_data.get("threshold", 0.5)
+        return PredictionController._audited(
+            audit_log,
+            "predict/long",
+            email_data.get("message", ""),
+            threshold,
+            lambda: PredictionController._run(
+                classifier,
+                classifier.classify_long,
+                email_data,
+                threshold=threshold,
+                max_tokens=max_tokens,
+                truncation=email_data.get("truncation") or settings.long_message_truncation,
+                window_chars=settings.long_message_window_chars,
+            ),
+        )
+
+    @staticmethod
+    def classify_eml(
+        classifier, extraction: Dict[str, Any], threshold: float = 0.5, audit_log=None
+    ) -> Dict[str, Any]:
+        """Classify the text extracted from a raw email.
+
+        Args:
+            classifier: Classifier instance
+            extraction: Result of MimeTextExtractor.close()
+            threshold: Probability threshold to classify as spam
+            audit_log: Optional AuditLog recording the decision
+
+        Raises:
+            HTTPException: If no text was found or classification fails
+        """
+        if not extraction["text"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid data: no text/plain or text/html content found in message",
+            )
+
+        email_data = {"message": extraction["text"], "threshold": threshold}
+        result = PredictionController._audited(
+            audit_log,
+            "predict/eml",
+            extraction["text"],
+            threshold,
+            lambda: PredictionController._run(
+                classifier, classifier.classify, email_data, threshold=threshold
+            ),
+        )
+        result["extraction"] = {
+            key: value for key, value in extraction.items() if key != "text"
+        }
+        return result
+
+    @staticmethod
+    def classify_batch(
+        classifier, messages: List[str], threshold: float = 0.5, audit_log=None
+    ) -> List[Dict[str, Any]]:
+        """Classify several messages with one vectorized call.
+
+        Args:
+            classifier: Classifier instance
+            messages: Validated message texts
+            threshold: Probability threshold to classify as spam
+            audit_log: Optional AuditLog recording each decision
+
+        Raises:
+            HTTPException: If model is not loaded or an error occurs
+        """
+        start = time.perf_counter()
+        results = PredictionController._run(
+            classifier, classifier.classify_batch, messages, [threshold] * len(messages)
+        )
+        if audit_log is not None:
+            latency_ms = (time.perf_counter() - start) * 1000 / len(messages)
+            for message, result in zip(messages, results):
+                audit_log.log("predict/batch", message, threshold, result, latency_ms)
+        return results
+
+    @staticmethod
+    def _audited(
+        audit_log, endpoint: str, message: str, threshold: float, classify: Callable
+    ) -> Dict[str, Any]:
+        """Run a classification and enqueue its audit record (if auditing is enabled)."""
+        if audit_log is None:
+            return classify()
+        start = time.perf_counter()
+        result = classify()
+        audit_log.log(
+            endpoint, message, threshold, result, (time.perf_counter() - start) * 1000
+        )
+        return result
+
+    @staticmethod
+    def _run(classifier, classify, *args, **kwargs) -> Dict[str, Any]:
+        """Run a classification call, mapping failures to HTTP errors."""
         if not classifier.is_loaded:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -33,8 +203,7 @@ class PredictionController:
             )
 
         try:
-            threshold = email_data.get("threshold", 0.5)
-            return classifier.classify(email_data, threshold=threshold)
+            return classify(*args, **kwargs)
         except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -45,4 +214,3 @@ class PredictionController:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Classification error: {str(e)}",
             )
-
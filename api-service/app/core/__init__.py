@@ -2,7 +2,49 @@
 Core module - lifecycle and configuration.
 """
 
-from .lifecycle import classifier, shutdown_event, startup_event
+from .config import settings
+from .lifecycle import (
+    audit_log,
+    classifier,
+    drain_coordinator,
+    feedback_log,
+    feedback_store,
+    feedback_trainer,
+    inference_scheduler,
+    job_runner,
+    job_store,
+    memory_tracer,
+    micro_batcher,
+    model_registry,
+    prediction_cache,
+    shutdown_event,
+    startup_event,
+    startup_timeline,
+    tenant_directory,
+    tenant_pool,
+    traffic_recorder,
+)
 
-__all__ = ["startup_event", "shutdown_event", "classifier"]
+__all__ = [
+    "startup_event",
+    "shutdown_event",
+    "classifier",
+    "settings",
+    "job_store",
+    "job_runner",
+    "traffic_recorder",
+    "audit_log",
+    "model_registry",
+    "tenant_directory",
+    "tenant_pool",
+    "micro_batcher",
+    "prediction_cache",
+    "startup_timeline",
+    "feedback_store",
+    "feedback_log",
+    "feedback_trainer",
+    "memory_tracer",
+    "inference_scheduler",
+    "drain_coordinator",
+]
 
@@ -0,0 +1,357 @@
+"""
+Application settings.
+
+Values are read from environment variables (see configs/.env.example).
+"""
+
+from typing import Any, Dict, List
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class Settings(BaseSettings):
+    """Runtime configuration for the API."""
+
+    models_dir: str = Field(default="models", description="Directory with exported models")
+    inference_backend: str = Field(
+        default="sklearn", description="Inference runtime ('sklearn' or 'onnx')",
+        pattern="^(sklearn|onnx)$",
+    )
+    inference_precision: str = Field(
+        default="float64",
+        description="Precision of sklearn vectorization, scoring and calibration",
+        pattern="^(float64|float32)$",
+    )
+    onnx_intra_op_threads: int = Field(
+        default=1, description="ONNX Runtime intra-op threads (0 = one per core)", ge=0
+    )
+    artifact_loader_threads: int = Field(
+        default=4, description="Model artifacts loaded concurrently", gt=0
+    )
+    verify_checksums: bool = Field(
+        default=True, description="Verify artifacts listed in the models' checksums.json"
+    )
+    warm_up_enabled: bool = Field(
+        default=True, description="Score one message at startup before serving traffic"
+    )
+    startup_budget_seconds: float = Field(
+        default=10.0, description="Import + model load time above which startup is reported", gt=0
+    )
+    drain_grace_period: float = Field(
+        default=30.0,
+        description="Seconds on shutdown to finish in-flight, queued and batched work",
+        ge=0,
+    )
+    drain_readiness_delay: float = Field(
+        default=5.0,
+        description="Seconds readiness fails before new inference work is refused",
+        ge=0,
+    )
+
+    near_duplicate_enabled: bool = Field(
+        default=False, description="Reuse predictions for near-duplicate messages"
+    )
+    near_duplicate_threshold: float = Field(
+        default=0.95,
+        description="Minimum sketch similarity (0.85-1.0) to reuse a cached prediction",
+        ge=0.85,
+        le=1.0,
+    )
+    near_duplicate_capacity: int = Field(
+        default=10000, description="Maximum number of messages kept in the index", gt=0
+    )
+
+    prefilter_enabled: bool = Field(
+        default=False, description="Decide known spam and allowlisted templates before the model"
+    )
+    prefilter_dir: str = Field(
+        default="data/prefilter", description="Directory with the pre-filter Bloom filters"
+    )
+    prefilter_false_positive_rate: float = Field(
+        default=1e-6,
+        description="Target false positive rate of built filters; fuller filters are not used",
+        gt=0.0,
+        lt=1.0,
+    )
+    prefilter_reload_interval: float = Field(
+        default=5.0, description="Seconds between checks for updated filter files", gt=0
+    )
+
+    prediction_cache_enabled: bool = Field(
+        default=False, description="Persist predictions on disk across restarts and workers"
+    )
+    prediction_cache_path: str = Field(
+        default="data/cache/predictions.sqlite3", description="SQLite prediction cache"
+    )
+    prediction_cache_max_entries: int = Field(
+        default=1_000_000, description="Cached predictions kept (LRU eviction)", gt=0
+    )
+    prediction_cache_mmap_mb: int = Field(
+        default=256, description="Memory-mapped I/O size of each cache connection (MB)", ge=0
+    )
+    prediction_cache_flush_interval: float = Field(
+        default=0.5, description="Maximum seconds a cache write waits for its batch", gt=0
+    )
+
+    eml_max_raw_bytes: int = Field(
+        default=25 * 1024 * 1024, description="Maximum raw .eml payload size", gt=0
+    )
+    eml_max_parts: int = Field(default=100, description="Maximum MIME parts inspected", gt=0)
+    eml_max_depth: int = Field(default=8, description="Maximum MIME nesting depth", gt=0)
+    eml_max_text_bytes: int = Field(
+        default=100_000, description="Budget of decoded text bytes per message", gt=0
+    )
+
+    predict_batch_max_messages: int = Field(
+        default=1000, description="Messages accepted by POST /predict/batch", gt=0
+    )
+    compression_enabled: bool = Field(
+        default=True, description="Compress large responses (zstd/gzip per Accept-Encoding)"
+    )
+    compression_min_bytes: int = Field(
+        default=4096, description="Smallest response body that is compressed", ge=0
+    )
+
+    scheduler_enabled: bool = Field(
+        default=False,
+        description="Run inference on threads, cheapest expected request first (else inline)",
+    )
+    scheduler_workers: int = Field(
+        default=2, description="Inference threads of the interactive lane", gt=0
+    )
+    scheduler_heavy_workers: int = Field(
+        default=1,
+        description="Inference threads reserved for bulk requests (0 shares the interactive ones)",
+        ge=0,
+    )
+    scheduler_heavy_cost: int = Field(
+        default=2000, description="Characters from which a request goes to the bulk lane", gt=0
+    )
+    scheduler_aging_rate: float = Field(
+        default=20000.0,
+        description="Characters of priority a queued request gains per second of wait",
+        gt=0,
+    )
+
+    long_message_max_tokens: int = Field(
+        default=20000, description="Token budget per long message", gt=0
+    )
+    long_message_truncation: str = Field(
+        default="head_tail",
+        description="Policy when the token budget is exceeded ('head' or 'head_tail')",
+        pattern="^(head|head_tail)$",
+    )
+    long_message_window_chars: int = Field(
+        default=65536, description="Characters vectorized per window", gt=0
+    )
+
+    jobs_enabled: bool = Field(default=False, description="Enable asynchronous batch jobs")
+    jobs_db_path: str = Field(
+        default="data/jobs.sqlite3", description="SQLite database for jobs and results"
+    )
+    jobs_workers: int = Field(default=1, description="Background job worker threads", gt=0)
+    jobs_chunk_size: int = Field(
+        default=5000, description="Messages scored per vectorized chunk", gt=0
+    )
+    jobs_max_messages: int = Field(
+        default=1_000_000, description="Maximum messages per job", gt=0
+    )
+    jobs_lease_seconds: float = Field(
+        default=60.0, description="Idle time after which a running job is resumed", gt=0
+    )
+
+    capture_enabled: bool = Field(
+        default=False, description="Record sampled prediction requests for replay"
+    )
+    capture_path: str = Field(
+        default="data/capture/traffic.jsonl", description="Active capture JSONL file"
+    )
+    capture_sample_rate: float = Field(
+        default=0.01, description="Fraction of prediction requests recorded", ge=0.0, le=1.0
+    )
+    capture_redaction: str = Field(
+        default="pii",
+        description="Message redaction ('none', 'pii' or 'full')",
+        pattern="^(none|pii|full)$",
+    )
+    capture_max_file_bytes: int = Field(
+        default=50 * 1024 * 1024, description="Capture file size before rotation", gt=0
+    )
+    capture_backups: int = Field(default=5, description="Rotated capture files kept", ge=0)
+    capture_queue_size: int = Field(
+        default=10000, description="Records buffered before new ones are dropped", gt=0
+    )
+    capture_max_body_bytes: int = Field(
+        default=1024 * 1024, description="Larger request bodies are recorded without content", gt=0
+    )
+
+    audit_enabled: bool = Field(
+        default=False, description="Log every classification decision (message hash only)"
+    )
+    audit_backend: str = Field(
+        default="jsonl", description="Audit log backend ('jsonl' or 'sqlite')",
+        pattern="^(jsonl|sqlite)$",
+    )
+    audit_path: str = Field(
+        default="data/audit/predictions.jsonl", description="Audit JSONL file or SQLite database"
+    )
+    audit_max_file_bytes: int = Field(
+        default=100 * 1024 * 1024, description="Audit JSONL file size before rotation", gt=0
+    )
+    audit_backups: int = Field(default=10, description="Rotated audit files kept", ge=0)
+    audit_queue_size: int = Field(
+        default=50000, description="Audit records buffered in memory", gt=0
+    )
+    audit_batch_size: int = Field(
+        default=1000, description="Audit records written per flush/transaction", gt=0
+    )
+    audit_flush_interval: float = Field(
+        default=1.0, description="Maximum seconds an audit record waits for its batch", gt=0
+    )
+    audit_full_policy: str = Field(
+        default="drop",
+        description="When the audit queue is full: 'drop' the record or 'block' the request",
+        pattern="^(drop|block)$",
+    )
+    audit_block_timeout: float = Field(
+        default=0.1, description="Longest wait of a request under the 'block' policy", ge=0
+    )
+
+    registry_models: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description=(
+            "Extra model versions (JSON list of {name, models_dir, role: 'ab' | 'shadow', "
+            "weight}) served next to MODELS_DIR"
+        ),
+    )
+    shadow_sample_rate: float = Field(
+        default=1.0, description="Fraction of requests scored by shadow models", ge=0.0, le=1.0
+    )
+    shadow_queue_size: int = Field(
+        default=1000, description="Shadow requests buffered before new ones are shed", gt=0
+    )
+    shadow_batch_size: int = Field(
+        default=64, description="Shadow requests scored per vectorized call", gt=0
+    )
+    shadow_flush_interval: float = Field(
+        default=0.05, description="Maximum seconds a shadow request waits for its batch", gt=0
+    )
+
+    tenants: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description=(
+            "Tenants (JSON object {tenant_id: {models_dir, threshold, api_keys}}); "
+            "requests without tenant credentials use MODELS_DIR"
+        ),
+    )
+    api_key_header: str = Field(default="X-API-Key", description="Header with a tenant API key")
+    tenant_header: str = Field(default="X-Tenant-ID", description="Header with a tenant id")
+    tenant_pool_max_models: int = Field(
+        default=8, description="Tenant classifiers kept loaded (LRU)", gt=0
+    )
+    tenant_pool_max_mb: float = Field(
+        default=512.0, description="Artifact megabytes of tenant classifiers kept loaded", gt=0
+    )
+    tenant_pool_loader_threads: int = Field(
+        default=2, description="Tenant models loaded concurrently", gt=0
+    )
+
+    ws_max_outstanding: int = Field(
+        default=256, description="Unanswered requests per WebSocket connection", gt=0
+    )
+    ws_batch_size: int = Field(
+        default=64, description="Streamed requests scored per vectorized call", gt=0
+    )
+    ws_batch_wait_ms: float = Field(
+        default=2.0, description="Longest wait (ms) of a streamed request for its batch", ge=0
+    )
+
+    feedback_enabled: bool = Field(
+        default=False, description="Accept feedback and update the model in the background"
+    )
+    feedback_db_path: str = Field(
+        default="data/feedback.sqlite3", description="SQLite database of labelled feedback"
+    )
+    feedback_update_interval: float = Field(
+        default=300.0, description="Seconds between checks for new feedback", gt=0
+    )
+    feedback_min_new: int = Field(
+        default=20, description="New feedback rows needed to attempt an update", gt=0
+    )
+    feedback_max_rows: int = Field(
+        default=5000, description="Oldest pending feedback rows used per update", gt=0
+    )
+    feedback_holdout_every: int = Field(
+        default=5, description="Every Nth feedback row is held out for the update check", ge=2
+    )
+    feedback_holdout_path: str = Field(
+        default="", description="Optional labelled CSV added to the holdout check"
+    )
+    feedback_epochs: int = Field(
+        default=5, description="partial_fit passes over the new feedback", gt=0
+    )
+    feedback_learning_rate: float = Field(
+        default=0.01, description="Constant SGD learning rate of feedback updates", gt=0
+    )
+    feedback_alpha: float = Field(
+        default=1e-4, description="L2 regularization of feedback updates", ge=0
+    )
+    feedback_max_regression: float = Field(
+        default=0.0,
+        description="Holdout accuracy an update may lose and still be published",
+        ge=0.0,
+        le=1.0,
+    )
+    feedback_queue_size: int = Field(
+        default=10000, description="Feedback buffered before new records are rejected", gt=0
+    )
+
+    memory_trace_frames: int = Field(
+        default=1, description="Stack frames kept per allocation by the tracemalloc diff", ge=1
+    )
+
+    drift_enabled: bool = Field(
+        default=True, description="Track drift of live traffic against training statistics"
+    )
+    drift_window_seconds: float = Field(
+        default=3600.0, description="Rolling window compared with the reference", gt=0
+    )
+    drift_slots: int = Field(
+        default=12, description="Time slots per window (expiry granularity)", gt=0
+    )
+    drift_min_samples: int = Field(
+        default=100, description="Observations needed before drift is reported", gt=0
+    )
+    drift_max_tokens: int = Field(
+        default=256, description="Tokens inspected per message for the OOV ratio", gt=0
+    )
+
+    router_backends: List[str] = Field(
+        default_factory=list,
+        description="Base URLs of the API instances behind the routing proxy (JSON list)",
+    )
+    router_virtual_nodes: int = Field(
+        default=160, description="Points of each instance on the consistent-hash ring", gt=0
+    )
+    router_health_interval: float = Field(
+        default=2.0, description="Seconds between readiness checks of the instances", gt=0
+    )
+    router_health_timeout: float = Field(
+        default=1.0, description="Timeout of one readiness check", gt=0
+    )
+    router_unhealthy_after: int = Field(
+        default=2, description="Failed readiness checks before an instance leaves the ring", gt=0
+    )
+    router_timeout: float = Field(
+        default=30.0, description="Timeout of a request forwarded to an instance", gt=0
+    )
+    router_max_connections: int = Field(
+        default=100, description="Connections open from the proxy to all instances", gt=0
+    )
+    router_max_keepalive: int = Field(
+        default=20, description="Idle connections to the instances kept for reuse", ge=0
+    )
+
+
+settings = Settings()
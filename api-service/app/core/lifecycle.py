@@ -1,31 +1,347 @@
 """
 Application lifecycle events.
 
-Manages model loading on startup.
+Manages model loading, background job workers and the drain on shutdown.
 """
 
+import asyncio
 import logging
+from typing import Callable
 
-from ..models import SpamClassifier
+from ..models import (
+    DriftMonitor,
+    NearDuplicateIndex,
+    PreFilter,
+    SklearnBackend,
+    SpamClassifier,
+    create_backend,
+)
+from ..services import (
+    AuditLog,
+    ClassifierPool,
+    DrainCoordinator,
+    FeedbackLog,
+    FeedbackStore,
+    FeedbackTrainer,
+    InferenceScheduler,
+    JobRunner,
+    JobStore,
+    MemoryTracer,
+    MicroBatcher,
+    ModelRegistry,
+    PredictionCache,
+    TenantDirectory,
+    TrafficRecorder,
+    drain_sink,
+)
+from .config import settings
+from .timeline import StartupTimeline
 
 logger = logging.getLogger(__name__)
 
-classifier = SpamClassifier(models_dir="models")
+prediction_cache = (
+    PredictionCache(
+        settings.prediction_cache_path,
+        max_entries=settings.prediction_cache_max_entries,
+        mmap_bytes=settings.prediction_cache_mmap_mb * 1024 * 1024,
+        flush_interval=settings.prediction_cache_flush_interval,
+    )
+    if settings.prediction_cache_enabled
+    else None
+)
+
+classifier = SpamClassifier(
+    models_dir=settings.models_dir,
+    near_duplicate_index=(
+        NearDuplicateIndex(
+            threshold=settings.near_duplicate_threshold,
+            capacity=settings.near_duplicate_capacity,
+        )
+        if settings.near_duplicate_enabled
+        else None
+    ),
+    drift_monitor=(
+        DriftMonitor(
+            window_seconds=settings.drift_window_seconds,
+            slots=settings.drift_slots,
+            min_samples=settings.drift_min_samples,
+            max_tokens=settings.drift_max_tokens,
+        )
+        if settings.drift_enabled
+        else None
+    ),
+    backend=create_backend(
+        settings.inference_backend,
+        intra_op_threads=settings.onnx_intra_op_threads,
+        precision=settings.inference_precision,
+    ),
+    prediction_cache=prediction_cache,
+    prefilter=(
+        PreFilter(
+            settings.prefilter_dir,
+            max_false_positive_rate=settings.prefilter_false_positive_rate,
+            reload_interval=settings.prefilter_reload_interval,
+        )
+        if settings.prefilter_enabled
+        else None
+    ),
+    loader_threads=settings.artifact_loader_threads,
+    verify_checksums=settings.verify_checksums,
+)
+
+startup_timeline = StartupTimeline()
+drain_coordinator = DrainCoordinator(
+    grace_period=settings.drain_grace_period, readiness_delay=settings.drain_readiness_delay
+)
+memory_tracer = MemoryTracer(frames=settings.memory_trace_frames)
+
+
+def _build_classifier(models_dir: str) -> SpamClassifier:
+    """Unloaded classifier for an additional model version or tenant."""
+    return SpamClassifier(
+        models_dir=models_dir,
+        backend=create_backend(
+            settings.inference_backend,
+            intra_op_threads=settings.onnx_intra_op_threads,
+            precision=settings.inference_precision,
+        ),
+        loader_threads=settings.artifact_loader_threads,
+        verify_checksums=settings.verify_checksums,
+    )
+
+
+model_registry = ModelRegistry(
+    _build_classifier,
+    entries=settings.registry_models,
+    queue_size=settings.shadow_queue_size,
+    batch_size=settings.shadow_batch_size,
+    flush_interval=settings.shadow_flush_interval,
+    sample_rate=settings.shadow_sample_rate,
+)
+
+tenant_directory = TenantDirectory(settings.tenants)
+tenant_pool = ClassifierPool(
+    _build_classifier,
+    max_models=settings.tenant_pool_max_models,
+    max_bytes=int(settings.tenant_pool_max_mb * 1024 * 1024),
+    pinned={settings.models_dir: classifier},
+    loader_threads=settings.tenant_pool_loader_threads,
+)
+
+micro_batcher = MicroBatcher(
+    max_batch_size=settings.ws_batch_size, max_wait=settings.ws_batch_wait_ms / 1000
+)
+
+inference_scheduler = (
+    InferenceScheduler(
+        workers=settings.scheduler_workers,
+        heavy_workers=settings.scheduler_heavy_workers,
+        heavy_cost=settings.scheduler_heavy_cost,
+        aging_rate=settings.scheduler_aging_rate,
+    )
+    if settings.scheduler_enabled
+    else None
+)
+
+job_store = JobStore(settings.jobs_db_path)
+job_runner = JobRunner(
+    job_store,
+    classifier,
+    chunk_size=settings.jobs_chunk_size,
+    workers=settings.jobs_workers,
+    lease_seconds=settings.jobs_lease_seconds,
+    long_options={
+        "max_tokens": settings.long_message_max_tokens,
+        "truncation": settings.long_message_truncation,
+        "window_chars": settings.long_message_window_chars,
+    },
+)
+
+traffic_recorder = TrafficRecorder(
+    settings.capture_path,
+    max_bytes=settings.capture_max_file_bytes,
+    backups=settings.capture_backups,
+    queue_size=settings.capture_queue_size,
+)
+
+audit_log = (
+    AuditLog(
+        settings.audit_path,
+        backend=settings.audit_backend,
+        max_bytes=settings.audit_max_file_bytes,
+        backups=settings.audit_backups,
+        queue_size=settings.audit_queue_size,
+        batch_size=settings.audit_batch_size,
+        flush_interval=settings.audit_flush_interval,
+        policy=settings.audit_full_policy,
+        block_timeout=settings.audit_block_timeout,
+    )
+    if settings.audit_enabled
+    else None
+)
+
+feedback_store = FeedbackStore(
+    settings.feedback_db_path, holdout_every=settings.feedback_holdout_every
+)
+feedback_log = FeedbackLog(feedback_store, queue_size=settings.feedback_queue_size)
+feedback_trainer = FeedbackTrainer(
+    feedback_store,
+    classifier,
+    interval=settings.feedback_update_interval,
+    min_new=settings.feedback_min_new,
+    max_rows=settings.feedback_max_rows,
+    holdout_path=settings.feedback_holdout_path or None,
+    epochs=settings.feedback_epochs,
+    alpha=settings.feedback_alpha,
+    eta0=settings.feedback_learning_rate,
+    max_regression=settings.feedback_max_regression,
+)
+
+
+def _load_model() -> None:
+    logger.info("Loading classification model...")
+    with startup_timeline.phase("model load"):
+        classifier.load()
+    for name, (start, end) in classifier.load_timings.items():
+        startup_timeline.add(f"artifact {name}", start, end)
+    logger.info("Model loaded successfully")
+    if settings.warm_up_enabled:
+        with startup_timeline.phase("warm-up"):
+            classifier.warm_up()
+    logger.info(f"Model info: {classifier.get_model_info()}")
+    if classifier.prefilter is not None:
+        classifier.prefilter.load()
+        logger.info(f"Pre-filter enabled ({settings.prefilter_dir})")
+
+
+def _start_feedback() -> None:
+    feedback_store.open()
+    feedback_log.start()
+    if not isinstance(classifier.backend, SklearnBackend):
+        logger.warning("Feedback is stored but model updates need the sklearn inference backend")
+        return
+    feedback_trainer.start()
+    logger.info(
+        f"Feedback enabled ({settings.feedback_db_path}), model updates every "
+        f"{settings.feedback_update_interval}s"
+    )
+
+
+def _start_services() -> None:
+    """Start the enabled caches, registry models, workers and sinks."""
+    if prediction_cache is not None:
+        prediction_cache.start()
+        logger.info(f"Persistent prediction cache enabled ({settings.prediction_cache_path})")
+    if model_registry.models:
+        model_registry.load()
+        logger.info(
+            f"Model registry loaded ({model_registry.policy}): "
+            f"{[model.name for model in model_registry.models]}"
+        )
+    if settings.jobs_enabled:
+        job_runner.start()
+        logger.info(f"Batch job workers started ({settings.jobs_workers})")
+    if settings.capture_enabled:
+        traffic_recorder.start()
+        logger.info(f"Capturing {settings.capture_sample_rate:.2%} of prediction traffic")
+    if audit_log is not None:
+        audit_log.start()
+        logger.info(f"Audit log enabled ({settings.audit_backend}: {settings.audit_path})")
+    if settings.feedback_enabled:
+        _start_feedback()
 
 
 async def startup_event():
     """Load ML model on startup."""
+    drain_coordinator.reset()
+    if drain_coordinator.install_signal_handler(asyncio.get_running_loop()):
+        logger.info(
+            f"SIGTERM drains: readiness fails {settings.drain_readiness_delay}s before new "
+            f"work is refused, {settings.drain_grace_period}s to finish admitted work"
+        )
     try:
-        logger.info("Loading classification model...")
-        classifier.load()
-        logger.info("Model loaded successfully")
-        logger.info(f"Model info: {classifier.get_model_info()}")
+        _load_model()
+        _start_services()
+        startup_timeline.log(logger)
+        if startup_timeline.total_seconds > settings.startup_budget_seconds:
+            logger.warning(
+                f"Startup took {startup_timeline.total_seconds:.3f}s, over the "
+                f"{settings.startup_budget_seconds}s budget"
+            )
     except Exception as e:
         logger.error(f"Error loading model: {e}")
         raise
 
 
+async def _drain_work(drain: DrainCoordinator) -> None:
+    """Finish in-flight requests, then queued and batched inference and jobs."""
+    if not await drain.wait_idle(drain.remaining()):
+        logger.warning(f"Grace period over with {drain.inflight} requests in flight")
+    if inference_scheduler is not None:
+        drain.record("scheduler", await inference_scheduler.drain(drain.remaining()))
+    drain.record("micro_batcher", await micro_batcher.drain(drain.remaining()))
+    if settings.jobs_enabled:
+        # A job in progress is requeued at its next chunk
+        job_runner.stop(drain.remaining())
+
+
+def _drain_shadow_queue(drain: DrainCoordinator, budget: float) -> None:
+    shadow = model_registry.stats()["shadow_queue"]
+    model_registry.stop(budget)
+    if not model_registry.models:
+        return
+    after = model_registry.stats()["shadow_queue"]
+    drain.record(
+        "shadow_queue",
+        {
+            "queued": shadow["queued"],
+            "written": after["scored"] - shadow["scored"],
+            "dropped": after["shed"] - shadow["shed"],
+            "left": after["queued"],
+        },
+    )
+
+
+def _flush_sinks(drain: DrainCoordinator, flush_budget: Callable[[], float]) -> None:
+    """Write the records already accepted by every enabled sink."""
+    if settings.feedback_enabled:
+        feedback_trainer.stop()
+    sinks = [
+        (settings.capture_enabled, "capture", traffic_recorder),
+        (audit_log is not None, "audit", audit_log),
+        (settings.feedback_enabled, "feedback", feedback_log),
+        (prediction_cache is not None, "prediction_cache", prediction_cache),
+    ]
+    for enabled, name, sink in sinks:
+        if enabled:
+            drain.record(name, drain_sink(sink, flush_budget()))
+
+
+def _release_resources() -> None:
+    if classifier.prefilter is not None:
+        classifier.prefilter.close()
+    tenant_pool.close()
+    micro_batcher.close()
+    if inference_scheduler is not None:
+        inference_scheduler.close()
+    memory_tracer.stop()
+
+
 async def shutdown_event():
-    """Clean up resources on shutdown."""
+    """Drain in-flight, queued and batched work, flush sinks and release resources.
+
+    Steps share drain_coordinator's grace period; writes of already accepted
+    records (logs, cache) get at least a second even when it is exhausted.
+    """
     logger.info("Shutting down API...")
+    drain = drain_coordinator
+    drain.stop_admission()
+
+    def flush_budget() -> float:
+        return max(drain.remaining(), 1.0)
 
+    await _drain_work(drain)
+    _drain_shadow_queue(drain, flush_budget())
+    _flush_sinks(drain, flush_budget)
+    _release_resources()
+    drain.log_report()
@@ -0,0 +1,67 @@
+"""
+Startup timeline.
+
+Records how long each cold-start phase takes (imports, each model
+artifact, warm-up) so the time before an instance can serve traffic is
+visible in the logs.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Set when the app package is first imported (see app/__init__.py)
+from .. import IMPORT_STARTED
+
+
+class StartupTimeline:
+    """Named phases of the startup, in time.perf_counter() seconds."""
+
+    def __init__(self, origin: Optional[float] = None):
+        """Initialize the timeline.
+
+        Args:
+            origin: Time the startup began (default: when the app package was imported)
+        """
+        self.origin = IMPORT_STARTED if origin is None else origin
+        self.phases: List[Tuple[str, float, float]] = []
+
+    def add(self, name: str, start: float, end: float) -> None:
+        """Record a phase that ran between start and end."""
+        self.phases.append((name, start, end))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Record the time spent in the with block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter())
+
+    @property
+    def total_seconds(self) -> float:
+        """Seconds from the origin to the end of the last phase."""
+        if not self.phases:
+            return 0.0
+        return max(end for _, _, end in self.phases) - self.origin
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """Offset from the origin and duration of each phase, in seconds."""
+        return {
+            name: {
+                "offset": round(start - self.origin, 4),
+                "seconds": round(end - start, 4),
+            }
+            for name, start, end in self.phases
+        }
+
+    def log(self, logger: logging.Logger) -> None:
+        """Log the timeline at INFO, one line per phase."""
+        logger.info(f"Startup timeline (total {self.total_seconds:.3f}s):")
+        width = max((len(name) for name, _, _ in self.phases), default=0)
+        for name, start, end in self.phases:
+            logger.info(
+                f"  {name:<{width}}  +{start - self.origin:7.3f}s  {end - start:7.3f}s"
+            )
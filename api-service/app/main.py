@@ -5,12 +5,29 @@ Uses trained ML model to identify emails as spam or ham.
 """
 
 import logging
+import time
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .core import shutdown_event, startup_event
-from .routers import health_router, predictions_router
+from . import IMPORT_STARTED
+from .core import (
+    drain_coordinator,
+    settings,
+    shutdown_event,
+    startup_event,
+    startup_timeline,
+    traffic_recorder,
+)
+from .routers import (
+    admin_router,
+    feedback_router,
+    health_router,
+    jobs_router,
+    predictions_router,
+    stream_router,
+)
+from .services import DrainMiddleware, TrafficCaptureMiddleware
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -32,9 +49,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.capture_enabled:
+    app.add_middleware(
+        TrafficCaptureMiddleware,
+        recorder=traffic_recorder,
+        sample_rate=settings.capture_sample_rate,
+        redaction=settings.capture_redaction,
+        max_body_bytes=settings.capture_max_body_bytes,
+    )
+
+# Outermost: work handed back while draining is neither captured nor served
+app.add_middleware(DrainMiddleware, coordinator=drain_coordinator)
+
 app.on_event("startup")(startup_event)
 app.on_event("shutdown")(shutdown_event)
 
 app.include_router(health_router, tags=["health"])
 app.include_router(predictions_router, prefix="/api/v1", tags=["predictions"])
+app.include_router(jobs_router, prefix="/api/v1", tags=["jobs"])
+app.include_router(admin_router, prefix="/api/v1", tags=["admin"])
+app.include_router(stream_router, prefix="/api/v1", tags=["stream"])
+app.include_router(feedback_router, prefix="/api/v1", tags=["feedback"])
 
+startup_timeline.add("import", IMPORT_STARTED, time.perf_counter())
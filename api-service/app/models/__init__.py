@@ -0,0 +1,33 @@
+"""
+ML models module.
+"""
+
+from .backends import InferenceBackend, OnnxBackend, SklearnBackend, create_backend
+from .drift import DriftMonitor, reference_statistics
+from .near_duplicate import NearDuplicateIndex
+from .prefilter import BloomFilter, PreFilter
+from .spam_classifier import SpamClassifier
+
+__all__ = [
+    "SpamClassifier",
+    "NearDuplicateIndex",
+    "PreFilter",
+    "BloomFilter",
+    "HashedTfidfVectorizer",
+    "DriftMonitor",
+    "reference_statistics",
+    "InferenceBackend",
+    "SklearnBackend",
+    "OnnxBackend",
+    "create_backend",
+]
+
+
+def __getattr__(name):
+    # HashedTfidfVectorizer imports scikit-learn: deferred so that importing the
+    # app does not (unpickling a model imports it when it is actually needed).
+    if name == "HashedTfidfVectorizer":
+        from .hashing import HashedTfidfVectorizer
+
+        return HashedTfidfVectorizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
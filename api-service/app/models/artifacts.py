@@ -0,0 +1,121 @@
+"""
+Concurrent, checksum-verified loading of model artifacts.
+
+Artifacts of a models directory are read on a small thread pool, so the
+model, vectorizer, label encoder and metadata load at the same time
+instead of one after another (file reads and numpy buffers release the
+GIL). When the directory has a checksums.json manifest (written by
+scripts/deploy_models.py), listed files are read once into memory and
+their SHA-256 is verified on those bytes before they are deserialized.
+"""
+
+import hashlib
+import io
+import json
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import joblib
+
+CHECKSUMS_FILE = "checksums.json"
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_checksums(models_dir: Path) -> Dict[str, str]:
+    """Expected SHA-256 per artifact name ({} without a manifest)."""
+    path = Path(models_dir) / CHECKSUMS_FILE
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_checksums(models_dir: Path, names: Iterable[str]) -> Dict[str, str]:
+    """Write the manifest of the given artifacts (those that exist)."""
+    models_dir = Path(models_dir)
+    checksums = {
+        name: file_sha256(models_dir / name)
+        for name in sorted(names)
+        if (models_dir / name).exists()
+    }
+    (models_dir / CHECKSUMS_FILE).write_text(
+        json.dumps(checksums, indent=2) + "\n", encoding="utf-8"
+    )
+    return checksums
+
+
+def refresh_checksums(models_dir: Path, names: Iterable[str] = ()) -> Optional[Dict[str, str]]:
+    """Rewrite an existing manifest after artifacts were replaced.
+
+    Keeps listing the artifacts already in the manifest, adds names, and
+    does nothing (returns None) when the directory has no manifest.
+    """
+    if not (Path(models_dir) / CHECKSUMS_FILE).exists():
+        return None
+    return write_checksums(models_dir, set(read_checksums(models_dir)) | set(names))
+
+
+class ArtifactLoader:
+    """Reads artifacts of a models directory concurrently, verifying checksums."""
+
+    def __init__(self, models_dir: Path, max_workers: int = 4, verify: bool = True):
+        """Initialize the loader.
+
+        Args:
+            models_dir: Directory with the artifacts (and optional checksums.json)
+            max_workers: Artifacts read at the same time
+            verify: Whether to check artifacts listed in checksums.json
+        """
+        self.models_dir = Path(models_dir)
+        self.max_workers = max_workers
+        self.checksums = read_checksums(self.models_dir) if verify else {}
+        # Artifact name -> (start, end) in time.perf_counter() seconds
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, path: Path, load: Optional[Callable[[Any], Any]] = None) -> Future:
+        """Start loading an artifact (with joblib.load by default).
+
+        load receives the path, or a file object with the verified bytes of
+        artifacts listed in the manifest.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix="artifact-loader"
+            )
+        return self._executor.submit(self._load, Path(path), load)
+
+    def _load(self, path: Path, load: Optional[Callable[[Any], Any]]) -> Any:
+        load = load or joblib.load
+        start = time.perf_counter()
+        expected = self.checksums.get(path.name)
+        if expected is None:
+            artifact = load(path)
+        else:
+            data = path.read_bytes()
+            if hashlib.sha256(data).hexdigest() != expected:
+                raise ValueError(f"Checksum mismatch for {path.name} (see {CHECKSUMS_FILE})")
+            artifact = load(io.BytesIO(data))
+        self.timings[path.name] = (start, time.perf_counter())
+        return artifact
+
+    def close(self) -> None:
+        """Wait for pending reads and stop the threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self) -> "ArtifactLoader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
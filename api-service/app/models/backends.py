@@ -0,0 +1,286 @@
+"""
+Inference backends.
+
+A backend owns the fitted vectorizer and the scoring runtime: it loads the
+artifacts of a models directory, scores batches of raw messages (vectorize
+and predict in one call) or already vectorized rows, and describes itself.
+The sklearn backend runs the joblib-loaded objects; the ONNX backend runs
+the graphs written by onnx_export.py with ONNX Runtime on CPU.
+"""
+
+import json
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .artifacts import ArtifactLoader
+from .precision import PRECISIONS, cast_model, set_precision
+
+# Vocabulary-based TF-IDF first, then the stateless hashed variant.
+VECTORIZER_FILES = ("tfidf_vectorizer.joblib", "hashing_vectorizer.joblib")
+
+MODEL_FILE = "best_model_temp.joblib"
+ONNX_TOKENS_FILE = "model.onnx"
+ONNX_SCORER_FILE = "scorer.onnx"
+
+# Rows per ONNX call (bounds token padding and dense float32 conversion)
+CHUNK_ROWS = 256
+
+
+def find_vectorizer(models_dir: Path) -> Path:
+    """Return the vectorizer artifact of a models directory."""
+    return next(
+        (models_dir / name for name in VECTORIZER_FILES if (models_dir / name).exists()),
+        models_dir / VECTORIZER_FILES[0],
+    )
+
+
+def _loading(models_dir: Path, loader: Optional[ArtifactLoader]):
+    """The caller's loader, or a new one closed when loading ends."""
+    return nullcontext(loader) if loader is not None else ArtifactLoader(models_dir)
+
+
+class InferenceBackend:
+    """Base class of inference runtimes."""
+
+    name = "base"
+
+    def __init__(self):
+        self.model = None
+        self.vectorizer = None
+        self.vectorizer_file: Optional[str] = None
+        self.artifact_paths: List[Path] = []
+
+    def load(self, models_dir: Path, loader: Optional[ArtifactLoader] = None) -> None:
+        """Load the artifacts of a models directory.
+
+        Args:
+            models_dir: Directory with the exported artifacts
+            loader: Shared concurrent loader (default: a private one)
+        """
+        raise NotImplementedError
+
+    @property
+    def classes_(self) -> Sequence[Any]:
+        """Class labels, in the column order of predicted probabilities."""
+        raise NotImplementedError
+
+    def predict_proba(self, messages: Sequence[str]) -> np.ndarray:
+        """Vectorize and score a batch of messages; returns (n, n_classes)."""
+        raise NotImplementedError
+
+    def predict_proba_vectorized(self, X) -> np.ndarray:
+        """Score already vectorized (TF-IDF) rows; returns (n, n_classes)."""
+        raise NotImplementedError
+
+    def describe(self) -> Dict[str, Any]:
+        """Runtime name, version and options."""
+        raise NotImplementedError
+
+
+class SklearnBackend(InferenceBackend):
+    """Joblib-loaded scikit-learn vectorizer and calibrated model."""
+
+    name = "sklearn"
+
+    def __init__(self, precision: str = "float64"):
+        """Initialize the backend.
+
+        Args:
+            precision: 'float64', or 'float32' to vectorize, score and calibrate
+                in single precision (see precision.py)
+        """
+        if precision not in PRECISIONS:
+            raise ValueError(f"precision must be one of {PRECISIONS}")
+        super().__init__()
+        self.precision = precision
+
+    def load(self, models_dir: Path, loader: Optional[ArtifactLoader] = None) -> None:
+        model_path = models_dir / MODEL_FILE
+        vectorizer_path = find_vectorizer(models_dir)
+        with _loading(models_dir, loader) as loader:
+            model = loader.submit(model_path)
+            vectorizer = loader.submit(vectorizer_path)
+            self.model = model.result()
+            self.vectorizer = vectorizer.result()
+        set_precision(self.vectorizer, self.model, self.precision)
+        self.vectorizer_file = vectorizer_path.name
+        self.artifact_paths = [model_path, vectorizer_path]
+
+    def prepare_model(self, model):
+        """Cast a newly loaded model (e.g. a feedback update) to the serving precision."""
+        return cast_model(model, self.precision)
+
+    @property
+    def classes_(self) -> Sequence[Any]:
+        return self.model.classes_
+
+    def predict_proba(self, messages: Sequence[str]) -> np.ndarray:
+        return self.predict_proba_vectorized(self.vectorizer.transform(list(messages)))
+
+    def predict_proba_vectorized(self, X) -> np.ndarray:
+        # Get probabilities from model (model must have predict_proba)
+        if not hasattr(self.model, "predict_proba"):
+            raise RuntimeError(
+                "Model must have predict_proba method. Use CalibratedClassifierCV during training."
+            )
+        return self.model.predict_proba(X)
+
+    def describe(self) -> Dict[str, Any]:
+        import sklearn
+
+        return {
+            "name": self.name,
+            "runtime": f"scikit-learn {sklearn.__version__}",
+            "precision": self.precision,
+        }
+
+
+class OnnxBackend(InferenceBackend):
+    """TF-IDF + calibrated LinearSVC graphs run by ONNX Runtime on CPU.
+
+    Messages are tokenized in Python with the exported vectorizer's own
+    preprocessor, tokenizer and stop words (ONNX string operators do not
+    reproduce scikit-learn's stop-word and n-gram handling), then the
+    TF-IDF weighting and the calibrated classifier run in ONNX. Vectorizers
+    without a token graph (hashed variant) and long-message rows go through
+    the scorer graph, which takes TF-IDF rows.
+    """
+
+    name = "onnx"
+
+    def __init__(self, intra_op_threads: int = 1):
+        """Initialize the backend.
+
+        Args:
+            intra_op_threads: ONNX Runtime intra-op threads (0 = runtime default)
+        """
+        super().__init__()
+        self.intra_op_threads = intra_op_threads
+        self._tokens_session = None
+        self._scorer_session = None
+        self._classes: Sequence[Any] = ()
+        self._pad_value = "#"
+
+    def load(self, models_dir: Path, loader: Optional[ArtifactLoader] = None) -> None:
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise RuntimeError(
+                "INFERENCE_BACKEND=onnx requires onnxruntime (pip install onnxruntime)"
+            ) from e
+
+        scorer_path = models_dir / ONNX_SCORER_FILE
+        if not scorer_path.exists():
+            raise FileNotFoundError(
+                f"{scorer_path} not found. Export it with scripts/export_onnx.py"
+            )
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        providers = ["CPUExecutionProvider"]
+
+        def session(source):
+            # Verified bytes (file object) or a path
+            model = source.read() if hasattr(source, "read") else str(source)
+            return onnxruntime.InferenceSession(model, options, providers=providers)
+
+        tokens_path = models_dir / ONNX_TOKENS_FILE
+        vectorizer_path = find_vectorizer(models_dir)
+        with _loading(models_dir, loader) as loader:
+            scorer = loader.submit(scorer_path, session)
+            tokens = loader.submit(tokens_path, session) if tokens_path.exists() else None
+            vectorizer = loader.submit(vectorizer_path)
+            self._scorer_session = scorer.result()
+            self._tokens_session = tokens.result() if tokens is not None else None
+            self.vectorizer = vectorizer.result()
+
+        self._scorer_input = self._scorer_session.get_inputs()[0].name
+        if self._tokens_session is not None:
+            self._tokens_input = self._tokens_session.get_inputs()[0].name
+
+        properties = self._scorer_session.get_modelmeta().custom_metadata_map
+        self._classes = json.loads(properties["classes"])
+        self._pad_value = properties.get("pad_value", "#")
+        self.vectorizer_file = vectorizer_path.name
+        self.artifact_paths = [scorer_path, vectorizer_path] + (
+            [tokens_path] if self._tokens_session is not None else []
+        )
+
+        if self._tokens_session is not None:
+            self._preprocess = self.vectorizer.build_preprocessor()
+            self._tokenize = self.vectorizer.build_tokenizer()
+            self._stop_words = self.vectorizer.get_stop_words() or frozenset()
+
+    @property
+    def classes_(self) -> Sequence[Any]:
+        return self._classes
+
+    def _token_matrix(self, messages: Sequence[str]) -> np.ndarray:
+        rows = [
+            [token for token in self._tokenize(self._preprocess(message))
+             if token not in self._stop_words]
+            for message in messages
+        ]
+        width = max((len(row) for row in rows), default=0) or 1
+        tokens = np.full((len(rows), width), self._pad_value, dtype=object)
+        for i, row in enumerate(rows):
+            tokens[i, : len(row)] = row
+        return tokens
+
+    def predict_proba(self, messages: Sequence[str]) -> np.ndarray:
+        if self._tokens_session is None:
+            return self.predict_proba_vectorized(self.vectorizer.transform(list(messages)))
+        messages = list(messages)
+        return np.vstack(
+            [
+                self._tokens_session.run(
+                    ["probabilities"],
+                    {self._tokens_input: self._token_matrix(messages[start : start + CHUNK_ROWS])},
+                )[0]
+                for start in range(0, len(messages), CHUNK_ROWS)
+            ]
+        )
+
+    def predict_proba_vectorized(self, X) -> np.ndarray:
+        chunks = []
+        for start in range(0, X.shape[0], CHUNK_ROWS):
+            rows = X[start : start + CHUNK_ROWS]
+            rows = rows.toarray() if hasattr(rows, "toarray") else rows
+            chunks.append(
+                self._scorer_session.run(
+                    ["probabilities"], {self._scorer_input: np.asarray(rows, dtype=np.float32)}
+                )[0]
+            )
+        return np.vstack(chunks)
+
+    def describe(self) -> Dict[str, Any]:
+        import onnxruntime
+
+        return {
+            "name": self.name,
+            "runtime": f"onnxruntime {onnxruntime.__version__}",
+            "intra_op_threads": self.intra_op_threads,
+            "token_graph": self._tokens_session is not None,
+        }
+
+
+BACKENDS = {"sklearn": SklearnBackend, "onnx": OnnxBackend}
+
+
+def create_backend(
+    name: str, intra_op_threads: int = 1, precision: str = "float64"
+) -> InferenceBackend:
+    """Build the backend selected by INFERENCE_BACKEND.
+
+    The ONNX graphs always run in float32; precision applies to sklearn.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"backend must be one of {tuple(BACKENDS)}")
+    if name == "onnx":
+        return OnnxBackend(intra_op_threads=intra_op_threads)
+    return SklearnBackend(precision=precision)
@@ -0,0 +1,117 @@
+"""
+Benchmark helpers for model artifacts.
+
+Shared by offline tools (pruning, conversion, deployment gate) to compare
+artifact sizes, load time, latency and prediction agreement.
+"""
+
+import csv
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+
+from .backends import InferenceBackend
+from .spam_classifier import SpamClassifier
+
+
+def load_corpus(csv_path: str, limit: int = 0) -> Tuple[List[str], List[str]]:
+    """Load messages and labels from a CSV with 'message' and 'label' columns."""
+    messages, labels = [], []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if not row.get("message"):
+                continue
+            messages.append(row["message"])
+            labels.append(row.get("label", ""))
+            if limit and len(messages) >= limit:
+                break
+    return messages, labels
+
+
+def artifact_sizes(models_dir: str) -> Dict[str, int]:
+    """Return size in bytes of each joblib artifact in a directory."""
+    return {path.name: path.stat().st_size for path in sorted(Path(models_dir).glob("*.joblib"))}
+
+
+def loaded_size(path: str) -> Tuple[int, float]:
+    """Return (heap bytes allocated, seconds) to deserialize an artifact."""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        obj = joblib.load(path)
+        seconds = time.perf_counter() - start
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del obj
+    return size, seconds
+
+
+def load_classifier(
+    models_dir: str, backend: Optional[InferenceBackend] = None
+) -> Tuple[SpamClassifier, float]:
+    """Load a classifier and return it with the load time in seconds."""
+    classifier = SpamClassifier(models_dir=str(models_dir), backend=backend)
+    start = time.perf_counter()
+    classifier.load()
+    return classifier, time.perf_counter() - start
+
+
+def measure_latency(
+    classifier: SpamClassifier, messages: Sequence[str], limit: int = 500
+) -> Dict[str, float]:
+    """Measure single-message classification latency and batch throughput."""
+    sample = list(messages[:limit])
+    latencies = []
+    for message in sample:
+        start = time.perf_counter()
+        classifier.classify({"message": message})
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    classifier.predict_spam_probabilities(messages)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "mean_ms": round(float(np.mean(latencies)), 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 4),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 4),
+        "batch_messages_per_second": round(len(messages) / batch_seconds, 1),
+    }
+
+
+def prediction_agreement(
+    probabilities_a: np.ndarray, probabilities_b: np.ndarray, threshold: float = 0.5
+) -> Dict[str, float]:
+    """Compare spam probabilities of two models on the same messages."""
+    labels_a = probabilities_a >= threshold
+    labels_b = probabilities_b >= threshold
+    return {
+        "agreement": round(float(np.mean(labels_a == labels_b)), 6),
+        "max_abs_diff": float(np.max(np.abs(probabilities_a - probabilities_b))),
+        "mean_abs_diff": float(np.mean(np.abs(probabilities_a - probabilities_b))),
+    }
+
+
+def compare_models(
+    baseline_dir: str, candidate_dir: str, messages: Sequence[str]
+) -> Dict[str, Any]:
+    """Benchmark two artifact directories on the same messages."""
+    report: Dict[str, Any] = {}
+    probabilities = {}
+    for name, models_dir in (("baseline", baseline_dir), ("candidate", candidate_dir)):
+        classifier, load_seconds = load_classifier(models_dir)
+        sizes = artifact_sizes(models_dir)
+        probabilities[name] = classifier.predict_spam_probabilities(messages)
+        report[name] = {
+            "sizes": sizes,
+            "total_bytes": sum(sizes.values()),
+            "load_seconds": round(load_seconds, 4),
+            "latency": measure_latency(classifier, messages),
+        }
+    report["agreement"] = prediction_agreement(probabilities["baseline"], probabilities["candidate"])
+    return report
@@ -0,0 +1,260 @@
+"""
+Streaming drift monitor.
+
+Each classification updates fixed-size histograms of the spam probability,
+the out-of-vocabulary token ratio and the message length, plus the spam
+rate. Counts are kept in a ring of time slots covering a rolling window, so
+memory is constant and an update is a handful of integer increments. The
+window is compared with reference statistics computed on the training data
+at export time (metadata["drift_reference"]) using the population
+stability index (PSI).
+"""
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+PROBABILITY_BINS = 20
+OOV_BINS = 20
+# Message length in characters, bucketed by powers of two (bit length)
+LENGTH_BINS = 21
+
+FEATURES = ("probability_spam", "oov_ratio", "message_length", "spam_rate")
+FEATURE_BINS = {
+    "probability_spam": PROBABILITY_BINS,
+    "oov_ratio": OOV_BINS,
+    "message_length": LENGTH_BINS,
+    "spam_rate": 2,
+}
+
+# Usual PSI reading: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 drift
+PSI_MODERATE = 0.1
+PSI_DRIFT = 0.25
+
+_EPSILON = 1e-4
+
+
+def _unit_bin(value: float, bins: int) -> int:
+    return min(max(int(value * bins), 0), bins - 1)
+
+
+def _length_bin(length: int) -> int:
+    return min(length.bit_length(), LENGTH_BINS - 1)
+
+
+class VocabularyCoverage:
+    """Out-of-vocabulary ratio of a message's tokens for a fitted vectorizer."""
+
+    def __init__(self, vectorizer, max_tokens: int = 256):
+        """Initialize from a fitted word-analyzer TfidfVectorizer or HashedTfidfVectorizer.
+
+        Args:
+            vectorizer: Fitted vectorizer
+            max_tokens: Tokens inspected per message (bounds the cost per update)
+
+        Raises:
+            ValueError: If the vectorizer does not use a word analyzer
+        """
+        if getattr(vectorizer, "analyzer", None) != "word":
+            raise ValueError("Vocabulary coverage requires a word-analyzer vectorizer")
+        self.max_tokens = max_tokens
+        self._max_chars = max_tokens * 16
+        self._preprocess = vectorizer.build_preprocessor()
+        self._tokenize = vectorizer.build_tokenizer()
+        self._stop_words = vectorizer.get_stop_words() or frozenset()
+        vocabulary = getattr(vectorizer, "vocabulary_", None)
+        self._lookup: Callable[[str], Optional[int]] = (
+            vocabulary.get if vocabulary is not None else vectorizer.feature_index
+        )
+
+    def oov_ratio(self, message: str) -> Optional[float]:
+        """Fraction of (non stop-word) tokens outside the vocabulary; None without tokens."""
+        tokens = self._tokenize(self._preprocess(message[: self._max_chars]))
+        seen = 0
+        missing = 0
+        for token in tokens:
+            if token in self._stop_words:
+                continue
+            seen += 1
+            if self._lookup(token) is None:
+                missing += 1
+            if seen == self.max_tokens:
+                break
+        return missing / seen if seen else None
+
+
+def _empty_counts() -> Dict[str, List[int]]:
+    return {feature: [0] * bins for feature, bins in FEATURE_BINS.items()}
+
+
+def population_stability_index(reference: Sequence[float], current: Sequence[float]) -> float:
+    """PSI between two histograms (counts or proportions over the same bins)."""
+    reference_total = sum(reference) or 1
+    current_total = sum(current) or 1
+    psi = 0.0
+    for expected, actual in zip(reference, current):
+        expected = max(expected / reference_total, _EPSILON)
+        actual = max(actual / current_total, _EPSILON)
+        psi += (actual - expected) * math.log(actual / expected)
+    return psi
+
+
+def reference_statistics(
+    messages: Iterable[str],
+    probabilities: Iterable[float],
+    vectorizer,
+    max_tokens: int = 256,
+) -> Dict[str, Any]:
+    """Histograms of the training data stored as metadata["drift_reference"].
+
+    Args:
+        messages: Training messages
+        probabilities: Spam probability of each message (preferably out-of-fold)
+        vectorizer: Fitted vectorizer exported with the model
+        max_tokens: Tokens inspected per message, as in the live monitor
+    """
+    coverage = VocabularyCoverage(vectorizer, max_tokens=max_tokens)
+    counts = _empty_counts()
+    samples = 0
+    for message, probability in zip(messages, probabilities):
+        _add(counts, message, float(probability), coverage.oov_ratio(message))
+        samples += 1
+    return {"samples": samples, "max_tokens": max_tokens, "histograms": counts}
+
+
+def _add(
+    counts: Dict[str, List[int]], message: str, probability: float, oov_ratio: Optional[float]
+) -> None:
+    counts["probability_spam"][_unit_bin(probability, PROBABILITY_BINS)] += 1
+    counts["message_length"][_length_bin(len(message))] += 1
+    counts["spam_rate"][1 if probability >= 0.5 else 0] += 1
+    if oov_ratio is not None:
+        counts["oov_ratio"][_unit_bin(oov_ratio, OOV_BINS)] += 1
+
+
+class DriftMonitor:
+    """Rolling-window histograms of live traffic compared with training statistics."""
+
+    def __init__(
+        self,
+        window_seconds: float = 3600.0,
+        slots: int = 12,
+        min_samples: int = 100,
+        max_tokens: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the monitor.
+
+        Args:
+            window_seconds: Length of the rolling window
+            slots: Time slots in the window (expiry granularity is window/slots)
+            min_samples: Observations needed before a status is reported
+            max_tokens: Tokens inspected per message for the OOV ratio
+            clock: Monotonic time source
+        """
+        self.window_seconds = window_seconds
+        self.slots = slots
+        self.min_samples = min_samples
+        self.max_tokens = max_tokens
+        self._slot_seconds = window_seconds / slots
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._coverage: Optional[VocabularyCoverage] = None
+        self.reference: Optional[Dict[str, Any]] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._ring = [_empty_counts() for _ in range(self.slots)]
+        self._epoch = int(self._clock() // self._slot_seconds)
+
+    def bind(self, vectorizer, reference: Optional[Dict[str, Any]]) -> None:
+        """Attach the loaded model's vectorizer and reference statistics; clears the window."""
+        try:
+            coverage = VocabularyCoverage(vectorizer, max_tokens=self.max_tokens)
+        except ValueError:
+            coverage = None
+        with self._lock:
+            self._coverage = coverage
+            self.reference = reference
+            self._reset()
+
+    def observe(self, message: str, probability_spam: float) -> None:
+        """Record one classified message."""
+        oov_ratio = self._coverage.oov_ratio(message) if self._coverage is not None else None
+        with self._lock:
+            _add(self._current(), message, probability_spam, oov_ratio)
+
+    def _current(self) -> Dict[str, List[int]]:
+        epoch = int(self._clock() // self._slot_seconds)
+        if epoch != self._epoch:
+            # Clear the slots skipped since the last update (at most the whole ring).
+            for skipped in range(self._epoch + 1, min(epoch, self._epoch + self.slots) + 1):
+                self._ring[skipped % self.slots] = _empty_counts()
+            self._epoch = epoch
+        return self._ring[epoch % self.slots]
+
+    def window_counts(self) -> Dict[str, List[int]]:
+        """Histogram counts over the rolling window."""
+        with self._lock:
+            self._current()
+            merged = _empty_counts()
+            for slot in self._ring:
+                for feature, counts in slot.items():
+                    target = merged[feature]
+                    for index, count in enumerate(counts):
+                        target[index] += count
+        return merged
+
+    def report(self) -> Dict[str, Any]:
+        """Compare the rolling window with the reference statistics."""
+        counts = self.window_counts()
+        observed = sum(counts["spam_rate"])
+        reference = (self.reference or {}).get("histograms")
+
+        features = {}
+        for feature in FEATURES:
+            current = counts[feature]
+            entry: Dict[str, Any] = {"observations": sum(current), "psi": None, "status": None}
+            entry["current"] = _proportions(current)
+            if reference is not None and feature in reference:
+                entry["reference"] = _proportions(reference[feature])
+                if entry["observations"] >= self.min_samples:
+                    entry["psi"] = round(population_stability_index(reference[feature], current), 4)
+                    entry["status"] = _status(entry["psi"])
+            features[feature] = entry
+
+        statuses = [entry["status"] for entry in features.values() if entry["status"]]
+        if reference is None:
+            status = "no_reference"
+        elif observed < self.min_samples:
+            status = "insufficient_data"
+        else:
+            status = max(statuses, key=("stable", "moderate", "drift").index)
+
+        return {
+            "status": status,
+            "window_seconds": self.window_seconds,
+            "observed": observed,
+            "spam_rate": round(counts["spam_rate"][1] / observed, 4) if observed else None,
+            "reference_spam_rate": (
+                round(reference["spam_rate"][1] / (sum(reference["spam_rate"]) or 1), 4)
+                if reference is not None
+                else None
+            ),
+            "reference_samples": (self.reference or {}).get("samples"),
+            "features": features,
+        }
+
+
+def _proportions(counts: Sequence[int]) -> List[float]:
+    total = sum(counts)
+    return [round(count / total, 4) if total else 0.0 for count in counts]
+
+
+def _status(psi: float) -> str:
+    if psi >= PSI_DRIFT:
+        return "drift"
+    if psi >= PSI_MODERATE:
+        return "moderate"
+    return "stable"
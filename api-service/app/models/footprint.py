@@ -0,0 +1,158 @@
+"""
+Deep memory footprint of loaded model artifacts.
+
+sys.getsizeof() only counts an object's own header; the size reported here
+follows containers, instance attributes and NumPy buffers, counting each
+object once. Fitted scikit-learn objects are plain Python objects holding
+dicts and arrays, so their footprint is measured without importing
+scikit-learn. Memory held by native runtimes (ONNX Runtime sessions) is
+not visible to this walk and only shows in the process RSS.
+"""
+
+import sys
+import types
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+# Shared, immutable or owned elsewhere: never counted
+_SKIPPED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+)
+
+# Fitted attributes reported on their own before the rest of an object
+VECTORIZER_PARTS = ("vocabulary_", "idf_", "stop_words_")
+ESTIMATOR_PARTS = ("coef_", "intercept_")
+
+
+_SCALAR_TYPES = (str, bytes, bytearray, int, float, complex, bool)
+
+
+def _array_size(array: np.ndarray) -> Tuple[int, Iterable[Any]]:
+    size = sys.getsizeof(array)
+    if not array.flags.owndata:
+        # Views and memory maps: the buffer is not part of the header size
+        size += array.nbytes
+    return size, array.ravel().tolist() if array.dtype == object else ()
+
+
+def _container_items(container: Any) -> Iterable[Any]:
+    if isinstance(container, dict):
+        return [*container.keys(), *container.values()]
+    return container
+
+
+def _object_references(obj: Any) -> Iterable[Any]:
+    attributes = getattr(obj, "__dict__", None)
+    if attributes is not None:
+        yield attributes
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            yield getattr(obj, slot)
+
+
+def _size_and_references(obj: Any) -> Tuple[int, Iterable[Any]]:
+    """Own size of an object and the objects it references."""
+    if isinstance(obj, np.ndarray):
+        return _array_size(obj)
+    if isinstance(obj, (memoryview, np.generic, *_SCALAR_TYPES)):
+        return sys.getsizeof(obj), ()
+    if isinstance(obj, (dict, list, tuple, set, frozenset)):
+        return sys.getsizeof(obj), _container_items(obj)
+    return sys.getsizeof(obj), _object_references(obj)
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Bytes held by an object and everything it references (each object counted once).
+
+    Args:
+        obj: Object to measure
+        seen: Ids already counted; shared between calls to split a total into parts
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIPPED_TYPES) or current is None:
+            continue
+        seen.add(id(current))
+        size, references = _size_and_references(current)
+        total += size
+        stack.extend(references)
+    return total
+
+
+def _parts(
+    obj: Any, named: Iterable[Tuple[str, Any]], seen: Set[int]
+) -> Dict[str, int]:
+    """Sizes of named parts of an object, then of the rest of it as 'other'."""
+    parts = {}
+    for name, part in named:
+        if part is not None:
+            parts[name] = deep_sizeof(part, seen)
+    parts["other"] = deep_sizeof(obj, seen)
+    return parts
+
+
+def _attributes(obj: Any, names: Iterable[str], prefix: str = "") -> Iterable[Tuple[str, Any]]:
+    for name in names:
+        try:
+            value = getattr(obj, name)
+        except Exception:
+            # Unfitted attribute or property failing on this object
+            continue
+        yield f"{prefix}{name}", value
+
+
+def _estimator_parts(model: Any) -> Iterable[Tuple[str, Any]]:
+    folds = getattr(model, "calibrated_classifiers_", None)
+    if folds is None:
+        yield from _attributes(model, ESTIMATOR_PARTS)
+        return
+    for index, fold in enumerate(folds):
+        yield from _attributes(fold.estimator, ESTIMATOR_PARTS, prefix=f"fold_{index}.")
+        yield f"fold_{index}.calibrators", getattr(fold, "calibrators", None)
+
+
+def _describe(obj: Any, parts: Dict[str, int]) -> Dict[str, Any]:
+    return {"type": type(obj).__name__, "bytes": sum(parts.values()), "parts": parts}
+
+
+def artifact_footprint(classifier, seen: Optional[Set[int]] = None) -> Dict[str, Any]:
+    """Deep size of each artifact a loaded SpamClassifier holds, split into its parts.
+
+    Args:
+        classifier: Loaded SpamClassifier
+        seen: Ids already counted (artifacts shared with them report 0 bytes)
+
+    Returns:
+        {"artifacts": {name: {"type", "bytes", "parts"}}, "total_bytes"}; the
+        model is None for runtimes whose memory is native (ONNX)
+    """
+    seen = set() if seen is None else seen
+    artifacts: Dict[str, Any] = {}
+    vectorizer = classifier.vectorizer
+    if vectorizer is not None:
+        artifacts["vectorizer"] = _describe(
+            vectorizer, _parts(vectorizer, _attributes(vectorizer, VECTORIZER_PARTS), seen)
+        )
+    model = classifier.model
+    artifacts["model"] = (
+        _describe(model, _parts(model, _estimator_parts(model), seen))
+        if model is not None
+        else None
+    )
+    for name in ("label_encoder", "metadata"):
+        artifact = getattr(classifier, name)
+        if artifact is not None:
+            artifacts[name] = _describe(artifact, {"other": deep_sizeof(artifact, seen)})
+    return {
+        "artifacts": artifacts,
+        "total_bytes": sum(entry["bytes"] for entry in artifacts.values() if entry is not None),
+    }
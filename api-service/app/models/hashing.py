@@ -0,0 +1,146 @@
+"""
+Stateless TF-IDF vectorization with feature hashing.
+
+Terms are mapped to columns with the same MurmurHash3 function as
+HashingVectorizer, so no vocabulary dict is kept in memory. Only the hashed
+buckets selected at fit time (min_df, max_df, max_features) and their IDF
+weights are stored, as two small NumPy arrays.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+
+
+class HashedTfidfVectorizer:
+    """TF-IDF vectorizer over hashed n-gram buckets."""
+
+    analyzer = "word"
+    binary = False
+    use_idf = True
+
+    def __init__(
+        self,
+        n_features: int = 2**20,
+        ngram_range: Tuple[int, int] = (1, 2),
+        stop_words: Optional[str] = "english",
+        min_df: float = 2,
+        max_df: float = 0.95,
+        max_features: Optional[int] = 5000,
+        sublinear_tf: bool = False,
+        norm: Optional[str] = "l2",
+        dtype=np.float64,
+    ):
+        """Initialize the vectorizer.
+
+        Args:
+            n_features: Number of hash buckets
+            ngram_range: Range of word n-grams
+            stop_words: Stop word list passed to the analyzer
+            min_df: Minimum document frequency (count, or proportion if float)
+            max_df: Maximum document frequency (count, or proportion if float)
+            max_features: Keep only the most frequent buckets (None keeps all)
+            sublinear_tf: Apply 1 + log(tf)
+            norm: Row normalization ('l1', 'l2' or None)
+            dtype: Output dtype
+        """
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.stop_words = stop_words
+        self.min_df = min_df
+        self.max_df = max_df
+        self.max_features = max_features
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.dtype = dtype
+        self.columns_: Optional[np.ndarray] = None
+        self.idf_: Optional[np.ndarray] = None
+        self._hashing_vectorizer: Optional[HashingVectorizer] = None
+
+    def _hasher(self) -> HashingVectorizer:
+        # Reused so the analyzer's stop-word validation runs only once.
+        if self._hashing_vectorizer is None:
+            self._hashing_vectorizer = HashingVectorizer(
+                n_features=self.n_features,
+                ngram_range=self.ngram_range,
+                stop_words=self.stop_words,
+                alternate_sign=False,
+                norm=None,
+                dtype=self.dtype,
+            )
+        return self._hashing_vectorizer
+
+    def build_preprocessor(self):
+        return self._hasher().build_preprocessor()
+
+    def build_tokenizer(self):
+        return self._hasher().build_tokenizer()
+
+    def get_stop_words(self):
+        return self._hasher().get_stop_words()
+
+    def fit(self, raw_documents: Iterable[str]) -> "HashedTfidfVectorizer":
+        """Select buckets and learn their IDF weights."""
+        counts = self._hasher().transform(raw_documents).tocsc()
+        n_documents = counts.shape[0]
+        df = np.diff(counts.indptr)
+
+        min_df = self.min_df if isinstance(self.min_df, int) else self.min_df * n_documents
+        max_df = self.max_df if isinstance(self.max_df, int) else self.max_df * n_documents
+        columns = np.flatnonzero((df >= min_df) & (df <= max_df))
+        if not len(columns):
+            raise ValueError("No hashed feature satisfies min_df/max_df")
+
+        if self.max_features is not None and len(columns) > self.max_features:
+            term_counts = np.asarray(counts[:, columns].sum(axis=0)).ravel()
+            top = np.argsort(-term_counts, kind="mergesort")[: self.max_features]
+            columns = np.sort(columns[top])
+
+        self.columns_ = columns.astype(np.int32)
+        self.idf_ = (np.log((1 + n_documents) / (1 + df[columns])) + 1).astype(self.dtype)
+        return self
+
+    def fit_transform(self, raw_documents: List[str]) -> csr_matrix:
+        return self.fit(raw_documents).transform(raw_documents)
+
+    def feature_index(self, term: str) -> Optional[int]:
+        """Return the output column of an analyzed term, or None if not selected."""
+        # Same bucket as sklearn's _hashing_fast (including the INT_MIN case).
+        h = murmurhash3_32(term, seed=0)
+        bucket = (
+            (2147483647 - (self.n_features - 1)) % self.n_features
+            if h == -2147483648
+            else abs(h) % self.n_features
+        )
+        position = int(np.searchsorted(self.columns_, bucket))
+        if position < len(self.columns_) and self.columns_[position] == bucket:
+            return position
+        return None
+
+    def transform(self, raw_documents: Iterable[str]) -> csr_matrix:
+        """Transform documents to a TF-IDF matrix over the selected buckets."""
+        if self.columns_ is None:
+            raise ValueError("HashedTfidfVectorizer is not fitted")
+
+        hashed = self._hasher().transform(raw_documents)
+        positions = np.searchsorted(self.columns_, hashed.indices)
+        np.minimum(positions, len(self.columns_) - 1, out=positions)
+        selected = self.columns_[positions] == hashed.indices
+
+        indptr = np.concatenate(([0], np.cumsum(selected)))[hashed.indptr]
+        matrix = csr_matrix(
+            (hashed.data[selected], positions[selected].astype(np.int32), indptr),
+            shape=(hashed.shape[0], len(self.columns_)),
+        )
+
+        if self.sublinear_tf:
+            np.log(matrix.data, matrix.data)
+            matrix.data += 1
+        matrix.data *= self.idf_[matrix.indices]
+        if self.norm:
+            matrix = normalize(matrix, norm=self.norm, copy=False)
+        return matrix
@@ -0,0 +1,91 @@
+"""
+Incremental updates of the linear model from labelled feedback.
+
+The calibrated LinearSVC folds are turned into SGDClassifiers with the
+same weights (hinge loss, so the decision function keeps its scale and the
+fitted sigmoid calibrators stay valid) and updated with partial_fit on the
+TF-IDF rows of new feedback. The vectorizer is not refitted: updates are a
+few sparse passes over a small batch, cheap enough to run every few
+minutes. Candidates are only published when they do not lose accuracy on a
+holdout set compared with the model currently served.
+"""
+
+import copy
+import os
+from pathlib import Path
+from typing import Any, Dict, Sequence
+
+import joblib
+import numpy as np
+
+from .artifacts import refresh_checksums
+from .backends import MODEL_FILE
+
+
+def to_sgd(estimator, alpha: float = 1e-4, eta0: float = 0.01):
+    """SGDClassifier with the weights of a fitted linear estimator (SGD ones are copied)."""
+    from sklearn.linear_model import SGDClassifier
+
+    if isinstance(estimator, SGDClassifier):
+        return copy.deepcopy(estimator)
+    coef = estimator.coef_
+    sgd = SGDClassifier(
+        loss="hinge", alpha=alpha, learning_rate="constant", eta0=eta0, random_state=42
+    )
+    sgd.coef_ = np.array(coef.toarray() if hasattr(coef, "toarray") else coef, dtype=np.float64)
+    sgd.intercept_ = np.array(estimator.intercept_, dtype=np.float64)
+    sgd.classes_ = np.array(estimator.classes_)
+    sgd.n_features_in_ = sgd.coef_.shape[1]
+    sgd.t_ = 1.0
+    return sgd
+
+
+def partial_fit_model(
+    model, X, y: Sequence, epochs: int = 5, alpha: float = 1e-4, eta0: float = 0.01
+):
+    """Copy of a calibrated (or bare) linear model updated with partial_fit on (X, y).
+
+    Args:
+        model: Fitted CalibratedClassifierCV or linear classifier
+        X: TF-IDF rows of the feedback messages
+        y: Labels in the encoding of the model's classes_
+        epochs: Passes over the feedback batch
+        alpha: L2 regularization of the SGD updates
+        eta0: Constant SGD learning rate
+    """
+    y = np.asarray(y)
+    updated = copy.deepcopy(model)
+    folds = (
+        updated.calibrated_classifiers_ if hasattr(updated, "calibrated_classifiers_") else None
+    )
+    estimators = [fold.estimator for fold in folds] if folds is not None else [updated]
+    sgds = [to_sgd(estimator, alpha=alpha, eta0=eta0) for estimator in estimators]
+    rng = np.random.default_rng(42)
+    for _ in range(epochs):
+        order = rng.permutation(len(y))
+        for sgd in sgds:
+            sgd.partial_fit(X[order], y[order])
+    if folds is None:
+        return sgds[0]
+    for fold, sgd in zip(folds, sgds):
+        fold.estimator = sgd
+    return updated
+
+
+def accuracy(model, X, y: Sequence) -> float:
+    """Accuracy of a model on encoded labels."""
+    return float(np.mean(model.predict(X) == np.asarray(y)))
+
+
+def publish_model(models_dir: Path, model, metadata: Dict[str, Any]) -> None:
+    """Atomically replace the model and metadata artifacts of a models directory.
+
+    Each file is written next to its target and renamed over it, so readers
+    see either the old or the new artifact, never a partial one.
+    """
+    models_dir = Path(models_dir)
+    for name, artifact in ((MODEL_FILE, model), ("metadata.joblib", metadata)):
+        staging = models_dir / f".{name}.tmp"
+        joblib.dump(artifact, staging)
+        os.replace(staging, models_dir / name)
+    refresh_checksums(models_dir)
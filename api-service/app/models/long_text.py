@@ -0,0 +1,190 @@
+"""
+Chunked TF-IDF vectorization for long messages.
+
+Text is analyzed in fixed-size windows cut at whitespace. Term counts are
+merged across windows (n-grams spanning a window boundary included) before
+IDF weighting and normalization, so the result equals the fitted
+TfidfVectorizer applied to the whole document. Work is capped by a token
+budget; when it is exceeded only the head (or head and tail) is used.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.preprocessing import normalize
+
+TRUNCATION_POLICIES = ("head", "head_tail")
+_WHITESPACE = (" ", "\n", "\t", "\r")
+
+
+class ChunkedTfidfVectorizer:
+    """Bounded-memory transform of long documents with a fitted TF-IDF vectorizer."""
+
+    def __init__(
+        self,
+        vectorizer,
+        window_chars: int = 65536,
+        max_tokens: int = 20000,
+        truncation: str = "head_tail",
+    ):
+        """Initialize the chunked vectorizer.
+
+        Args:
+            vectorizer: Fitted word-analyzer TfidfVectorizer or HashedTfidfVectorizer
+            window_chars: Characters analyzed per window
+            max_tokens: Maximum tokens (after stop-word removal) counted per document
+            truncation: Policy when the budget is exceeded ('head' or 'head_tail')
+        """
+        if getattr(vectorizer, "analyzer", None) != "word":
+            raise ValueError("Chunked vectorization requires a word-analyzer vectorizer")
+        if truncation not in TRUNCATION_POLICIES:
+            raise ValueError(f"truncation must be one of {TRUNCATION_POLICIES}")
+        if window_chars <= 0 or max_tokens <= 0:
+            raise ValueError("window_chars and max_tokens must be positive")
+
+        self.vectorizer = vectorizer
+        self.window_chars = window_chars
+        self.max_tokens = max_tokens
+        self.truncation = truncation
+
+        self._preprocess = vectorizer.build_preprocessor()
+        self._tokenize = vectorizer.build_tokenizer()
+        self._stop_words = vectorizer.get_stop_words()
+        self._min_n, self._max_n = vectorizer.ngram_range
+        vocabulary = getattr(vectorizer, "vocabulary_", None)
+        if vocabulary is not None:
+            self._lookup, self._n_features = vocabulary.get, len(vocabulary)
+        else:
+            # Hashed vectorizers map terms to columns without a vocabulary.
+            self._lookup, self._n_features = vectorizer.feature_index, len(vectorizer.idf_)
+
+    def _tokens(self, window: str) -> List[str]:
+        tokens = self._tokenize(self._preprocess(window))
+        if self._stop_words is not None:
+            tokens = [token for token in tokens if token not in self._stop_words]
+        return tokens
+
+    def _count(self, counts: Counter, tokens: List[str], carry: List[str]) -> List[str]:
+        """Count vocabulary n-grams ending in tokens; return the new carry."""
+        sequence = carry + tokens
+        for n in range(self._min_n, self._max_n + 1):
+            for i in range(max(0, len(carry) - n + 1), len(sequence) - n + 1):
+                index = self._lookup(" ".join(sequence[i : i + n]))
+                if index is not None:
+                    counts[index] += 1
+        return sequence[len(sequence) - (self._max_n - 1) :] if self._max_n > 1 else []
+
+    def _forward_windows(self, text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        """Yield windows from start to end, cut at the last whitespace."""
+        pos = start
+        while pos < end:
+            stop = pos + self.window_chars
+            if stop >= end:
+                stop = end
+            else:
+                cut = max(text.rfind(char, pos, stop) for char in _WHITESPACE)
+                stop = cut if cut > pos else stop
+            yield pos, stop
+            pos = stop
+
+    def _backward_windows(self, text: str, start: int, end: int) -> Iterator[Tuple[int, int]]:
+        """Yield windows from end back to start, cut at the first whitespace."""
+        pos = end
+        while pos > start:
+            begin = pos - self.window_chars
+            if begin <= start:
+                begin = start
+            else:
+                found = [text.find(char, begin, pos) for char in _WHITESPACE]
+                found = [index for index in found if index > begin]
+                begin = min(found) if found else begin
+            yield begin, pos
+            pos = begin
+
+    def transform(self, text: str) -> Tuple[csr_matrix, Dict[str, Any]]:
+        """Vectorize a single document.
+
+        Returns:
+            Tuple of (1 x n_features TF-IDF matrix, truncation report)
+        """
+        counts: Counter = Counter()
+        carry: List[str] = []
+        head_budget = self.max_tokens if self.truncation == "head" else self.max_tokens // 2
+        used, windows = 0, 0
+        pending: Optional[List[str]] = None
+        head_end = len(text)
+
+        for start, stop in self._forward_windows(text, 0, len(text)):
+            tokens = self._tokens(text[start:stop])
+            windows += 1
+            if used + len(tokens) > head_budget:
+                pending, head_end = tokens, stop
+                break
+            carry = self._count(counts, tokens, carry)
+            used += len(tokens)
+
+        truncated = pending is not None
+        if truncated and self.truncation == "head":
+            self._count(counts, pending[: head_budget - used], carry)
+            used = head_budget
+        elif truncated:
+            tail_budget = self.max_tokens - head_budget
+            tail, tail_used, reached_head = [], 0, True
+            for start, stop in self._backward_windows(text, head_end, len(text)):
+                tokens = self._tokens(text[start:stop])
+                windows += 1
+                if tail_used + len(tokens) > tail_budget:
+                    keep = tail_budget - tail_used
+                    tail.append(tokens[len(tokens) - keep :] if keep else [])
+                    tail_used, reached_head = tail_budget, False
+                    break
+                tail.append(tokens)
+                tail_used += len(tokens)
+            tail.reverse()
+
+            if reached_head and used + len(pending) + tail_used <= self.max_tokens:
+                # Whole document fits: count it contiguously.
+                truncated = False
+                used += len(pending) + tail_used
+                tail.insert(0, pending)
+            else:
+                self._count(counts, pending[: head_budget - used], carry)
+                if reached_head and tail_used < tail_budget:
+                    tail.insert(0, pending[len(pending) - (tail_budget - tail_used) :])
+                used = self.max_tokens if reached_head else head_budget + tail_used
+                carry = []
+
+            for tokens in tail:
+                carry = self._count(counts, tokens, carry)
+
+        return self._weight(counts), {
+            "policy": self.truncation,
+            "truncated": truncated,
+            "tokens_used": used,
+            "chars_total": len(text),
+            "windows": windows,
+        }
+
+    def _weight(self, counts: Counter) -> csr_matrix:
+        """Apply TF scaling, IDF and normalization like TfidfVectorizer."""
+        vectorizer = self.vectorizer
+        terms = sorted(counts)
+        indices = np.array(terms, dtype=np.int32)
+        data = np.array([counts[index] for index in terms], dtype=vectorizer.dtype)
+        if vectorizer.binary:
+            data[:] = 1
+        matrix = csr_matrix(
+            (data, indices, np.array([0, len(indices)])),
+            shape=(1, self._n_features),
+        )
+
+        if vectorizer.sublinear_tf:
+            np.log(matrix.data, matrix.data)
+            matrix.data += 1
+        if vectorizer.use_idf:
+            matrix.data *= vectorizer.idf_[matrix.indices]
+        if vectorizer.norm:
+            matrix = normalize(matrix, norm=vectorizer.norm, copy=False)
+        return matrix
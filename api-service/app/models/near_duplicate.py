@@ -0,0 +1,171 @@
+"""
+Near-duplicate message index.
+
+Campaign variants differ only in recipient names, tracking URLs or random
+tokens, so exact caching misses them. Messages are reduced to a 64-bit
+SimHash sketch and indexed with LSH bands, allowing previously scored
+probabilities to be reused when a new message is similar enough.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+SKETCH_BITS = 64
+
+# Lowest similarity threshold accepted. Lower thresholds need more and
+# narrower LSH bands (33 two-bit bands at 0.5), so nearly every entry shares
+# a band with the query and lookups degrade to a linear scan; at 0.85 there
+# are at most 10 bands of 6-7 bits.
+MIN_THRESHOLD = 0.85
+
+_URL_RE = re.compile(r"(?:https?://|www\.)\S+")
+_EMAIL_RE = re.compile(r"\S+@\S+")
+_DIGIT_TOKEN_RE = re.compile(r"\w*\d\w*")
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_tokens(message: str) -> List[str]:
+    """Lowercase message and mask URLs, addresses and tokens with digits."""
+    text = _URL_RE.sub(" urltoken ", message.lower())
+    text = _EMAIL_RE.sub(" emailtoken ", text)
+    text = _DIGIT_TOKEN_RE.sub(" numtoken ", text)
+    return _TOKEN_RE.findall(text)
+
+
+def _feature_hash(feature: str) -> int:
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def simhash(message: str) -> Optional[int]:
+    """Compute a 64-bit SimHash sketch over unigrams and bigrams.
+
+    Tokens are hashed with BLAKE2b rather than the built-in string hash,
+    which is salted per process, so sketches are stable across workers and
+    restarts.
+
+    Returns:
+        The sketch, or None for a message without word tokens (all such
+        messages would share one sketch)
+    """
+    tokens = normalize_tokens(message)
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    if not features:
+        return None
+
+    hashes = np.fromiter(
+        (_feature_hash(feature) for feature in features),
+        dtype=np.uint64,
+        count=len(features),
+    )
+    bits = np.unpackbits(hashes.view(np.uint8)).reshape(len(features), SKETCH_BITS)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(features)
+    packed = np.packbits(votes > 0).view(np.uint64)[0]
+    return int(packed)
+
+
+def similarity(sketch_a: int, sketch_b: int) -> float:
+    """Return the fraction of matching bits between two sketches."""
+    return 1.0 - (sketch_a ^ sketch_b).bit_count() / SKETCH_BITS
+
+
+class NearDuplicateIndex:
+    """Bounded LSH index of recently scored messages."""
+
+    def __init__(self, threshold: float = 0.95, capacity: int = 10000):
+        """Initialize the index.
+
+        Args:
+            threshold: Minimum similarity (MIN_THRESHOLD-1.0) to reuse a prediction
+            capacity: Maximum number of sketches kept (least recently used are evicted)
+        """
+        if not MIN_THRESHOLD <= threshold <= 1.0:
+            raise ValueError(f"threshold must be between {MIN_THRESHOLD} and 1.0")
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.threshold = threshold
+        self.capacity = capacity
+        self.max_distance = int((1.0 - threshold) * SKETCH_BITS + 1e-9)
+
+        # Pigeonhole: with max_distance + 1 bands, any sketch within
+        # max_distance bits matches at least one band exactly.
+        band_count = self.max_distance + 1
+        edges = np.linspace(0, SKETCH_BITS, band_count + 1).astype(int)
+        self._bands = [
+            (int(start), (1 << int(end - start)) - 1) for start, end in zip(edges, edges[1:])
+        ]
+
+        self._entries: "OrderedDict[int, Tuple[float, float]]" = OrderedDict()
+        self._buckets: List[Dict[int, Set[int]]] = [{} for _ in self._bands]
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _band_keys(self, sketch: int) -> List[int]:
+        return [(sketch >> shift) & mask for shift, mask in self._bands]
+
+    def lookup(self, sketch: int) -> Optional[Tuple[float, float]]:
+        """Return cached (probability_spam, probability_ham) for a similar sketch."""
+        with self._lock:
+            best, best_distance = None, self.max_distance + 1
+            for bucket, key in zip(self._buckets, self._band_keys(sketch)):
+                for candidate in bucket.get(key, ()):
+                    distance = (candidate ^ sketch).bit_count()
+                    if distance < best_distance:
+                        best, best_distance = candidate, distance
+
+            if best is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(best)
+            return self._entries[best]
+
+    def add(self, sketch: int, probability_spam: float, probability_ham: float) -> None:
+        """Store probabilities for a sketch, evicting the oldest entry if full."""
+        with self._lock:
+            if sketch in self._entries:
+                self._entries.move_to_end(sketch)
+                self._entries[sketch] = (probability_spam, probability_ham)
+                return
+
+            if len(self._entries) >= self.capacity:
+                evicted, _ = self._entries.popitem(last=False)
+                for bucket, key in zip(self._buckets, self._band_keys(evicted)):
+                    members = bucket[key]
+                    members.discard(evicted)
+                    if not members:
+                        del bucket[key]
+
+            self._entries[sketch] = (probability_spam, probability_ham)
+            for bucket, key in zip(self._buckets, self._band_keys(sketch)):
+                bucket.setdefault(key, set()).add(sketch)
+
+    def clear(self) -> None:
+        """Forget every sketch (e.g. after the model changed)."""
+        with self._lock:
+            self._entries.clear()
+            for bucket in self._buckets:
+                bucket.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Return index size and hit statistics."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,123 @@
+"""
+ONNX export of the TF-IDF + calibrated classifier artifacts.
+
+Writes the graphs run by OnnxBackend next to the joblib artifacts:
+scorer.onnx (TF-IDF rows -> class probabilities, for every vectorizer) and,
+for vocabulary TfidfVectorizers, model.onnx (tokens -> class probabilities).
+model.onnx is the converted pipeline cut at the tokenizer output: the
+converter's string normalizer and tokenizer do not match scikit-learn's
+regex tokenization and stop-word handling, so tokens are produced in Python
+and only n-grams, TF-IDF weighting and the classifier run in ONNX.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Sequence
+
+import joblib
+
+from .artifacts import refresh_checksums
+from .backends import MODEL_FILE, ONNX_SCORER_FILE, ONNX_TOKENS_FILE, OnnxBackend, find_vectorizer
+from .benchmark import load_classifier, measure_latency, prediction_agreement
+
+TARGET_OPSET = 17
+# Output of the converter's Tokenizer node, where model.onnx starts
+TOKENS_INPUT = "tokenized"
+
+
+def _has_token_graph(vectorizer) -> bool:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    return (
+        type(vectorizer) is TfidfVectorizer
+        and vectorizer.analyzer == "word"
+        and vectorizer.tokenizer is None
+    )
+
+
+def _set_properties(onx, classes: Sequence[Any], **extra: str) -> None:
+    from onnx import helper
+
+    helper.set_model_props(onx, {"classes": json.dumps(list(classes)), **extra})
+
+
+def export_onnx(models_dir: str, target_opset: int = TARGET_OPSET) -> Dict[str, str]:
+    """Convert the artifacts of models_dir to ONNX graphs written alongside them.
+
+    Returns:
+        Mapping of written file name to its role
+    """
+    import onnx
+    from onnx import TensorProto, helper
+    from onnx.utils import Extractor
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType, StringTensorType
+    from sklearn.pipeline import Pipeline
+
+    models_dir = Path(models_dir)
+    model = joblib.load(models_dir / MODEL_FILE)
+    vectorizer = joblib.load(find_vectorizer(models_dir))
+    classes = model.classes_.tolist()
+    n_features = getattr(model, "n_features_in_", None) or len(vectorizer.idf_)
+    written = {}
+
+    properties = {}
+    tokens_path = models_dir / ONNX_TOKENS_FILE
+    if _has_token_graph(vectorizer):
+        pipeline = Pipeline([("tfidf", vectorizer), ("classifier", model)])
+        full = convert_sklearn(
+            pipeline,
+            initial_types=[("message", StringTensorType([None, 1]))],
+            # "C" avoids depending on an installed en_US locale; the string
+            # normalizer is cut off below anyway.
+            options={id(vectorizer): {"locale": "C"}, id(model): {"zipmap": False}},
+            target_opset=target_opset,
+        )
+        tokenizer = next(node for node in full.graph.node if TOKENS_INPUT in node.output)
+        properties["pad_value"] = next(
+            helper.get_attribute_value(attribute).decode()
+            for attribute in tokenizer.attribute
+            if attribute.name == "pad_value"
+        )
+        full.graph.value_info.append(
+            helper.make_tensor_value_info(TOKENS_INPUT, TensorProto.STRING, [None, None])
+        )
+        tokens_graph = Extractor(full).extract_model([TOKENS_INPUT], ["probabilities"])
+        _set_properties(tokens_graph, classes, **properties)
+        onnx.save(tokens_graph, tokens_path)
+        written[ONNX_TOKENS_FILE] = "tokens"
+    elif tokens_path.exists():
+        # A stale token graph would score with another vocabulary.
+        tokens_path.unlink()
+
+    scorer = convert_sklearn(
+        model,
+        initial_types=[("tfidf", FloatTensorType([None, n_features]))],
+        options={id(model): {"zipmap": False}},
+        target_opset=target_opset,
+    )
+    # OnnxBackend reads classes and pad_value from the scorer.
+    _set_properties(scorer, classes, **properties)
+    onnx.save(scorer, models_dir / ONNX_SCORER_FILE)
+    written[ONNX_SCORER_FILE] = "scorer"
+
+    refresh_checksums(models_dir, written)
+    return written
+
+
+def compare_backends(
+    models_dir: str, messages: Sequence[str], intra_op_threads: int = 1
+) -> Dict[str, Any]:
+    """Benchmark the sklearn and ONNX backends on the same messages and artifacts."""
+    report: Dict[str, Any] = {}
+    probabilities = {}
+    for name, backend in (("sklearn", None), ("onnx", OnnxBackend(intra_op_threads))):
+        classifier, load_seconds = load_classifier(models_dir, backend=backend)
+        probabilities[name] = classifier.predict_spam_probabilities(messages)
+        report[name] = {
+            "backend": classifier.backend.describe(),
+            "load_seconds": round(load_seconds, 4),
+            "latency": measure_latency(classifier, messages),
+        }
+    report["agreement"] = prediction_agreement(probabilities["sklearn"], probabilities["onnx"])
+    return report
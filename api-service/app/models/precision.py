@@ -0,0 +1,196 @@
+"""
+Reduced-precision serving of TF-IDF + calibrated linear models.
+
+Fitted vectorizers and LinearSVC folds are float64, which doubles the bytes
+moved per sparse row, batch matrix and coefficient array. Serving in
+float32 casts the IDF weights and the vectorizer output dtype, every
+fold's coefficients and intercepts and the sigmoid calibration parameters,
+so vectorization, decision functions and calibration run in float32 end to
+end. Artifacts can also be stored with float16 coefficients (half the
+size on disk); they are widened to the serving precision when loaded.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import joblib
+import numpy as np
+
+from .artifacts import refresh_checksums
+
+PRECISIONS = ("float64", "float32")
+COEFFICIENT_DTYPES = ("float64", "float32", "float16")
+
+
+def _linear_parts(model):
+    """(linear estimator, calibrators) pairs of a calibrated (or bare) model."""
+    folds = getattr(model, "calibrated_classifiers_", None)
+    if folds is None:
+        return [(model, [])]
+    return [(fold.estimator, getattr(fold, "calibrators", [])) for fold in folds]
+
+
+def cast_vectorizer(vectorizer, dtype) -> Any:
+    """Set the output dtype and IDF weights of a fitted vectorizer (in place)."""
+    dtype = np.dtype(dtype)
+    vectorizer.dtype = dtype.type
+    if getattr(vectorizer, "_hashing_vectorizer", None) is not None:
+        # Hashed variant: the inner hasher was built with the previous dtype
+        vectorizer._hashing_vectorizer = None
+    if getattr(vectorizer, "use_idf", False):
+        idf = getattr(vectorizer, "idf_", None)
+        if idf is not None and idf.dtype != dtype:
+            vectorizer.idf_ = idf.astype(dtype)
+    return vectorizer
+
+
+def cast_model(model, dtype, coefficient_dtype=None) -> Any:
+    """Cast coefficients, intercepts and sigmoid calibration of a model (in place).
+
+    Args:
+        model: Fitted CalibratedClassifierCV (or linear model)
+        dtype: Precision of intercepts and calibration
+        coefficient_dtype: Precision of stored coefficients (default: dtype)
+    """
+    dtype = np.dtype(dtype)
+    coefficient_dtype = np.dtype(coefficient_dtype or dtype)
+    for estimator, calibrators in _linear_parts(model):
+        if hasattr(estimator, "coef_") and estimator.coef_.dtype != coefficient_dtype:
+            estimator.coef_ = estimator.coef_.astype(coefficient_dtype)
+        if hasattr(estimator, "intercept_"):
+            estimator.intercept_ = np.asarray(estimator.intercept_).astype(dtype)
+        for calibrator in calibrators:
+            # Sigmoid calibration; isotonic calibrators interpolate in float64 anyway
+            if hasattr(calibrator, "a_"):
+                calibrator.a_ = dtype.type(calibrator.a_)
+                calibrator.b_ = dtype.type(calibrator.b_)
+    return model
+
+
+def set_precision(vectorizer, model, precision: str) -> None:
+    """Serve a loaded (vectorizer, model) pair in the given precision."""
+    if precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {PRECISIONS}")
+    cast_vectorizer(vectorizer, precision)
+    if model is not None:
+        cast_model(model, precision)
+
+
+def serving_version(model_version: str, precision: str) -> str:
+    """Model version keying the cached predictions of a given serving precision.
+
+    Artifacts converted by convert_models_dir already carry a '+float32'
+    suffix; float64 artifacts served in float32 at runtime get one here.
+    """
+    if precision == "float64" or f"+{precision}" in model_version:
+        return model_version
+    return f"{model_version}+{precision}"
+
+
+def coefficient_bytes(model) -> int:
+    """Bytes of the coefficient arrays of every fold (dense or sparse)."""
+    total = 0
+    for estimator, _ in _linear_parts(model):
+        coef = estimator.coef_
+        if hasattr(coef, "indices"):
+            total += coef.data.nbytes + coef.indices.nbytes + coef.indptr.nbytes
+        else:
+            total += coef.nbytes
+    return total
+
+
+def convert_models_dir(
+    models_dir: str,
+    output_dir: str,
+    holdout_messages: Sequence[str],
+    precision: str = "float32",
+    coefficient_dtype: Optional[str] = None,
+    min_agreement: float = 0.999,
+) -> Dict[str, Any]:
+    """Write reduced-precision artifacts after checking them against float64.
+
+    Artifacts are written to a temporary directory first; output_dir is only
+    populated when the labels predicted in the new precision agree with the
+    float64 predict_proba labels on at least min_agreement of the holdout.
+
+    Args:
+        models_dir: Directory with float64 artifacts
+        output_dir: Directory receiving the converted artifacts
+        holdout_messages: Validation messages
+        precision: Serving precision of the converted artifacts
+        coefficient_dtype: Stored coefficient precision (default: precision;
+            'float16' halves the coefficient arrays again)
+        min_agreement: Minimum label agreement with float64
+
+    Returns:
+        Report with sizes, coefficient bytes (float64, stored and served),
+        latency and throughput of both precisions, agreement and whether
+        artifacts were written
+    """
+    # Imported here: both modules import this one through the backends
+    from .backends import SklearnBackend
+    from .benchmark import artifact_sizes, load_classifier, measure_latency, prediction_agreement
+
+    coefficient_dtype = coefficient_dtype or precision
+    if precision not in PRECISIONS or coefficient_dtype not in COEFFICIENT_DTYPES:
+        raise ValueError(
+            f"precision must be one of {PRECISIONS}, coefficients one of {COEFFICIENT_DTYPES}"
+        )
+    baseline, baseline_load = load_classifier(models_dir, backend=SklearnBackend("float64"))
+
+    with tempfile.TemporaryDirectory() as staging:
+        for name in ("label_encoder.joblib",):
+            if (Path(models_dir) / name).exists():
+                shutil.copy2(Path(models_dir) / name, Path(staging) / name)
+        vectorizer = joblib.load(Path(models_dir) / baseline.vectorizer_file)
+        model = joblib.load(Path(models_dir) / "best_model_temp.joblib")
+        cast_vectorizer(vectorizer, precision)
+        cast_model(model, precision, coefficient_dtype)
+        metadata = {
+            **baseline.metadata,
+            "precision": {"dtype": precision, "coefficients": coefficient_dtype},
+        }
+        if metadata.get("model_version"):
+            # Cached predictions of the float64 model must not be reused
+            suffix = (
+                precision
+                if coefficient_dtype == precision
+                else f"{precision}-{coefficient_dtype}"
+            )
+            metadata["model_version"] = f"{metadata['model_version']}+{suffix}"
+        joblib.dump(model, Path(staging) / "best_model_temp.joblib")
+        joblib.dump(vectorizer, Path(staging) / baseline.vectorizer_file)
+        joblib.dump(metadata, Path(staging) / "metadata.joblib")
+
+        candidate, candidate_load = load_classifier(staging, backend=SklearnBackend(precision))
+        agreement = prediction_agreement(
+            baseline.predict_spam_probabilities(holdout_messages),
+            candidate.predict_spam_probabilities(holdout_messages),
+        )
+        sizes_before = artifact_sizes(models_dir)
+        sizes_after = artifact_sizes(staging)
+        report = {
+            "precision": precision,
+            "coefficient_dtype": coefficient_dtype,
+            "bytes_before": sum(sizes_before.values()),
+            "bytes_after": sum(sizes_after.values()),
+            "coefficient_bytes_before": coefficient_bytes(baseline.model),
+            "coefficient_bytes_stored": coefficient_bytes(model),
+            "coefficient_bytes_served": coefficient_bytes(candidate.model),
+            "load_seconds_before": round(baseline_load, 4),
+            "load_seconds_after": round(candidate_load, 4),
+            "latency_before": measure_latency(baseline, holdout_messages),
+            "latency_after": measure_latency(candidate, holdout_messages),
+            "agreement": agreement,
+            "written": agreement["agreement"] >= min_agreement,
+        }
+
+        if report["written"]:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            for path in Path(staging).iterdir():
+                shutil.copy2(path, Path(output_dir) / path.name)
+            refresh_checksums(output_dir)
+
+    return report
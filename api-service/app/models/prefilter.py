@@ -0,0 +1,332 @@
+"""
+Signature pre-filter in front of the model.
+
+Much of the spam traffic is byte-identical to messages already confirmed as
+spam, and much of the ham comes from known transactional templates. Those
+messages are decided from Bloom filters of signatures before vectorization:
+
+- known-spam bodies (whitespace-collapsed message text)
+- known-spam URLs (lowercased host and path, without scheme, "www.",
+  query or fragment)
+- allowlisted templates (lowercased words, with words containing digits,
+  addresses or URLs masked)
+
+A lookup hashes the signature once and tests a fixed number of bits, so it
+costs a few microseconds regardless of how many signatures are stored. The
+filter files are memory-mapped and swapped in when they change on disk,
+without a restart.
+"""
+
+import hashlib
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"SPBF"
+_VERSION = 1
+# magic, version, hash functions, bits, items
+_HEADER = struct.Struct("<4sBxxxIQQ")
+
+SPAM_BODY = "known_spam_body"
+SPAM_URL = "known_spam_url"
+ALLOWLISTED_TEMPLATE = "allowlisted_template"
+
+# decided_by -> filter file; spam signatures are checked before the allowlist
+FILTER_FILES = {
+    SPAM_BODY: "spam_bodies.bloom",
+    SPAM_URL: "spam_urls.bloom",
+    ALLOWLISTED_TEMPLATE: "allow_templates.bloom",
+}
+
+_URL_RE = re.compile(r"(?:https?://|www\.)[^\s<>\"']+", re.IGNORECASE)
+# Whole words holding a digit or "@", or starting a URL
+_VARIABLE_WORD_RE = re.compile(r"(?<!\S)(?:[^\s\d@]*[\d@]|(?:https?://|www\.))\S*")
+
+
+def body_signature(message: str) -> bytes:
+    """Signature of a message body (whitespace is collapsed, case is kept)."""
+    return " ".join(message.split()).encode("utf-8", errors="surrogatepass")
+
+
+def url_signatures(message: str) -> List[bytes]:
+    """Normalized signatures of the URLs in a message."""
+    signatures = []
+    if "://" not in message and "www." not in message.lower():
+        return signatures
+    for url in _URL_RE.findall(message):
+        url = url.lower().rstrip(".,;:!?)]}")
+        url = re.sub(r"^https?://", "", url)
+        url = url.removeprefix("www.")
+        url = re.split(r"[?#]", url, maxsplit=1)[0].rstrip("/")
+        if url:
+            signatures.append(url.encode("utf-8", errors="surrogatepass"))
+    return signatures
+
+
+def template_signature(message: str) -> bytes:
+    """Signature shared by messages rendered from the same template."""
+    masked = _VARIABLE_WORD_RE.sub("#", message.lower())
+    return " ".join(masked.split()).encode("utf-8", errors="surrogatepass")
+
+
+class BloomFilter:
+    """Bloom filter over byte strings, stored in a compact file that is read memory-mapped."""
+
+    def __init__(self, num_bits: int, num_hashes: int, bits=None, count: int = 0):
+        """Initialize the filter.
+
+        Args:
+            num_bits: Size of the bit array
+            num_hashes: Bits set per item
+            bits: Existing bit array (default: empty, writable)
+            count: Items already added
+        """
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+        self.count = count
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float) -> "BloomFilter":
+        """Empty filter sized so that capacity items give the false positive rate."""
+        capacity = max(capacity, 1)
+        num_hashes = max(1, round(-math.log2(false_positive_rate)))
+        # Solves (1 - e^(-kn/m))^k = p for m
+        num_bits = math.ceil(
+            -num_hashes * capacity / math.log(1 - false_positive_rate ** (1 / num_hashes))
+        )
+        return cls(max(num_bits, 64), num_hashes)
+
+    def _positions(self, item: bytes):
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: bytes) -> None:
+        """Add an item."""
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: bytes) -> bool:
+        bits = self.bits
+        for position in self._positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Expected false positive rate with the items added so far."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def save(self, path: Path) -> None:
+        """Write the filter atomically (readers see the old or the new file)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f".{path.name}.tmp")
+        with open(staging, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.num_hashes, self.num_bits, self.count))
+            f.write(self.bits)
+        os.replace(staging, path)
+
+    def close(self) -> None:
+        """Release the memory map of a loaded filter (it cannot be queried afterwards)."""
+        if isinstance(self.bits, memoryview):
+            mapped = self.bits.obj
+            self.bits.release()
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+
+    @classmethod
+    def load(cls, path: Path) -> "BloomFilter":
+        """Read-only filter backed by a memory map of the file.
+
+        Raises:
+            ValueError: If the file is not a valid filter
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < _HEADER.size:
+            raise ValueError(f"{path} is not a Bloom filter file")
+        magic, version, num_hashes, num_bits, count = _HEADER.unpack_from(mapped)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a Bloom filter file")
+        if len(mapped) != _HEADER.size + (num_bits + 7) // 8:
+            raise ValueError(f"{path} is truncated")
+        # The memoryview keeps the map open while the filter is referenced
+        return cls(num_bits, num_hashes, bits=memoryview(mapped)[_HEADER.size:], count=count)
+
+
+def build_filters(
+    output_dir: Path,
+    spam_messages: Iterable[str],
+    allow_messages: Iterable[str] = (),
+    ham_messages: Iterable[str] = (),
+    false_positive_rate: float = 1e-6,
+) -> Dict[str, int]:
+    """Write the three pre-filter files from confirmed spam and allowlisted templates.
+
+    URLs that also appear in ham_messages are not added to the spam URL
+    filter, so shared links (shorteners, large sites) never decide a message.
+
+    Returns:
+        Signatures stored per filter file
+    """
+    spam_bodies = set()
+    spam_urls = set()
+    for message in spam_messages:
+        spam_bodies.add(body_signature(message))
+        spam_urls.update(url_signatures(message))
+    for message in ham_messages:
+        spam_urls.difference_update(url_signatures(message))
+    templates = {template_signature(message) for message in allow_messages}
+    templates.discard(b"")
+
+    counts = {}
+    for decided_by, signatures in (
+        (SPAM_BODY, spam_bodies),
+        (SPAM_URL, spam_urls),
+        (ALLOWLISTED_TEMPLATE, templates),
+    ):
+        bloom = BloomFilter.for_capacity(len(signatures), false_positive_rate)
+        for signature in signatures:
+            bloom.add(signature)
+        bloom.save(Path(output_dir) / FILTER_FILES[decided_by])
+        counts[FILTER_FILES[decided_by]] = len(signatures)
+    return counts
+
+
+class PreFilter:
+    """Decides known spam and allowlisted templates before the model."""
+
+    def __init__(
+        self, directory: str, max_false_positive_rate: float = 1e-6, reload_interval: float = 5.0
+    ):
+        """Initialize the pre-filter (files are read by load()).
+
+        Args:
+            directory: Directory with the filter files
+            max_false_positive_rate: Filters expected to exceed this rate (too
+                many items for their size) are not used
+            reload_interval: Seconds between checks for changed filter files
+        """
+        self.directory = Path(directory)
+        self.max_false_positive_rate = max_false_positive_rate
+        self.reload_interval = reload_interval
+        self.checks = 0
+        self.hits = {decided_by: 0 for decided_by in FILTER_FILES}
+        self.reloads = 0
+        self._filters: Dict[str, BloomFilter] = {}
+        self._stamps: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        self._next_reload = 0.0
+        self._reload_lock = threading.Lock()
+
+    def _stamp(self, name: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = (self.directory / name).stat()
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def load(self) -> None:
+        """Map filter files that changed on disk; missing or invalid files are not used."""
+        filters = dict(self._filters)
+        changed = False
+        for decided_by, name in FILTER_FILES.items():
+            stamp = self._stamp(name)
+            if stamp == self._stamps.get(decided_by, ...):
+                continue
+            self._stamps[decided_by] = stamp
+            changed = True
+            filters.pop(decided_by, None)
+            if stamp is None:
+                continue
+            try:
+                bloom = BloomFilter.load(self.directory / name)
+            except (OSError, ValueError) as e:
+                logger.error(f"Pre-filter {name} not loaded: {e}")
+                continue
+            if bloom.false_positive_rate > self.max_false_positive_rate:
+                logger.warning(
+                    f"Pre-filter {name} not used: expected false positive rate "
+                    f"{bloom.false_positive_rate:.2e} above {self.max_false_positive_rate:.2e}"
+                )
+                continue
+            filters[decided_by] = bloom
+        if changed:
+            # Lookups in flight keep the previous maps until they drop their reference
+            self._filters = filters
+            self.reloads += 1
+            counts = {decided_by: bloom.count for decided_by, bloom in filters.items()}
+            logger.info(f"Pre-filter loaded: {counts}")
+        self._next_reload = time.monotonic() + self.reload_interval
+
+    def _maybe_reload(self) -> None:
+        if time.monotonic() < self._next_reload or not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            self.load()
+        except Exception as e:
+            logger.error(f"Pre-filter reload failed: {e}")
+            self._next_reload = time.monotonic() + self.reload_interval
+        finally:
+            self._reload_lock.release()
+
+    def check(self, message: str) -> Optional[Tuple[bool, str]]:
+        """Return (is_spam, decided_by) for a known message, None if the model must decide."""
+        self._maybe_reload()
+        filters = self._filters
+        self.checks += 1
+        if not filters:
+            return None
+        decision = None
+        bloom = filters.get(SPAM_BODY)
+        if bloom is not None and body_signature(message) in bloom:
+            decision = (True, SPAM_BODY)
+        bloom = filters.get(SPAM_URL)
+        if decision is None and bloom is not None:
+            if any(signature in bloom for signature in url_signatures(message)):
+                decision = (True, SPAM_URL)
+        bloom = filters.get(ALLOWLISTED_TEMPLATE)
+        if decision is None and bloom is not None and template_signature(message) in bloom:
+            decision = (False, ALLOWLISTED_TEMPLATE)
+        if decision is not None:
+            self.hits[decision[1]] += 1
+        return decision
+
+    def close(self) -> None:
+        """Unmap the filter files; lookups fall through to the model afterwards."""
+        filters, self._filters = self._filters, {}
+        # No reload remaps them before the next load()
+        self._next_reload = float("inf")
+        for bloom in filters.values():
+            bloom.close()
+
+    def stats(self) -> Dict[str, object]:
+        """Lookups, hits per filter and the loaded filters."""
+        return {
+            "checks": self.checks,
+            "hits": dict(self.hits),
+            "reloads": self.reloads,
+            "filters": {
+                decided_by: {
+                    "items": bloom.count,
+                    "bytes": (bloom.num_bits + 7) // 8,
+                    "hashes": bloom.num_hashes,
+                    "false_positive_rate": bloom.false_positive_rate,
+                }
+                for decided_by, bloom in self._filters.items()
+            },
+        }
@@ -0,0 +1,268 @@
+"""
+Performance gate for promoting model artifacts to production.
+
+A retrained model can match production accuracy and still be several times
+slower or larger (a bigger vocabulary, more n-grams, another estimator).
+Before candidate artifacts replace the production ones, both are
+benchmarked on the same reference corpus, each in a fresh process like an
+API worker: load time, peak resident memory, single-message latency, batch
+throughput and label agreement with production. Promotion is refused when
+an absolute budget or the allowed slowdown relative to production is
+exceeded, and the results are stored in the promoted metadata.
+
+The candidate is benchmarked with the inference backend production runs.
+ONNX graphs are re-exported from the candidate when that backend is onnx
+or production already has graphs, and graphs or vectorizers the candidate
+does not ship are removed from production, so no stale artifact is served
+next to the promoted ones.
+"""
+
+import multiprocessing
+import resource
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import joblib
+
+from .artifacts import CHECKSUMS_FILE, write_checksums
+from .backends import (
+    MODEL_FILE,
+    ONNX_SCORER_FILE,
+    ONNX_TOKENS_FILE,
+    VECTORIZER_FILES,
+    create_backend,
+    find_vectorizer,
+)
+from .benchmark import load_classifier, measure_latency, prediction_agreement
+from .onnx_export import export_onnx
+
+ONNX_FILES = (ONNX_TOKENS_FILE, ONNX_SCORER_FILE)
+
+DEFAULT_BUDGETS = {
+    # Absolute budgets of the candidate
+    "max_p99_ms": 50.0,
+    "max_rss_mb": 1024.0,
+    "max_load_seconds": 10.0,
+    # Mean latency and batch throughput relative to production
+    "max_slowdown": 1.5,
+    # Share of reference messages labelled as production labels them
+    "min_agreement": 0.95,
+}
+
+
+def artifact_files(models_dir: str) -> List[str]:
+    """Joblib artifacts of a directory, with whichever vectorizer it was trained with."""
+    return [
+        MODEL_FILE,
+        find_vectorizer(Path(models_dir)).name,
+        "label_encoder.joblib",
+        "metadata.joblib",
+    ]
+
+
+def benchmark_artifacts(
+    models_dir: str,
+    messages: Sequence[str],
+    repeats: int = 5,
+    backend: str = "sklearn",
+    precision: str = "float64",
+    intra_op_threads: int = 1,
+) -> Dict[str, Any]:
+    """Load an artifact directory as a worker does and benchmark it.
+
+    Latency and throughput are measured repeats times and the best run of
+    each is kept, so noise from other processes does not read as a slowdown.
+
+    Returns:
+        Load time, peak RSS of the process, latency/throughput, model
+        version and spam probabilities of the messages
+    """
+    classifier, load_seconds = load_classifier(
+        models_dir, create_backend(backend, intra_op_threads, precision)
+    )
+    classifier.warm_up()
+    runs = [measure_latency(classifier, messages) for _ in range(repeats)]
+    latency = {
+        **min(runs, key=lambda run: run["mean_ms"]),
+        "batch_messages_per_second": max(run["batch_messages_per_second"] for run in runs),
+    }
+    probabilities = classifier.predict_spam_probabilities(messages)
+    # Linux reports ru_maxrss in kB
+    rss_bytes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return {
+        "model_version": classifier.model_version,
+        "load_seconds": round(load_seconds, 4),
+        "rss_bytes": rss_bytes,
+        "latency": latency,
+        "probabilities": probabilities,
+    }
+
+
+def benchmark_isolated(
+    models_dir: str, messages: Sequence[str], **backend_options: Any
+) -> Dict[str, Any]:
+    """benchmark_artifacts in a new interpreter, so models and caches do not mix."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(1, mp_context=context) as pool:
+        return pool.submit(
+            benchmark_artifacts, str(models_dir), list(messages), **backend_options
+        ).result()
+
+
+def check_budgets(
+    candidate: Dict[str, Any],
+    production: Optional[Dict[str, Any]],
+    agreement: Optional[Dict[str, float]],
+    budgets: Dict[str, float],
+) -> List[str]:
+    """Budget violations of a benchmarked candidate (empty list: promotable)."""
+    violations = []
+    latency = candidate["latency"]
+    rss_mb = candidate["rss_bytes"] / 1024 / 1024
+    if latency["p99_ms"] > budgets["max_p99_ms"]:
+        violations.append(
+            f"p99 latency {latency['p99_ms']:.2f} ms above {budgets['max_p99_ms']} ms"
+        )
+    if rss_mb > budgets["max_rss_mb"]:
+        violations.append(f"worker RSS {rss_mb:.0f} MB above {budgets['max_rss_mb']} MB")
+    if candidate["load_seconds"] > budgets["max_load_seconds"]:
+        violations.append(
+            f"load time {candidate['load_seconds']:.2f} s above {budgets['max_load_seconds']} s"
+        )
+    if production is not None:
+        slowdown = latency["mean_ms"] / production["latency"]["mean_ms"]
+        if slowdown > budgets["max_slowdown"]:
+            violations.append(
+                f"mean latency {slowdown:.2f}x production (max {budgets['max_slowdown']}x)"
+            )
+        throughput = (
+            production["latency"]["batch_messages_per_second"]
+            / latency["batch_messages_per_second"]
+        )
+        if throughput > budgets["max_slowdown"]:
+            violations.append(
+                f"batch throughput {throughput:.2f}x lower than production "
+                f"(max {budgets['max_slowdown']}x)"
+            )
+    if agreement is not None and agreement["agreement"] < budgets["min_agreement"]:
+        violations.append(
+            f"agreement with production {agreement['agreement']:.4f} "
+            f"below {budgets['min_agreement']}"
+        )
+    return violations
+
+
+def _stage(source_dir: str, target_dir: str, staging: str, backend: str) -> List[str]:
+    """Copy the candidate to staging, exporting ONNX graphs if production needs them.
+
+    Returns:
+        Names of the staged artifacts
+
+    Raises:
+        FileNotFoundError: If a candidate artifact is missing
+    """
+    files = artifact_files(source_dir)
+    missing = [name for name in files if not (Path(source_dir) / name).exists()]
+    if missing:
+        raise FileNotFoundError(f"Candidate artifacts not found in {source_dir}: {missing}")
+    for name in files:
+        shutil.copy2(Path(source_dir) / name, Path(staging) / name)
+    if backend == "onnx" or any((Path(target_dir) / name).exists() for name in ONNX_FILES):
+        files.extend(export_onnx(staging))
+    return files
+
+
+def _install(staging: str, target_dir: str, files: Sequence[str]) -> None:
+    """Replace production artifacts with the staged ones and drop stale ones."""
+    target = Path(target_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    for name in (*VECTORIZER_FILES, *ONNX_FILES):
+        if name not in files:
+            (target / name).unlink(missing_ok=True)
+    for name in (*files, CHECKSUMS_FILE):
+        shutil.copy2(Path(staging) / name, target / name)
+
+
+def promote_models(
+    source_dir: str,
+    target_dir: str,
+    messages: Sequence[str],
+    budgets: Optional[Dict[str, float]] = None,
+    force: bool = False,
+    backend: str = "sklearn",
+    precision: str = "float64",
+    intra_op_threads: int = 1,
+) -> Dict[str, Any]:
+    """Copy candidate artifacts to the production directory if they meet the budgets.
+
+    The candidate is staged in a temporary directory and benchmarked there;
+    target_dir is only written when no budget is exceeded (or force is
+    set), with the benchmark in metadata['deployment_benchmark'] and a new
+    checksums.json covering every promoted artifact.
+
+    Args:
+        source_dir: Directory with the candidate artifacts
+        target_dir: Production models directory (its artifacts are the baseline)
+        messages: Reference corpus
+        budgets: Overrides of DEFAULT_BUDGETS
+        force: Promote even if budgets are exceeded (recorded in the metadata)
+        backend: Inference backend of the API (INFERENCE_BACKEND), used by both benchmarks
+        precision: Inference precision of the sklearn backend
+        intra_op_threads: ONNX Runtime threads of the onnx backend
+
+    Returns:
+        Benchmark of both directories, violations, the promoted file names
+        and whether artifacts were promoted
+
+    Raises:
+        FileNotFoundError: If a candidate artifact is missing
+    """
+    budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+    backend_options = {
+        "backend": backend,
+        "precision": precision,
+        "intra_op_threads": intra_op_threads,
+    }
+
+    with tempfile.TemporaryDirectory() as staging:
+        files = _stage(source_dir, target_dir, staging, backend)
+        candidate = benchmark_isolated(staging, messages, **backend_options)
+        production = None
+        if (Path(target_dir) / MODEL_FILE).exists():
+            production = benchmark_isolated(target_dir, messages, **backend_options)
+        agreement = (
+            prediction_agreement(production["probabilities"], candidate["probabilities"])
+            if production is not None
+            else None
+        )
+        violations = check_budgets(candidate, production, agreement, budgets)
+        promoted = not violations or force
+
+        benchmark = {
+            "benchmarked_at": datetime.now().isoformat(timespec="seconds"),
+            "corpus_size": len(messages),
+            "backend": backend,
+            "candidate": {k: v for k, v in candidate.items() if k != "probabilities"},
+            "production": (
+                {k: v for k, v in production.items() if k != "probabilities"}
+                if production is not None
+                else None
+            ),
+            "agreement": agreement,
+            "budgets": budgets,
+            "violations": violations,
+            "forced": bool(violations) and force,
+        }
+        if promoted:
+            metadata_path = Path(staging) / "metadata.joblib"
+            metadata = joblib.load(metadata_path)
+            metadata["deployment_benchmark"] = benchmark
+            joblib.dump(metadata, metadata_path)
+            write_checksums(staging, files)
+            _install(staging, target_dir, files)
+
+    return {**benchmark, "files": files, "promoted": promoted}
@@ -0,0 +1,168 @@
+"""
+Vocabulary pruning and coefficient sparsification.
+
+Features whose absolute weight is below a threshold in every calibrated
+LinearSVC fold contribute almost nothing to the decision function but still
+cost vocabulary memory and lookups on every transform. They are removed from
+both the vectorizer and the model, keeping the pair consistent.
+"""
+
+import copy
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import joblib
+import numpy as np
+
+from .artifacts import refresh_checksums
+from .benchmark import artifact_sizes, load_classifier, measure_latency, prediction_agreement
+
+
+def linear_estimators(model) -> List[Any]:
+    """Return the linear estimators of a calibrated (or bare) model."""
+    if hasattr(model, "calibrated_classifiers_"):
+        return [calibrated.estimator for calibrated in model.calibrated_classifiers_]
+    return [model]
+
+
+def dense_coef(estimator) -> np.ndarray:
+    """Return estimator coefficients as a dense array (sparsified ones included)."""
+    coef = estimator.coef_
+    return coef.toarray() if hasattr(coef, "toarray") else np.asarray(coef)
+
+
+def select_features(model, threshold: float) -> np.ndarray:
+    """Return a mask of features whose |weight| reaches threshold in any fold."""
+    weights = np.vstack([np.abs(dense_coef(estimator)) for estimator in linear_estimators(model)])
+    return weights.max(axis=0) >= threshold
+
+
+def prune(
+    vectorizer, model, keep: np.ndarray, sparsify_threshold: float = 0.0
+) -> Tuple[Any, Any]:
+    """Return a pruned copy of the (vectorizer, model) pair.
+
+    Args:
+        vectorizer: Fitted TfidfVectorizer or HashedTfidfVectorizer
+        model: Fitted CalibratedClassifierCV (or linear model)
+        keep: Boolean mask of features to keep
+        sparsify_threshold: If > 0, also zero per-fold weights below this value
+            and store coefficients as sparse matrices
+    """
+    kept = np.flatnonzero(keep)
+    new_index = np.full(len(keep), -1, dtype=np.int64)
+    new_index[kept] = np.arange(len(kept))
+
+    pruned_vectorizer = copy.deepcopy(vectorizer)
+    if hasattr(vectorizer, "columns_"):
+        # Hashed variant: drop buckets instead of vocabulary entries.
+        pruned_vectorizer.columns_ = vectorizer.columns_[kept]
+        pruned_vectorizer.idf_ = vectorizer.idf_[kept]
+    else:
+        pruned_vectorizer.vocabulary_ = {
+            term: int(new_index[index])
+            for term, index in vectorizer.vocabulary_.items()
+            if keep[index]
+        }
+    if getattr(vectorizer, "use_idf", False) and hasattr(vectorizer, "_tfidf"):
+        pruned_vectorizer.idf_ = vectorizer.idf_[kept]
+        # The inner TfidfTransformer validates the input width on transform.
+        pruned_vectorizer._tfidf.n_features_in_ = len(kept)
+    # stop_words_ only documents terms dropped at fit time and can be large.
+    if hasattr(pruned_vectorizer, "stop_words_"):
+        del pruned_vectorizer.stop_words_
+
+    pruned_model = copy.deepcopy(model)
+    for estimator in linear_estimators(pruned_model):
+        coef = dense_coef(estimator)[:, kept]
+        if sparsify_threshold > 0:
+            coef = np.where(np.abs(coef) < sparsify_threshold, 0.0, coef)
+        estimator.coef_ = coef
+        estimator.n_features_in_ = len(kept)
+        if sparsify_threshold > 0:
+            estimator.sparsify()
+    if hasattr(pruned_model, "n_features_in_"):
+        pruned_model.n_features_in_ = len(kept)
+
+    return pruned_vectorizer, pruned_model
+
+
+def prune_models_dir(
+    models_dir: str,
+    output_dir: str,
+    holdout_messages: Sequence[str],
+    threshold: float,
+    sparsify: bool = False,
+    min_agreement: float = 0.999,
+) -> Dict[str, Any]:
+    """Prune artifacts, verify them on a held-out set and write them.
+
+    Artifacts are written to a temporary directory first; output_dir is only
+    populated when prediction agreement reaches min_agreement.
+
+    Returns:
+        Report with feature counts, size, load-time and latency deltas,
+        agreement and whether artifacts were written
+    """
+    baseline, baseline_load = load_classifier(models_dir)
+    keep = select_features(baseline.model, threshold)
+    if not keep.any():
+        raise ValueError(f"No feature reaches the pruning threshold {threshold}")
+    vectorizer, model = prune(
+        baseline.vectorizer, baseline.model, keep, sparsify_threshold=threshold if sparsify else 0.0
+    )
+
+    with tempfile.TemporaryDirectory() as staging:
+        for name in ("label_encoder.joblib", "metadata.joblib"):
+            if (Path(models_dir) / name).exists():
+                shutil.copy2(Path(models_dir) / name, Path(staging) / name)
+
+        metadata = dict(baseline.metadata)
+        # OOV statistics refer to the unpruned vocabulary; recompute them for
+        # the pruned model (scripts/export_drift_reference.py).
+        metadata.pop("drift_reference", None)
+        metadata.update(
+            {
+                "features_count": int(keep.sum()),
+                "vocabulary_size": int(keep.sum()),
+                "pruning": {
+                    "threshold": threshold,
+                    "sparsified": sparsify,
+                    "original_features": int(len(keep)),
+                },
+            }
+        )
+        joblib.dump(model, Path(staging) / "best_model_temp.joblib")
+        joblib.dump(vectorizer, Path(staging) / baseline.vectorizer_file)
+        joblib.dump(metadata, Path(staging) / "metadata.joblib")
+
+        candidate, candidate_load = load_classifier(staging)
+        agreement = prediction_agreement(
+            baseline.predict_spam_probabilities(holdout_messages),
+            candidate.predict_spam_probabilities(holdout_messages),
+        )
+
+        sizes_before = artifact_sizes(models_dir)
+        sizes_after = artifact_sizes(staging)
+        report = {
+            "features_before": int(len(keep)),
+            "features_after": int(keep.sum()),
+            "bytes_before": sum(sizes_before.values()),
+            "bytes_after": sum(sizes_after.values()),
+            "load_seconds_before": round(baseline_load, 4),
+            "load_seconds_after": round(candidate_load, 4),
+            "latency_before": measure_latency(baseline, holdout_messages),
+            "latency_after": measure_latency(candidate, holdout_messages),
+            "agreement": agreement,
+            "written": agreement["agreement"] >= min_agreement,
+        }
+
+        if report["written"]:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            for path in Path(staging).iterdir():
+                shutil.copy2(path, Path(output_dir) / path.name)
+            refresh_checksums(output_dir)
+
+    return report
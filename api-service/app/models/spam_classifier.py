@@ -4,53 +4,168 @@ Spam classification model for emails.
 Loads and manages trained model to identify spam.
 """
 
+import hashlib
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-import joblib
+import numpy as np
+
+from .artifacts import ArtifactLoader
+from .backends import MODEL_FILE, InferenceBackend, SklearnBackend
+from .drift import DriftMonitor
+from .near_duplicate import NearDuplicateIndex, simhash
+from .precision import serving_version
+from .prefilter import PreFilter
+
+WARM_UP_MESSAGE = "Warm-up message: free offer, meeting notes and project report"
 
 
 class SpamClassifier:
     """Spam classifier using trained model."""
 
-    def __init__(self, models_dir: str = "models"):
+    def __init__(
+        self,
+        models_dir: str = "models",
+        near_duplicate_index: Optional[NearDuplicateIndex] = None,
+        drift_monitor: Optional[DriftMonitor] = None,
+        backend: Optional[InferenceBackend] = None,
+        prediction_cache=None,
+        loader_threads: int = 4,
+        verify_checksums: bool = True,
+        prefilter: Optional[PreFilter] = None,
+    ):
         """Initialize the classifier.
 
         Args:
             models_dir: Path to directory with exported models
+            near_duplicate_index: Optional index to reuse predictions of similar messages
+            drift_monitor: Optional monitor fed with every classified message
+            backend: Inference runtime (default: scikit-learn)
+            prediction_cache: Optional persistent cache consulted below the
+                near-duplicate index (e.g. services.PredictionCache)
+            loader_threads: Artifacts loaded concurrently
+            verify_checksums: Verify artifacts listed in checksums.json
+            prefilter: Optional signature filters deciding known spam and
+                allowlisted templates without the model
         """
         self.models_dir = Path(models_dir)
-        self.model = None
-        self.vectorizer = None
+        self.backend = backend if backend is not None else SklearnBackend()
         self.label_encoder = None
         self.metadata = None
+        self.model_version = None
         self.is_loaded = False
+        self.near_duplicate_index = near_duplicate_index
+        self.drift_monitor = drift_monitor
+        self.prediction_cache = prediction_cache
+        self.loader_threads = loader_threads
+        self.verify_checksums = verify_checksums
+        self.prefilter = prefilter
+        # Artifact name -> (start, end) time.perf_counter() of the last load
+        self.load_timings: Dict[str, Tuple[float, float]] = {}
+
+    @property
+    def model(self):
+        """Fitted classifier of the sklearn backend (None for other runtimes)."""
+        return self.backend.model
+
+    @model.setter
+    def model(self, model) -> None:
+        self.backend.model = model
+
+    @property
+    def vectorizer(self):
+        """Fitted vectorizer shared by every backend."""
+        return self.backend.vectorizer
+
+    @vectorizer.setter
+    def vectorizer(self, vectorizer) -> None:
+        self.backend.vectorizer = vectorizer
+
+    @property
+    def vectorizer_file(self) -> Optional[str]:
+        """File name of the loaded vectorizer artifact."""
+        return self.backend.vectorizer_file
+
+    @vectorizer_file.setter
+    def vectorizer_file(self, name: Optional[str]) -> None:
+        self.backend.vectorizer_file = name
 
     def load(self) -> None:
         """Load model and required artifacts."""
         try:
-            model_path = self.models_dir / "best_model_temp.joblib"
-            self.model = joblib.load(model_path)
-
-            vectorizer_path = self.models_dir / "tfidf_vectorizer.joblib"
-            self.vectorizer = joblib.load(vectorizer_path)
-
-            # Load label_encoder if exists
-            label_encoder_path = self.models_dir / "label_encoder.joblib"
-            if label_encoder_path.exists():
-                self.label_encoder = joblib.load(label_encoder_path)
+            loader = ArtifactLoader(
+                self.models_dir, max_workers=self.loader_threads, verify=self.verify_checksums
+            )
+            with loader:
+                # Label encoder and metadata load while the backend loads its artifacts
+                label_encoder_path = self.models_dir / "label_encoder.joblib"
+                label_encoder = (
+                    loader.submit(label_encoder_path) if label_encoder_path.exists() else None
+                )
+                metadata_path = self.models_dir / "metadata.joblib"
+                metadata = loader.submit(metadata_path) if metadata_path.exists() else None
 
-            metadata_path = self.models_dir / "metadata.joblib"
-            if metadata_path.exists():
-                self.metadata = joblib.load(metadata_path)
-            else:
-                self.metadata = {}
+                self.backend.load(self.models_dir, loader)
+                if label_encoder is not None:
+                    self.label_encoder = label_encoder.result()
+                self.metadata = metadata.result() if metadata is not None else {}
+            self.load_timings = dict(loader.timings)
 
+            self.model_version = self.metadata.get("model_version") or self._artifact_digest(
+                *self.backend.artifact_paths
+            )
+            if self.drift_monitor is not None:
+                self.drift_monitor.bind(self.vectorizer, self.metadata.get("drift_reference"))
             self.is_loaded = True
 
         except Exception as e:
             raise RuntimeError(f"Error loading model: {str(e)}")
 
+    def reload_model(self) -> None:
+        """Serve the model and metadata artifacts again, e.g. after a feedback update.
+
+        The vectorizer and label encoder are kept. Requests in flight finish
+        with the model they started with; the near-duplicate index is
+        cleared because it holds predictions of the previous model.
+        """
+        if not isinstance(self.backend, SklearnBackend):
+            raise RuntimeError("Model reload requires the scikit-learn backend")
+        if not self.is_loaded:
+            raise RuntimeError("Model not loaded. Execute .load() first.")
+        metadata_path = self.models_dir / "metadata.joblib"
+        with ArtifactLoader(self.models_dir, verify=self.verify_checksums) as loader:
+            model = loader.submit(self.models_dir / MODEL_FILE)
+            metadata = loader.submit(metadata_path) if metadata_path.exists() else None
+            model = model.result()
+            metadata = metadata.result() if metadata is not None else {}
+
+        self.model = self.backend.prepare_model(model)
+        self.metadata = metadata
+        self.model_version = metadata.get("model_version") or self._artifact_digest(
+            *self.backend.artifact_paths
+        )
+        if self.near_duplicate_index is not None:
+            self.near_duplicate_index.clear()
+
+    def warm_up(self) -> None:
+        """Score one message so first-call costs are not paid by a request."""
+        if not self.is_loaded:
+            raise RuntimeError("Model not loaded. Execute .load() first.")
+        self.backend.predict_proba([WARM_UP_MESSAGE])
+
+    @staticmethod
+    def _artifact_digest(*paths: Path) -> Optional[str]:
+        """Short content hash identifying a model/vectorizer pair (None if unreadable)."""
+        digest = hashlib.sha256()
+        try:
+            for path in paths:
+                with open(path, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(block)
+        except OSError:
+            return None
+        return digest.hexdigest()[:12]
+
     def classify(self, data: Dict[str, Any], threshold: float = 0.5) -> Dict[str, Any]:
         """Classify email as spam or ham.
 
@@ -69,23 +184,245 @@ class SpamClassifier:
         if not message:
             raise ValueError("Message cannot be empty")
 
-        message_vectorized = self.vectorizer.transform([message])
+        if self.prefilter is not None:
+            decision = self.prefilter.check(message)
+            if decision is not None:
+                return self._prefilter_result(*decision)
 
-        # Get probabilities from model (model must have predict_proba)
-        if not hasattr(self.model, "predict_proba"):
-            raise RuntimeError(
-                "Model must have predict_proba method. Use CalibratedClassifierCV during training."
-            )
+        sketch, cached = self._near_duplicate_lookup(message)
+        near_duplicate = cached is not None
+
+        cache_key = None
+        if cached is None and self._persistent_cache_enabled():
+            cache_key = self.prediction_cache.key(self._cache_version(), message)
+            cached = self.prediction_cache.get(cache_key)
+
+        if cached is not None:
+            probability_spam, probability_ham = cached
+        else:
+            probability_spam, probability_ham = self._predict_probabilities(message)
+            if cache_key is not None:
+                self.prediction_cache.put(cache_key, probability_spam, probability_ham)
+        if sketch is not None and not near_duplicate:
+            self.near_duplicate_index.add(sketch, probability_spam, probability_ham)
+
+        if self.drift_monitor is not None:
+            self.drift_monitor.observe(message, probability_spam)
+        return self._build_result(
+            probability_spam, probability_ham, threshold, near_duplicate=near_duplicate
+        )
 
-        probabilities = self.model.predict_proba(message_vectorized)[0]
-        classes = self.model.classes_
+    def classify_long(
+        self,
+        data: Dict[str, Any],
+        threshold: float = 0.5,
+        max_tokens: int = 20000,
+        truncation: str = "head_tail",
+        window_chars: int = 65536,
+    ) -> Dict[str, Any]:
+        """Classify an arbitrarily long email with chunked vectorization.
+
+        Args:
+            data: Dictionary with email data (field 'message')
+            threshold: Probability threshold to classify as spam
+            max_tokens: Token budget for the message
+            truncation: Policy when the budget is exceeded ('head' or 'head_tail')
+            window_chars: Characters analyzed per window
+
+        Returns:
+            Dictionary with classification result and truncation report
+        """
+        if not self.is_loaded:
+            raise RuntimeError("Model not loaded. Execute .load() first.")
+
+        message = data.get("message", "")
+        if not message:
+            raise ValueError("Message cannot be empty")
+
+        # scipy/sklearn helpers are only imported when long messages are used
+        from .long_text import ChunkedTfidfVectorizer
+
+        chunked = ChunkedTfidfVectorizer(
+            self.vectorizer,
+            window_chars=window_chars,
+            max_tokens=max_tokens,
+            truncation=truncation,
+        )
+        message_vectorized, truncation_report = chunked.transform(message)
+
+        probability_spam, probability_ham = self._score(message_vectorized)
+        if self.drift_monitor is not None:
+            self.drift_monitor.observe(message, probability_spam)
+        result = self._build_result(probability_spam, probability_ham, threshold)
+        result["truncation"] = truncation_report
+        return result
+
+    def _predict_probabilities(self, message: str) -> Tuple[float, float]:
+        """Vectorize message and return (probability_spam, probability_ham)."""
+        return self._probability_pair(self.backend.predict_proba([message])[0])
+
+    def _score(self, message_vectorized) -> Tuple[float, float]:
+        """Return (probability_spam, probability_ham) for a vectorized message."""
+        return self._probability_pair(self.backend.predict_proba_vectorized(message_vectorized)[0])
+
+    def _probability_pair(self, probabilities) -> Tuple[float, float]:
+        """Return (probability_spam, probability_ham) from one row of class probabilities."""
+        spam_idx, ham_idx = self._class_indices()
+
+        return float(probabilities[spam_idx]), float(probabilities[ham_idx])
+
+    def _class_indices(self) -> Tuple[int, int]:
+        """Return (spam_idx, ham_idx) columns of predict_proba output."""
+        classes = self.backend.classes_
 
         spam_idx = list(classes).index("spam") if "spam" in classes else 1
         ham_idx = list(classes).index("ham") if "ham" in classes else 0
+        return spam_idx, ham_idx
+
+    def predict_spam_probabilities(self, messages: Sequence[str]) -> np.ndarray:
+        """Return the spam probability of each message, vectorized as one batch."""
+        if not self.is_loaded:
+            raise RuntimeError("Model not loaded. Execute .load() first.")
+
+        probabilities = self.backend.predict_proba(messages)
+        spam_idx, _ = self._class_indices()
+        return np.asarray(probabilities)[:, spam_idx]
+
+    def classify_batch(
+        self, messages: Sequence[str], thresholds: Sequence[float]
+    ) -> List[Dict[str, Any]]:
+        """Classify several messages with one vectorized call.
+
+        Messages decided by the pre-filter or found in the persistent
+        prediction cache skip inference.
+
+        Args:
+            messages: Non-empty message texts
+            thresholds: Probability threshold of each message
+
+        Returns:
+            One classification result per message, in input order
+        """
+        if not self.is_loaded:
+            raise RuntimeError("Model not loaded. Execute .load() first.")
+
+        decisions: List[Optional[Tuple[bool, str]]] = [None] * len(messages)
+        if self.prefilter is not None:
+            decisions = [self.prefilter.check(message) for message in messages]
+        undecided = [index for index, decision in enumerate(decisions) if decision is None]
+        sketches, pairs = self._near_duplicate_pairs(messages, undecided)
+        near_duplicates = [pair is not None for pair in pairs]
+        keys = self._cached_pairs(
+            messages, [index for index in undecided if pairs[index] is None], pairs
+        )
+        self._score_missing(
+            messages, [index for index in undecided if pairs[index] is None], pairs, keys
+        )
+        for sketch, pair, near_duplicate in zip(sketches, pairs, near_duplicates):
+            if sketch is not None and not near_duplicate:
+                self.near_duplicate_index.add(sketch, *pair)
+
+        results = []
+        for index, (message, threshold) in enumerate(zip(messages, thresholds)):
+            if decisions[index] is not None:
+                results.append(self._prefilter_result(*decisions[index]))
+                continue
+            probability_spam, probability_ham = pairs[index]
+            if self.drift_monitor is not None:
+                self.drift_monitor.observe(message, probability_spam)
+            results.append(
+                self._build_result(
+                    probability_spam,
+                    probability_ham,
+                    threshold,
+                    near_duplicate=near_duplicates[index],
+                )
+            )
+        return results
+
+    def _near_duplicate_pairs(
+        self, messages: Sequence[str], indices: Sequence[int]
+    ) -> Tuple[List[Optional[int]], List[Optional[Tuple[float, float]]]]:
+        """Sketches of the messages at indices and the probabilities of indexed similar ones."""
+        sketches: List[Optional[int]] = [None] * len(messages)
+        pairs: List[Optional[Tuple[float, float]]] = [None] * len(messages)
+        for index in indices:
+            sketches[index], pairs[index] = self._near_duplicate_lookup(messages[index])
+        return sketches, pairs
+
+    def _cached_pairs(
+        self,
+        messages: Sequence[str],
+        indices: Sequence[int],
+        pairs: List[Optional[Tuple[float, float]]],
+    ) -> List[Optional[bytes]]:
+        """Fill pairs at indices from the persistent cache and return their cache keys."""
+        keys: List[Optional[bytes]] = [None] * len(messages)
+        if self._persistent_cache_enabled():
+            version = self._cache_version()
+            for index in indices:
+                keys[index] = self.prediction_cache.key(version, messages[index])
+                pairs[index] = self.prediction_cache.get(keys[index])
+        return keys
+
+    def _score_missing(
+        self,
+        messages: Sequence[str],
+        missing: Sequence[int],
+        pairs: List[Optional[Tuple[float, float]]],
+        keys: Sequence[Optional[bytes]],
+    ) -> None:
+        """Fill pairs at the missing indices with one vectorized call, caching them."""
+        if not missing:
+            return
+        probabilities = np.asarray(
+            self.backend.predict_proba([messages[index] for index in missing])
+        )
+        spam_idx, ham_idx = self._class_indices()
+        for index, row in zip(missing, probabilities):
+            pairs[index] = (float(row[spam_idx]), float(row[ham_idx]))
+            if keys[index] is not None:
+                self.prediction_cache.put(keys[index], *pairs[index])
+
+    def _near_duplicate_lookup(
+        self, message: str
+    ) -> Tuple[Optional[int], Optional[Tuple[float, float]]]:
+        """Sketch of a message and the probabilities of an indexed similar one.
+
+        Messages without word tokens have no sketch and bypass the index.
+        """
+        if self.near_duplicate_index is None:
+            return None, None
+        sketch = simhash(message)
+        if sketch is None:
+            return None, None
+        return sketch, self.near_duplicate_index.lookup(sketch)
+
+    def _persistent_cache_enabled(self) -> bool:
+        # Without a model version, entries of different models could not be told apart.
+        return self.prediction_cache is not None and self.model_version is not None
+
+    def _cache_version(self) -> str:
+        """Model version qualified by the serving precision (float32 scores differ)."""
+        precision = getattr(self.backend, "precision", "float64")
+        return serving_version(self.model_version, precision)
 
-        probability_spam = float(probabilities[spam_idx])
-        probability_ham = float(probabilities[ham_idx])
+    def _prefilter_result(self, is_spam: bool, decided_by: str) -> Dict[str, Any]:
+        """Result of a message decided by the pre-filter (certain, whatever the threshold)."""
+        probability_spam = 1.0 if is_spam else 0.0
+        return self._build_result(
+            probability_spam, 1.0 - probability_spam, threshold=0.5, decided_by=decided_by
+        )
 
+    def _build_result(
+        self,
+        probability_spam: float,
+        probability_ham: float,
+        threshold: float,
+        near_duplicate: bool = False,
+        decided_by: str = "model",
+    ) -> Dict[str, Any]:
+        """Build classification result from class probabilities."""
         is_spam = probability_spam >= threshold
         confidence = probability_spam if is_spam else probability_ham
 
@@ -95,10 +432,13 @@ class SpamClassifier:
             "confidence": round(confidence, 4),
             "probability_spam": round(probability_spam, 4),
             "probability_ham": round(probability_ham, 4),
+            "near_duplicate": near_duplicate,
+            "decided_by": decided_by,
             "model_info": {
                 "type": self.metadata.get("base_model_type")
                 or self.metadata.get("model_type", "Unknown"),
-                "vectorizer": "TfidfVectorizer",
+                "vectorizer": self.metadata.get("vectorizer_type", "TfidfVectorizer"),
+                "version": self.model_version,
             },
         }
 
@@ -111,7 +451,9 @@ class SpamClassifier:
             "loaded": True,
             "model_type": self.metadata.get("base_model_type")
             or self.metadata.get("model_type", "Unknown"),
-            "vectorizer_type": "TfidfVectorizer",
+            "vectorizer_type": self.metadata.get("vectorizer_type", "TfidfVectorizer"),
+            "model_version": self.model_version,
+            "backend": self.backend.describe(),
             "training_samples": self.metadata.get("training_samples"),
             "accuracy": self.metadata.get("optimization_accuracy"),
             "precision": self.metadata.get("optimization_precision"),
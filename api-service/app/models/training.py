@@ -0,0 +1,422 @@
+"""
+Scripted training pipeline (notebooks 01, 03 and 04 as one repeatable job).
+
+Each vectorizer configuration tokenizes and vectorizes the corpus once:
+the vectorizer is fitted on the training split, the TF-IDF matrix of the
+whole corpus is written to a feature cache as raw CSR arrays and later
+runs, cross-validation folds and search workers read it memory-mapped
+instead of re-tokenizing. The LinearSVC search runs fold fits on a process
+pool, either as a full grid or by successive halving (candidates are first
+compared on a small stratified sample and only the best ones get more
+rows). The result is the artifact set copied by scripts/deploy_models.py.
+"""
+
+import hashlib
+import itertools
+import json
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import joblib
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.preprocessing import LabelEncoder
+from sklearn.svm import LinearSVC
+
+from .drift import reference_statistics
+
+# TfidfVectorizer of notebook 01
+VECTORIZER_PARAMS = {
+    "max_features": 5000,
+    "min_df": 2,
+    "max_df": 0.95,
+    "ngram_range": (1, 2),
+    "stop_words": "english",
+}
+# LinearSVC of notebooks 02/03 and its search space
+SVC_PARAMS = {"random_state": 42, "max_iter": 2000, "dual": False}
+C_VALUES = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+MATRIX_ARRAYS = ("data", "indices", "indptr")
+
+
+def corpus_digest(messages: Sequence[str], labels: Sequence[str]) -> str:
+    """Content hash of a labelled corpus."""
+    digest = hashlib.sha256()
+    for message, label in zip(messages, labels):
+        digest.update(label.encode("utf-8") + b"\0" + message.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+def save_matrix(matrix: csr_matrix, directory: Path) -> None:
+    """Write a CSR matrix as .npy arrays that can be memory-mapped."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for name in MATRIX_ARRAYS:
+        np.save(directory / f"{name}.npy", getattr(matrix, name))
+    (directory / "shape.json").write_text(json.dumps(list(matrix.shape)), encoding="utf-8")
+
+
+def load_matrix(directory: Path) -> csr_matrix:
+    """Memory-mapped CSR matrix written by save_matrix (no copy of the arrays)."""
+    arrays = [np.load(directory / f"{name}.npy", mmap_mode="r") for name in MATRIX_ARRAYS]
+    shape = tuple(json.loads((directory / "shape.json").read_text(encoding="utf-8")))
+    return csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+
+class FeatureCache:
+    """On-disk TF-IDF matrices, one per corpus, split and vectorizer configuration."""
+
+    def __init__(self, cache_dir: Path):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory with one subdirectory per cached configuration
+        """
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(corpus: str, train_rows: np.ndarray, params: Dict[str, Any]) -> str:
+        """Cache key of a vectorizer configuration fitted on train_rows of a corpus."""
+        digest = hashlib.sha256(corpus.encode("ascii"))
+        digest.update(np.ascontiguousarray(train_rows, dtype=np.int64).tobytes())
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def features(
+        self,
+        messages: Sequence[str],
+        corpus: str,
+        train_rows: np.ndarray,
+        params: Dict[str, Any],
+    ) -> Path:
+        """Directory with the fitted vectorizer and the TF-IDF matrix of every message.
+
+        The vectorizer is fitted on train_rows only (as in notebook 01) and
+        then transforms the whole corpus; cached results are reused.
+        """
+        directory = self.cache_dir / self.key(corpus, train_rows, params)
+        if (directory / "vectorizer.joblib").exists():
+            self.hits += 1
+            return directory
+
+        self.misses += 1
+        vectorizer = TfidfVectorizer(**params)
+        vectorizer.fit([messages[row] for row in train_rows])
+        staging = directory.with_name(directory.name + ".tmp")
+        save_matrix(vectorizer.transform(messages).astype(np.float64), staging)
+        # Written last: its presence marks a complete entry
+        joblib.dump(vectorizer, staging / "vectorizer.joblib")
+        staging.replace(directory)
+        return directory
+
+
+def config_key(params: Dict[str, Any]) -> str:
+    """Stable name of a vectorizer configuration."""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def vectorizer_grid(
+    max_features: Sequence[int], ngram_max: Sequence[int]
+) -> List[Dict[str, Any]]:
+    """Vectorizer configurations varying VECTORIZER_PARAMS."""
+    return [
+        {**VECTORIZER_PARAMS, "max_features": features, "ngram_range": (1, ngrams)}
+        for features, ngrams in itertools.product(max_features, ngram_max)
+    ]
+
+
+def candidates(
+    vectorizers: Sequence[Dict[str, Any]], c_values: Sequence[float]
+) -> List[Dict[str, Any]]:
+    """Every (vectorizer configuration, LinearSVC C) combination."""
+    return [
+        {"vectorizer": dict(vectorizer), "svc": {**SVC_PARAMS, "C": c}}
+        for vectorizer, c in itertools.product(vectorizers, c_values)
+    ]
+
+
+def fit_fold(
+    features_dir: str,
+    labels: np.ndarray,
+    train_rows: np.ndarray,
+    test_rows: np.ndarray,
+    svc_params: Dict[str, Any],
+    calibrated: bool = False,
+) -> np.ndarray:
+    """Fit on train_rows of a cached matrix and return decisions for test_rows.
+
+    Runs in pool workers: the matrix is memory-mapped, so every process
+    shares the page cache instead of receiving a pickled copy.
+    Returns spam-class probabilities when calibrated, else 0/1 predictions.
+    """
+    matrix = load_matrix(Path(features_dir))
+    if calibrated:
+        model = CalibratedClassifierCV(LinearSVC(**svc_params), method="sigmoid", cv=5)
+        model.fit(matrix[train_rows], labels[train_rows])
+        return model.predict_proba(matrix[test_rows])[:, 1]
+    model = LinearSVC(**svc_params).fit(matrix[train_rows], labels[train_rows])
+    return model.predict(matrix[test_rows])
+
+
+def _sample(rows: np.ndarray, labels: np.ndarray, size: int, seed: int) -> np.ndarray:
+    """Stratified subset of rows (all rows when size covers them)."""
+    if size >= len(rows):
+        return rows
+    sample, _ = train_test_split(
+        rows, train_size=size, random_state=seed, stratify=labels[rows]
+    )
+    return np.sort(sample)
+
+
+def search(
+    executor: Executor,
+    features: Dict[str, Path],
+    labels: np.ndarray,
+    train_rows: np.ndarray,
+    candidate_list: Sequence[Dict[str, Any]],
+    strategy: str = "halving",
+    factor: int = 3,
+    min_samples: int = 2000,
+    cv: int = 5,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """Cross-validated F1 search over candidates.
+
+    With strategy="grid" every candidate is scored on all training rows.
+    With "halving", round r scores the remaining candidates on
+    min_samples * factor**r rows and keeps the best 1/factor of them, until
+    one candidate is left or all rows are used.
+
+    Args:
+        executor: Pool running one fold fit per task
+        features: Cached feature directory per vectorizer configuration key
+        labels: Encoded labels of the whole corpus (1 = spam)
+        train_rows: Rows of the training split
+        candidate_list: Output of candidates()
+        strategy: "grid" or "halving"
+        factor: Halving reduction factor
+        min_samples: Rows of the first halving round
+        cv: Stratified folds per evaluation
+        seed: Seed of the samples and folds
+
+    Returns:
+        Best candidate with its score, and the scores of every round
+    """
+    if strategy not in ("grid", "halving"):
+        raise ValueError(f"Unknown search strategy: {strategy}")
+    if factor < 2:
+        raise ValueError("factor must be at least 2")
+
+    remaining = list(candidate_list)
+    size = len(train_rows) if strategy == "grid" else min(min_samples, len(train_rows))
+    rounds = []
+    while True:
+        rows = _sample(train_rows, labels, size, seed)
+        folds = list(StratifiedKFold(cv, shuffle=True, random_state=seed).split(rows, labels[rows]))
+        start = time.perf_counter()
+        futures = [
+            [
+                executor.submit(
+                    fit_fold,
+                    str(features[config_key(candidate["vectorizer"])]),
+                    labels,
+                    rows[fit],
+                    rows[held_out],
+                    candidate["svc"],
+                )
+                for fit, held_out in folds
+            ]
+            for candidate in remaining
+        ]
+        scores = [
+            float(
+                np.mean(
+                    [
+                        f1_score(labels[rows[held_out]], future.result(), zero_division=0)
+                        for future, (_, held_out) in zip(fold_futures, folds)
+                    ]
+                )
+            )
+            for fold_futures in futures
+        ]
+        order = sorted(range(len(remaining)), key=lambda i: scores[i], reverse=True)
+        rounds.append(
+            {
+                "samples": len(rows),
+                "seconds": round(time.perf_counter() - start, 3),
+                "scores": [
+                    {**remaining[i], "cv_f1": round(scores[i], 6)} for i in order
+                ],
+            }
+        )
+        if len(remaining) == 1 or len(rows) == len(train_rows):
+            break
+        remaining = [remaining[i] for i in order[: max(1, -(-len(remaining) // factor))]]
+        size *= factor
+
+    best = rounds[-1]["scores"][0]
+    return {
+        "best": {"vectorizer": best["vectorizer"], "svc": best["svc"]},
+        "best_cv_f1": best["cv_f1"],
+        "strategy": strategy,
+        "candidates": len(candidate_list),
+        "fits": sum(len(r["scores"]) for r in rounds) * cv,
+        "rounds": rounds,
+    }
+
+
+def train(
+    messages: Sequence[str],
+    labels: Sequence[str],
+    output_dir: Path,
+    cache_dir: Path,
+    vectorizers: Sequence[Dict[str, Any]] = (VECTORIZER_PARAMS,),
+    c_values: Sequence[float] = C_VALUES,
+    strategy: str = "halving",
+    factor: int = 3,
+    min_samples: int = 2000,
+    n_jobs: int = 1,
+    cv: int = 5,
+    seed: int = 42,
+) -> Dict[str, Any]:
+    """Search, evaluate and write the production artifacts.
+
+    Follows the notebooks: 80/20 stratified split, vectorizer fitted on
+    the training split, search scored by cross-validated F1, test metrics
+    of the best LinearSVC, then a sigmoid-calibrated LinearSVC trained on
+    every message. Out-of-fold probabilities of the final model give
+    cv_f1_mean/std and the drift reference in metadata.joblib.
+
+    Returns:
+        Report with the search rounds, test metrics, cache hits and timings
+    """
+    started = time.perf_counter()
+    label_encoder = LabelEncoder()
+    y = label_encoder.fit_transform(labels)
+    if list(label_encoder.classes_) != ["ham", "spam"]:
+        raise ValueError(f"Expected 'ham'/'spam' labels, got {list(label_encoder.classes_)}")
+    rows = np.arange(len(messages))
+    train_rows, test_rows = train_test_split(rows, test_size=0.2, random_state=seed, stratify=y)
+    train_rows, test_rows = np.sort(train_rows), np.sort(test_rows)
+
+    cache = FeatureCache(cache_dir)
+    corpus = corpus_digest(messages, labels)
+    start = time.perf_counter()
+    features = {
+        config_key(params): cache.features(messages, corpus, train_rows, params)
+        for params in vectorizers
+    }
+    vectorize_seconds = time.perf_counter() - start
+
+    executor = ProcessPoolExecutor(n_jobs) if n_jobs > 1 else _InlineExecutor()
+    with executor:
+        report = search(
+            executor, features, y, train_rows, candidates(vectorizers, c_values),
+            strategy=strategy, factor=factor, min_samples=min_samples, cv=cv, seed=seed,
+        )
+        best = report["best"]
+        best_dir = str(features[config_key(best["vectorizer"])])
+
+        # Test split (notebook 03): uncalibrated LinearSVC trained on the training split
+        y_pred = fit_fold(best_dir, y, train_rows, test_rows, best["svc"])
+        y_test = y[test_rows]
+        test_metrics = {
+            "test_accuracy": accuracy_score(y_test, y_pred),
+            "test_precision": precision_score(y_test, y_pred, zero_division=0),
+            "test_recall": recall_score(y_test, y_pred, zero_division=0),
+            "test_f1": f1_score(y_test, y_pred, zero_division=0),
+        }
+
+        # Out-of-fold probabilities of the final calibrated model (notebook 04)
+        folds = list(StratifiedKFold(cv, shuffle=True, random_state=seed).split(rows, y))
+        oof_futures = [
+            executor.submit(fit_fold, best_dir, y, fit, held_out, best["svc"], True)
+            for fit, held_out in folds
+        ]
+        final_future = executor.submit(_fit_final, best_dir, y, best["svc"])
+        oof_probabilities = np.zeros(len(rows))
+        fold_f1 = []
+        for future, (_, held_out) in zip(oof_futures, folds):
+            oof_probabilities[held_out] = future.result()
+            fold_f1.append(f1_score(y[held_out], oof_probabilities[held_out] >= 0.5))
+        model = final_future.result()
+
+    vectorizer = joblib.load(Path(best_dir) / "vectorizer.joblib")
+    metadata = {
+        "model_type": "CalibratedClassifierCV(LinearSVC)",
+        "base_model_type": "LinearSVC",
+        "base_model_params": best["svc"],
+        "calibration_method": "sigmoid",
+        "vectorizer_type": "TfidfVectorizer",
+        "vectorizer_params": vectorizer.get_params(),
+        "training_samples": len(rows),
+        "cv_f1_mean": float(np.mean(fold_f1)),
+        "cv_f1_std": float(np.std(fold_f1)),
+        "trained_date": datetime.now().isoformat(),
+        "features_count": len(vectorizer.vocabulary_),
+        "vocabulary_size": len(vectorizer.vocabulary_),
+        "label_encoder": True,
+        "label_mapping": dict(
+            zip(label_encoder.classes_, label_encoder.transform(label_encoder.classes_))
+        ),
+        "has_predict_proba": True,
+        "optimization_f1": test_metrics["test_f1"],
+        "optimization_accuracy": test_metrics["test_accuracy"],
+        "optimization_precision": test_metrics["test_precision"],
+        "optimization_recall": test_metrics["test_recall"],
+        "search": {
+            "strategy": strategy,
+            "best_cv_f1": report["best_cv_f1"],
+            "candidates": report["candidates"],
+            "fits": report["fits"],
+        },
+        "drift_reference": reference_statistics(list(messages), oof_probabilities, vectorizer),
+    }
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(model, output_dir / "best_model_temp.joblib")
+    joblib.dump(vectorizer, output_dir / "tfidf_vectorizer.joblib")
+    joblib.dump(label_encoder, output_dir / "label_encoder.joblib")
+    joblib.dump(metadata, output_dir / "metadata.joblib")
+
+    report.update(test_metrics)
+    report.update(
+        {
+            "cv_f1_mean": metadata["cv_f1_mean"],
+            "cv_f1_std": metadata["cv_f1_std"],
+            "cache_hits": cache.hits,
+            "cache_misses": cache.misses,
+            "vectorize_seconds": round(vectorize_seconds, 3),
+            "total_seconds": round(time.perf_counter() - started, 3),
+        }
+    )
+    return report
+
+
+def _fit_final(features_dir: str, labels: np.ndarray, svc_params: Dict[str, Any]):
+    """Calibrated LinearSVC trained on every row of a cached matrix."""
+    matrix = load_matrix(Path(features_dir))
+    model = CalibratedClassifierCV(LinearSVC(**svc_params), method="sigmoid", cv=5)
+    return model.fit(matrix, labels)
+
+
+class _InlineExecutor(Executor):
+    """Executor running tasks in the calling thread (n_jobs=1)."""
+
+    def submit(self, fn, *args, **kwargs):
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
@@ -0,0 +1,263 @@
+"""
+Cache-affinity routing front-end for several API instances.
+
+Runs as its own service (uvicorn app.proxy:app) in front of the instances
+listed in ROUTER_BACKENDS. Single predictions are routed by the hash of
+their normalized message, batches are split by owning instance and merged,
+and every other request goes to any healthy instance. WebSocket channels
+are not proxied: streaming clients connect to an instance directly.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import List, Optional
+
+import httpx
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+
+from .core.config import settings
+from .schemas import BatchEmailInput
+from .services.affinity import AffinityRouter, NoBackendAvailable, Upstream, routing_key
+from .services.drain import RETRY_AFTER_SECONDS
+from .services.wire import columnar, decode_request, encode_response
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+# One line per forwarded request and readiness check would drown the router's own logs
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+affinity_router = AffinityRouter(
+    settings.router_backends,
+    virtual_nodes=settings.router_virtual_nodes,
+    health_interval=settings.router_health_interval,
+    health_timeout=settings.router_health_timeout,
+    unhealthy_after=settings.router_unhealthy_after,
+    timeout=settings.router_timeout,
+    max_connections=settings.router_max_connections,
+    max_keepalive=settings.router_max_keepalive,
+)
+
+# The instances serve the documentation: /docs and /openapi.json are forwarded.
+app = FastAPI(
+    title="ML Spam Classifier Router",
+    version="1.0.0",
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None,
+)
+
+BATCH_PATH = "/api/v1/predict/batch"
+# Sub-batches are exchanged uncompressed as JSON rows and re-encoded for the client
+SUB_BATCH_HEADERS = [
+    ("content-type", "application/json"),
+    ("accept", "application/json"),
+    ("accept-encoding", "identity"),
+]
+
+
+@app.on_event("startup")
+async def startup_event():
+    if not affinity_router.backends:
+        logger.warning("ROUTER_BACKENDS is empty: every request will fail with 503")
+    affinity_router.start()
+    logger.info(f"Routing to {len(affinity_router.backends)} API instances")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await affinity_router.close()
+
+
+def _unavailable(detail: str) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
+
+
+def _bad_gateway(error: httpx.HTTPError) -> JSONResponse:
+    return JSONResponse(
+        {"detail": f"API instance error: {type(error).__name__}"},
+        status_code=status.HTTP_502_BAD_GATEWAY,
+    )
+
+
+def _relay(upstream: Upstream) -> Response:
+    """Return an instance's response as received, naming the instance."""
+    response = Response(content=upstream.content, status_code=upstream.status_code)
+    response.raw_headers.extend(
+        (name.encode("latin-1"), value.encode("latin-1")) for name, value in upstream.headers
+    )
+    response.headers["X-Backend"] = upstream.backend.url
+    return response
+
+
+async def _forward(request: Request, key: Optional[bytes]) -> Response:
+    try:
+        upstream = await affinity_router.forward(
+            key,
+            request.method,
+            request.url.path,
+            request.url.query,
+            request.headers.items(),
+            await request.body(),
+        )
+    except NoBackendAvailable as e:
+        return _unavailable(str(e))
+    except httpx.HTTPError as e:
+        return _bad_gateway(e)
+    return _relay(upstream)
+
+
+def _message_key(body: bytes, content_type: Optional[str]) -> bytes:
+    """Routing key of a single-message body (the body hash if it has no message)."""
+    try:
+        payload = decode_request(body, content_type)
+    except ValueError:
+        payload = None
+    message = payload.get("message") if isinstance(payload, dict) else None
+    if isinstance(message, str):
+        return routing_key(message)
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+@app.get("/health")
+async def health():
+    stats = affinity_router.stats()
+    return {
+        "status": "healthy" if stats["healthy"] else "unhealthy",
+        "backends": len(stats["backends"]),
+        "healthy_backends": stats["healthy"],
+    }
+
+
+@app.get("/ready")
+async def ready():
+    if not any(backend.healthy for backend in affinity_router.backends.values()):
+        return _unavailable("No API instance ready")
+    return {"ready": True}
+
+
+@app.get("/router/stats")
+async def router_stats():
+    return affinity_router.stats()
+
+
+async def _splittable_batch(request: Request) -> Optional[BatchEmailInput]:
+    """Validated batch, or None if the instances would reject it (sent whole instead)."""
+    try:
+        payload = decode_request(await request.body(), request.headers.get("content-type"))
+        data = BatchEmailInput.model_validate(payload)
+    except (ValueError, ValidationError):
+        return None
+    if len(data.messages) > settings.predict_batch_max_messages:
+        return None
+    return data
+
+
+async def _fan_out(request: Request, data: BatchEmailInput, groups: List[List[int]]) -> list:
+    """Send each group of messages to its owner as a JSON row-layout sub-batch."""
+    replaced = {name for name, _ in SUB_BATCH_HEADERS}
+    headers = [
+        (name, value) for name, value in request.headers.items() if name.lower() not in replaced
+    ] + SUB_BATCH_HEADERS
+    threshold = {"threshold": data.threshold} if "threshold" in data.model_fields_set else {}
+    return await asyncio.gather(
+        *(
+            affinity_router.forward(
+                routing_key(data.messages[indices[0]]),
+                "POST",
+                BATCH_PATH,
+                "layout=rows",
+                headers,
+                json.dumps(
+                    {"messages": [data.messages[i] for i in indices], **threshold}
+                ).encode(),
+            )
+            for indices in groups
+        ),
+        return_exceptions=True,
+    )
+
+
+def _failed_part(parts: list) -> Optional[Response]:
+    """Response for the first sub-batch that failed, or None if all succeeded."""
+    for part in parts:
+        if isinstance(part, NoBackendAvailable):
+            return _unavailable(str(part))
+        if isinstance(part, httpx.HTTPError):
+            return _bad_gateway(part)
+        if isinstance(part, BaseException):
+            raise part
+        if part.status_code != status.HTTP_200_OK:
+            return _relay(part)
+    return None
+
+
+def _merge(request: Request, groups: List[List[int]], parts: List[Upstream]) -> Response:
+    """Results of the sub-batches in input order, encoded as the client asked."""
+    results = [None] * sum(len(indices) for indices in groups)
+    for indices, part in zip(groups, parts):
+        for index, result in zip(indices, json.loads(part.content)["results"]):
+            results[index] = result
+    merged = (
+        columnar(results)
+        if request.query_params.get("layout") == "columnar"
+        else {"count": len(results), "results": results}
+    )
+    content, response_headers = encode_response(
+        merged,
+        request.headers.get("accept"),
+        request.headers.get("accept-encoding"),
+        settings.compression_min_bytes if settings.compression_enabled else None,
+    )
+    return Response(content=content, headers=response_headers)
+
+
+@app.post(BATCH_PATH)
+async def classify_batch(request: Request) -> Response:
+    """Split a batch by owning instance, score the parts concurrently and merge them.
+
+    Batches the instances would reject (invalid or above
+    PREDICT_BATCH_MAX_MESSAGES) are forwarded whole, so the client gets the
+    instance's own error.
+    """
+    data = await _splittable_batch(request)
+    if data is None:
+        return await _forward(request, None)
+    try:
+        groups = list(affinity_router.split(data.messages).values())
+    except NoBackendAvailable as e:
+        return _unavailable(str(e))
+    if len(groups) == 1:
+        return await _forward(request, routing_key(data.messages[0]))
+
+    parts = await _fan_out(request, data, groups)
+    failed = _failed_part(parts)
+    if failed is not None:
+        return failed
+    return _merge(request, groups, parts)
+
+
+@app.post("/api/v1/predict")
+@app.post("/api/v1/predict/long")
+@app.post("/api/v1/predict/eml")
+async def classify(request: Request) -> Response:
+    """Route a single prediction to the instance owning its message."""
+    body = await request.body()
+    return await _forward(request, _message_key(body, request.headers.get("content-type")))
+
+
+@app.api_route(
+    "/{path:path}", methods=["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+)
+async def passthrough(request: Request, path: str) -> Response:
+    """Forward any other request to a healthy instance, round-robin."""
+    return await _forward(request, None)
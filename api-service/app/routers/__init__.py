@@ -2,8 +2,19 @@
 API routers module.
 """
 
+from .admin import router as admin_router
+from .feedback import router as feedback_router
 from .health import router as health_router
+from .jobs import router as jobs_router
 from .predictions import router as predictions_router
+from .stream import router as stream_router
 
-__all__ = ["health_router", "predictions_router"]
+__all__ = [
+    "health_router",
+    "predictions_router",
+    "jobs_router",
+    "admin_router",
+    "stream_router",
+    "feedback_router",
+]
 
@@ -0,0 +1,190 @@
+"""
+Router for operational (admin) endpoints.
+"""
+
+from fastapi import APIRouter, Query
+
+from ..controllers import AdminController, FeedbackController
+from ..schemas import (
+    DriftReport,
+    ErrorResponse,
+    FeedbackStats,
+    MemoryDiff,
+    MemoryReport,
+    ModelRegistryResponse,
+    SchedulerStats,
+    TenantsResponse,
+    TracemallocStatus,
+)
+
+router = APIRouter()
+
+
+@router.get(
+    "/admin/drift",
+    response_model=DriftReport,
+    summary="Drift Monitor",
+    description=(
+        "Compare the rolling window of classified traffic (spam probability, spam rate, "
+        "out-of-vocabulary ratio, message length) with the training-time statistics"
+    ),
+    responses={503: {"model": ErrorResponse, "description": "Drift monitoring is disabled"}},
+)
+async def drift_report() -> DriftReport:
+    """Drift monitor endpoint."""
+    from ..core import classifier
+
+    return DriftReport(**AdminController.get_drift_report(classifier))
+
+
+@router.get(
+    "/admin/models",
+    response_model=ModelRegistryResponse,
+    summary="Model Registry",
+    description=(
+        "Routing policy (primary, weighted A/B, shadow) with served latency per model and "
+        "agreement of shadow models with the served predictions"
+    ),
+)
+async def model_registry_stats() -> ModelRegistryResponse:
+    """Model registry endpoint."""
+    from ..core import model_registry
+
+    return ModelRegistryResponse(**AdminController.get_model_registry(model_registry))
+
+
+@router.get(
+    "/admin/scheduler",
+    response_model=SchedulerStats,
+    summary="Inference Scheduler",
+    description=(
+        "Queue wait and latency per lane (interactive and bulk) of the cost-aware "
+        "inference scheduler of this worker"
+    ),
+    responses={503: {"model": ErrorResponse, "description": "Scheduling is disabled"}},
+)
+async def scheduler_stats() -> SchedulerStats:
+    """Inference scheduler endpoint."""
+    from ..core import inference_scheduler
+
+    return SchedulerStats(**AdminController.get_scheduler(inference_scheduler))
+
+
+@router.get(
+    "/admin/tenants",
+    response_model=TenantsResponse,
+    summary="Tenants",
+    description=(
+        "Tenant model directories and default thresholds, with hit, load and eviction "
+        "counters of the LRU pool of loaded classifiers"
+    ),
+)
+async def tenants() -> TenantsResponse:
+    """Tenant pool endpoint."""
+    from ..core import tenant_directory, tenant_pool
+
+    return TenantsResponse(**AdminController.get_tenants(tenant_directory, tenant_pool))
+
+
+@router.get(
+    "/admin/feedback",
+    response_model=FeedbackStats,
+    summary="Feedback Updates",
+    description=(
+        "Stored, pending and holdout feedback with the outcome of the background "
+        "incremental updates and the model version being served"
+    ),
+    responses={503: {"model": ErrorResponse, "description": "Feedback is disabled"}},
+)
+async def feedback_stats() -> FeedbackStats:
+    """Feedback update endpoint."""
+    from ..core import classifier, feedback_log, feedback_trainer, settings
+
+    return FeedbackStats(
+        **FeedbackController.get_stats(feedback_trainer, feedback_log, classifier, settings)
+    )
+
+
+@router.get(
+    "/admin/memory",
+    response_model=MemoryReport,
+    summary="Memory Footprint",
+    description=(
+        "Memory of the worker answering the request: RSS vs shared memory and the container "
+        "limit, deep size of each model artifact (vocabulary, IDF, calibrated fold "
+        "coefficients, label encoder) and of every cache and queue"
+    ),
+)
+def memory() -> MemoryReport:
+    """Memory footprint endpoint (sync: the deep size walk runs in the threadpool)."""
+    from ..core import (
+        audit_log,
+        classifier,
+        feedback_log,
+        memory_tracer,
+        micro_batcher,
+        model_registry,
+        settings,
+        tenant_pool,
+        traffic_recorder,
+    )
+
+    sinks = {
+        "audit_log": audit_log,
+        "traffic_capture": traffic_recorder if settings.capture_enabled else None,
+        "feedback_log": feedback_log if settings.feedback_enabled else None,
+    }
+    return MemoryReport(
+        **AdminController.get_memory(
+            classifier, sinks, model_registry, micro_batcher, tenant_pool, memory_tracer
+        )
+    )
+
+
+@router.post(
+    "/admin/memory/snapshot",
+    response_model=TracemallocStatus,
+    summary="Start Allocation Tracing",
+    description=(
+        "Start tracemalloc in this worker (if needed) and take the baseline snapshot that "
+        "GET /admin/memory/diff compares with. Tracing slows allocations down: stop it "
+        "with DELETE when done"
+    ),
+)
+def memory_snapshot() -> TracemallocStatus:
+    """Baseline snapshot endpoint."""
+    from ..core import memory_tracer
+
+    return TracemallocStatus(**memory_tracer.snapshot())
+
+
+@router.get(
+    "/admin/memory/diff",
+    response_model=MemoryDiff,
+    summary="Allocation Diff",
+    description="Top-N allocation sites by growth since the baseline snapshot",
+    responses={409: {"model": ErrorResponse, "description": "No baseline snapshot"}},
+)
+def memory_diff(
+    top: int = Query(20, ge=1, le=500, description="Allocation sites returned"),
+    group_by: str = Query(
+        "lineno", pattern="^(lineno|filename|traceback)$", description="Grouping of allocations"
+    ),
+) -> MemoryDiff:
+    """Allocation diff endpoint."""
+    from ..core import memory_tracer
+
+    return MemoryDiff(**AdminController.get_memory_diff(memory_tracer, top, group_by))
+
+
+@router.delete(
+    "/admin/memory/snapshot",
+    response_model=TracemallocStatus,
+    summary="Stop Allocation Tracing",
+    description="Drop the baseline snapshot and stop tracemalloc in this worker",
+)
+def memory_snapshot_stop() -> TracemallocStatus:
+    """Stop tracing endpoint."""
+    from ..core import memory_tracer
+
+    return TracemallocStatus(**memory_tracer.stop())
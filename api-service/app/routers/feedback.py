@@ -0,0 +1,34 @@
+"""
+Router for user feedback endpoints.
+"""
+
+from fastapi import APIRouter, status
+
+from ..controllers import FeedbackController
+from ..schemas import ErrorResponse, FeedbackInput, FeedbackResponse
+
+router = APIRouter()
+
+
+@router.post(
+    "/feedback",
+    response_model=FeedbackResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit Feedback",
+    description=(
+        "Report the correct label of a message. Feedback is stored asynchronously and "
+        "used by periodic background updates of the model, published only when they do "
+        "not lose accuracy on a holdout set"
+    ),
+    responses={
+        202: {"description": "Feedback queued"},
+        503: {"model": ErrorResponse, "description": "Feedback is disabled or the queue is full"},
+    },
+)
+async def submit_feedback(feedback: FeedbackInput) -> FeedbackResponse:
+    """Feedback endpoint."""
+    from ..core import classifier, feedback_log, settings
+
+    return FeedbackResponse(
+        **FeedbackController.submit(feedback_log, classifier, feedback.model_dump(), settings)
+    )
@@ -5,7 +5,7 @@ Router for health check.
 from fastapi import APIRouter
 
 from ..controllers import HealthController
-from ..schemas import HealthResponse
+from ..schemas import HealthResponse, ReadinessResponse
 
 router = APIRouter()
 
@@ -24,8 +24,21 @@ router = APIRouter()
 )
 async def health_check() -> HealthResponse:
     """Check service and model status."""
-    from ..core import classifier
+    from ..core import audit_log, classifier, drain_coordinator
 
-    health_data = HealthController.get_health_status(classifier)
+    health_data = HealthController.get_health_status(classifier, audit_log, drain_coordinator)
     return HealthResponse(**health_data)
 
+
+@router.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    summary="Readiness Check",
+    description="503 while the model is not loaded or the worker drains for shutdown",
+)
+async def readiness_check() -> ReadinessResponse:
+    """Check whether the worker should receive traffic."""
+    from ..core import classifier, drain_coordinator
+
+    return ReadinessResponse(**HealthController.get_readiness(classifier, drain_coordinator))
+
@@ -0,0 +1,79 @@
+"""
+Router for asynchronous batch job endpoints.
+"""
+
+from fastapi import APIRouter, Query, status
+from fastapi.responses import StreamingResponse
+
+from ..controllers import JobController
+from ..schemas import ErrorResponse, JobCreate, JobStatusResponse
+
+router = APIRouter()
+
+
+@router.post(
+    "/jobs",
+    response_model=JobStatusResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Create Batch Job",
+    description=(
+        "Upload messages for asynchronous classification. Poll the job for progress "
+        "and download results when completed"
+    ),
+    responses={
+        202: {"description": "Job queued"},
+        413: {"model": ErrorResponse, "description": "Too many messages"},
+        503: {"model": ErrorResponse, "description": "Batch jobs are disabled"},
+    },
+)
+def create_job(job_data: JobCreate) -> JobStatusResponse:
+    """Batch job submission endpoint."""
+    from ..core import job_runner, job_store, settings
+
+    result = JobController.create_job(job_store, job_runner, job_data.model_dump(), settings)
+    return JobStatusResponse(**result)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobStatusResponse,
+    summary="Job Progress",
+    description="Get the status and progress of a batch job",
+    responses={
+        404: {"model": ErrorResponse, "description": "Job not found"},
+        503: {"model": ErrorResponse, "description": "Batch jobs are disabled"},
+    },
+)
+def get_job(job_id: str) -> JobStatusResponse:
+    """Batch job progress endpoint."""
+    from ..core import job_store, settings
+
+    return JobStatusResponse(**JobController.get_job(job_store, job_id, settings))
+
+
+@router.get(
+    "/jobs/{job_id}/results",
+    summary="Job Results",
+    description=(
+        "Stream the results classified so far as NDJSON, one object per message "
+        "ordered by index. Use offset to resume an interrupted download"
+    ),
+    responses={
+        200: {"content": {"application/x-ndjson": {}}, "description": "Results stream"},
+        404: {"model": ErrorResponse, "description": "Job not found"},
+        503: {"model": ErrorResponse, "description": "Batch jobs are disabled"},
+    },
+)
+def get_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="First message index to return"),
+) -> StreamingResponse:
+    """Batch job results endpoint."""
+    from ..core import job_store, settings
+
+    job = JobController.get_job(job_store, job_id, settings)
+    return StreamingResponse(
+        JobController.stream_results(job_store, job_id, offset),
+        media_type="application/x-ndjson",
+        headers={"X-Job-Status": job["status"], "X-Job-Processed": str(job["processed"])},
+    )
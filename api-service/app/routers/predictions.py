@@ -2,13 +2,136 @@
 Router for prediction endpoints.
 """
 
-from fastapi import APIRouter
+from typing import Any, Callable, Dict, Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
 
 from ..controllers import PredictionController
-from ..schemas import EmailInput, ErrorResponse, ModelInfoResponse, PredictionResponse
+from ..schemas import (
+    BatchEmailInput,
+    BatchPredictionResponse,
+    ColumnarPredictionResponse,
+    EmailInput,
+    EmlPredictionResponse,
+    ErrorResponse,
+    LongEmailInput,
+    LongPredictionResponse,
+    ModelInfoResponse,
+    PredictionResponse,
+)
+from ..services import (
+    MSGPACK,
+    MimeTextExtractor,
+    UnsupportedMediaType,
+    columnar,
+    decode_request,
+    encode_response,
+    negotiate_media_type,
+)
 
 router = APIRouter()
 
+MSGPACK_CONTENT = {"application/msgpack": {}}
+
+
+def _encoded(request: Request, payload: Any) -> Response:
+    """Response in the format negotiated from Accept and Accept-Encoding."""
+    from ..core import settings
+
+    body, headers = encode_response(
+        payload,
+        request.headers.get("accept"),
+        request.headers.get("accept-encoding"),
+        settings.compression_min_bytes if settings.compression_enabled else None,
+    )
+    return Response(content=body, headers=headers)
+
+
+def _negotiated(request: Request, response: BaseModel):
+    """Return a single-prediction response, as MessagePack when the client asks for it.
+
+    Only the response is negotiated: single-message bodies are always JSON.
+    """
+    if negotiate_media_type(request.headers.get("accept")) != MSGPACK:
+        return response
+    return _encoded(request, response.model_dump())
+
+
+async def _batch_input(request: Request) -> BatchEmailInput:
+    """Decode and validate a JSON or MessagePack batch body within the size limit."""
+    from ..core import settings
+
+    try:
+        payload = decode_request(await request.body(), request.headers.get("content-type"))
+    except UnsupportedMediaType as e:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid data: {str(e)}"
+        )
+    try:
+        data = BatchEmailInput.model_validate(payload)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
+    if len(data.messages) > settings.predict_batch_max_messages:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds {settings.predict_batch_max_messages} messages",
+        )
+    return data
+
+
+async def _classify(
+    request: Request,
+    message: str,
+    threshold: float,
+    threshold_set: bool,
+    classify: Callable[[Any, float], Dict[str, Any]],
+    shadow: bool = True,
+) -> Dict[str, Any]:
+    """Classify with the model of the request's tenant.
+
+    The primary classifier goes through the model registry (A/B and shadow
+    routing); tenant-specific models answer directly. Inference runs on the
+    scheduler's threads in order of expected cost when it is enabled.
+    """
+    from ..core import (
+        classifier,
+        inference_scheduler,
+        model_registry,
+        settings,
+        tenant_directory,
+        tenant_pool,
+    )
+
+    selected, threshold, tenant_id = await PredictionController.select_classifier(
+        tenant_directory,
+        tenant_pool,
+        classifier,
+        request.headers.get(settings.api_key_header),
+        request.headers.get(settings.tenant_header),
+        threshold,
+        threshold_set,
+    )
+
+    def serve() -> Dict[str, Any]:
+        if selected is classifier:
+            return model_registry.serve(
+                classifier, message, threshold, lambda chosen: classify(chosen, threshold), shadow
+            )
+        return classify(selected, threshold)
+
+    if inference_scheduler is None:
+        result = serve()
+    else:
+        result = await inference_scheduler.run(inference_scheduler.estimate_cost(message), serve)
+    if tenant_id is not None:
+        result["model_info"]["tenant"] = tenant_id
+    return result
+
 
 @router.get(
     "/model/info",
@@ -30,16 +153,202 @@ async def model_info() -> ModelInfoResponse:
     summary="Classify Email",
     description="Classify email as spam or ham using trained model",
     responses={
-        200: {"description": "Classification successful"},
+        200: {"description": "Classification successful", "content": MSGPACK_CONTENT},
         400: {"model": ErrorResponse, "description": "Invalid input data"},
         500: {"model": ErrorResponse, "description": "Internal server error"},
     },
 )
-async def classify_email(email_data: EmailInput) -> PredictionResponse:
+async def classify_email(email_data: EmailInput, request: Request) -> PredictionResponse:
     """Main email classification endpoint."""
-    from ..core import classifier
+    from ..core import audit_log
+
+    data = email_data.model_dump()
+    result = await _classify(
+        request,
+        data["message"],
+        data["threshold"],
+        "threshold" in email_data.model_fields_set,
+        lambda selected, threshold: PredictionController.classify_email(
+            selected, {**data, "threshold": threshold}, audit_log
+        ),
+    )
+    return _negotiated(request, PredictionResponse(**result))
+
+
+@router.post(
+    "/predict/long",
+    response_model=LongPredictionResponse,
+    summary="Classify Long Email",
+    description=(
+        "Classify messages beyond the 5000-character limit using chunked TF-IDF "
+        "vectorization under a token budget"
+    ),
+    responses={
+        200: {"description": "Classification successful", "content": MSGPACK_CONTENT},
+        400: {"model": ErrorResponse, "description": "Invalid input data"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+)
+async def classify_long_email(
+    email_data: LongEmailInput, request: Request
+) -> LongPredictionResponse:
+    """Long-message classification endpoint."""
+    from ..core import audit_log, settings
 
     data = email_data.model_dump()
-    result = PredictionController.classify_email(classifier, data)
-    return PredictionResponse(**result)
+    # Shadow models score whole messages, which would not match the token budget.
+    result = await _classify(
+        request,
+        data["message"],
+        data["threshold"],
+        "threshold" in email_data.model_fields_set,
+        lambda selected, threshold: PredictionController.classify_long_email(
+            selected, {**data, "threshold": threshold}, settings, audit_log
+        ),
+        shadow=False,
+    )
+    return _negotiated(request, LongPredictionResponse(**result))
+
+
+@router.post(
+    "/predict/eml",
+    response_model=EmlPredictionResponse,
+    summary="Classify Raw Email",
+    description=(
+        "Classify a raw RFC 822/MIME message (.eml). Only text/plain and text/html "
+        "parts are decoded, within part, depth and size limits"
+    ),
+    responses={
+        200: {"description": "Classification successful", "content": MSGPACK_CONTENT},
+        400: {"model": ErrorResponse, "description": "No text content found"},
+        413: {"model": ErrorResponse, "description": "Payload too large"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"message/rfc822": {"schema": {"type": "string", "format": "binary"}}},
+        }
+    },
+)
+async def classify_eml(
+    request: Request,
+    threshold: float = Query(
+        0.5, ge=0.0, le=1.0, description="Probability threshold to classify as spam"
+    ),
+) -> EmlPredictionResponse:
+    """Raw email classification endpoint."""
+    from ..core import audit_log, settings
+
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Payload exceeds {settings.eml_max_raw_bytes} bytes",
+    )
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > settings.eml_max_raw_bytes:
+        raise too_large
+
+    extractor = MimeTextExtractor(
+        max_parts=settings.eml_max_parts,
+        max_depth=settings.eml_max_depth,
+        max_text_bytes=settings.eml_max_text_bytes,
+    )
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > settings.eml_max_raw_bytes:
+            raise too_large
+        extractor.feed(chunk)
+        if extractor.done:
+            break
+
+    extraction = extractor.close()
+    result = await _classify(
+        request,
+        extraction["text"],
+        threshold,
+        "threshold" in request.query_params,
+        lambda selected, tenant_threshold: PredictionController.classify_eml(
+            selected, extraction, tenant_threshold, audit_log
+        ),
+    )
+    return _negotiated(request, EmlPredictionResponse(**result))
+
+
+@router.post(
+    "/predict/batch",
+    response_model=BatchPredictionResponse,
+    summary="Classify Email Batch",
+    description=(
+        "Classify up to PREDICT_BATCH_MAX_MESSAGES messages with one vectorized call. "
+        "Accepts and returns JSON or MessagePack (Content-Type/Accept); layout=columnar "
+        "returns one array per field"
+    ),
+    responses={
+        200: {
+            "description": "Classification successful",
+            "content": {
+                "application/msgpack": {
+                    "schema": ColumnarPredictionResponse.model_json_schema()
+                }
+            },
+        },
+        400: {"model": ErrorResponse, "description": "Invalid input data"},
+        413: {"model": ErrorResponse, "description": "Too many messages"},
+        415: {"model": ErrorResponse, "description": "Unsupported content type"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": BatchEmailInput.model_json_schema()},
+                "application/msgpack": {"schema": BatchEmailInput.model_json_schema()},
+            },
+        }
+    },
+)
+async def classify_batch(
+    request: Request,
+    layout: Literal["rows", "columnar"] = Query(
+        "rows", description="'rows' (list of results) or 'columnar' (one array per field)"
+    ),
+) -> BatchPredictionResponse:
+    """Synchronous batch classification endpoint.
+
+    Tenant models and thresholds apply as in /predict; A/B and shadow
+    routing do not (as for batch jobs).
+    """
+    from ..core import (
+        audit_log,
+        classifier,
+        inference_scheduler,
+        settings,
+        tenant_directory,
+        tenant_pool,
+    )
+
+    data = await _batch_input(request)
 
+    selected, threshold, tenant_id = await PredictionController.select_classifier(
+        tenant_directory,
+        tenant_pool,
+        classifier,
+        request.headers.get(settings.api_key_header),
+        request.headers.get(settings.tenant_header),
+        data.threshold,
+        "threshold" in data.model_fields_set,
+    )
+    batch = (PredictionController.classify_batch, selected, data.messages, threshold, audit_log)
+    if inference_scheduler is None:
+        results = await run_in_threadpool(*batch)
+    else:
+        results = await inference_scheduler.run(
+            inference_scheduler.estimate_cost(*data.messages), *batch
+        )
+    if tenant_id is not None:
+        for result in results:
+            result["model_info"]["tenant"] = tenant_id
+    if layout == "columnar":
+        return _encoded(request, columnar(results))
+    return _encoded(request, {"count": len(results), "results": results})
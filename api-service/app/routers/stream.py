@@ -0,0 +1,195 @@
+"""
+Router for the pipelined WebSocket classification channel.
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, Optional, Set
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+
+from ..controllers import PredictionController
+
+router = APIRouter()
+
+# Same limits as EmailInput (validated by hand: no Pydantic model per frame)
+MESSAGE_MIN_CHARS = 10
+MESSAGE_MAX_CHARS = 5000
+
+
+def _error(request_id: Any, status_code: int, detail: str) -> Dict[str, Any]:
+    return {"id": request_id, "error": {"status": status_code, "detail": detail}}
+
+
+def _parse(raw: str, default_threshold: float):
+    """Return (id, message, threshold) of a request frame or raise ValueError."""
+    try:
+        frame = json.loads(raw)
+    except ValueError:
+        raise ValueError("Frame is not valid JSON")
+    if not isinstance(frame, dict):
+        raise ValueError("Frame must be a JSON object")
+    message = frame.get("message")
+    if not isinstance(message, str):
+        raise ValueError("'message' must be a string")
+    message = message.strip()
+    if not MESSAGE_MIN_CHARS <= len(message) <= MESSAGE_MAX_CHARS:
+        raise ValueError(
+            f"'message' must have {MESSAGE_MIN_CHARS}-{MESSAGE_MAX_CHARS} characters"
+        )
+    threshold = frame.get("threshold", default_threshold)
+    if isinstance(threshold, bool) or not isinstance(threshold, (int, float)) or not (
+        0.0 <= threshold <= 1.0
+    ):
+        raise ValueError("'threshold' must be a number between 0.0 and 1.0")
+    return message, float(threshold)
+
+
+class _Channel:
+    """Per-connection state shared by the reader, the sender and the answers."""
+
+    def __init__(self, websocket: WebSocket, selected, default_threshold: float, tenant_id):
+        from ..core import settings
+
+        self.websocket = websocket
+        self.selected = selected
+        self.default_threshold = default_threshold
+        self.tenant_id = tenant_id
+        self.outstanding = asyncio.Semaphore(settings.ws_max_outstanding)
+        self.outgoing: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self.tasks: Set[asyncio.Task] = set()
+
+    def reply(self, frame: Dict[str, Any]) -> None:
+        """Queue an answer and free its outstanding slot."""
+        self.outstanding.release()
+        self.outgoing.put_nowait(frame)
+
+
+def _request_id(raw: str) -> Any:
+    try:
+        return json.loads(raw).get("id")
+    except (ValueError, AttributeError):
+        return None
+
+
+async def _receive_text(websocket: WebSocket) -> Optional[str]:
+    """Next text frame, or None for a binary frame."""
+    frame = await websocket.receive()
+    if frame["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(frame.get("code", status.WS_1000_NORMAL_CLOSURE))
+    return frame.get("text")
+
+
+async def _answer(channel: _Channel, request_id: Any, message: str, threshold: float) -> None:
+    from ..core import audit_log, micro_batcher
+
+    start = time.perf_counter()
+    try:
+        result = await micro_batcher.classify(channel.selected, message, threshold)
+    except ValueError as e:
+        frame = _error(request_id, 400, f"Invalid data: {str(e)}")
+    except Exception as e:
+        frame = _error(request_id, 500, f"Classification error: {str(e)}")
+    else:
+        if channel.tenant_id is not None:
+            result["model_info"]["tenant"] = channel.tenant_id
+        if audit_log is not None:
+            audit_log.log(
+                "ws/predict", message, threshold, result, (time.perf_counter() - start) * 1000
+            )
+        frame = {"id": request_id, "result": result}
+    channel.reply(frame)
+
+
+async def _send(channel: _Channel) -> None:
+    while True:
+        frame = await channel.outgoing.get()
+        try:
+            await channel.websocket.send_text(json.dumps(frame))
+        finally:
+            channel.outgoing.task_done()
+
+
+async def _receive(channel: _Channel) -> None:
+    while True:
+        await channel.outstanding.acquire()
+        raw = await _receive_text(channel.websocket)
+        if raw is None:
+            channel.reply(_error(None, 400, "Invalid data: frames must be text (JSON)"))
+            continue
+        request_id = _request_id(raw)
+        if not channel.selected.is_loaded:
+            channel.reply(_error(request_id, 503, "Model not loaded"))
+            continue
+        try:
+            message, threshold = _parse(raw, channel.default_threshold)
+        except ValueError as e:
+            channel.reply(_error(request_id, 400, f"Invalid data: {str(e)}"))
+            continue
+        task = asyncio.create_task(_answer(channel, request_id, message, threshold))
+        channel.tasks.add(task)
+        task.add_done_callback(channel.tasks.discard)
+
+
+async def _drain(channel: _Channel, reader: asyncio.Task) -> None:
+    """Stop reading, answer what was read and close with 'service restart'."""
+    from ..core import drain_coordinator
+
+    reader.cancel()
+    if channel.tasks:
+        await asyncio.wait(set(channel.tasks), timeout=drain_coordinator.remaining())
+    await asyncio.wait_for(channel.outgoing.join(), timeout=drain_coordinator.remaining())
+    await channel.websocket.close(code=status.WS_1012_SERVICE_RESTART, reason="Draining")
+
+
+@router.websocket("/ws/predict")
+async def classify_stream(websocket: WebSocket) -> None:
+    """Pipelined classification over one WebSocket connection.
+
+    Each text frame is a JSON request {"id", "message", "threshold"?}; each
+    answer is {"id", "result"} or {"id", "error": {"status", "detail"}}, sent
+    as soon as it is ready (not in request order); binary frames get a 400
+    error. Requests of all connections are scored together in micro-batches.
+    At most WS_MAX_OUTSTANDING requests per connection are in flight; beyond that
+    the server stops reading until answers go out. When the worker drains
+    for shutdown, the server stops reading, answers the requests already
+    read and closes the connection with 1012 (service restart).
+    """
+    from ..core import classifier, drain_coordinator, settings, tenant_directory, tenant_pool
+
+    try:
+        selected, default_threshold, tenant_id = await PredictionController.select_classifier(
+            tenant_directory,
+            tenant_pool,
+            classifier,
+            websocket.headers.get(settings.api_key_header),
+            websocket.headers.get(settings.tenant_header),
+            0.5,
+            False,
+        )
+    except HTTPException as e:
+        # Closing before accept rejects the handshake (HTTP 403).
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+        return
+    await websocket.accept()
+
+    channel = _Channel(websocket, selected, default_threshold, tenant_id)
+    stopping = asyncio.Event()
+    unsubscribe = drain_coordinator.on_stop(stopping.set)
+    sender = asyncio.create_task(_send(channel))
+    reader = asyncio.create_task(_receive(channel))
+    stopped = asyncio.create_task(stopping.wait())
+    try:
+        await asyncio.wait({reader, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        if reader.done():
+            reader.result()
+        else:
+            await _drain(channel, reader)
+    except (WebSocketDisconnect, asyncio.TimeoutError):
+        pass
+    finally:
+        unsubscribe()
+        for task in (*channel.tasks, reader, stopped):
+            task.cancel()
+        sender.cancel()
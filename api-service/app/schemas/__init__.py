@@ -2,17 +2,55 @@
 Pydantic schemas for API validation.
 """
 
-from .email import EmailInput
+from .batch import BatchEmailInput, BatchPredictionResponse, ColumnarPredictionResponse
+from .drift import DriftFeature, DriftReport
+from .email import EmailInput, LongEmailInput
+from .eml import EmlExtraction, EmlPredictionResponse
 from .error import ErrorResponse
-from .health import HealthResponse
+from .feedback import FeedbackInput, FeedbackResponse, FeedbackStats
+from .health import HealthResponse, ReadinessResponse
+from .job import JobCreate, JobStatusResponse
+from .memory import ArtifactFootprint, MemoryDiff, MemoryReport, TracemallocStatus
 from .model_info import ModelInfoResponse
-from .prediction import PredictionResponse
+from .prediction import LongPredictionResponse, PredictionResponse, TruncationInfo
+from .registry import ModelRegistryResponse, RegisteredModelStats, ShadowQueueStats
+from .scheduler import LaneStats, SchedulerStats, WorkerPoolStats
+from .tenant import ClassifierPoolStats, TenantInfo, TenantsResponse
 
 __all__ = [
     "EmailInput",
     "PredictionResponse",
     "HealthResponse",
+    "ReadinessResponse",
     "ModelInfoResponse",
     "ErrorResponse",
+    "EmlExtraction",
+    "EmlPredictionResponse",
+    "LongEmailInput",
+    "LongPredictionResponse",
+    "TruncationInfo",
+    "JobCreate",
+    "JobStatusResponse",
+    "DriftFeature",
+    "DriftReport",
+    "ModelRegistryResponse",
+    "RegisteredModelStats",
+    "ShadowQueueStats",
+    "TenantInfo",
+    "ClassifierPoolStats",
+    "TenantsResponse",
+    "BatchEmailInput",
+    "BatchPredictionResponse",
+    "ColumnarPredictionResponse",
+    "FeedbackInput",
+    "FeedbackResponse",
+    "FeedbackStats",
+    "ArtifactFootprint",
+    "MemoryReport",
+    "MemoryDiff",
+    "TracemallocStatus",
+    "LaneStats",
+    "SchedulerStats",
+    "WorkerPoolStats",
 ]
 
@@ -0,0 +1,53 @@
+"""
+Synchronous batch prediction schemas.
+"""
+
+from typing import Annotated, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, StringConstraints
+
+from .prediction import PredictionResponse
+
+BatchMessage = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=10, max_length=5000)
+]
+
+
+class BatchEmailInput(BaseModel):
+    """Input schema for synchronous batch classification (JSON or MessagePack)."""
+
+    messages: List[BatchMessage] = Field(
+        ..., description="Email messages to classify", min_length=1
+    )
+    threshold: float = Field(
+        default=0.5,
+        description="Probability threshold to classify as spam (0.0-1.0)",
+        ge=0.0,
+        le=1.0,
+    )
+
+
+class BatchPredictionResponse(BaseModel):
+    """Batch classification response ('rows' layout)."""
+
+    count: int = Field(..., description="Number of classified messages")
+    results: List[PredictionResponse] = Field(..., description="Results in input order")
+
+
+class ColumnarPredictionResponse(BaseModel):
+    """Batch classification response ('columnar' layout): one array per field."""
+
+    count: int = Field(..., description="Number of classified messages")
+    prediction: List[Literal["spam", "ham"]] = Field(..., description="Labels in input order")
+    is_spam: List[bool] = Field(..., description="Spam flags")
+    confidence: List[float] = Field(..., description="Prediction confidences")
+    probability_spam: List[float] = Field(..., description="Spam probabilities")
+    probability_ham: List[float] = Field(..., description="Ham probabilities")
+    near_duplicate: List[bool] = Field(..., description="Near-duplicate reuse flags")
+    decided_by: List[str] = Field(..., description="Model or pre-filter deciding each message")
+    model_info: Optional[Union[dict, List[dict]]] = Field(
+        ...,
+        description=(
+            "Model information, shared by the batch; one per message when the batch mixes models"
+        ),
+    )
@@ -0,0 +1,41 @@
+"""
+Drift monitoring schemas.
+"""
+
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class DriftFeature(BaseModel):
+    """Drift of one monitored statistic."""
+
+    observations: int = Field(..., description="Observations in the rolling window")
+    psi: Optional[float] = Field(
+        None, description="Population stability index against the reference"
+    )
+    status: Optional[Literal["stable", "moderate", "drift"]] = Field(
+        None, description="PSI reading (< 0.1 stable, 0.1-0.25 moderate, > 0.25 drift)"
+    )
+    current: List[float] = Field(..., description="Histogram of the rolling window")
+    reference: Optional[List[float]] = Field(None, description="Training-time histogram")
+
+
+class DriftReport(BaseModel):
+    """Live traffic statistics compared with the training data."""
+
+    status: Literal["stable", "moderate", "drift", "insufficient_data", "no_reference"] = Field(
+        ..., description="Worst feature status"
+    )
+    window_seconds: float = Field(..., description="Length of the rolling window")
+    observed: int = Field(..., description="Messages classified in the window")
+    spam_rate: Optional[float] = Field(None, description="Spam rate (probability >= 0.5)")
+    reference_spam_rate: Optional[float] = Field(None, description="Training spam rate")
+    reference_samples: Optional[int] = Field(None, description="Messages in the reference")
+    features: Dict[str, DriftFeature] = Field(
+        ...,
+        description=(
+            "probability_spam (20 bins), oov_ratio (20 bins), message_length "
+            "(power-of-two character buckets) and spam_rate ([ham, spam])"
+        ),
+    )
@@ -2,8 +2,20 @@
 Input schema for spam classification.
 """
 
+from typing import Literal, Optional
+
 from pydantic import BaseModel, Field, field_validator
 
+LONG_MESSAGE_MAX_CHARS = 10_000_000
+
+
+def normalize_message(v: str) -> str:
+    """Validate and normalize message."""
+    v = v.strip()
+    if not v:
+        raise ValueError("Message cannot be blank")
+    return v
+
 
 class EmailInput(BaseModel):
     """Input schema for classification."""
@@ -24,11 +36,7 @@ class EmailInput(BaseModel):
         le=1.0,
     )
 
-    @field_validator("message")
-    @classmethod
-    def validate_message(cls, v: str) -> str:
-        """Validate and normalize message."""
-        return v.strip()
+    validate_message = field_validator("message")(normalize_message)
 
     model_config = {
         "json_schema_extra": {
@@ -43,3 +51,30 @@ class EmailInput(BaseModel):
         }
     }
 
+
+class LongEmailInput(BaseModel):
+    """Input schema for long-message classification."""
+
+    message: str = Field(
+        ...,
+        description="Email message text to classify (long newsletters allowed)",
+        min_length=10,
+        max_length=LONG_MESSAGE_MAX_CHARS,
+    )
+    threshold: float = Field(
+        default=0.5,
+        description="Probability threshold to classify as spam (0.0-1.0)",
+        ge=0.0,
+        le=1.0,
+    )
+    max_tokens: Optional[int] = Field(
+        default=None,
+        description="Token budget (capped by the server limit)",
+        gt=0,
+    )
+    truncation: Optional[Literal["head", "head_tail"]] = Field(
+        default=None,
+        description="Which part of the message to keep when the budget is exceeded",
+    )
+
+    validate_message = field_validator("message")(normalize_message)
@@ -0,0 +1,23 @@
+"""
+Raw email (.eml) classification response schema.
+"""
+
+from pydantic import BaseModel, Field
+
+from .prediction import PredictionResponse
+
+
+class EmlExtraction(BaseModel):
+    """Statistics of the text extracted from a raw email."""
+
+    subject: str = Field("", description="Decoded Subject header")
+    parts: int = Field(..., description="MIME parts inspected")
+    text_parts: int = Field(..., description="text/plain and text/html parts used")
+    text_bytes: int = Field(..., description="Decoded text bytes used for classification")
+    truncated: bool = Field(..., description="Whether a size, part or depth limit was hit")
+
+
+class EmlPredictionResponse(PredictionResponse):
+    """Classification response for a raw email."""
+
+    extraction: EmlExtraction = Field(..., description="Text extraction statistics")
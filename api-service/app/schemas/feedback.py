@@ -0,0 +1,46 @@
+"""
+Feedback schemas.
+"""
+
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class FeedbackInput(BaseModel):
+    """A message with its correct label."""
+
+    message: str = Field(..., min_length=1, description="Email or SMS text")
+    label: Literal["spam", "ham"] = Field(..., description="Correct label of the message")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [{"message": "WINNER! Claim your free prize now", "label": "spam"}]
+        }
+    }
+
+
+class FeedbackResponse(BaseModel):
+    """Acknowledgement of queued feedback."""
+
+    status: str = Field(..., description="'queued': stored asynchronously")
+    model_version: Optional[str] = Field(None, description="Model served when it was received")
+
+
+class FeedbackStats(BaseModel):
+    """Feedback store counters and outcome of background updates."""
+
+    stored: int = Field(..., description="Feedback rows stored")
+    pending: int = Field(..., description="Training rows not yet in a published model")
+    holdout: int = Field(..., description="Rows kept out of training for the update check")
+    last_id: int = Field(..., description="Id of the newest stored row")
+    trained_through: int = Field(..., description="Id of the last row in a published model")
+    updates_published: int = Field(..., description="Updates published by this process")
+    updates_rejected: int = Field(..., description="Updates rejected by the holdout check")
+    models_swapped: int = Field(..., description="Published models swapped in by this process")
+    queued: int = Field(..., description="Feedback waiting to be written")
+    dropped: int = Field(..., description="Feedback rejected because the queue was full")
+    model_version: Optional[str] = Field(None, description="Model version being served")
+    last_update: Optional[Dict[str, Any]] = Field(
+        None, description="Report of the last update attempted by this process"
+    )
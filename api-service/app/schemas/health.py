@@ -3,7 +3,7 @@ Health check response schema.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from pydantic import BaseModel, Field
 
@@ -15,6 +15,18 @@ class HealthResponse(BaseModel):
     timestamp: Optional[datetime] = Field(None, description="Check timestamp")
     model_loaded: Optional[bool] = Field(None, description="Whether model is loaded")
     version: Optional[str] = Field(None, description="API version")
+    audit: Optional[Dict[str, int]] = Field(
+        None, description="Audit log counters (written, dropped, queued) when enabled"
+    )
+    prediction_cache: Optional[Dict[str, Any]] = Field(
+        None, description="Persistent prediction cache counters (hits, misses, ...) when enabled"
+    )
+    prefilter: Optional[Dict[str, Any]] = Field(
+        None, description="Pre-filter lookups, hits per filter and loaded filters when enabled"
+    )
+    drain: Optional[Dict[str, Any]] = Field(
+        None, description="Drain state (serving, draining, stopping) and admission counters"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -29,3 +41,10 @@ class HealthResponse(BaseModel):
         }
     }
 
+
+class ReadinessResponse(BaseModel):
+    """Readiness check response schema."""
+
+    status: str = Field(..., description="'ready'")
+    model_loaded: bool = Field(..., description="Whether model is loaded")
+    drain: Dict[str, Any] = Field(..., description="Drain state and admission counters")
@@ -0,0 +1,59 @@
+"""
+Batch job schemas.
+"""
+
+from typing import Annotated, List, Literal, Optional
+
+from pydantic import BaseModel, Field, StringConstraints
+
+from .email import LONG_MESSAGE_MAX_CHARS
+
+# Messages above the /predict limit are scored like /predict/long
+JobMessage = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=1, max_length=LONG_MESSAGE_MAX_CHARS)
+]
+
+
+class JobCreate(BaseModel):
+    """Input schema for a batch classification job."""
+
+    messages: List[JobMessage] = Field(
+        ..., description="Email messages to classify", min_length=1
+    )
+    threshold: float = Field(
+        default=0.5,
+        description="Probability threshold to classify as spam (0.0-1.0)",
+        ge=0.0,
+        le=1.0,
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "messages": [
+                        "Free money! Click here now to claim your prize!",
+                        "Hi, can we move our meeting to Thursday?",
+                    ],
+                    "threshold": 0.5,
+                }
+            ]
+        }
+    }
+
+
+class JobStatusResponse(BaseModel):
+    """Progress of a batch job."""
+
+    job_id: str = Field(..., description="Job identifier")
+    status: Literal["queued", "running", "completed", "failed"] = Field(
+        ..., description="Job status"
+    )
+    total: int = Field(..., description="Number of messages in the job")
+    processed: int = Field(..., description="Messages classified so far")
+    progress: float = Field(..., description="Fraction of messages classified", ge=0.0, le=1.0)
+    spam_count: int = Field(..., description="Messages classified as spam so far")
+    threshold: float = Field(..., description="Probability threshold used")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    created_at: float = Field(..., description="Creation time (Unix timestamp)")
+    updated_at: float = Field(..., description="Last update time (Unix timestamp)")
@@ -0,0 +1,65 @@
+"""
+Memory introspection schemas.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ArtifactFootprint(BaseModel):
+    """Deep size of a loaded model artifact."""
+
+    type: str = Field(..., description="Artifact class")
+    bytes: int = Field(..., description="Bytes held by the artifact")
+    parts: Dict[str, int] = Field(
+        ..., description="Bytes per part (vocabulary_, idf_, fold_N.coef_, ...; rest in 'other')"
+    )
+
+
+class TracemallocStatus(BaseModel):
+    """State of on-demand allocation tracing."""
+
+    tracing: bool = Field(..., description="Whether tracemalloc is tracing allocations")
+    baseline: bool = Field(..., description="Whether a baseline snapshot was taken")
+    traced_bytes: int = Field(..., description="Memory currently traced")
+    traced_peak_bytes: int = Field(..., description="Peak traced memory since tracing started")
+
+
+class MemoryReport(BaseModel):
+    """Memory of the API worker answering the request."""
+
+    pid: int = Field(..., description="Worker process id (each worker reports its own memory)")
+    process: Dict[str, Optional[int]] = Field(
+        ..., description="RSS, peak RSS, anonymous/file-backed and shared/private/PSS bytes"
+    )
+    container: Dict[str, Optional[int]] = Field(
+        ..., description="cgroup memory limit and usage (None outside a container or unlimited)"
+    )
+    artifacts: Dict[str, Optional[ArtifactFootprint]] = Field(
+        ..., description="Deep size of each artifact of the primary model (None: native runtime)"
+    )
+    artifacts_total_bytes: int = Field(..., description="Bytes held by the primary model")
+    components: Dict[str, Dict[str, Any]] = Field(
+        ..., description="Bytes and occupancy of each cache and queue"
+    )
+    components_total_bytes: int = Field(..., description="Bytes held by caches and queues")
+    tracemalloc: TracemallocStatus = Field(..., description="Allocation tracing state")
+
+
+class AllocationDiff(BaseModel):
+    """Growth of one allocation site since the baseline."""
+
+    location: str = Field(..., description="file:line (innermost frame first)")
+    size_bytes: int = Field(..., description="Bytes allocated there now")
+    size_diff_bytes: int = Field(..., description="Bytes allocated since the baseline")
+    count: int = Field(..., description="Live allocations")
+    count_diff: int = Field(..., description="Allocations since the baseline")
+
+
+class MemoryDiff(TracemallocStatus):
+    """Top allocation sites by growth since the baseline snapshot."""
+
+    baseline_age_seconds: float = Field(..., description="Seconds since the baseline")
+    group_by: str = Field(..., description="Grouping of allocations ('lineno', 'filename', ...)")
+    top: List[AllocationDiff] = Field(..., description="Sites sorted by size difference")
@@ -2,7 +2,7 @@
 Model information schema.
 """
 
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from pydantic import BaseModel, Field
 
@@ -13,6 +13,12 @@ class ModelInfoResponse(BaseModel):
     loaded: bool = Field(..., description="Whether model is loaded")
     model_type: Optional[str] = Field(None, description="Model type")
     vectorizer_type: Optional[str] = Field(None, description="Vectorizer type")
+    model_version: Optional[str] = Field(
+        None, description="Model version (metadata value or artifact content hash)"
+    )
+    backend: Optional[Dict[str, Any]] = Field(
+        None, description="Inference runtime (name, version and options)"
+    )
     training_samples: Optional[int] = Field(None, description="Training samples count")
     accuracy: Optional[float] = Field(None, description="Model accuracy")
     precision: Optional[float] = Field(None, description="Model precision")
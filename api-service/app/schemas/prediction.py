@@ -21,6 +21,16 @@ class PredictionResponse(BaseModel):
     probability_ham: float = Field(
         ..., description="Probability of being ham (not spam)", ge=0.0, le=1.0
     )
+    near_duplicate: bool = Field(
+        False, description="Whether the result was reused from a near-duplicate message"
+    )
+    decided_by: str = Field(
+        "model",
+        description=(
+            "'model', or the pre-filter that decided the message: 'known_spam_body', "
+            "'known_spam_url' or 'allowlisted_template'"
+        ),
+    )
     model_info: dict = Field(..., description="Model information")
 
     model_config = {
@@ -32,6 +42,8 @@ class PredictionResponse(BaseModel):
                     "confidence": 0.95,
                     "probability_spam": 0.95,
                     "probability_ham": 0.05,
+                    "near_duplicate": False,
+                    "decided_by": "model",
                     "model_info": {
                         "type": "LogisticRegression",
                         "vectorizer": "TfidfVectorizer",
@@ -43,6 +55,8 @@ class PredictionResponse(BaseModel):
                     "confidence": 0.88,
                     "probability_spam": 0.12,
                     "probability_ham": 0.88,
+                    "near_duplicate": True,
+                    "decided_by": "model",
                     "model_info": {
                         "type": "LogisticRegression",
                         "vectorizer": "TfidfVectorizer",
@@ -52,3 +66,18 @@ class PredictionResponse(BaseModel):
         }
     }
 
+
+class TruncationInfo(BaseModel):
+    """Report of the token budget applied to a long message."""
+
+    policy: str = Field(..., description="Truncation policy ('head' or 'head_tail')")
+    truncated: bool = Field(..., description="Whether part of the message was skipped")
+    tokens_used: int = Field(..., description="Tokens counted for classification")
+    chars_total: int = Field(..., description="Message length in characters")
+    windows: int = Field(..., description="Vectorization windows processed")
+
+
+class LongPredictionResponse(PredictionResponse):
+    """Classification response for a long message."""
+
+    truncation: TruncationInfo = Field(..., description="Token budget report")
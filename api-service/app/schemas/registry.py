@@ -0,0 +1,49 @@
+"""
+Model registry schemas.
+"""
+
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class RegisteredModelStats(BaseModel):
+    """Routing role and live statistics of one model version."""
+
+    name: str = Field(..., description="Model name ('primary' for MODELS_DIR)")
+    role: Literal["primary", "ab", "shadow"] = Field(..., description="Routing role")
+    weight: float = Field(..., description="Share of traffic routed to an A/B variant")
+    models_dir: str = Field(..., description="Directory with the model artifacts")
+    loaded: bool = Field(..., description="Whether the model is loaded")
+    model_version: Optional[str] = Field(None, description="Model version")
+    latency_ms: Optional[Dict[str, float]] = Field(
+        None,
+        description=(
+            "mean/p50/p99 of recent latencies: per request for served models, per "
+            "message (batch time / batch size) for shadow models"
+        ),
+    )
+    served: Optional[int] = Field(None, description="Requests answered by this model")
+    scored: Optional[int] = Field(None, description="Requests scored in shadow")
+    agreement: Optional[float] = Field(
+        None, description="Fraction of shadow labels equal to the served prediction"
+    )
+    mean_abs_diff: Optional[float] = Field(
+        None, description="Mean |shadow - served| spam probability"
+    )
+
+
+class ShadowQueueStats(BaseModel):
+    """Counters of the background shadow scoring queue."""
+
+    scored: int = Field(..., description="Requests scored by the shadow worker")
+    shed: int = Field(..., description="Requests not scored because the queue was full")
+    queued: int = Field(..., description="Requests waiting to be scored")
+
+
+class ModelRegistryResponse(BaseModel):
+    """Routing policy and per-model statistics."""
+
+    policy: str = Field(..., description="'primary', 'ab', 'shadow' or 'ab+shadow'")
+    models: List[RegisteredModelStats] = Field(..., description="Registered model versions")
+    shadow_queue: ShadowQueueStats = Field(..., description="Shadow scoring queue counters")
@@ -0,0 +1,43 @@
+"""
+Inference scheduler schemas.
+"""
+
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class LaneStats(BaseModel):
+    """Counters and latencies of one scheduling lane."""
+
+    pool: str = Field(..., description="Pool of inference threads serving the lane")
+    requests: int = Field(..., description="Requests scheduled in this lane")
+    completed: int = Field(..., description="Requests answered")
+    failed: int = Field(..., description="Requests whose inference raised an error")
+    queued: int = Field(..., description="Requests waiting for an inference thread")
+    mean_cost: Optional[float] = Field(None, description="Mean estimated cost (characters)")
+    wait_ms: Optional[Dict[str, float]] = Field(
+        None, description="mean/p50/p99 of recent queue waits"
+    )
+    latency_ms: Optional[Dict[str, float]] = Field(
+        None, description="mean/p50/p99 of recent queue wait + inference times"
+    )
+
+
+class WorkerPoolStats(BaseModel):
+    """Inference threads of a pool."""
+
+    threads: int = Field(..., description="Inference threads")
+    running: int = Field(..., description="Requests being scored")
+
+
+class SchedulerStats(BaseModel):
+    """Scheduling parameters with per-lane counters."""
+
+    heavy_cost: int = Field(..., description="Characters from which a request is bulk")
+    aging_rate: float = Field(
+        ..., description="Characters of priority a queued request gains per second"
+    )
+    shared_pool: bool = Field(..., description="Whether both lanes share the same threads")
+    workers: Dict[str, WorkerPoolStats] = Field(..., description="Thread pools by name")
+    lanes: Dict[str, LaneStats] = Field(..., description="'interactive' and 'bulk' lanes")
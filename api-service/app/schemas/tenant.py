@@ -0,0 +1,44 @@
+"""
+Tenant schemas.
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class TenantInfo(BaseModel):
+    """A tenant's model directory and default threshold (API keys are not exposed)."""
+
+    tenant_id: str = Field(..., description="Tenant id")
+    models_dir: Optional[str] = Field(
+        None, description="Directory with the tenant's model artifacts (None: primary model)"
+    )
+    threshold: Optional[float] = Field(
+        None, description="Default threshold when the request does not set one"
+    )
+
+
+class ClassifierPoolStats(BaseModel):
+    """Occupancy and counters of the LRU pool of tenant classifiers."""
+
+    loaded: int = Field(..., description="Classifiers in the pool")
+    pinned: int = Field(..., description="Classifiers never evicted (primary model)")
+    loading: int = Field(..., description="Loads in progress")
+    bytes: int = Field(..., description="Artifact bytes of the pooled classifiers")
+    max_models: int = Field(..., description="Pool capacity in classifiers")
+    max_bytes: int = Field(..., description="Pool capacity in artifact bytes")
+    hits: int = Field(..., description="Requests served by an already loaded classifier")
+    misses: int = Field(..., description="Requests that waited for a load")
+    loads: int = Field(..., description="Classifiers loaded")
+    load_failures: int = Field(..., description="Failed loads")
+    evictions: int = Field(..., description="Classifiers evicted (least recently used)")
+    load_seconds: float = Field(..., description="Total time spent loading classifiers")
+    models_dirs: List[str] = Field(..., description="Pooled models directories, LRU first")
+
+
+class TenantsResponse(BaseModel):
+    """Configured tenants and pool statistics."""
+
+    tenants: List[TenantInfo] = Field(..., description="Configured tenants")
+    pool: ClassifierPoolStats = Field(..., description="Classifier pool statistics")
@@ -0,0 +1,58 @@
+"""
+Services - runtime components used by controllers and routers.
+"""
+
+from .audit import AuditLog, message_digest
+from .batcher import MicroBatcher
+from .capture import TrafficCaptureMiddleware, TrafficRecorder
+from .drain import DrainCoordinator, DrainMiddleware, drain_sink
+from .feedback import FeedbackLog, FeedbackStore, FeedbackTrainer
+from .jobs import JobRunner, JobStore
+from .memory import MemoryTracer, memory_report
+from .mime import MimeTextExtractor, html_to_text
+from .prediction_cache import PredictionCache
+from .registry import ModelRegistry
+from .scheduler import InferenceScheduler
+from .sink import BatchingSink, RotatingJsonlWriter
+from .tenants import ClassifierPool, TenantDirectory
+from .wire import (
+    MSGPACK,
+    UnsupportedMediaType,
+    columnar,
+    decode_request,
+    encode_response,
+    negotiate_media_type,
+)
+
+__all__ = [
+    "MimeTextExtractor",
+    "html_to_text",
+    "JobStore",
+    "JobRunner",
+    "TrafficCaptureMiddleware",
+    "TrafficRecorder",
+    "BatchingSink",
+    "RotatingJsonlWriter",
+    "AuditLog",
+    "message_digest",
+    "ModelRegistry",
+    "ClassifierPool",
+    "TenantDirectory",
+    "MicroBatcher",
+    "decode_request",
+    "encode_response",
+    "columnar",
+    "UnsupportedMediaType",
+    "negotiate_media_type",
+    "MSGPACK",
+    "PredictionCache",
+    "FeedbackStore",
+    "FeedbackLog",
+    "FeedbackTrainer",
+    "MemoryTracer",
+    "memory_report",
+    "InferenceScheduler",
+    "DrainCoordinator",
+    "DrainMiddleware",
+    "drain_sink",
+]
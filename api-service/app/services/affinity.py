@@ -0,0 +1,367 @@
+"""
+Cache-affinity routing across API instances.
+
+Each instance keeps its own prediction cache (the SQLite cache shared by
+the workers of a node, plus the near-duplicate index). Behind a
+round-robin load balancer a repeated message lands on a different
+instance most of the time, so every instance computes and stores it
+again and the cache hit rate falls as instances are added. The router
+consistent-hashes the whitespace-normalized message onto a ring of
+instances instead: a message is always scored by the same instance,
+adding or removing an instance only moves the keys it owns, and the
+instances' caches together behave like one cache of their combined size.
+
+Instances are polled on GET /ready; one that fails its checks, refuses a
+connection or hands a request back while draining (503 with Retry-After)
+leaves the ring until it is ready again, and its keys go to the next
+instances on the ring. Batches are split by owner, sent concurrently and
+merged in their original order.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import itertools
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+from .prediction_cache import normalize_message
+from .registry import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+# Headers of one connection, never forwarded (RFC 9110 section 7.6.1)
+HOP_BY_HOP = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+        "host",
+        "content-length",
+    }
+)
+
+
+class NoBackendAvailable(Exception):
+    """Raised when no instance could take a request."""
+
+
+class RouterOverloaded(NoBackendAvailable):
+    """Raised when the router's connection pool has no free connection."""
+
+
+def routing_key(message: str) -> bytes:
+    """Ring key of a message, normalized as the prediction cache keys it."""
+    return hashlib.blake2b(
+        normalize_message(message).encode("utf-8", errors="surrogatepass"), digest_size=16
+    ).digest()
+
+
+def _point(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring with virtual nodes."""
+
+    def __init__(self, nodes: Sequence[str], virtual_nodes: int = 160):
+        """Place every node virtual_nodes times on the ring.
+
+        Args:
+            nodes: Node names (instance base URLs)
+            virtual_nodes: Points per node; more points even out the key shares
+        """
+        points = sorted(
+            (_point(f"{node}#{i}".encode()), node)
+            for node in nodes
+            for i in range(virtual_nodes)
+        )
+        self.nodes = list(dict.fromkeys(nodes))
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def walk(self, key: bytes) -> Iterator[str]:
+        """Distinct nodes clockwise from the key: its owner first, then its fallbacks."""
+        if not self._points:
+            return
+        start = bisect.bisect(self._points, _point(key))
+        seen = set()
+        for i in range(len(self._points)):
+            node = self._owners[(start + i) % len(self._points)]
+            if node not in seen:
+                seen.add(node)
+                yield node
+                if len(seen) == len(self.nodes):
+                    return
+
+    def shares(self) -> Dict[str, float]:
+        """Fraction of the key space owned by each node."""
+        shares = dict.fromkeys(self.nodes, 0.0)
+        space = 2**64
+        for i, point in enumerate(self._points):
+            previous = self._points[i - 1] if i else self._points[-1] - space
+            shares[self._owners[i]] += (point - previous) / space
+        return {node: round(share, 4) for node, share in shares.items()}
+
+
+class Backend:
+    """An API instance with its health and statistics."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        # Optimistic until the first check, so the router serves right away
+        self.healthy = True
+        self.failed_checks = 0
+        self.requests = 0
+        self.errors = 0
+        self.ejections = 0
+        self.latency = LatencyWindow()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "requests": self.requests,
+            "errors": self.errors,
+            "ejections": self.ejections,
+            "latency_ms": self.latency.summary(),
+        }
+
+
+class Upstream:
+    """Response of an instance, with the body as received (still content-encoded)."""
+
+    def __init__(self, backend: Backend, response: httpx.Response, content: bytes):
+        self.backend = backend
+        self.status_code = response.status_code
+        self.headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in HOP_BY_HOP
+        ]
+        self.content = content
+
+
+class AffinityRouter:
+    """Route requests to API instances by message hash over pooled connections."""
+
+    def __init__(
+        self,
+        backends: Sequence[str],
+        virtual_nodes: int = 160,
+        health_interval: float = 2.0,
+        health_timeout: float = 1.0,
+        unhealthy_after: int = 2,
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        mounts: Optional[Dict[str, httpx.AsyncBaseTransport]] = None,
+    ):
+        """Initialize the router (connections are opened on first use).
+
+        Args:
+            backends: Base URLs of the API instances
+            virtual_nodes: Ring points per instance
+            health_interval: Seconds between GET /ready checks of every instance
+            health_timeout: Timeout of one check
+            unhealthy_after: Consecutive failed checks that take an instance out
+            timeout: Timeout of a forwarded request
+            max_connections: Connections open to all instances
+            max_keepalive: Idle connections kept for reuse
+            mounts: httpx transports by URL prefix (in-process instances in tests)
+        """
+        self.backends = {backend.url: backend for backend in map(Backend, backends)}
+        self.ring = HashRing(list(self.backends), virtual_nodes)
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self.unhealthy_after = unhealthy_after
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.mounts = mounts
+        self.failovers = 0
+        self.split_batches = 0
+        self.pool_timeouts = 0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._next = itertools.count()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                ),
+                mounts=self.mounts,
+            )
+        return self._client
+
+    def start(self) -> None:
+        """Start polling instance health (requires a running event loop)."""
+        if self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def close(self) -> None:
+        """Stop health checks and close pooled connections."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _health_loop(self) -> None:
+        while True:
+            await self.check_health()
+            await asyncio.sleep(self.health_interval)
+
+    async def check_health(self) -> None:
+        """Check GET /ready of every instance once."""
+
+        async def check(backend: Backend) -> None:
+            try:
+                response = await self.client.get(
+                    f"{backend.url}/ready", timeout=self.health_timeout
+                )
+                ready = response.status_code == 200
+            except httpx.HTTPError:
+                ready = False
+            self._observe(backend, ready)
+
+        await asyncio.gather(*(check(backend) for backend in self.backends.values()))
+
+    def _observe(self, backend: Backend, ready: bool) -> None:
+        if ready:
+            if not backend.healthy:
+                logger.info(f"Backend {backend.url} is ready, returning it to the ring")
+            backend.healthy = True
+            backend.failed_checks = 0
+            return
+        backend.failed_checks += 1
+        if backend.healthy and backend.failed_checks >= self.unhealthy_after:
+            self._eject(backend, "failed readiness checks")
+
+    def _eject(self, backend: Backend, reason: str) -> None:
+        if backend.healthy:
+            logger.warning(f"Backend {backend.url} removed from the ring: {reason}")
+            backend.healthy = False
+            backend.ejections += 1
+        backend.failed_checks = max(backend.failed_checks, self.unhealthy_after)
+
+    def candidates(self, key: Optional[bytes]) -> List[Backend]:
+        """Instances to try for a key, owner first (round-robin without a key).
+
+        Unhealthy instances are skipped; if none is healthy all are tried,
+        since a failed check is not proof the next request fails too.
+        """
+        if key is None:
+            urls = list(self.backends)
+            offset = next(self._next) % len(urls) if urls else 0
+            urls = urls[offset:] + urls[:offset]
+        else:
+            urls = list(self.ring.walk(key))
+        backends = [self.backends[url] for url in urls]
+        return [backend for backend in backends if backend.healthy] or backends
+
+    def owner(self, key: bytes) -> Optional[Backend]:
+        candidates = self.candidates(key)
+        return candidates[0] if candidates else None
+
+    async def forward(
+        self,
+        key: Optional[bytes],
+        method: str,
+        path: str,
+        query: str = "",
+        headers: Sequence[Tuple[str, str]] = (),
+        body: bytes = b"",
+    ) -> Upstream:
+        """Send a request to the instance owning key, failing over along the ring.
+
+        Only failures where the instance cannot have processed the request
+        move it to the next instance: a refused or timed-out connection, or
+        a 503 with Retry-After from an instance that is draining. Waiting too
+        long for a connection of the router's own pool ejects no instance.
+
+        Raises:
+            RouterOverloaded: If the router's connection pool is exhausted
+            NoBackendAvailable: If every candidate failed that way
+            httpx.HTTPError: If the request failed after it was sent
+        """
+        headers = [(name, value) for name, value in headers if name.lower() not in HOP_BY_HOP]
+        for attempt, backend in enumerate(self.candidates(key)):
+            if attempt:
+                self.failovers += 1
+            backend.requests += 1
+            started = time.perf_counter()
+            request = self.client.build_request(
+                method,
+                f"{backend.url}{path}",
+                params=httpx.QueryParams(query),
+                headers=headers,
+                content=body,
+            )
+            try:
+                response = await self.client.send(request, stream=True)
+            except httpx.PoolTimeout:
+                # The router's own pool is saturated: the instance is not at fault,
+                # and failing over would only spread the overload along the ring.
+                self.pool_timeouts += 1
+                raise RouterOverloaded("No connection to the API instances available")
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                backend.errors += 1
+                self._eject(backend, f"{type(e).__name__}: {e}")
+                continue
+            except httpx.HTTPError:
+                backend.errors += 1
+                raise
+            try:
+                content = b"".join([chunk async for chunk in response.aiter_raw()])
+            except httpx.HTTPError:
+                backend.errors += 1
+                raise
+            finally:
+                await response.aclose()
+            if response.status_code == 503 and "retry-after" in response.headers:
+                backend.errors += 1
+                self._eject(backend, "draining")
+                continue
+            backend.latency.add((time.perf_counter() - started) * 1000)
+            return Upstream(backend, response, content)
+        raise NoBackendAvailable("No API instance available")
+
+    def split(self, messages: Sequence[Any]) -> Dict[str, List[int]]:
+        """Indices of a batch's messages grouped by owning instance."""
+        groups: Dict[str, List[int]] = {}
+        for index, message in enumerate(messages):
+            owner = self.owner(routing_key(message))
+            if owner is None:
+                raise NoBackendAvailable("No API instance configured")
+            groups.setdefault(owner.url, []).append(index)
+        if len(groups) > 1:
+            self.split_batches += 1
+        return groups
+
+    def stats(self) -> Dict[str, Any]:
+        shares = self.ring.shares()
+        return {
+            "backends": {
+                url: {**backend.stats(), "ring_share": shares.get(url, 0.0)}
+                for url, backend in self.backends.items()
+            },
+            "healthy": sum(backend.healthy for backend in self.backends.values()),
+            "failovers": self.failovers,
+            "split_batches": self.split_batches,
+            "pool_timeouts": self.pool_timeouts,
+        }
@@ -0,0 +1,160 @@
+"""
+Audit log of classification decisions.
+
+Every decision (message hash, probabilities, threshold, model version,
+latency and the tier that decided it) is enqueued on the request path and written in batches by a
+background sink to rotating JSONL files or a SQLite database, one flush or
+transaction per batch. Message text is never stored, only its SHA-256.
+"""
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .sink import BatchingSink, RotatingJsonlWriter
+
+AUDIT_BACKENDS = ("jsonl", "sqlite")
+
+AUDIT_COLUMNS = (
+    "ts", "endpoint", "message_sha256", "prediction", "probability_spam", "probability_ham",
+    "threshold", "model_version", "latency_ms", "near_duplicate", "decided_by",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_log (
+    ts REAL NOT NULL,
+    endpoint TEXT NOT NULL,
+    message_sha256 TEXT NOT NULL,
+    prediction TEXT NOT NULL,
+    probability_spam REAL NOT NULL,
+    probability_ham REAL NOT NULL,
+    threshold REAL NOT NULL,
+    model_version TEXT,
+    latency_ms REAL NOT NULL,
+    near_duplicate INTEGER,
+    decided_by TEXT
+);
+CREATE INDEX IF NOT EXISTS audit_log_ts ON audit_log (ts);
+CREATE INDEX IF NOT EXISTS audit_log_message ON audit_log (message_sha256);
+"""
+
+
+def message_digest(message: str) -> str:
+    """SHA-256 hex digest identifying a message without storing its text."""
+    return hashlib.sha256(message.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+class SqliteAuditWriter:
+    """Append audit records to a SQLite table, one transaction per batch."""
+
+    def __init__(self, path: str):
+        """Initialize the writer (the connection is opened by the writer thread).
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self._conn = None
+
+    def open(self) -> None:
+        """Create the database and schema if needed."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # Databases created before decided_by was recorded gain the column
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(audit_log)")}
+        if "decided_by" not in existing:
+            self._conn.execute("ALTER TABLE audit_log ADD COLUMN decided_by TEXT")
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Insert a batch of records in a single transaction."""
+        if self._conn is None:
+            self.open()
+        self._conn.execute("BEGIN")
+        self._conn.executemany(
+            f"INSERT INTO audit_log ({', '.join(AUDIT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in AUDIT_COLUMNS)})",
+            ([record.get(column) for column in AUDIT_COLUMNS] for record in records),
+        )
+        self._conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class AuditLog(BatchingSink):
+    """Non-blocking audit log of classification decisions."""
+
+    def __init__(
+        self,
+        path: str,
+        backend: str = "jsonl",
+        max_bytes: int = 100 * 1024 * 1024,
+        backups: int = 10,
+        queue_size: int = 50000,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        policy: str = "drop",
+        block_timeout: float = 0.1,
+    ):
+        """Initialize the audit log.
+
+        Args:
+            path: JSONL file (rotated by size) or SQLite database
+            backend: 'jsonl' or 'sqlite'
+            max_bytes: Size at which the JSONL file is rotated
+            backups: Number of rotated JSONL files kept
+            queue_size: Records buffered before the full-queue policy applies
+            batch_size: Records written per flush/transaction
+            flush_interval: Maximum seconds a record waits for its batch
+            policy: 'drop' or 'block' when the queue is full
+            block_timeout: Longest wait of a request under the 'block' policy
+        """
+        if backend not in AUDIT_BACKENDS:
+            raise ValueError(f"backend must be one of {AUDIT_BACKENDS}")
+        writer = (
+            SqliteAuditWriter(path)
+            if backend == "sqlite"
+            else RotatingJsonlWriter(path, max_bytes=max_bytes, backups=backups)
+        )
+        super().__init__(
+            writer,
+            queue_size=queue_size,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            policy=policy,
+            block_timeout=block_timeout,
+            name="audit-log",
+        )
+
+    def log(
+        self,
+        endpoint: str,
+        message: str,
+        threshold: float,
+        result: Dict[str, Any],
+        latency_ms: float,
+    ) -> bool:
+        """Enqueue the audit record of one classification result."""
+        return self.submit(
+            {
+                "ts": time.time(),
+                "endpoint": endpoint,
+                "message_sha256": message_digest(message),
+                "prediction": result["prediction"],
+                "probability_spam": result["probability_spam"],
+                "probability_ham": result["probability_ham"],
+                "threshold": threshold,
+                "model_version": (result.get("model_info") or {}).get("version"),
+                "latency_ms": round(latency_ms, 3),
+                "near_duplicate": result.get("near_duplicate"),
+                "decided_by": result.get("decided_by"),
+            }
+        )
@@ -0,0 +1,139 @@
+"""
+Adaptive micro-batching of classification requests.
+
+Requests from any number of connections are queued per classifier and
+scored together with one vectorized call on a single inference thread.
+A batch is dispatched when it reaches max_batch_size or its oldest request
+has waited max_wait seconds; while a batch is being scored, new requests
+accumulate and go out as the next batch, so batches grow with load
+instead of queuing many small ones.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class MicroBatcher:
+    """Groups concurrent classification requests into vectorized batches."""
+
+    def __init__(self, max_batch_size: int = 64, max_wait: float = 0.002):
+        """Initialize the batcher.
+
+        Args:
+            max_batch_size: Requests scored per vectorized call
+            max_wait: Longest time (s) a request waits for its batch to fill
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.requests = 0
+        self.scored = 0
+        self.batches = 0
+        self.batch_seconds = 0.0
+        # id(classifier) -> (classifier, [(message, threshold, future)], ready)
+        self._pending: Dict[int, Tuple[Any, List[Tuple[str, float, asyncio.Future]], bool]] = {}
+        self._running = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def classify(self, classifier, message: str, threshold: float) -> Dict[str, Any]:
+        """Classify one message as part of the next batch of its classifier."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = id(classifier)
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = (classifier, [], False)
+            self._pending[key] = entry
+            loop.call_later(self.max_wait, self._mark_ready, key, entry[1])
+        entry[1].append((message, threshold, future))
+        self.requests += 1
+        if len(entry[1]) >= self.max_batch_size:
+            self._mark_ready(key, entry[1])
+        return await future
+
+    def _mark_ready(self, key: int, items: List) -> None:
+        entry = self._pending.get(key)
+        # The timer of an already dispatched batch must not affect the next one.
+        if entry is None or entry[1] is not items:
+            return
+        self._pending[key] = (entry[0], entry[1], True)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        if self._running:
+            return
+        key = next((key for key, entry in self._pending.items() if entry[2]), None)
+        if key is None:
+            return
+        classifier, items, _ = self._pending.pop(key)
+        batch, rest = items[: self.max_batch_size], items[self.max_batch_size :]
+        if rest:
+            self._pending[key] = (classifier, rest, True)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="micro-batcher")
+        self._running = True
+        start = time.perf_counter()
+        task = asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            classifier.classify_batch,
+            [message for message, _, _ in batch],
+            [threshold for _, threshold, _ in batch],
+        )
+        task.add_done_callback(lambda done: self._complete(done, batch, start))
+
+    def _complete(self, done: asyncio.Future, batch: List, start: float) -> None:
+        self._running = False
+        self.batches += 1
+        self.scored += len(batch)
+        self.batch_seconds += time.perf_counter() - start
+        error = asyncio.CancelledError() if done.cancelled() else done.exception()
+        for index, (_, _, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result()[index])
+        # Requests that arrived while this batch was scored have waited long enough.
+        for key, (classifier, items, _) in list(self._pending.items()):
+            self._pending[key] = (classifier, items, True)
+        self._dispatch()
+
+    async def drain(self, timeout: float) -> Dict[str, int]:
+        """Score pending requests now, then cancel what is still pending at timeout.
+
+        Returns:
+            Requests pending when the drain started, and those cancelled at timeout
+        """
+        pending = sum(len(items) for _, items, _ in self._pending.values())
+        for key, (classifier, items, _) in list(self._pending.items()):
+            self._pending[key] = (classifier, items, True)
+        self._dispatch()
+        deadline = time.monotonic() + timeout
+        while (self._pending or self._running) and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        cancelled = 0
+        for _, items, _ in self._pending.values():
+            cancelled += sum(future.cancel() for _, _, future in items)
+        self._pending.clear()
+        return {"queued": pending, "cancelled": cancelled}
+
+    def close(self) -> None:
+        """Stop the inference thread (a later batch starts a new one)."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Request and batch counters."""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": round(self.scored / self.batches, 2) if self.batches else None,
+            "mean_batch_ms": (
+                round(self.batch_seconds * 1000 / self.batches, 3) if self.batches else None
+            ),
+            "pending": sum(len(items) for _, items, _ in self._pending.values()),
+        }
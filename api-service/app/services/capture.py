@@ -0,0 +1,194 @@
+"""
+Sampled traffic capture for capacity tests.
+
+An ASGI middleware records a sample of prediction requests (body, timing,
+status and the prediction returned) and hands them to a recorder. The
+recorder only enqueues on the request path; a background batching sink
+writes the records to size-rotated JSONL files. When the queue is full
+records are dropped and counted rather than slowing requests down.
+"""
+
+import json
+import random
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from .sink import BatchingSink, RotatingJsonlWriter
+
+REDACTION_MODES = ("none", "pii", "full")
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_URL_RE = re.compile(r"(?:https?://|www\.)\S+")
+_DIGITS_RE = re.compile(r"\d")
+_WORD_RE = re.compile(r"\w")
+
+
+def redact(text: str, mode: str) -> str:
+    """Redact message text.
+
+    'pii' masks email addresses, URLs and digits; 'full' replaces every word
+    character, keeping length and whitespace so payload sizes are preserved.
+    """
+    if mode == "pii":
+        text = _EMAIL_RE.sub("user@example.com", text)
+        text = _URL_RE.sub("http://example.com/", text)
+        return _DIGITS_RE.sub("0", text)
+    if mode == "full":
+        return _WORD_RE.sub("x", text)
+    return text
+
+
+class TrafficRecorder(BatchingSink):
+    """Non-blocking writer of capture records to rotating JSONL files."""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 50 * 1024 * 1024,
+        backups: int = 5,
+        queue_size: int = 10000,
+        flush_interval: float = 1.0,
+    ):
+        """Initialize the recorder.
+
+        Args:
+            path: Active JSONL file; rotated files get .1, .2, ... suffixes
+            max_bytes: Size at which the active file is rotated
+            backups: Number of rotated files kept
+            queue_size: Records buffered before new ones are dropped
+            flush_interval: Seconds between flushes of the active file
+        """
+        super().__init__(
+            RotatingJsonlWriter(path, max_bytes=max_bytes, backups=backups),
+            queue_size=queue_size,
+            flush_interval=flush_interval,
+            policy="drop",
+            name="traffic-capture",
+        )
+        self.path = Path(path)
+
+    def record(self, entry: Dict[str, Any]) -> bool:
+        """Enqueue a record; returns False (and counts a drop) if the queue is full."""
+        return self.submit(entry)
+
+
+class TrafficCaptureMiddleware:
+    """ASGI middleware recording sampled prediction requests."""
+
+    def __init__(
+        self,
+        app,
+        recorder: TrafficRecorder,
+        sample_rate: float = 0.01,
+        redaction: str = "pii",
+        path_prefix: str = "/api/v1/predict",
+        max_body_bytes: int = 1024 * 1024,
+    ):
+        """Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            recorder: Destination of capture records
+            sample_rate: Fraction of matching requests recorded (0.0-1.0)
+            redaction: Message redaction mode ('none', 'pii' or 'full')
+            path_prefix: Only requests under this path are sampled
+            max_body_bytes: Larger request bodies are recorded without content
+        """
+        if redaction not in REDACTION_MODES:
+            raise ValueError(f"redaction must be one of {REDACTION_MODES}")
+        self.app = app
+        self.recorder = recorder
+        self.sample_rate = sample_rate
+        self.redaction = redaction
+        self.path_prefix = path_prefix
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not scope["path"].startswith(self.path_prefix)
+            or random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body = bytearray()
+        body_size = 0
+        response = bytearray()
+        state: Dict[str, Any] = {"status": None, "json": False}
+
+        async def capture_receive():
+            nonlocal body_size
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                body_size += len(chunk)
+                if body_size <= self.max_body_bytes:
+                    body.extend(chunk)
+            return message
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                headers = dict(message.get("headers", []))
+                state["json"] = headers.get(b"content-type", b"").startswith(b"application/json")
+            elif message["type"] == "http.response.body" and state["json"]:
+                if len(response) < 64 * 1024:
+                    response.extend(message.get("body", b""))
+            await send(message)
+
+        started = time.time()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, capture_receive, capture_send)
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            self.recorder.record(
+                self._entry(scope, started, latency_ms, body, body_size, state, response)
+            )
+
+    def _entry(self, scope, started, latency_ms, body, body_size, state, response) -> Dict[str, Any]:
+        headers = dict(scope.get("headers", []))
+        entry: Dict[str, Any] = {
+            "ts": round(started, 6),
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": scope.get("query_string", b"").decode("latin-1"),
+            "content_type": headers.get(b"content-type", b"").decode("latin-1"),
+            "body_bytes": body_size,
+            "status": state["status"],
+            "latency_ms": round(latency_ms, 3),
+            "redaction": self.redaction,
+        }
+
+        if body_size <= self.max_body_bytes:
+            entry["body"] = self._redact_body(bytes(body), entry["content_type"])
+
+        try:
+            result = json.loads(bytes(response)) if response else None
+        except ValueError:
+            result = None
+        if isinstance(result, dict) and "prediction" in result:
+            entry["response"] = {
+                "prediction": result.get("prediction"),
+                "probability_spam": result.get("probability_spam"),
+                "model_version": (result.get("model_info") or {}).get("version"),
+            }
+        return entry
+
+    def _redact_body(self, body: bytes, content_type: str) -> str:
+        text = body.decode("utf-8", errors="replace")
+        if self.redaction == "none":
+            return text
+        if content_type.startswith("application/json"):
+            try:
+                data = json.loads(text)
+            except ValueError:
+                return redact(text, self.redaction)
+            if isinstance(data, dict) and isinstance(data.get("message"), str):
+                data["message"] = redact(data["message"], self.redaction)
+                return json.dumps(data, ensure_ascii=False)
+        return redact(text, self.redaction)
@@ -0,0 +1,265 @@
+"""
+Graceful drain of a worker on shutdown.
+
+During a rolling deploy every worker receives SIGTERM while clients are
+still sending it traffic. Cutting that traffic off makes clients retry
+against the remaining instances exactly when capacity is reduced, so the
+worker drains in stages instead:
+
+1. draining: readiness (GET /ready) fails, so the load balancer stops
+   routing new requests here; requests keep being served for
+   readiness_delay seconds while that change propagates.
+2. stopping: new inference work is handed back (503 with Retry-After and
+   Connection: close; WebSocket handshakes are refused with 1013) and open
+   WebSocket channels stop reading, answer what they read and close.
+3. shutdown: once the admitted work has finished (or grace_period has
+   passed) the server stops accepting connections; queued and batched work
+   is finished within what is left of grace_period, sinks and caches are
+   flushed, executors and memory maps released, and a report of what was
+   drained is logged.
+"""
+
+import asyncio
+import json
+import logging
+import signal
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVING = "serving"
+DRAINING = "draining"
+STOPPING = "stopping"
+
+# Seconds a client handed back a request should wait before retrying
+RETRY_AFTER_SECONDS = 1
+
+# Paths admitting inference work: (ASGI scope type, method or None, path prefix)
+INFERENCE_ROUTES = (
+    ("http", "POST", "/api/v1/predict"),
+    ("http", "POST", "/api/v1/jobs"),
+    ("http", "POST", "/api/v1/feedback"),
+    ("websocket", None, "/api/v1/ws"),
+)
+
+
+class DrainCoordinator:
+    """Readiness, admission of inference work and the drain report of a worker."""
+
+    def __init__(self, grace_period: float = 30.0, readiness_delay: float = 5.0):
+        """Initialize the coordinator.
+
+        Args:
+            grace_period: Seconds allowed to finish queued and batched work
+            readiness_delay: Seconds between failing readiness and refusing work
+        """
+        self.grace_period = grace_period
+        self.readiness_delay = readiness_delay
+        self._on_stop: List[Callable[[], None]] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Serve again with fresh counters (on startup)."""
+        self.state = SERVING
+        self.inflight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.report: Dict[str, Any] = {}
+        self._began_at: Optional[float] = None
+        self._deadline: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the load balancer should route traffic here."""
+        return self.state == SERVING
+
+    @property
+    def admitting(self) -> bool:
+        """Whether new inference work is accepted."""
+        return self.state != STOPPING
+
+    def begin(self) -> None:
+        """Fail readiness (requests are still served)."""
+        if self.state == SERVING:
+            self.state = DRAINING
+            self._began_at = time.monotonic()
+            logger.info(f"Draining: readiness fails, work stops in {self.readiness_delay}s")
+
+    def stop_admission(self) -> None:
+        """Refuse new inference work and ask open channels to finish."""
+        self.begin()
+        if self.state == STOPPING:
+            return
+        self.state = STOPPING
+        self._deadline = time.monotonic() + self.grace_period
+        logger.info(f"Draining: new inference work refused ({self.inflight} in flight)")
+        for callback in list(self._on_stop):
+            callback()
+
+    def on_stop(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Call callback when admission stops; returns a function unregistering it."""
+        if not self.admitting:
+            callback()
+            return lambda: None
+        self._on_stop.append(callback)
+        return lambda: self._on_stop.remove(callback) if callback in self._on_stop else None
+
+    def remaining(self) -> float:
+        """Seconds left of the grace period (the full period before admission stops)."""
+        if self._deadline is None:
+            return self.grace_period
+        return max(0.0, self._deadline - time.monotonic())
+
+    def admit(self) -> bool:
+        """Count a new unit of inference work; False if it must be handed back."""
+        if not self.admitting:
+            self.rejected += 1
+            return False
+        self.inflight += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        """Count a unit of admitted work as finished."""
+        self.inflight -= 1
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """Wait until no admitted work is in flight; False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self.inflight > 0 and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        return self.inflight == 0
+
+    def install_signal_handler(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """Run the drain stages on SIGTERM before the server's own handler.
+
+        The server (uvicorn) stops accepting connections and shuts open ones
+        down when its handler runs, so it is only called once readiness has
+        failed for readiness_delay seconds and the work admitted until then
+        has finished (or grace_period has passed). A second SIGTERM skips
+        the readiness delay.
+
+        Returns:
+            False if the handler cannot be installed (not in the main thread,
+            or no server handler to chain to)
+        """
+        try:
+            original = signal.getsignal(signal.SIGTERM)
+        except ValueError:
+            return False
+        if not callable(original):
+            return False
+
+        async def handoff(sig, frame, delay: float) -> None:
+            self.begin()
+            await asyncio.sleep(delay)
+            self.stop_admission()
+            await self.wait_idle(self.remaining())
+            original(sig, frame)
+
+        def on_signal(sig, frame) -> None:
+            delay = self.readiness_delay if self.state == SERVING else 0.0
+            loop.call_soon_threadsafe(lambda: loop.create_task(handoff(sig, frame, delay)))
+
+        try:
+            signal.signal(signal.SIGTERM, on_signal)
+        except ValueError:
+            return False
+        return True
+
+    def record(self, name: str, entry: Dict[str, Any]) -> None:
+        """Add a component to the drain report."""
+        self.report[name] = entry
+
+    def log_report(self) -> Dict[str, Any]:
+        """Log and return what was drained."""
+        report = {
+            "seconds": round(time.monotonic() - self._began_at, 3) if self._began_at else 0.0,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "inflight_left": self.inflight,
+            **self.report,
+        }
+        logger.info(f"Drain report: {json.dumps(report, default=str)}")
+        return report
+
+    def stats(self) -> Dict[str, Any]:
+        """State and admission counters."""
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "inflight": self.inflight,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+def drain_sink(sink, timeout: float) -> Dict[str, int]:
+    """Stop a BatchingSink, writing its queue; returns what was flushed and lost."""
+    before = sink.stats()
+    sink.stop(timeout)
+    after = sink.stats()
+    return {
+        "queued": before["queued"],
+        "written": after["written"] - before["written"],
+        "dropped": after["dropped"] - before["dropped"],
+        "left": after["queued"],
+    }
+
+
+class DrainMiddleware:
+    """ASGI middleware counting inference work and handing it back while stopping."""
+
+    def __init__(self, app, coordinator: DrainCoordinator, routes=INFERENCE_ROUTES):
+        """Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            coordinator: Drain state of the worker
+            routes: (scope type, method or None, path prefix) of inference work
+        """
+        self.app = app
+        self.coordinator = coordinator
+        self.routes = routes
+
+    def _is_inference(self, scope) -> bool:
+        return any(
+            scope["type"] == kind
+            and (method is None or scope.get("method") == method)
+            and scope["path"].startswith(prefix)
+            for kind, method, prefix in self.routes
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket") or not self._is_inference(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self.coordinator.admit():
+            await self._hand_back(scope, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.coordinator.release()
+
+    @staticmethod
+    async def _hand_back(scope, send) -> None:
+        if scope["type"] == "websocket":
+            # Rejects the handshake; 1013 = try again later
+            await send({"type": "websocket.close", "code": 1013, "reason": "Draining"})
+            return
+        body = json.dumps({"detail": "Server is shutting down. Retry the request."}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(RETRY_AFTER_SECONDS).encode()),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,399 @@
+"""
+User feedback and background incremental model updates.
+
+POST /feedback only enqueues the labelled message; a background sink
+appends batches to a SQLite store. A trainer thread periodically checks
+for new feedback and runs run_update() in a separate process: the served
+model is updated with partial_fit on the new rows, compared with the
+current best_model_temp.joblib on a holdout set (every Nth feedback row,
+never trained on, plus an optional labelled CSV) and atomically published
+only if it does not lose accuracy. Every API process then swaps the new
+model in when the artifact changes on disk, outside the request path. A
+file lock next to the database lets a single worker train at a time.
+"""
+
+import fcntl
+import logging
+import multiprocessing
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .sink import BatchingSink
+
+logger = logging.getLogger(__name__)
+
+FEEDBACK_LABELS = ("ham", "spam")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    message TEXT NOT NULL,
+    label TEXT NOT NULL,
+    model_version TEXT
+);
+CREATE TABLE IF NOT EXISTS feedback_state (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class FeedbackStore:
+    """SQLite store of labelled feedback and of the rows already trained on."""
+
+    def __init__(self, path: str, holdout_every: int = 5):
+        """Initialize the store (the database is created by open()).
+
+        Args:
+            path: SQLite database file
+            holdout_every: Every Nth row is kept out of training for the holdout check
+        """
+        self.path = Path(path)
+        self.holdout_every = holdout_every
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def open(self) -> None:
+        """Create the database and schema if needed."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Append a batch of feedback in a single transaction."""
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT INTO feedback (ts, message, label, model_version) VALUES (?, ?, ?, ?)",
+                (
+                    (record["ts"], record["message"], record["label"], record.get("model_version"))
+                    for record in records
+                ),
+            )
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Nothing to release: connections are opened per operation."""
+
+    @staticmethod
+    def _trained_through(conn: sqlite3.Connection) -> int:
+        row = conn.execute(
+            "SELECT value FROM feedback_state WHERE key = 'trained_through'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    def trained_through(self) -> int:
+        """Id of the last feedback row included in a published model."""
+        with closing(self._connect()) as conn:
+            return self._trained_through(conn)
+
+    def mark_trained(self, last_id: int) -> None:
+        """Record that rows up to last_id are part of the published model."""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO feedback_state (key, value) VALUES ('trained_through', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (last_id,),
+            )
+
+    def pending(self, limit: int) -> List[Tuple[int, str, str]]:
+        """Oldest untrained training rows (id, message, label), oldest first.
+
+        Updates advance trained_through to the last row they used, so a
+        backlog larger than limit drains over successive updates instead of
+        its older rows being skipped.
+        """
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT id, message, label FROM feedback WHERE id > ? AND id % ? != 0 "
+                "ORDER BY id ASC LIMIT ?",
+                (self._trained_through(conn), self.holdout_every, limit),
+            ).fetchall()
+
+    def holdout(self, limit: int) -> List[Tuple[int, str, str]]:
+        """Most recent holdout rows (id, message, label)."""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT id, message, label FROM feedback WHERE id % ? = 0 "
+                "ORDER BY id DESC LIMIT ?",
+                (self.holdout_every, limit),
+            ).fetchall()
+
+    def stats(self) -> Dict[str, int]:
+        """Stored, pending (untrained) and holdout row counts."""
+        with closing(self._connect()) as conn:
+            trained_through = self._trained_through(conn)
+            total, pending, holdout = conn.execute(
+                "SELECT COUNT(*), "
+                "COALESCE(SUM(id > ? AND id % ? != 0), 0), "
+                "COALESCE(SUM(id % ? = 0), 0) FROM feedback",
+                (trained_through, self.holdout_every, self.holdout_every),
+            ).fetchone()
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM feedback").fetchone()[0]
+        return {
+            "stored": total,
+            "pending": pending,
+            "holdout": holdout,
+            "last_id": last_id,
+            "trained_through": trained_through,
+        }
+
+
+class FeedbackLog(BatchingSink):
+    """Non-blocking writer of user feedback."""
+
+    def __init__(self, store: FeedbackStore, queue_size: int = 10000, flush_interval: float = 1.0):
+        """Initialize the feedback log.
+
+        Args:
+            store: Destination store
+            queue_size: Feedback buffered before new records are dropped
+            flush_interval: Maximum seconds a record waits for its batch
+        """
+        super().__init__(
+            store, queue_size=queue_size, batch_size=500, flush_interval=flush_interval,
+            name="feedback-log",
+        )
+
+    def record(self, message: str, label: str, model_version: Optional[str] = None) -> bool:
+        """Enqueue one labelled message; returns False if the queue was full."""
+        return self.submit(
+            {"ts": time.time(), "message": message, "label": label, "model_version": model_version}
+        )
+
+
+def run_update(
+    models_dir: str,
+    db_path: str,
+    holdout_every: int = 5,
+    max_rows: int = 5000,
+    holdout_path: Optional[str] = None,
+    epochs: int = 5,
+    alpha: float = 1e-4,
+    eta0: float = 0.01,
+    max_regression: float = 0.0,
+) -> Dict[str, Any]:
+    """Train, check and publish one incremental update (runs in a worker process).
+
+    Returns:
+        Report with the status ('published', 'rejected' or 'skipped'),
+        row counts and holdout accuracy of the current and candidate models
+    """
+    import joblib
+
+    from ..models.backends import MODEL_FILE, find_vectorizer
+    from ..models.benchmark import load_corpus
+    from ..models.incremental import accuracy, partial_fit_model, publish_model
+
+    started = time.perf_counter()
+    store = FeedbackStore(db_path, holdout_every=holdout_every)
+    rows = store.pending(max_rows)
+    report: Dict[str, Any] = {"trained_rows": len(rows), "started_at": time.time()}
+    if not rows:
+        return {**report, "status": "skipped", "reason": "no new feedback"}
+
+    holdout = [(message, label) for _, message, label in store.holdout(max_rows)]
+    if holdout_path:
+        messages, labels = load_corpus(holdout_path, limit=max_rows)
+        holdout.extend(zip(messages, labels))
+    report["holdout_rows"] = len(holdout)
+    if not holdout:
+        return {**report, "status": "skipped", "reason": "no holdout rows yet"}
+
+    models_dir = Path(models_dir)
+    model = joblib.load(models_dir / MODEL_FILE)
+    vectorizer = joblib.load(find_vectorizer(models_dir))
+    encoder_path = models_dir / "label_encoder.joblib"
+    encoder = joblib.load(encoder_path) if encoder_path.exists() else None
+    metadata_path = models_dir / "metadata.joblib"
+    metadata = joblib.load(metadata_path) if metadata_path.exists() else {}
+
+    def encode(labels):
+        return encoder.transform(list(labels)) if encoder is not None else list(labels)
+
+    X_train = vectorizer.transform([message for _, message, _ in rows])
+    y_train = encode(label for _, _, label in rows)
+    X_holdout = vectorizer.transform([message for message, _ in holdout])
+    y_holdout = encode(label for _, label in holdout)
+
+    candidate = partial_fit_model(model, X_train, y_train, epochs=epochs, alpha=alpha, eta0=eta0)
+    report["current_accuracy"] = accuracy(model, X_holdout, y_holdout)
+    report["candidate_accuracy"] = accuracy(candidate, X_holdout, y_holdout)
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    if report["candidate_accuracy"] < report["current_accuracy"] - max_regression:
+        return {**report, "status": "rejected", "reason": "holdout accuracy regression"}
+
+    last_id = rows[-1][0]
+    updates = metadata.get("feedback_updates", 0) + 1
+    metadata = {
+        **metadata,
+        "feedback_updates": updates,
+        "feedback_trained_through": last_id,
+        "feedback_updated_date": datetime.now().isoformat(),
+    }
+    if metadata.get("model_version"):
+        # Keep versions distinct so caches keyed by version are not reused
+        base_version = str(metadata["model_version"]).split("+fb")[0]
+        metadata["model_version"] = f"{base_version}+fb{updates}"
+    publish_model(models_dir, candidate, metadata)
+    store.mark_trained(last_id)
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    return {**report, "status": "published", "trained_through": last_id}
+
+
+class FeedbackTrainer:
+    """Background thread scheduling incremental updates and swapping in published models."""
+
+    def __init__(
+        self,
+        store: FeedbackStore,
+        classifier,
+        interval: float = 300.0,
+        min_new: int = 20,
+        max_rows: int = 5000,
+        holdout_path: Optional[str] = None,
+        epochs: int = 5,
+        alpha: float = 1e-4,
+        eta0: float = 0.01,
+        max_regression: float = 0.0,
+    ):
+        """Initialize the trainer.
+
+        Args:
+            store: Feedback store
+            classifier: Served SpamClassifier (scikit-learn backend)
+            interval: Seconds between checks for new feedback
+            min_new: Untrained rows needed to attempt an update
+            max_rows: Oldest pending feedback rows used per update
+            holdout_path: Optional labelled CSV added to the holdout check
+            epochs: partial_fit passes over the new rows
+            alpha: L2 regularization of the SGD updates
+            eta0: Constant SGD learning rate
+            max_regression: Holdout accuracy a candidate may lose and still be published
+        """
+        self.store = store
+        self.classifier = classifier
+        self.interval = interval
+        self.min_new = min_new
+        self.update_kwargs = {
+            "holdout_every": store.holdout_every,
+            "max_rows": max_rows,
+            "holdout_path": holdout_path,
+            "epochs": epochs,
+            "alpha": alpha,
+            "eta0": eta0,
+            "max_regression": max_regression,
+        }
+        self.updates_published = 0
+        self.updates_rejected = 0
+        self.models_swapped = 0
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._attempted_last_id = 0
+        self._model_stamp: Optional[Tuple[int, int]] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def model_path(self) -> Path:
+        from ..models.backends import MODEL_FILE
+
+        return Path(self.classifier.models_dir) / MODEL_FILE
+
+    def _stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.model_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def start(self) -> None:
+        """Start the scheduling thread."""
+        self._model_stamp = self._stamp()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="feedback-trainer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the thread and the worker process."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Feedback update failed: {e}")
+
+    def run_once(self) -> Optional[Dict[str, Any]]:
+        """Swap in a model published elsewhere, then attempt one update if due."""
+        self.sync_model()
+        stats = self.store.stats()
+        if stats["pending"] < self.min_new or stats["last_id"] == self._attempted_last_id:
+            return None
+
+        lock_path = self.store.path.with_name(self.store.path.name + ".lock")
+        with open(lock_path, "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return None  # another API process is training
+            self._attempted_last_id = stats["last_id"]
+            report = self._submit()
+        self.last_report = report
+        if report["status"] == "published":
+            self.updates_published += 1
+            self.sync_model()
+        elif report["status"] == "rejected":
+            self.updates_rejected += 1
+        logger.info(f"Feedback update {report['status']}: {report}")
+        return report
+
+    def _submit(self) -> Dict[str, Any]:
+        if self._executor is None:
+            # spawn: forking a process with serving threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            )
+        future = self._executor.submit(
+            run_update, str(self.classifier.models_dir), str(self.store.path),
+            **self.update_kwargs,
+        )
+        return future.result()
+
+    def sync_model(self) -> bool:
+        """Load the model artifact if it changed on disk and serve it (True if swapped)."""
+        stamp = self._stamp()
+        if stamp is None or stamp == self._model_stamp:
+            return False
+        self.classifier.reload_model()
+        self._model_stamp = stamp
+        self.models_swapped += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Store counters and the outcome of the last update."""
+        return {
+            **self.store.stats(),
+            "updates_published": self.updates_published,
+            "updates_rejected": self.updates_rejected,
+            "models_swapped": self.models_swapped,
+            "last_update": self.last_report,
+        }
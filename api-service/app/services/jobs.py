@@ -0,0 +1,323 @@
+"""
+Asynchronous batch jobs backed by SQLite.
+
+Uploaded messages are stored in a local database and scored by background
+worker threads in large vectorized chunks. Each chunk's results, the job's
+progress counter and the removal of the scored messages are committed in a
+single transaction, so a job interrupted by a restart resumes from the last
+committed chunk.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    threshold REAL NOT NULL,
+    total INTEGER NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    spam_count INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_messages (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    is_spam INTEGER NOT NULL,
+    probability_spam REAL NOT NULL,
+    PRIMARY KEY (job_id, seq)
+) WITHOUT ROWID;
+"""
+
+_JOB_COLUMNS = (
+    "id", "status", "threshold", "total", "processed", "spam_count", "error",
+    "created_at", "updated_at",
+)
+
+
+class JobStore:
+    """SQLite persistence of jobs, pending messages and results."""
+
+    def __init__(self, path: str):
+        """Initialize the store (the database is created by open()).
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per operation: callers run on worker,
+        # event-loop and threadpool threads.
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def open(self) -> None:
+        """Create the database and schema if needed."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def create_job(self, messages: Sequence[str], threshold: float) -> Dict[str, Any]:
+        """Store a new queued job with its messages."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO jobs (id, status, threshold, total, created_at, updated_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, threshold, len(messages), now, now),
+            )
+            conn.executemany(
+                "INSERT INTO job_messages (job_id, seq, message) VALUES (?, ?, ?)",
+                ((job_id, seq, message) for seq, message in enumerate(messages)),
+            )
+            conn.execute("COMMIT")
+        return self.get_job(job_id)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's state, or None if it does not exist."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(zip(_JOB_COLUMNS, row)) if row else None
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """Mark the oldest queued job as running and return it."""
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', updated_at = ? WHERE id = ?",
+                    (time.time(), row[0]),
+                )
+            conn.execute("COMMIT")
+        return self.get_job(row[0]) if row else None
+
+    def pending_messages(self, job_id: str, limit: int) -> List[Tuple[int, str]]:
+        """Return the next unscored (seq, message) pairs of a job."""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT seq, message FROM job_messages WHERE job_id = ? ORDER BY seq LIMIT ?",
+                (job_id, limit),
+            ).fetchall()
+
+    def save_results(
+        self, job_id: str, results: Sequence[Tuple[int, bool, float]]
+    ) -> Dict[str, Any]:
+        """Commit a chunk of (seq, is_spam, probability_spam) results atomically.
+
+        Only messages still pending are counted, so a chunk scored twice (by a
+        worker that lost its lease) does not inflate the progress counters.
+        """
+        seqs = [seq for seq, _, _ in results]
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            deleted = {
+                row[0]
+                for row in conn.execute(
+                    "DELETE FROM job_messages WHERE job_id = ? AND seq BETWEEN ? AND ? "
+                    "RETURNING seq",
+                    (job_id, min(seqs), max(seqs)),
+                ).fetchall()
+            }
+            fresh = [result for result in results if result[0] in deleted]
+            conn.executemany(
+                "INSERT OR REPLACE INTO job_results (job_id, seq, is_spam, probability_spam) "
+                "VALUES (?, ?, ?, ?)",
+                ((job_id, seq, int(is_spam), probability) for seq, is_spam, probability in fresh),
+            )
+            conn.execute(
+                "UPDATE jobs SET processed = processed + ?, spam_count = spam_count + ?, "
+                "status = CASE WHEN processed + ? >= total THEN 'completed' ELSE status END, "
+                "updated_at = ? WHERE id = ?",
+                (len(fresh), sum(1 for _, is_spam, _ in fresh if is_spam), len(fresh),
+                 time.time(), job_id),
+            )
+            conn.execute("COMMIT")
+        return self.get_job(job_id)
+
+    def set_status(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        """Update a job's status (and error message)."""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, error, time.time(), job_id),
+            )
+
+    def requeue_stale(self, older_than: float) -> int:
+        """Requeue running jobs not updated for older_than seconds.
+
+        Workers update a job after every chunk, so a stale running job belongs
+        to a worker that crashed or was killed. Returns how many were requeued.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'queued', updated_at = ? "
+                "WHERE status = 'running' AND updated_at < ?",
+                (now, now - older_than),
+            ).rowcount
+
+    def iter_results(
+        self, job_id: str, offset: int = 0, page_size: int = 1000
+    ) -> Iterator[Tuple[int, bool, float]]:
+        """Yield stored (seq, is_spam, probability_spam) results in order."""
+        seq = offset - 1
+        while True:
+            with closing(self._connect()) as conn:
+                page = conn.execute(
+                    "SELECT seq, is_spam, probability_spam FROM job_results "
+                    "WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                    (job_id, seq, page_size),
+                ).fetchall()
+            for seq, is_spam, probability in page:
+                yield seq, bool(is_spam), probability
+            if len(page) < page_size:
+                return
+
+
+class JobRunner:
+    """Background workers that score queued jobs chunk by chunk."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        classifier,
+        chunk_size: int = 5000,
+        workers: int = 1,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 60.0,
+        max_chars: int = 5000,
+        long_options: Optional[Dict[str, Any]] = None,
+    ):
+        """Initialize the runner.
+
+        Args:
+            store: Job store
+            classifier: Loaded SpamClassifier
+            chunk_size: Messages vectorized and scored per transaction
+            workers: Number of worker threads
+            poll_interval: Seconds between queue checks when idle
+            lease_seconds: Running jobs idle for longer are considered abandoned
+                and resumed (other API processes may share the database)
+            max_chars: Longer messages are scored one by one with classify_long
+                under a token budget, as /predict/long does
+            long_options: Keyword arguments of classify_long (max_tokens,
+                truncation, window_chars)
+        """
+        self.store = store
+        self.classifier = classifier
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_chars = max_chars
+        self.long_options = long_options or {}
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        """Open the store and start the workers."""
+        self.store.open()
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the workers; a job in progress is requeued at the next chunk."""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self) -> None:
+        """Wake idle workers after a job is submitted."""
+        self._wakeup.set()
+
+    def run_pending(self) -> int:
+        """Process queued jobs until the queue is empty; returns jobs processed."""
+        requeued = self.store.requeue_stale(self.lease_seconds)
+        if requeued:
+            logger.info(f"Resuming {requeued} interrupted job(s)")
+        count = 0
+        while not self._stop.is_set():
+            job = self.store.claim_next()
+            if job is None:
+                return count
+            self._process(job)
+            count += 1
+        return count
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            if self.run_pending() == 0:
+                self._wakeup.wait(self.poll_interval)
+
+    def _process(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        try:
+            while True:
+                if self._stop.is_set():
+                    self.store.set_status(job_id, "queued")
+                    return
+                pending = self.store.pending_messages(job_id, self.chunk_size)
+                if not pending:
+                    break
+                probabilities = self._score([message for _, message in pending])
+                self.store.save_results(
+                    job_id,
+                    [
+                        (seq, bool(probability >= job["threshold"]), float(probability))
+                        for (seq, _), probability in zip(pending, probabilities)
+                    ],
+                )
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self.store.set_status(job_id, "failed", error=str(e))
+
+    def _score(self, messages: List[str]) -> List[float]:
+        """Spam probabilities of a chunk: one vectorized call, long messages chunked."""
+        long_indices = [i for i, message in enumerate(messages) if len(message) > self.max_chars]
+        short_indices = sorted(set(range(len(messages))) - set(long_indices))
+        probabilities = [0.0] * len(messages)
+        if short_indices:
+            scored = self.classifier.predict_spam_probabilities(
+                [messages[i] for i in short_indices]
+            )
+            for i, probability in zip(short_indices, scored):
+                probabilities[i] = float(probability)
+        for i in long_indices:
+            result = self.classifier.classify_long({"message": messages[i]}, **self.long_options)
+            probabilities[i] = result["probability_spam"]
+        return probabilities
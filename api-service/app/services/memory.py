@@ -0,0 +1,264 @@
+"""
+Process memory introspection.
+
+Reports what an API worker holds: resident and shared memory of the process
+(from /proc on Linux), the cgroup limit of its container, the in-memory
+caches and queues, and tracemalloc diffs between a baseline snapshot and
+now, taken on demand because tracing slows every allocation down.
+"""
+
+import os
+import resource
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+# /proc/self/status and smaps_rollup fields (kB) -> reported names (bytes)
+_STATUS_FIELDS = {
+    "VmRSS": "rss_bytes",
+    "VmHWM": "peak_rss_bytes",
+    "RssAnon": "anonymous_bytes",
+    "RssFile": "file_backed_bytes",
+    "RssShmem": "shmem_bytes",
+}
+_SMAPS_FIELDS = {
+    "Pss": "pss_bytes",
+    "Shared_Clean": "shared_clean_bytes",
+    "Shared_Dirty": "shared_dirty_bytes",
+    "Private_Clean": "private_clean_bytes",
+    "Private_Dirty": "private_dirty_bytes",
+}
+# cgroup v2 first, then v1
+_CGROUP_FILES = (
+    ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"),
+    (
+        "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+        "/sys/fs/cgroup/memory/memory.usage_in_bytes",
+    ),
+)
+
+
+def _read_kb_fields(path: str, fields: Dict[str, str]) -> Dict[str, int]:
+    values = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in fields:
+                    values[fields[key]] = int(rest.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return values
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """Resident, shared and private memory of this process in bytes.
+
+    Shared pages (model files mapped by several workers, copy-on-write pages
+    after a fork) count fully in the RSS of every worker; PSS splits them
+    between the processes sharing them and adds up to the node's usage.
+    """
+    memory: Dict[str, Optional[int]] = {name: None for name in _STATUS_FIELDS.values()}
+    memory.update({name: None for name in _SMAPS_FIELDS.values()})
+    memory.update(_read_kb_fields("/proc/self/status", _STATUS_FIELDS))
+    memory.update(_read_kb_fields("/proc/self/smaps_rollup", _SMAPS_FIELDS))
+    if memory["peak_rss_bytes"] is None:
+        # Linux reports ru_maxrss in kB (macOS in bytes)
+        memory["peak_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return memory
+
+
+def container_memory() -> Dict[str, Optional[int]]:
+    """Memory limit and usage of the container (cgroup), None outside one or unlimited."""
+    for limit_path, usage_path in _CGROUP_FILES:
+        try:
+            limit = Path(limit_path).read_text().strip()
+            usage = int(Path(usage_path).read_text().strip())
+        except (OSError, ValueError):
+            continue
+        # cgroup v1 reports "no limit" as a huge page-aligned number
+        unlimited = limit == "max" or int(limit) >= 1 << 60
+        return {"limit_bytes": None if unlimited else int(limit), "usage_bytes": usage}
+    return {"limit_bytes": None, "usage_bytes": None}
+
+
+def file_size(path) -> Optional[int]:
+    """Size of a file in bytes, None if it does not exist."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+class MemoryTracer:
+    """On-demand tracemalloc baseline and top-N diffs against it."""
+
+    def __init__(self, frames: int = 1):
+        """Initialize the tracer (tracing starts with snapshot()).
+
+        Args:
+            frames: Stack frames stored per traced allocation
+        """
+        self.frames = frames
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._baseline_at: Optional[float] = None
+        self._started_tracing = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _take() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            )
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Start tracing if needed and take the baseline later diffs compare with."""
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self._started_tracing = True
+            self._baseline = self._take()
+            self._baseline_at = time.time()
+        return self.status()
+
+    def diff(self, top: int = 20, group_by: str = "lineno") -> Optional[Dict[str, Any]]:
+        """Allocation sites that grew most since the baseline, None without a baseline.
+
+        Args:
+            top: Sites returned, largest size difference first
+            group_by: 'lineno', 'filename' or 'traceback'
+        """
+        with self._lock:
+            if self._baseline is None or not tracemalloc.is_tracing():
+                return None
+            current = self._take()
+            stats = current.compare_to(self._baseline, group_by)
+            baseline_at = self._baseline_at
+        return {
+            **self.status(),
+            "baseline_age_seconds": round(time.time() - baseline_at, 3),
+            "group_by": group_by,
+            "top": [
+                {
+                    "location": " <- ".join(
+                        f"{frame.filename}:{frame.lineno}" for frame in stat.traceback
+                    ),
+                    "size_bytes": stat.size,
+                    "size_diff_bytes": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in stats[:top]
+            ],
+        }
+
+    def stop(self) -> Dict[str, Any]:
+        """Drop the baseline and stop tracing if this tracer started it."""
+        with self._lock:
+            self._baseline = None
+            self._baseline_at = None
+            if self._started_tracing and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self._started_tracing = False
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        """Whether tracing is on, and traced memory (current and peak) in bytes."""
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "tracing": tracing,
+            "baseline": self._baseline is not None,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+        }
+
+
+def memory_report(
+    classifier,
+    sinks: Dict[str, Any],
+    model_registry=None,
+    micro_batcher=None,
+    tenant_pool=None,
+) -> Dict[str, Any]:
+    """Memory of this worker: process and container, model artifacts, caches and queues.
+
+    Objects shared between components (e.g. the vectorizer referenced by the
+    drift monitor) are counted once, under the first component holding them.
+
+    Args:
+        classifier: Primary SpamClassifier
+        sinks: Background queues by name (BatchingSink instances or None)
+        model_registry: Optional ModelRegistry with extra model versions
+        micro_batcher: Optional MicroBatcher of the WebSocket channel
+        tenant_pool: Optional ClassifierPool of tenant classifiers
+    """
+    from ..models.footprint import artifact_footprint, deep_sizeof
+
+    seen: Set[int] = set()
+    footprint = artifact_footprint(classifier, seen) if classifier.is_loaded else None
+    components: Dict[str, Dict[str, Any]] = {}
+
+    index = classifier.near_duplicate_index
+    if index is not None:
+        components["near_duplicate_index"] = {
+            "bytes": deep_sizeof(index, seen), "entries": len(index), "capacity": index.capacity,
+        }
+    if classifier.drift_monitor is not None:
+        components["drift_monitor"] = {"bytes": deep_sizeof(classifier.drift_monitor, seen)}
+    if classifier.prefilter is not None:
+        filters = classifier.prefilter.stats()["filters"]
+        # Memory-mapped files: page cache shared by every worker, not heap
+        components["prefilter"] = {
+            "bytes": 0,
+            "mapped_bytes": sum(entry["bytes"] for entry in filters.values()),
+        }
+    cache = classifier.prediction_cache
+    if cache is not None:
+        components["prediction_cache"] = {
+            **cache.memory_footprint(),
+            "file_bytes": file_size(cache.path),
+            "wal_bytes": file_size(f"{cache.path}-wal"),
+            "mmap_bytes_per_connection": cache.mmap_bytes,
+        }
+    for name, sink in sinks.items():
+        if sink is not None:
+            components[name] = sink.memory_footprint()
+    if model_registry is not None:
+        components["shadow_queue"] = model_registry.shadow_queue_footprint()
+        components["model_versions"] = {
+            "bytes": sum(
+                artifact_footprint(model.classifier, seen)["total_bytes"]
+                for model in model_registry.models
+                if model.classifier.is_loaded
+            ),
+            "loaded": sum(model.classifier.is_loaded for model in model_registry.models),
+        }
+    if micro_batcher is not None:
+        components["micro_batcher"] = {"bytes": None, "pending": micro_batcher.stats()["pending"]}
+    if tenant_pool is not None:
+        pooled = tenant_pool.loaded()
+        components["tenant_pool"] = {
+            "bytes": sum(
+                artifact_footprint(pooled_classifier, seen)["total_bytes"]
+                for pooled_classifier in pooled.values()
+                if pooled_classifier.is_loaded
+            ),
+            "loaded": len(pooled),
+        }
+
+    return {
+        "pid": os.getpid(),
+        "process": process_memory(),
+        "container": container_memory(),
+        "artifacts": footprint["artifacts"] if footprint is not None else {},
+        "artifacts_total_bytes": footprint["total_bytes"] if footprint is not None else 0,
+        "components": components,
+        "components_total_bytes": sum(entry["bytes"] or 0 for entry in components.values()),
+    }
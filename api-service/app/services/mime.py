@@ -0,0 +1,368 @@
+"""
+Streaming text extraction from raw RFC 822/MIME messages.
+
+The message is consumed incrementally, line by line. Only text/plain and
+text/html parts are buffered and decoded; every other part is skipped
+without being stored. Hard limits on parts, nesting depth, line length and
+decoded text size keep memory and CPU bounded for hostile payloads.
+"""
+
+import binascii
+import html
+import quopri
+import re
+from email.parser import BytesHeaderParser
+from email.policy import default as default_policy
+from typing import Any, Dict, List, Optional, Tuple
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TAG_NAME_RE = re.compile(r"/?([a-z0-9]+)")
+# A '<' only opens markup when followed by one of these (as in browsers)
+_TAG_START_RE = re.compile(r"[a-z/!?]")
+_SKIP_CONTENT_TAGS = ("script", "style")
+_MAX_HEADER_BYTES = 64 * 1024
+
+
+def html_to_text(markup: str) -> str:
+    """Strip tags, comments, scripts and styles from HTML in linear time.
+
+    A '<' that cannot start a tag (e.g. "price < 5") and a tag left
+    unterminated at the end of the markup are kept as text.
+    """
+    lower = markup.lower()
+    pieces: List[str] = []
+    pos, size = 0, len(markup)
+
+    while pos < size:
+        start = markup.find("<", pos)
+        if start < 0:
+            pieces.append(markup[pos:])
+            break
+        pieces.append(markup[pos:start])
+
+        if lower.startswith("<!--", start):
+            end = markup.find("-->", start + 4)
+            pos = size if end < 0 else end + 3
+            continue
+
+        if not _TAG_START_RE.match(lower, start + 1):
+            pieces.append("<")
+            pos = start + 1
+            continue
+
+        end = markup.find(">", start + 1)
+        if end < 0:
+            pieces.append(markup[start:])
+            break
+
+        match = _TAG_NAME_RE.match(lower, start + 1, end)
+        name = match.group(1) if match else ""
+        pos = end + 1
+        if name in _SKIP_CONTENT_TAGS and not lower.startswith("/", start + 1):
+            close = lower.find(f"</{name}", pos)
+            close_end = lower.find(">", close) if close >= 0 else -1
+            pos = size if close_end < 0 else close_end + 1
+        pieces.append(" ")
+
+    return _WHITESPACE_RE.sub(" ", html.unescape("".join(pieces))).strip()
+
+
+class _Part:
+    """State of the MIME part currently being read."""
+
+    def __init__(self, depth: int, parent: Optional["_Multipart"]):
+        self.depth = depth
+        self.parent = parent
+        self.header_block = bytearray()
+        self.content_type = "text/plain"
+        self.encoding = ""
+        self.charset = "utf-8"
+        self.collect = False
+        self.body = bytearray()
+
+
+class _Multipart:
+    """Open multipart container on the boundary stack."""
+
+    def __init__(self, boundary: bytes, subtype: str, depth: int):
+        self.delimiter = b"--" + boundary
+        self.closing = self.delimiter + b"--"
+        self.subtype = subtype
+        self.depth = depth
+        self.has_text = False
+
+
+class MimeTextExtractor:
+    """Incremental extractor of the text content of a raw email."""
+
+    def __init__(
+        self,
+        max_parts: int = 100,
+        max_depth: int = 8,
+        max_text_bytes: int = 100_000,
+        max_line_bytes: int = 64 * 1024,
+    ):
+        """Initialize the extractor.
+
+        Args:
+            max_parts: Maximum number of MIME parts inspected
+            max_depth: Maximum multipart/message nesting depth
+            max_text_bytes: Budget of decoded text bytes across all parts
+            max_line_bytes: Longer lines are truncated
+        """
+        self.max_parts = max_parts
+        self.max_depth = max_depth
+        self.max_text_bytes = max_text_bytes
+        self.max_line_bytes = max_line_bytes
+
+        self.subject = ""
+        self.parts = 0
+        self.text_parts = 0
+        self.truncated = False
+        self.done = False
+
+        self._buffer = bytearray()
+        self._discard_line = False
+        self._stack: List[_Multipart] = []
+        self._part: Optional[_Part] = _Part(depth=0, parent=None)
+        self._in_headers = True
+        self._texts: List[str] = []
+        self._text_bytes = 0
+
+    @property
+    def _skipping(self) -> bool:
+        return not self._in_headers and (self._part is None or not self._part.collect)
+
+    def feed(self, chunk: bytes) -> None:
+        """Consume a chunk of the raw message."""
+        if self.done:
+            return
+        self._buffer += chunk
+        self._process(final=False)
+
+    def close(self) -> Dict[str, Any]:
+        """Finish parsing and return extracted text and statistics."""
+        if not self.done:
+            self._process(final=True)
+            self._finish_part()
+        self.done = True
+
+        body = "\n".join(self._texts)
+        text = f"{self.subject}\n{body}".strip() if self.subject else body.strip()
+        return {
+            "text": text,
+            "subject": self.subject,
+            "parts": self.parts,
+            "text_parts": self.text_parts,
+            "text_bytes": self._text_bytes,
+            "truncated": self.truncated,
+        }
+
+    def _process(self, final: bool) -> None:
+        buf, pos = self._buffer, 0
+
+        while not self.done and pos < len(buf):
+            if self._discard_line:
+                pos, more = self._discard_rest_of_line(buf, pos)
+            elif self._skipping and not self._stack:
+                # Outside any multipart there is nothing left to extract.
+                self.done = True
+                break
+            elif self._skipping and not buf.startswith(b"--", pos):
+                pos, more = self._skip_to_boundary(buf, pos, final)
+            else:
+                pos, more = self._next_line(buf, pos, final)
+            if not more:
+                break
+
+        del buf[:pos]
+
+    def _discard_rest_of_line(self, buf: bytearray, pos: int) -> Tuple[int, bool]:
+        newline = buf.find(b"\n", pos)
+        if newline < 0:
+            return len(buf), False
+        self._discard_line = False
+        return newline + 1, True
+
+    def _skip_to_boundary(self, buf: bytearray, pos: int, final: bool) -> Tuple[int, bool]:
+        """Fast path for skipped parts: jump straight to the next line that
+        could be a boundary instead of handling every line."""
+        candidate = buf.find(b"\n--", pos)
+        if candidate >= 0:
+            return candidate + 1, True
+        last_newline = buf.rfind(b"\n", pos)
+        if last_newline >= 0:
+            pos = last_newline + 1
+        if final:
+            return len(buf), False
+        if len(buf) - pos <= self.max_line_bytes:
+            return pos, False
+        return self._next_line(buf, pos, final)
+
+    def _next_line(self, buf: bytearray, pos: int, final: bool) -> Tuple[int, bool]:
+        """Handle the line at pos; returns the new position and whether to go on."""
+        newline = buf.find(b"\n", pos)
+        if newline < 0:
+            if len(buf) - pos > self.max_line_bytes:
+                self._handle_cut_line(bytes(buf[pos : pos + self.max_line_bytes]))
+                return len(buf), False
+            if final:
+                self._handle_line(bytes(buf[pos:]))
+                return len(buf), False
+            return pos, False
+
+        end = min(newline + 1, pos + self.max_line_bytes)
+        if end <= newline:
+            self._handle_cut_line(bytes(buf[pos:end]))
+        else:
+            self._handle_line(bytes(buf[pos:end]))
+        return end, True
+
+    def _handle_cut_line(self, line: bytes) -> None:
+        """Handle the first max_line_bytes of a longer line and drop the rest."""
+        if not self._skipping:
+            # Headers or text were lost; long lines of skipped parts do not matter.
+            self.truncated = True
+        self._handle_line(line)
+        self._discard_line = True
+
+    def _handle_line(self, line: bytes) -> None:
+        if self._in_headers:
+            if line.strip():
+                if len(self._part.header_block) + len(line) <= _MAX_HEADER_BYTES:
+                    self._part.header_block += line
+                return
+            self._end_headers()
+            return
+
+        if line.startswith(b"--") and self._stack:
+            stripped = line.rstrip()
+            for level in range(len(self._stack) - 1, -1, -1):
+                multipart = self._stack[level]
+                if stripped == multipart.delimiter:
+                    self._finish_part()
+                    del self._stack[level + 1 :]
+                    self._start_part(multipart)
+                    return
+                if stripped == multipart.closing:
+                    self._finish_part()
+                    del self._stack[level:]
+                    self._part = None
+                    return
+
+        part = self._part
+        if part is not None and part.collect:
+            # Encoded size is bounded by a multiple of the decoded budget
+            # (base64 and quoted-printable expand at most 3x).
+            room = (self.max_text_bytes - self._text_bytes) * 3 + 1024 - len(part.body)
+            if len(line) > room:
+                line = line[: max(room, 0)]
+                self.truncated = True
+            part.body += line
+
+    def _start_part(self, parent: Optional[_Multipart]) -> None:
+        self.parts += 1
+        if self.parts > self.max_parts:
+            self.truncated = True
+            self.done = True
+            return
+        depth = parent.depth + 1 if parent is not None else self._part.depth + 1
+        self._part = _Part(depth=depth, parent=parent)
+        self._in_headers = True
+
+    def _end_headers(self) -> None:
+        part = self._part
+        headers = BytesHeaderParser(policy=default_policy).parsebytes(bytes(part.header_block))
+        part.header_block = bytearray()
+        self._in_headers = False
+
+        if part.depth == 0:
+            self.parts = 1
+            self.subject = str(headers.get("Subject", "") or "").strip()
+
+        part.content_type = headers.get_content_type()
+        maintype = headers.get_content_maintype()
+        nested = maintype == "multipart" or part.content_type == "message/rfc822"
+        if nested and part.depth >= self.max_depth:
+            self.truncated = True
+            return
+
+        if maintype == "multipart":
+            boundary = headers.get_param("boundary")
+            if boundary:
+                self._stack.append(
+                    _Multipart(
+                        str(boundary).encode("latin-1", "replace"),
+                        headers.get_content_subtype(),
+                        part.depth,
+                    )
+                )
+                self._part = None
+            return
+
+        if part.content_type == "message/rfc822":
+            self._start_part(part.parent)
+            if self._part is not None:
+                self._part.depth = part.depth + 1
+            return
+
+        is_text = part.content_type in ("text/plain", "text/html")
+        is_attachment = headers.get_content_disposition() == "attachment"
+        already_has_text = (
+            part.parent is not None
+            and part.parent.subtype == "alternative"
+            and part.parent.has_text
+        )
+        if is_text and not is_attachment and not already_has_text:
+            part.collect = self._text_bytes < self.max_text_bytes
+            part.encoding = str(headers.get("Content-Transfer-Encoding", "")).strip().lower()
+            part.charset = headers.get_content_charset() or "utf-8"
+            if part.collect and part.parent is not None:
+                part.parent.has_text = True
+            if not part.collect:
+                self.truncated = True
+
+    def _finish_part(self) -> None:
+        part = self._part
+        if part is None or not part.collect or self._in_headers:
+            return
+        part.collect = False
+
+        data = self._decode_body(part)
+        remaining = self.max_text_bytes - self._text_bytes
+        if len(data) > remaining:
+            data = data[:remaining]
+            self.truncated = True
+        self._text_bytes += len(data)
+
+        text = self._part_text(part, data)
+        if text:
+            self._texts.append(text)
+            self.text_parts += 1
+        if self._text_bytes >= self.max_text_bytes:
+            self.done = True
+
+    @staticmethod
+    def _decode_body(part: _Part) -> bytes:
+        """Undo the Content-Transfer-Encoding of a collected part."""
+        raw = bytes(part.body)
+        if part.encoding == "base64":
+            compact = b"".join(raw.split())
+            try:
+                return binascii.a2b_base64(compact[: len(compact) - len(compact) % 4])
+            except binascii.Error:
+                return b""
+        if part.encoding == "quoted-printable":
+            return quopri.decodestring(raw)
+        return raw
+
+    @staticmethod
+    def _part_text(part: _Part, data: bytes) -> str:
+        """Decode a part's charset and reduce HTML to text."""
+        try:
+            text = data.decode(part.charset, errors="replace")
+        except LookupError:
+            text = data.decode("latin-1")
+        if part.content_type == "text/html":
+            return html_to_text(text)
+        return text.strip()
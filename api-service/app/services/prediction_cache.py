@@ -0,0 +1,216 @@
+"""
+Persistent prediction cache shared by the API workers of a node.
+
+Probabilities computed by the primary classifier are stored in a SQLite
+database keyed by a hash of the model version and the whitespace-normalized
+message, so a restarted or newly scaled worker starts warm and entries of a
+previous model are never served after a deploy. Lookups use per-thread
+read connections with memory-mapped I/O; new entries and the recency of
+hits are queued and committed in batches by a background sink, which also
+evicts the least recently used entries above max_entries. In WAL mode any
+number of worker processes read while one of them writes.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .sink import BatchingSink
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    key BLOB PRIMARY KEY,
+    probability_spam REAL NOT NULL,
+    probability_ham REAL NOT NULL,
+    used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS predictions_used ON predictions (used);
+"""
+
+# Eviction removes this share of max_entries beyond the excess, so it runs
+# once per many batches instead of on every one.
+EVICT_SLACK = 0.05
+
+
+def normalize_message(message: str) -> str:
+    """Collapse whitespace: the vectorizers tokenize on it, so messages
+    differing only in spacing get the same probabilities."""
+    return " ".join(message.split())
+
+
+def _connect(path: Path, mmap_bytes: int, read_only: bool = False) -> sqlite3.Connection:
+    if read_only:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=5)
+    else:
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA mmap_size={int(mmap_bytes)}")
+    return conn
+
+
+class SqliteCacheWriter:
+    """Upsert cache entries in one transaction per batch and bound their number."""
+
+    def __init__(self, path: str, max_entries: int, mmap_bytes: int):
+        """Initialize the writer (the connection is opened by the writer thread).
+
+        Args:
+            path: SQLite database file
+            max_entries: Entries kept; the least recently used are evicted
+            mmap_bytes: Memory-mapped I/O size of the connection
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.mmap_bytes = mmap_bytes
+        self.evicted = 0
+        self._conn = None
+        self._unchecked = 0
+
+    def open(self) -> None:
+        """Create the database and schema if needed."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = _connect(self.path, self.mmap_bytes)
+        self._conn.executescript(_SCHEMA)
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Insert new entries and refresh the recency of hits."""
+        if self._conn is None:
+            self.open()
+        # The last record of a key carries its most recent use.
+        rows = {record["key"]: record for record in records}
+        self._conn.execute("BEGIN")
+        self._conn.executemany(
+            "INSERT INTO predictions (key, probability_spam, probability_ham, used) "
+            "VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET used = excluded.used",
+            (
+                (key, row["probability_spam"], row["probability_ham"], row["used"])
+                for key, row in rows.items()
+            ),
+        )
+        self._unchecked += len(rows)
+        # Counting is a full index scan: only recount after enough new writes.
+        if self._unchecked >= max(1, int(self.max_entries * EVICT_SLACK)):
+            self._unchecked = 0
+            self._evict()
+        self._conn.execute("COMMIT")
+
+    def _evict(self) -> None:
+        entries = self._conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        excess = entries - self.max_entries
+        if excess <= 0:
+            return
+        count = excess + int(self.max_entries * EVICT_SLACK)
+        self._conn.execute(
+            "DELETE FROM predictions WHERE key IN "
+            "(SELECT key FROM predictions ORDER BY used LIMIT ?)",
+            (count,),
+        )
+        self.evicted += min(count, entries)
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class PredictionCache(BatchingSink):
+    """Persistent, size-bounded cache of spam/ham probabilities."""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 1_000_000,
+        mmap_bytes: int = 256 * 1024 * 1024,
+        queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+    ):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file (shared by the workers of a node)
+            max_entries: Entries kept; the least recently used are evicted
+            mmap_bytes: Memory-mapped I/O size of each connection
+            queue_size: Pending writes buffered before new ones are dropped
+            batch_size: Writes committed per transaction
+            flush_interval: Maximum seconds a write waits for its batch
+        """
+        super().__init__(
+            SqliteCacheWriter(path, max_entries, mmap_bytes),
+            queue_size=queue_size,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            policy="drop",
+            name="prediction-cache",
+        )
+        self.path = Path(path)
+        self.mmap_bytes = mmap_bytes
+        self.hits = 0
+        self.misses = 0
+        self._readers = threading.local()
+
+    @staticmethod
+    def key(model_version: str, message: str) -> bytes:
+        """Cache key of a message for a model version (whitespace-normalized)."""
+        digest = hashlib.sha256(
+            f"{model_version}\0{normalize_message(message)}".encode("utf-8", errors="surrogatepass")
+        )
+        return digest.digest()[:16]
+
+    def start(self) -> None:
+        """Create the database so readers find it, then start the writer."""
+        self.writer.open()
+        self.writer.close()
+        super().start()
+
+    def get(self, key: bytes) -> Optional[Tuple[float, float]]:
+        """Return (probability_spam, probability_ham) of a key, or None."""
+        row = None
+        try:
+            row = self._reader().execute(
+                "SELECT probability_spam, probability_ham FROM predictions WHERE key = ?",
+                (key,),
+            ).fetchone()
+        except sqlite3.Error:
+            # Database not created yet, or locked beyond the timeout: a miss.
+            self._readers.conn = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.put(key, row[0], row[1])
+        return row
+
+    def put(self, key: bytes, probability_spam: float, probability_ham: float) -> None:
+        """Queue an entry (or a recency update) for the background writer."""
+        self.submit(
+            {
+                "key": key,
+                "probability_spam": probability_spam,
+                "probability_ham": probability_ham,
+                "used": time.time(),
+            }
+        )
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = _connect(self.path, self.mmap_bytes, read_only=True)
+            self._readers.conn = conn
+        return conn
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and background writer counters."""
+        lookups = self.hits + self.misses
+        return {
+            **super().stats(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evicted": self.writer.evicted,
+        }
@@ -0,0 +1,285 @@
+"""
+Registry of loaded model versions with A/B and shadow routing.
+
+The primary classifier (MODELS_DIR) serves every request unless a weighted
+A/B variant is selected for it. Shadow models never answer requests: the
+served message and result are enqueued after the primary call returns and
+a background sink scores them in vectorized batches. The shadow queue is
+bounded; when scoring falls behind, new shadow records are shed instead of
+slowing requests down. Served latency and, for shadows, agreement with the
+served prediction are tracked per model.
+"""
+
+import random
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .sink import BatchingSink
+
+ROLES = ("ab", "shadow")
+
+# Latencies kept per model for percentiles
+LATENCY_WINDOW = 2048
+
+# Messages scored by a shadow model between two checks for primary requests.
+# Scoring holds the GIL, so small chunks bound the delay seen by a request
+# that arrives meanwhile.
+SHADOW_CHUNK = 8
+IDLE_POLL_SECONDS = 0.001
+
+
+class LatencyWindow:
+    """Most recent latencies of a model, in milliseconds."""
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self._values: deque = deque(maxlen=size)
+
+    def add(self, milliseconds: float) -> None:
+        self._values.append(milliseconds)
+
+    def summary(self) -> Optional[Dict[str, float]]:
+        """Mean, p50 and p99 of the window (None before the first sample)."""
+        values = np.fromiter(tuple(self._values), dtype=float)
+        if not len(values):
+            return None
+        return {
+            "mean": round(float(values.mean()), 3),
+            "p50": round(float(np.percentile(values, 50)), 3),
+            "p99": round(float(np.percentile(values, 99)), 3),
+        }
+
+
+class RegisteredModel:
+    """A loaded model version with its routing role and statistics."""
+
+    def __init__(self, name: str, classifier, role: str = "primary", weight: float = 0.0):
+        self.name = name
+        self.classifier = classifier
+        self.role = role
+        self.weight = weight
+        self.served = 0
+        self.latency = LatencyWindow()
+        self.scored = 0
+        self.agreed = 0
+        self.abs_diff_total = 0.0
+        self._lock = threading.Lock()
+
+    def record_served(self, milliseconds: float) -> None:
+        with self._lock:
+            self.served += 1
+        self.latency.add(milliseconds)
+
+    def record_shadow(self, agreed: int, abs_diff: float, count: int, milliseconds: float) -> None:
+        with self._lock:
+            self.scored += count
+            self.agreed += agreed
+            self.abs_diff_total += abs_diff
+        self.latency.add(milliseconds)
+
+    def stats(self) -> Dict[str, Any]:
+        info = self.classifier.get_model_info() if self.classifier.is_loaded else {}
+        entry = {
+            "name": self.name,
+            "role": self.role,
+            "weight": self.weight,
+            "models_dir": str(self.classifier.models_dir),
+            "loaded": self.classifier.is_loaded,
+            "model_version": info.get("model_version"),
+            "latency_ms": self.latency.summary(),
+        }
+        if self.role == "shadow":
+            entry["scored"] = self.scored
+            entry["agreement"] = round(self.agreed / self.scored, 6) if self.scored else None
+            entry["mean_abs_diff"] = (
+                round(self.abs_diff_total / self.scored, 6) if self.scored else None
+            )
+        else:
+            entry["served"] = self.served
+        return entry
+
+
+class _ShadowWriter:
+    """BatchingSink writer scoring queued requests with every shadow model.
+
+    Each chunk waits until no primary request is in flight, so shadow work
+    only uses the time the process would otherwise spend idle; under
+    sustained load the queue fills up and new shadow requests are shed.
+    """
+
+    def __init__(self, shadows: List[RegisteredModel], busy: Callable[[], bool]):
+        self.shadows = shadows
+        self.busy = busy
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        for start in range(0, len(records), SHADOW_CHUNK):
+            self._score(records[start : start + SHADOW_CHUNK])
+
+    def _score(self, records: List[Dict[str, Any]]) -> None:
+        messages = [record["message"] for record in records]
+        served = np.array([record["probability_spam"] for record in records])
+        thresholds = np.array([record["threshold"] for record in records])
+        served_labels = served >= thresholds
+        for shadow in self.shadows:
+            if not shadow.classifier.is_loaded:
+                continue
+            while self.busy():
+                time.sleep(IDLE_POLL_SECONDS)
+            start = time.perf_counter()
+            probabilities = shadow.classifier.predict_spam_probabilities(messages)
+            per_message = (time.perf_counter() - start) * 1000 / len(messages)
+            shadow.record_shadow(
+                agreed=int(np.sum((probabilities >= thresholds) == served_labels)),
+                abs_diff=float(np.sum(np.abs(probabilities - served))),
+                count=len(messages),
+                milliseconds=per_message,
+            )
+
+    def close(self) -> None:
+        pass
+
+
+class ModelRegistry:
+    """A/B and shadow model versions around the primary classifier."""
+
+    def __init__(
+        self,
+        classifier_factory: Callable[[str], Any],
+        entries: Iterable[Dict[str, Any]] = (),
+        queue_size: int = 1000,
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+        sample_rate: float = 1.0,
+    ):
+        """Initialize the registry.
+
+        Args:
+            classifier_factory: Builds an unloaded classifier for a models directory
+            entries: Model versions, each {"name", "models_dir", "role": "ab" | "shadow",
+                "weight" (A/B share of traffic, 0-1)}
+            queue_size: Shadow requests buffered before new ones are shed
+            batch_size: Shadow requests scored per vectorized call
+            flush_interval: Maximum seconds a shadow request waits for its batch
+            sample_rate: Fraction of requests scored by shadow models
+
+        Raises:
+            ValueError: If an entry is invalid or A/B weights exceed 1
+        """
+        self.models: List[RegisteredModel] = []
+        for entry in entries:
+            name, role = entry.get("name"), entry.get("role")
+            if not name or not entry.get("models_dir") or role not in ROLES:
+                raise ValueError(
+                    f"Registry entries need a name, a models_dir and a role in {ROLES}: {entry}"
+                )
+            if name == "primary" or name in {model.name for model in self.models}:
+                raise ValueError(f"Duplicate model name in registry: {name}")
+            weight = float(entry.get("weight", 0.0))
+            if role == "ab" and not 0.0 < weight <= 1.0:
+                raise ValueError(f"A/B weight of {name} must be in (0, 1]")
+            self.models.append(
+                RegisteredModel(name, classifier_factory(entry["models_dir"]), role, weight)
+            )
+
+        self.variants = [model for model in self.models if model.role == "ab"]
+        self.shadows = [model for model in self.models if model.role == "shadow"]
+        if sum(model.weight for model in self.variants) > 1.0:
+            raise ValueError("A/B weights must add up to at most 1")
+        # Cumulative upper bounds of each variant's share of the hash space
+        self._bounds = np.cumsum([model.weight for model in self.variants]).tolist()
+        self.sample_rate = sample_rate
+        self.primary = RegisteredModel("primary", None)
+        self._inflight = 0
+        self._inflight_lock = threading.Lock()
+        self._sink = BatchingSink(
+            _ShadowWriter(self.shadows, lambda: self._inflight > 0),
+            queue_size=queue_size,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            policy="drop",
+            name="shadow-scorer",
+        )
+
+    @property
+    def policy(self) -> str:
+        """Routing policy: 'primary', 'ab', 'shadow' or 'ab+shadow'."""
+        roles = [role for role in ROLES if any(model.role == role for model in self.models)]
+        return "+".join(roles) or "primary"
+
+    def load(self) -> None:
+        """Load every registered model version and start shadow scoring."""
+        for model in self.models:
+            model.classifier.load()
+        if self.shadows:
+            self._sink.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Score pending shadow requests and stop the background worker."""
+        self._sink.stop(timeout)
+
+    def select(self, primary, message: str) -> RegisteredModel:
+        """Choose the model serving a message (stable per message text)."""
+        if self.variants:
+            bucket = zlib.crc32(message.encode("utf-8", errors="surrogatepass")) / 2**32
+            for model, bound in zip(self.variants, self._bounds):
+                if bucket < bound:
+                    return model
+        self.primary.classifier = primary
+        return self.primary
+
+    def serve(
+        self,
+        primary,
+        message: str,
+        threshold: float,
+        classify: Callable[[Any], Dict[str, Any]],
+        shadow: bool = True,
+    ) -> Dict[str, Any]:
+        """Classify with the selected model, then enqueue shadow scoring.
+
+        Args:
+            primary: Primary classifier
+            message: Message text used for routing and shadow scoring
+            threshold: Threshold of the request, used to compare shadow labels
+            classify: Called with the selected classifier, returns the result
+            shadow: Whether shadow models score this request
+        """
+        model = self.select(primary, message)
+        # Requests may be served from several inference threads
+        with self._inflight_lock:
+            self._inflight += 1
+        try:
+            start = time.perf_counter()
+            result = classify(model.classifier)
+            model.record_served((time.perf_counter() - start) * 1000)
+        finally:
+            with self._inflight_lock:
+                self._inflight -= 1
+        if shadow and self.shadows and random.random() < self.sample_rate:
+            self._sink.submit(
+                {
+                    "message": message,
+                    "probability_spam": result["probability_spam"],
+                    "threshold": threshold,
+                }
+            )
+        return result
+
+    def shadow_queue_footprint(self) -> Dict[str, Any]:
+        """Memory held by shadow requests waiting to be scored."""
+        return self._sink.memory_footprint()
+
+    def stats(self) -> Dict[str, Any]:
+        """Routing policy, per-model statistics and shadow queue counters."""
+        models = ([self.primary] if self.primary.classifier is not None else []) + self.models
+        sink = self._sink.stats()
+        return {
+            "policy": self.policy,
+            "models": [model.stats() for model in models],
+            "shadow_queue": {"scored": sink["written"], "shed": sink["dropped"],
+                             "queued": sink["queued"]},
+        }
@@ -0,0 +1,206 @@
+"""
+Replay of captured prediction traffic.
+
+Capture records (see capture.py) are re-sent with their original pacing,
+a speed-up factor, or as fast as the concurrency limit allows. Results are
+summarized as throughput and latency percentiles, and predictions can be
+compared between two runs (or against the responses recorded at capture
+time) to spot differences between model versions.
+"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+REPLAY_MODES = ("original", "speedup", "max-rate")
+
+Sender = Callable[[Dict[str, Any]], Awaitable[Tuple[int, Optional[Dict[str, Any]]]]]
+
+
+def load_capture(paths: Iterable[str], limit: int = 0) -> List[Dict[str, Any]]:
+    """Load replayable records (with a body) from capture files, ordered by time."""
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if "body" in record:
+                    records.append(record)
+    records.sort(key=lambda record: record["ts"])
+    return records[:limit] if limit else records
+
+
+def http_sender(client) -> Sender:
+    """Build a sender for an httpx.AsyncClient (HTTP or ASGI transport)."""
+
+    async def send(record: Dict[str, Any]) -> Tuple[int, Optional[Dict[str, Any]]]:
+        url = record["path"] + (f"?{record['query']}" if record.get("query") else "")
+        headers = {"content-type": record["content_type"]} if record.get("content_type") else {}
+        response = await client.request(
+            record["method"], url, content=record["body"].encode("utf-8"), headers=headers
+        )
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        return response.status_code, data
+
+    return send
+
+
+def _outcome(index: int, status: int, data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    data = data if isinstance(data, dict) else {}
+    return {
+        "index": index,
+        "status": status,
+        "prediction": data.get("prediction"),
+        "probability_spam": data.get("probability_spam"),
+        "model_version": (data.get("model_info") or {}).get("version"),
+    }
+
+
+async def replay(
+    send: Sender,
+    records: List[Dict[str, Any]],
+    mode: str = "max-rate",
+    speedup: float = 1.0,
+    concurrency: int = 16,
+) -> Tuple[List[Dict[str, Any]], float]:
+    """Replay records and return (per-request results, wall-clock seconds).
+
+    Args:
+        send: Coroutine sending one record and returning (status, JSON body)
+        records: Capture records ordered by timestamp
+        mode: 'original' pacing, 'speedup' (original pacing / speedup) or 'max-rate'
+        speedup: Speed-up factor for 'speedup' mode
+        concurrency: Maximum requests in flight
+    """
+    if mode not in REPLAY_MODES:
+        raise ValueError(f"mode must be one of {REPLAY_MODES}")
+    pace = {"original": 1.0, "speedup": speedup, "max-rate": None}[mode]
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(records)
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = []
+
+    async def run(index: int, record: Dict[str, Any], lag_ms: float) -> None:
+        start = time.perf_counter()
+        try:
+            status, data = await send(record)
+            outcome = _outcome(index, status, data)
+        except Exception as e:
+            outcome = _outcome(index, 0, None)
+            outcome["error"] = str(e)
+        finally:
+            semaphore.release()
+        outcome["latency_ms"] = (time.perf_counter() - start) * 1000
+        outcome["lag_ms"] = lag_ms
+        results[index] = outcome
+
+    started = time.perf_counter()
+    first_ts = records[0]["ts"] if records else 0.0
+    for index, record in enumerate(records):
+        lag_ms = 0.0
+        if pace is not None:
+            due = started + (record["ts"] - first_ts) / pace
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        await semaphore.acquire()
+        if pace is not None:
+            lag_ms = max(0.0, (time.perf_counter() - due) * 1000)
+        tasks.append(asyncio.ensure_future(run(index, record, lag_ms)))
+
+    await asyncio.gather(*tasks)
+    return results, time.perf_counter() - started
+
+
+def summarize(results: List[Dict[str, Any]], duration: float) -> Dict[str, Any]:
+    """Compute throughput, error counts and latency percentiles of a replay."""
+    latencies = np.array([result["latency_ms"] for result in results]) if results else np.zeros(1)
+    statuses: Dict[str, int] = {}
+    for result in results:
+        statuses[str(result["status"])] = statuses.get(str(result["status"]), 0) + 1
+    lags = [result.get("lag_ms", 0.0) for result in results]
+
+    return {
+        "requests": len(results),
+        "errors": sum(1 for result in results if not 200 <= result["status"] < 300),
+        "status_counts": statuses,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(results) / duration, 1) if duration > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(float(latencies.mean()), 3),
+            "p50": round(float(np.percentile(latencies, 50)), 3),
+            "p90": round(float(np.percentile(latencies, 90)), 3),
+            "p99": round(float(np.percentile(latencies, 99)), 3),
+            "max": round(float(latencies.max()), 3),
+        },
+        "max_schedule_lag_ms": round(max(lags), 3) if lags else 0.0,
+    }
+
+
+def recorded_results(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return the responses stored at capture time in replay-result form."""
+    results = []
+    for index, record in enumerate(records):
+        response = record.get("response") or {}
+        results.append(
+            {
+                "index": index,
+                "status": record.get("status"),
+                "prediction": response.get("prediction"),
+                "probability_spam": response.get("probability_spam"),
+                "model_version": response.get("model_version"),
+            }
+        )
+    return results
+
+
+def compare_predictions(
+    baseline: List[Dict[str, Any]], candidate: List[Dict[str, Any]], top: int = 10
+) -> Dict[str, Any]:
+    """Compare predictions of two runs over the same records."""
+    pairs = [
+        (a, b)
+        for a, b in zip(baseline, candidate)
+        if a.get("probability_spam") is not None and b.get("probability_spam") is not None
+    ]
+    diffs = np.array([abs(a["probability_spam"] - b["probability_spam"]) for a, b in pairs])
+    changed = [(a, b) for a, b in pairs if a["prediction"] != b["prediction"]]
+    largest = sorted(
+        pairs, key=lambda pair: -abs(pair[0]["probability_spam"] - pair[1]["probability_spam"])
+    )
+
+    return {
+        "baseline_versions": sorted({str(a.get("model_version")) for a, _ in pairs}),
+        "candidate_versions": sorted({str(b.get("model_version")) for _, b in pairs}),
+        "compared": len(pairs),
+        "label_changes": len(changed),
+        "agreement": round(1 - len(changed) / len(pairs), 6) if pairs else None,
+        "max_abs_diff": round(float(diffs.max()), 6) if len(diffs) else None,
+        "mean_abs_diff": round(float(diffs.mean()), 6) if len(diffs) else None,
+        "largest_diffs": [
+            {
+                "index": a["index"],
+                "baseline": [a["prediction"], a["probability_spam"]],
+                "candidate": [b["prediction"], b["probability_spam"]],
+            }
+            for a, b in largest[:top]
+        ],
+    }
+
+
+def write_results(path: str, results: List[Dict[str, Any]]) -> None:
+    """Write per-request replay results as JSONL."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result) + "\n")
@@ -0,0 +1,213 @@
+"""
+Cost-aware scheduling of inference requests.
+
+Classification cost grows with message length (tokenization and n-gram
+generation), so serving requests in arrival order lets a few long messages
+delay every short one queued behind them. The scheduler estimates the cost
+of each request from its length and runs requests on inference threads in
+shortest-expected-job order with aging: a waiting request gains
+aging_rate cost units per second, so long requests are never starved.
+
+Requests costing at least heavy_cost go to the 'bulk' lane and the rest to
+the 'interactive' lane. With heavy_workers > 0 the bulk lane has its own
+threads and queue and never occupies interactive threads; otherwise both
+lanes share one pool, ordered by the same rule. Queue wait and latency are
+tracked per lane.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .registry import LatencyWindow
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+LANES = (INTERACTIVE, BULK)
+
+
+class _Pool:
+    """Inference threads with the queue of requests waiting for them."""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.running = 0
+        # (priority, sequence, lane, enqueued_at, function, args, future)
+        self.queue: List[tuple] = []
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+
+class _LaneStats:
+    """Counters and recent latencies of one lane."""
+
+    def __init__(self):
+        self.requests = 0
+        self.completed = 0
+        self.failed = 0
+        self.cost_total = 0
+        self.wait = LatencyWindow()
+        self.latency = LatencyWindow()
+
+
+class InferenceScheduler:
+    """Runs inference requests on bounded threads, cheapest expected job first."""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        heavy_workers: int = 1,
+        heavy_cost: int = 2000,
+        aging_rate: float = 20000.0,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            workers: Inference threads of the interactive lane (shared with bulk
+                requests when heavy_workers is 0)
+            heavy_workers: Inference threads reserved for the bulk lane (0 to share)
+            heavy_cost: Estimated cost (characters) from which a request is bulk
+            aging_rate: Cost units a waiting request is credited per second
+        """
+        self.heavy_cost = heavy_cost
+        self.aging_rate = aging_rate
+        interactive = _Pool(INTERACTIVE, workers)
+        bulk = _Pool(BULK, heavy_workers) if heavy_workers > 0 else interactive
+        self._pools = {INTERACTIVE: interactive, BULK: bulk}
+        self._lanes = {lane: _LaneStats() for lane in LANES}
+        self._sequence = itertools.count()
+
+    @staticmethod
+    def estimate_cost(*messages: str) -> int:
+        """Expected cost of classifying messages: their total length in characters."""
+        return sum(len(message) for message in messages)
+
+    def lane(self, cost: int) -> str:
+        """Lane serving a request of the given cost."""
+        return BULK if cost >= self.heavy_cost else INTERACTIVE
+
+    async def run(self, cost: int, function: Callable[..., Any], *args) -> Any:
+        """Run function(*args) on an inference thread when its turn comes.
+
+        Among queued requests, the one with the lowest cost minus the aging
+        credit of its wait runs first. Since every waiting request gains
+        credit at the same rate, that order equals the order of
+        enqueued_at + cost / aging_rate and is fixed at enqueue time.
+
+        Args:
+            cost: Estimated cost of the request (see estimate_cost)
+            function: Blocking call doing the inference
+        """
+        lane = self.lane(cost)
+        pool = self._pools[lane]
+        future = asyncio.get_running_loop().create_future()
+        enqueued_at = time.perf_counter()
+        priority = enqueued_at + cost / self.aging_rate
+        heapq.heappush(
+            pool.queue, (priority, next(self._sequence), lane, enqueued_at, function, args, future)
+        )
+        stats = self._lanes[lane]
+        stats.requests += 1
+        stats.cost_total += cost
+        self._dispatch(pool)
+        return await future
+
+    def _dispatch(self, pool: _Pool) -> None:
+        while pool.running < pool.workers and pool.queue:
+            _, _, lane, enqueued_at, function, args, future = heapq.heappop(pool.queue)
+            if future.done():
+                # The client went away while queued
+                continue
+            if pool.executor is None:
+                pool.executor = ThreadPoolExecutor(
+                    pool.workers, thread_name_prefix=f"inference-{pool.name}"
+                )
+            pool.running += 1
+            started_at = time.perf_counter()
+            self._lanes[lane].wait.add((started_at - enqueued_at) * 1000)
+            task = asyncio.get_running_loop().run_in_executor(pool.executor, function, *args)
+            task.add_done_callback(
+                lambda done, lane=lane, enqueued_at=enqueued_at, future=future: self._complete(
+                    pool, lane, enqueued_at, done, future
+                )
+            )
+
+    def _complete(
+        self,
+        pool: _Pool,
+        lane: str,
+        enqueued_at: float,
+        done: asyncio.Future,
+        future: asyncio.Future,
+    ) -> None:
+        pool.running -= 1
+        stats = self._lanes[lane]
+        stats.latency.add((time.perf_counter() - enqueued_at) * 1000)
+        error = asyncio.CancelledError() if done.cancelled() else done.exception()
+        if error is not None:
+            stats.failed += 1
+        else:
+            stats.completed += 1
+        if not future.done():
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result())
+        self._dispatch(pool)
+
+    async def drain(self, timeout: float) -> Dict[str, int]:
+        """Let queued and running requests finish, then cancel what is still queued.
+
+        Returns:
+            Requests queued when the drain started, and those cancelled at timeout
+        """
+        pools = set(self._pools.values())
+        queued = sum(len(pool.queue) for pool in pools)
+        deadline = time.monotonic() + timeout
+        while any(pool.queue or pool.running for pool in pools) and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        cancelled = 0
+        for pool in pools:
+            for entry in pool.queue:
+                if entry[-1].cancel():
+                    cancelled += 1
+            pool.queue.clear()
+        return {"queued": queued, "cancelled": cancelled}
+
+    def close(self) -> None:
+        """Stop the inference threads (later requests start new ones)."""
+        for pool in set(self._pools.values()):
+            executor, pool.executor = pool.executor, None
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Scheduling parameters, per-lane counters and queue wait/latency percentiles."""
+        lanes = {}
+        for lane, stats in self._lanes.items():
+            pool = self._pools[lane]
+            lanes[lane] = {
+                "pool": pool.name,
+                "requests": stats.requests,
+                "completed": stats.completed,
+                "failed": stats.failed,
+                "queued": sum(1 for entry in pool.queue if entry[2] == lane),
+                "mean_cost": (
+                    round(stats.cost_total / stats.requests, 1) if stats.requests else None
+                ),
+                "wait_ms": stats.wait.summary(),
+                "latency_ms": stats.latency.summary(),
+            }
+        return {
+            "heavy_cost": self.heavy_cost,
+            "aging_rate": self.aging_rate,
+            "shared_pool": self._pools[BULK] is self._pools[INTERACTIVE],
+            "workers": {
+                pool.name: {"threads": pool.workers, "running": pool.running}
+                for pool in self._pools.values()
+            },
+            "lanes": lanes,
+        }
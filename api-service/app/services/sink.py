@@ -0,0 +1,209 @@
+"""
+Bounded, batching background sink for log-style records.
+
+Producers only enqueue records; a background thread drains the queue and
+hands records to a writer in batches, so each batch costs one write and
+flush (or one transaction) instead of one per record. When the queue is
+full the record is dropped and counted ('drop' policy), or the producer
+waits up to a timeout before dropping it ('block' policy).
+"""
+
+import json
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FULL_POLICIES = ("drop", "block")
+
+
+class RotatingJsonlWriter:
+    """Append records to a JSONL file, rotating it by size."""
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, backups: int = 5):
+        """Initialize the writer.
+
+        Args:
+            path: Active JSONL file; rotated files get .1, .2, ... suffixes
+            max_bytes: Size at which the active file is rotated
+            backups: Number of rotated files kept
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = None
+        self._size = 0
+
+    def open(self) -> None:
+        """Open the active file for appending."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Write a batch of records with a single flush."""
+        if self._file is None:
+            self.open()
+        pending: List[str] = []
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+            encoded_size = len(line.encode("utf-8"))
+            if self._size and self._size + encoded_size > self.max_bytes:
+                self._file.write("".join(pending))
+                pending = []
+                self._rotate()
+            pending.append(line)
+            self._size += encoded_size
+        self._file.write("".join(pending))
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the active file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backups > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = 0
+
+
+class BatchingSink:
+    """Bounded in-memory queue flushed to a writer by a background thread."""
+
+    def __init__(
+        self,
+        writer,
+        queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        policy: str = "drop",
+        block_timeout: float = 0.1,
+        name: str = "sink",
+    ):
+        """Initialize the sink.
+
+        Args:
+            writer: Object with write_batch(records) and close()
+            queue_size: Records buffered before the full-queue policy applies
+            batch_size: Maximum records handed to the writer at once
+            flush_interval: Maximum seconds a record waits for its batch
+            policy: 'drop' discards records when the queue is full, 'block'
+                waits up to block_timeout for space first
+            block_timeout: Longest wait of a producer under the 'block' policy
+            name: Background thread name
+        """
+        if policy not in FULL_POLICIES:
+            raise ValueError(f"policy must be one of {FULL_POLICIES}")
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.name = name
+        self.written = 0
+        self.dropped = 0
+        # Producers and the writer thread both update the counters
+        self._counts_lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """Enqueue a record; returns False (and counts a drop) if it was discarded."""
+        try:
+            if self.policy == "block":
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self._count(dropped=1)
+            return False
+
+    def start(self) -> None:
+        """Start the background writer."""
+        self._thread = threading.Thread(target=self._write_loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write pending records and stop the writer."""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            # The writer is stuck (or far behind): give up rather than hang shutdown
+            logger.warning(f"{self.name}: queue still full after {timeout}s, not waiting for it")
+            self._thread = None
+            return
+        self._thread.join(timeout)
+        self._thread = None
+
+    def memory_footprint(self) -> Dict[str, Any]:
+        """Queued records, queue capacity and deep size of the queued records."""
+        from ..models.footprint import deep_sizeof
+
+        with self._queue.mutex:
+            records = [record for record in self._queue.queue if record is not None]
+        return {
+            "bytes": deep_sizeof(records),
+            "queued": len(records),
+            "capacity": self._queue.maxsize,
+            "dropped": self.dropped,
+        }
+
+    def stats(self) -> Dict[str, int]:
+        """Return written, dropped and queued record counts."""
+        with self._counts_lock:
+            written, dropped = self.written, self.dropped
+        return {"written": written, "dropped": dropped, "queued": self._queue.qsize()}
+
+    def _count(self, written: int = 0, dropped: int = 0) -> None:
+        with self._counts_lock:
+            self.written += written
+            self.dropped += dropped
+
+    def _write_loop(self) -> None:
+        stopping = False
+        try:
+            while not stopping:
+                try:
+                    first = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                if first is None:
+                    break
+                batch = [first]
+                while len(batch) < self.batch_size:
+                    try:
+                        record = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if record is None:
+                        stopping = True
+                        break
+                    batch.append(record)
+                self._write(batch)
+        finally:
+            self.writer.close()
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self.writer.write_batch(batch)
+            self._count(written=len(batch))
+        except Exception as e:
+            # Disk errors must not kill the API; the batch is counted as dropped.
+            self._count(dropped=len(batch))
+            logger.error(f"{self.name}: failed to write {len(batch)} records: {e}")
@@ -0,0 +1,215 @@
+"""
+Tenant-aware model selection.
+
+Each tenant (business unit) maps to a model directory and a default
+threshold, and is identified by one of its API keys or by a tenant header.
+Classifiers are loaded lazily into a memory-bounded LRU pool keyed by the
+resolved model directory, so tenants sharing artifacts share one instance.
+Loads run on a small thread pool; requests for a cold tenant wait on its
+single in-flight load while other tenants keep being served.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def _pool_key(models_dir: str) -> str:
+    return str(Path(models_dir).resolve())
+
+
+def classifier_bytes(classifier) -> int:
+    """Approximate memory of a loaded classifier (size of its serialized artifacts)."""
+    total = 0
+    for path in getattr(classifier.backend, "artifact_paths", []):
+        try:
+            total += Path(path).stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+class ClassifierPool:
+    """LRU pool of loaded classifiers bounded by count and artifact bytes."""
+
+    def __init__(
+        self,
+        classifier_factory: Callable[[str], Any],
+        max_models: int = 8,
+        max_bytes: int = 512 * 1024 * 1024,
+        pinned: Optional[Dict[str, Any]] = None,
+        loader_threads: int = 2,
+    ):
+        """Initialize the pool.
+
+        Args:
+            classifier_factory: Builds an unloaded classifier for a models directory
+            max_models: Loaded classifiers kept (pinned ones excluded)
+            max_bytes: Artifact bytes kept (pinned ones excluded)
+            pinned: Already loaded classifiers by models directory, never evicted
+            loader_threads: Concurrent model loads
+        """
+        self.classifier_factory = classifier_factory
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self.pinned = {_pool_key(path): classifier for path, classifier in (pinned or {}).items()}
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.load_failures = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._loading: Dict[str, Future] = {}
+        self.loader_threads = loader_threads
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get(self, models_dir: str) -> Future:
+        """Return a future of the loaded classifier, starting a load on a miss."""
+        key = _pool_key(models_dir)
+        with self._lock:
+            classifier = self.pinned.get(key)
+            if classifier is None and key in self._entries:
+                self._entries.move_to_end(key)
+                classifier = self._entries[key][0]
+            if classifier is not None:
+                self.hits += 1
+                future: Future = Future()
+                future.set_result(classifier)
+                return future
+
+            self.misses += 1
+            future = self._loading.get(key)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        self.loader_threads, thread_name_prefix="model-loader"
+                    )
+                # One load per directory, however many requests are waiting for it.
+                future = self._executor.submit(self._load, key)
+                self._loading[key] = future
+            return future
+
+    async def acquire(self, models_dir: str):
+        """Loaded classifier for a models directory, without blocking the event loop."""
+        future = self.get(models_dir)
+        if future.done():
+            return future.result()
+        return await asyncio.wrap_future(future)
+
+    def _load(self, key: str):
+        start = time.perf_counter()
+        try:
+            classifier = self.classifier_factory(key)
+            classifier.load()
+        except Exception:
+            with self._lock:
+                self.load_failures += 1
+                self._loading.pop(key, None)
+            raise
+        size = classifier_bytes(classifier)
+        with self._lock:
+            self.loads += 1
+            self.load_seconds += time.perf_counter() - start
+            self._entries[key] = (classifier, size)
+            self._loading.pop(key, None)
+            self._evict()
+        return classifier
+
+    def _evict(self) -> None:
+        # The most recently loaded classifier is always kept, even if it alone
+        # exceeds max_bytes.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_models or self._bytes() > self.max_bytes
+        ):
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _bytes(self) -> int:
+        return sum(size for _, size in self._entries.values())
+
+    def close(self) -> None:
+        """Stop the loader threads (a later miss starts new ones)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def loaded(self) -> Dict[str, Any]:
+        """Pooled classifiers by models directory (the pinned ones are not included)."""
+        with self._lock:
+            return {path: classifier for path, (classifier, _) in self._entries.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss, load and eviction counters and current occupancy."""
+        with self._lock:
+            return {
+                "loaded": len(self._entries),
+                "pinned": len(self.pinned),
+                "loading": len(self._loading),
+                "bytes": self._bytes(),
+                "max_models": self.max_models,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "load_failures": self.load_failures,
+                "evictions": self.evictions,
+                "load_seconds": round(self.load_seconds, 4),
+                "models_dirs": list(self._entries),
+            }
+
+
+class TenantDirectory:
+    """Tenants identified by API key or tenant id."""
+
+    def __init__(self, tenants: Dict[str, Dict[str, Any]]):
+        """Initialize from the TENANTS setting.
+
+        Args:
+            tenants: {tenant_id: {"models_dir", "threshold", "api_keys": [...]}};
+                without models_dir the tenant uses the primary classifier, without
+                threshold the request's
+
+        Raises:
+            ValueError: If a threshold is outside [0, 1] or an API key is reused
+        """
+        self.tenants: Dict[str, Dict[str, Any]] = {}
+        self._by_key: Dict[str, str] = {}
+        for tenant_id, config in tenants.items():
+            threshold = config.get("threshold")
+            if threshold is not None and not 0.0 <= float(threshold) <= 1.0:
+                raise ValueError(f"Threshold of tenant {tenant_id} must be in [0, 1]")
+            self.tenants[tenant_id] = {
+                "tenant_id": tenant_id,
+                "models_dir": config.get("models_dir"),
+                "threshold": float(threshold) if threshold is not None else None,
+            }
+            for api_key in config.get("api_keys", []):
+                if api_key in self._by_key:
+                    raise ValueError(f"API key of tenant {tenant_id} is already assigned")
+                self._by_key[api_key] = tenant_id
+
+    def resolve(
+        self, api_key: Optional[str], tenant_id: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Return the tenant of a request (None without credentials).
+
+        Without configured tenants, tenancy is off and every request uses
+        the primary classifier, whatever headers a gateway may have set.
+
+        Raises:
+            KeyError: If the API key or tenant id is unknown
+        """
+        if not self.tenants:
+            return None
+        if api_key:
+            return self.tenants[self._by_key[api_key]]
+        if tenant_id:
+            return self.tenants[tenant_id]
+        return None
@@ -0,0 +1,188 @@
+"""
+Wire formats of prediction payloads.
+
+JSON stays the default; clients asking for MessagePack in Accept (or
+sending it as Content-Type) get binary bodies, which skip float-to-text
+conversion and are smaller for probability-heavy batches. Batch results
+can also be laid out by column, so repeated keys and the shared
+model_info are sent once instead of once per message. Large bodies are
+compressed with zstd or gzip when the client accepts it.
+"""
+
+import gzip
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import msgpack
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+MEDIA_TYPES = {
+    JSON: JSON,
+    MSGPACK: MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+
+# Preferred first when the client accepts several with the same quality
+ENCODINGS = ("zstd", "gzip")
+GZIP_LEVEL = 5
+ZSTD_LEVEL = 3
+
+# Per-message fields of the columnar batch layout
+COLUMNS = (
+    "prediction",
+    "is_spam",
+    "confidence",
+    "probability_spam",
+    "probability_ham",
+    "near_duplicate",
+    "decided_by",
+)
+
+
+class UnsupportedMediaType(ValueError):
+    """A request body in a format other than JSON or MessagePack."""
+
+
+def _preferences(header: Optional[str]) -> List[Tuple[str, float]]:
+    """Values of an Accept-style header with their quality, best first."""
+    preferences = []
+    for position, item in enumerate((header or "").split(",")):
+        value, *params = [part.strip() for part in item.split(";")]
+        if not value:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, number = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        preferences.append((value.lower(), quality, position))
+    preferences.sort(key=lambda preference: (-preference[1], preference[2]))
+    return [(value, quality) for value, quality, _ in preferences if quality > 0]
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """Media type of the response: the best supported type in Accept, else JSON."""
+    for value, _ in _preferences(accept):
+        if value in MEDIA_TYPES:
+            return MEDIA_TYPES[value]
+        if value in ("*/*", "application/*"):
+            return JSON
+    return JSON
+
+
+def request_media_type(content_type: Optional[str]) -> str:
+    """Media type of a request body (JSON when missing).
+
+    Raises:
+        UnsupportedMediaType: If the content type is not supported
+    """
+    value = (content_type or JSON).split(";")[0].strip().lower()
+    if value not in MEDIA_TYPES:
+        raise UnsupportedMediaType(f"Unsupported content type: {value}")
+    return MEDIA_TYPES[value]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Content encoding of the response (None for identity)."""
+    accepted = dict(_preferences(accept_encoding))
+    candidates = [
+        encoding
+        for encoding in ENCODINGS
+        if encoding in accepted or "*" in accepted
+        if encoding != "zstd" or zstandard is not None
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda encoding: accepted.get(encoding, accepted.get("*", 0.0)))
+
+
+def decode(body: bytes, media_type: str) -> Any:
+    """Parse a request body.
+
+    Raises:
+        ValueError: If the body is not valid for its media type
+    """
+    if media_type == MSGPACK:
+        try:
+            return msgpack.unpackb(body, raw=False)
+        except Exception as e:
+            raise ValueError(f"Body is not valid MessagePack: {e}") from e
+    try:
+        return json.loads(body)
+    except ValueError as e:
+        raise ValueError(f"Body is not valid JSON: {e}") from e
+
+
+def encode(payload: Any, media_type: str) -> bytes:
+    """Serialize a response payload."""
+    if media_type == MSGPACK:
+        # Results are rounded to 4 decimals: float32 keeps them and halves their size.
+        return msgpack.packb(payload, use_bin_type=True, use_single_float=True)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a body with a negotiated content encoding."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def decode_request(body: bytes, content_type: Optional[str]) -> Any:
+    """Parse a JSON or MessagePack request body.
+
+    Raises:
+        UnsupportedMediaType: If the content type is not JSON or MessagePack
+        ValueError: If the body is invalid
+    """
+    return decode(body, request_media_type(content_type))
+
+
+def encode_response(
+    payload: Any,
+    accept: Optional[str],
+    accept_encoding: Optional[str],
+    min_bytes: Optional[int] = None,
+) -> Tuple[bytes, Dict[str, str]]:
+    """Serialize a payload for a client, returning the body and its headers.
+
+    Args:
+        payload: JSON-compatible response payload
+        accept: Accept header of the request
+        accept_encoding: Accept-Encoding header of the request
+        min_bytes: Smallest body compressed (None disables compression)
+    """
+    media_type = negotiate_media_type(accept)
+    body = encode(payload, media_type)
+    headers = {"Content-Type": media_type, "Vary": "Accept, Accept-Encoding"}
+    encoding = negotiate_encoding(accept_encoding) if min_bytes is not None else None
+    if encoding is not None and len(body) >= min_bytes:
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return body, headers
+
+
+def columnar(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Lay out batch results by column, with the model_info of the batch sent once.
+
+    When the results come from different models (A/B variants, or
+    sub-batches scored by different instances behind the router),
+    model_info is a column too, so each message keeps its model.
+    """
+    model_infos = [result["model_info"] for result in results]
+    shared = all(model_info == model_infos[0] for model_info in model_infos)
+    return {
+        "count": len(results),
+        **{column: [result[column] for result in results] for column in COLUMNS},
+        "model_info": (model_infos[0] if results else None) if shared else model_infos,
+    }
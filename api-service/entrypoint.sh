@@ -31,6 +31,19 @@ case "${1:-runserver}" in
     WORKERS=${WORKERS:-4}
     LOG_LEVEL=${LOG_LEVEL:-info}
     exec uvicorn app.main:app \
+      --host 0.0.0.0 \
+      --port "$PORT" \
+      --workers "$WORKERS" \
+      --timeout-graceful-shutdown "${DRAIN_GRACE_PERIOD:-30}" \
+      --log-level "$LOG_LEVEL"
+    ;;
+
+  router)
+    # Cache-affinity routing front-end; needs ROUTER_BACKENDS, not the models
+    PORT=${ROUTER_PORT:-8080}
+    WORKERS=${ROUTER_WORKERS:-1}
+    LOG_LEVEL=${LOG_LEVEL:-info}
+    exec uvicorn app.proxy:app \
       --host 0.0.0.0 \
       --port "$PORT" \
       --workers "$WORKERS" \
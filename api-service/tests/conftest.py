@@ -2,10 +2,16 @@
 Pytest configuration and shared fixtures.
 """
 
+import random
 from unittest.mock import MagicMock, Mock
 
+import joblib
 import numpy as np
 import pytest
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import LabelEncoder
+from sklearn.svm import LinearSVC
 
 from app.models.spam_classifier import SpamClassifier
 
@@ -67,6 +73,48 @@ def classifier_unloaded():
     return classifier
 
 
-
-
-
+SPAM_WORDS = "free money win prize click claim offer cash bonus winner urgent deal".split()
+HAM_WORDS = "meeting schedule project report team lunch review budget agenda notes".split()
+COMMON_WORDS = "the to and of you your we our is for this that with on please".split()
+
+
+@pytest.fixture(scope="session")
+def training_corpus():
+    """Small deterministic labeled corpus of spam-like and ham-like messages."""
+    rng = random.Random(42)
+    messages, labels = [], []
+    for i in range(400):
+        label = "spam" if i % 2 else "ham"
+        words = (SPAM_WORDS if label == "spam" else HAM_WORDS) + COMMON_WORDS
+        messages.append(" ".join(rng.choice(words) for _ in range(rng.randint(8, 40))))
+        labels.append(label)
+    return messages, labels
+
+
+@pytest.fixture(scope="session")
+def fitted_vectorizer(training_corpus):
+    """TF-IDF vectorizer fitted like the training notebooks."""
+    messages, _ = training_corpus
+    vectorizer = TfidfVectorizer(
+        min_df=2, max_df=0.95, ngram_range=(1, 2), stop_words="english"
+    )
+    return vectorizer.fit(messages)
+
+
+@pytest.fixture(scope="session")
+def trained_models_dir(tmp_path_factory, training_corpus, fitted_vectorizer):
+    """Directory with real artifacts trained like the notebooks (small corpus)."""
+    messages, labels = training_corpus
+    encoder = LabelEncoder().fit(labels)
+    model = CalibratedClassifierCV(LinearSVC(random_state=42), method="sigmoid", cv=3)
+    model.fit(fitted_vectorizer.transform(messages), encoder.transform(labels))
+
+    models_dir = tmp_path_factory.mktemp("models")
+    joblib.dump(model, models_dir / "best_model_temp.joblib")
+    joblib.dump(fitted_vectorizer, models_dir / "tfidf_vectorizer.joblib")
+    joblib.dump(encoder, models_dir / "label_encoder.joblib")
+    joblib.dump(
+        {"model_name": "LinearSVC", "features_count": len(fitted_vectorizer.vocabulary_)},
+        models_dir / "metadata.joblib",
+    )
+    return models_dir
@@ -2,6 +2,8 @@
 Unit tests for prediction controller.
 """
 
+from unittest.mock import MagicMock
+
 import pytest
 from fastapi import HTTPException, status
 
@@ -79,3 +81,44 @@ def test_classify_email_exception_handling(classifier_mock):
         with pytest.raises(HTTPException) as exc_info:
             PredictionController.classify_email(classifier_mock, email_data)
         assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+def test_classification_decisions_are_audited(classifier_mock):
+    """Test each decision is handed to the audit log with its threshold and latency."""
+    audit_log = MagicMock()
+    email_data = {"message": "Free money! Click here now!", "threshold": 0.7}
+    result = PredictionController.classify_email(classifier_mock, email_data, audit_log)
+
+    endpoint, message, threshold, logged, latency_ms = audit_log.log.call_args.args
+    assert (endpoint, message, threshold) == ("predict", email_data["message"], 0.7)
+    assert logged is result
+    assert latency_ms >= 0
+
+    extraction = {"text": "Win a prize", "parts": 1}
+    PredictionController.classify_eml(classifier_mock, extraction, 0.5, audit_log)
+    assert audit_log.log.call_args.args[:3] == ("predict/eml", "Win a prize", 0.5)
+
+
+def test_failed_classification_is_not_audited(classifier_unloaded):
+    """Test requests that produce no decision are not audited."""
+    audit_log = MagicMock()
+    with pytest.raises(HTTPException):
+        PredictionController.classify_email(classifier_unloaded, {"message": "x"}, audit_log)
+    audit_log.log.assert_not_called()
+
+
+def test_batch_decisions_are_audited(trained_models_dir):
+    """Test each message of a batch is audited with its share of the latency."""
+    from app.models import SpamClassifier
+
+    classifier = SpamClassifier(models_dir=str(trained_models_dir))
+    classifier.load()
+    audit_log = MagicMock()
+    results = PredictionController.classify_batch(
+        classifier, ["free money now!!", "meeting notes attached"], 0.7, audit_log
+    )
+    assert len(results) == 2
+    assert [call.args[:3] for call in audit_log.log.call_args_list] == [
+        ("predict/batch", "free money now!!", 0.7),
+        ("predict/batch", "meeting notes attached", 0.7),
+    ]
@@ -6,6 +6,17 @@ import pytest
 from unittest.mock import patch, MagicMock
 
 from app.core import lifecycle
+from app.core.timeline import StartupTimeline
+
+
+@pytest.fixture(autouse=True)
+def no_warm_up():
+    """The classifier is not really loaded in these tests."""
+    with patch.object(lifecycle.classifier, 'warm_up') as mock_warm_up, \
+         patch.object(lifecycle, 'startup_timeline', StartupTimeline()):
+        yield mock_warm_up
+    # shutdown_event stops admission; later tests serve requests
+    lifecycle.drain_coordinator.reset()
 
 
 def test_startup_event_success():
@@ -34,3 +45,120 @@ def test_shutdown_event():
     import asyncio
     asyncio.run(lifecycle.shutdown_event())
 
+
+def test_job_runner_follows_settings():
+    """Test job workers are started and stopped only when jobs are enabled."""
+    import asyncio
+    with patch.object(lifecycle.classifier, 'load'), \
+         patch.object(lifecycle.classifier, 'get_model_info', return_value={}), \
+         patch.object(lifecycle.settings, 'jobs_enabled', True), \
+         patch.object(lifecycle.job_runner, 'start') as mock_start, \
+         patch.object(lifecycle.job_runner, 'stop') as mock_stop:
+        asyncio.run(lifecycle.startup_event())
+        asyncio.run(lifecycle.shutdown_event())
+
+        mock_start.assert_called_once()
+        mock_stop.assert_called_once()
+
+
+def test_traffic_recorder_started_when_capture_enabled():
+    """Test the traffic recorder follows the application lifecycle."""
+    import asyncio
+    with patch.object(lifecycle.classifier, 'load'), \
+         patch.object(lifecycle.classifier, 'get_model_info', return_value={}), \
+         patch.object(lifecycle.settings, 'capture_enabled', True), \
+         patch.object(lifecycle.traffic_recorder, 'start') as mock_start, \
+         patch.object(lifecycle.traffic_recorder, 'stop') as mock_stop:
+        asyncio.run(lifecycle.startup_event())
+        asyncio.run(lifecycle.shutdown_event())
+
+        mock_start.assert_called_once()
+        mock_stop.assert_called_once()
+
+
+def test_audit_log_follows_lifecycle():
+    """Test the audit log is started and flushed with the application."""
+    import asyncio
+    audit_log = MagicMock()
+    with patch.object(lifecycle.classifier, 'load'), \
+         patch.object(lifecycle.classifier, 'get_model_info', return_value={}), \
+         patch.object(lifecycle, 'audit_log', audit_log):
+        asyncio.run(lifecycle.startup_event())
+        asyncio.run(lifecycle.shutdown_event())
+
+    audit_log.start.assert_called_once()
+    audit_log.stop.assert_called_once()
+
+
+def test_model_registry_loaded_when_configured():
+    """Test registered model versions are loaded at startup and stopped at shutdown."""
+    import asyncio
+    with patch.object(lifecycle.classifier, 'load'), \
+         patch.object(lifecycle.classifier, 'get_model_info', return_value={}), \
+         patch.object(lifecycle.model_registry, 'models', [MagicMock()]), \
+         patch.object(lifecycle.model_registry, 'load') as mock_load, \
+         patch.object(lifecycle.model_registry, 'stop') as mock_stop:
+        asyncio.run(lifecycle.startup_event())
+        asyncio.run(lifecycle.shutdown_event())
+
+        mock_load.assert_called_once()
+        mock_stop.assert_called_once()
+
+
+def test_prediction_cache_follows_lifecycle():
+    """Test the persistent prediction cache is started and flushed with the application."""
+    import asyncio
+    prediction_cache = MagicMock()
+    with patch.object(lifecycle.classifier, 'load'), \
+         patch.object(lifecycle.classifier, 'get_model_info', return_value={}), \
+         patch.object(lifecycle, 'prediction_cache', prediction_cache):
+        asyncio.run(lifecycle.startup_event())
+        asyncio.run(lifecycle.shutdown_event())
+
+    prediction_cache.start.assert_called_once()
+    prediction_cache.stop.assert_called_once()
+
+
+def test_startup_timeline_reports_load_and_warm_up(no_warm_up, caplog):
+    """Test artifacts and warm-up are timed and the timeline is logged at INFO."""
+    import asyncio
+    with patch.object(lifecycle.classifier, 'load'), \
+         patch.object(lifecycle.classifier, 'get_model_info', return_value={}), \
+         patch.object(lifecycle.classifier, 'load_timings', {"metadata.joblib": (1.0, 1.5)}), \
+         caplog.at_level("INFO", logger=lifecycle.logger.name):
+        asyncio.run(lifecycle.startup_event())
+
+    no_warm_up.assert_called_once()
+    phases = lifecycle.startup_timeline.to_dict()
+    assert list(phases) == ["model load", "artifact metadata.joblib", "warm-up"]
+    assert phases["artifact metadata.joblib"]["seconds"] == 0.5
+    assert "Startup timeline" in caplog.text
+
+
+def test_warm_up_skipped_when_disabled(no_warm_up):
+    """Test WARM_UP_ENABLED=false starts without scoring a message."""
+    import asyncio
+    with patch.object(lifecycle.classifier, 'load'), \
+         patch.object(lifecycle.classifier, 'get_model_info', return_value={}), \
+         patch.object(lifecycle.settings, 'warm_up_enabled', False):
+        asyncio.run(lifecycle.startup_event())
+
+    no_warm_up.assert_not_called()
+
+
+def test_shutdown_drains_and_logs_report(caplog):
+    """Test shutdown refuses new work, flushes sinks and logs what was drained."""
+    import asyncio
+    audit_log = MagicMock()
+    audit_log.stats.side_effect = [
+        {"written": 0, "dropped": 0, "queued": 3},
+        {"written": 3, "dropped": 0, "queued": 0},
+    ]
+    with patch.object(lifecycle, 'audit_log', audit_log), caplog.at_level("INFO"):
+        asyncio.run(lifecycle.shutdown_event())
+
+    assert not lifecycle.drain_coordinator.admitting
+    assert lifecycle.drain_coordinator.report["audit"] == {
+        "queued": 3, "written": 3, "dropped": 0, "left": 0,
+    }
+    assert "Drain report" in caplog.text
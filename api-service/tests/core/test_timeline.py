@@ -0,0 +1,75 @@
+"""
+Unit tests for the startup timeline and the cold-start budget.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.timeline import StartupTimeline
+
+API_SERVICE_DIR = Path(__file__).resolve().parents[2]
+
+# Cold start in a fresh interpreter: imports, artifact loading and warm-up
+COLD_START = """
+import asyncio, json, sys
+import app.main
+# sklearn modules imported by the app itself, before any model is unpickled
+IMPORTED = set(sys.modules)
+from app.core import startup_event, startup_timeline
+asyncio.run(startup_event())
+print(json.dumps({
+    "total_seconds": startup_timeline.total_seconds,
+    "phases": list(startup_timeline.to_dict()),
+    "sklearn_imported_by_app": "sklearn.feature_extraction" in IMPORTED,
+}))
+"""
+
+
+def test_timeline_offsets_and_total():
+    """Test phases are reported relative to the origin."""
+    timeline = StartupTimeline(origin=10.0)
+    timeline.add("import", 10.0, 10.5)
+    timeline.add("model load", 10.5, 11.25)
+
+    assert timeline.total_seconds == 1.25
+    assert timeline.to_dict()["model load"] == {"offset": 0.5, "seconds": 0.75}
+
+
+def test_timeline_phase_context_manager():
+    """Test a with block is recorded even when it raises."""
+    timeline = StartupTimeline()
+    try:
+        with timeline.phase("warm-up"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert list(timeline.to_dict()) == ["warm-up"]
+    assert StartupTimeline().total_seconds == 0.0
+
+
+def test_cold_start_within_budget(trained_models_dir):
+    """Test import + model load stays under STARTUP_BUDGET_SECONDS on the fixture model."""
+    env = dict(os.environ, MODELS_DIR=str(trained_models_dir))
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START],
+        cwd=API_SERVICE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report["phases"][:2] == ["import", "model load"]
+    assert "artifact best_model_temp.joblib" in report["phases"]
+    assert not report["sklearn_imported_by_app"]
+    assert report["total_seconds"] <= settings.startup_budget_seconds, (
+        f"Cold start took {report['total_seconds']:.3f}s "
+        f"(budget {settings.startup_budget_seconds}s)"
+    )
@@ -0,0 +1,99 @@
+"""
+Unit tests for concurrent, checksum-verified artifact loading.
+"""
+
+import shutil
+
+import joblib
+import pytest
+
+from app.models import SpamClassifier
+from app.models.artifacts import (
+    CHECKSUMS_FILE,
+    ArtifactLoader,
+    file_sha256,
+    read_checksums,
+    refresh_checksums,
+    write_checksums,
+)
+
+ARTIFACTS = (
+    "best_model_temp.joblib",
+    "tfidf_vectorizer.joblib",
+    "label_encoder.joblib",
+    "metadata.joblib",
+)
+
+
+@pytest.fixture
+def models_dir(tmp_path, trained_models_dir):
+    """Copy of the trained artifacts with a checksums.json manifest."""
+    models_dir = tmp_path / "models"
+    shutil.copytree(trained_models_dir, models_dir)
+    write_checksums(models_dir, ARTIFACTS)
+    return models_dir
+
+
+def test_write_checksums_lists_existing_artifacts(models_dir):
+    """Test the manifest holds the SHA-256 of each artifact that exists."""
+    checksums = write_checksums(models_dir, ARTIFACTS + ("missing.joblib",))
+
+    assert sorted(checksums) == sorted(ARTIFACTS)
+    assert checksums["metadata.joblib"] == file_sha256(models_dir / "metadata.joblib")
+    assert read_checksums(models_dir) == checksums
+
+
+def test_loader_reads_artifacts_concurrently(models_dir):
+    """Test submitted artifacts are loaded and timed."""
+    with ArtifactLoader(models_dir, max_workers=4) as loader:
+        futures = {name: loader.submit(models_dir / name) for name in ARTIFACTS}
+        metadata = futures["metadata.joblib"].result()
+
+    assert metadata["model_name"] == "LinearSVC"
+    assert sorted(loader.timings) == sorted(ARTIFACTS)
+    assert all(end >= start for start, end in loader.timings.values())
+
+
+def test_checksum_mismatch_fails_load(models_dir):
+    """Test a modified artifact is rejected before it is deserialized."""
+    joblib.dump({"model_name": "tampered"}, models_dir / "metadata.joblib")
+
+    with ArtifactLoader(models_dir) as loader:
+        with pytest.raises(ValueError, match="Checksum mismatch for metadata.joblib"):
+            loader.submit(models_dir / "metadata.joblib").result()
+
+    with pytest.raises(RuntimeError, match="Checksum mismatch"):
+        SpamClassifier(models_dir=str(models_dir)).load()
+
+    # Verification can be turned off (VERIFY_CHECKSUMS=false)
+    classifier = SpamClassifier(models_dir=str(models_dir), verify_checksums=False)
+    classifier.load()
+    assert classifier.metadata["model_name"] == "tampered"
+
+
+def test_refresh_checksums_after_replacing_artifacts(models_dir, trained_models_dir):
+    """Test an existing manifest is rewritten, and none is created."""
+    joblib.dump({"model_name": "retrained"}, models_dir / "metadata.joblib")
+    refresh_checksums(models_dir)
+    SpamClassifier(models_dir=str(models_dir)).load()
+
+    plain_dir = models_dir.parent / "plain"
+    shutil.copytree(trained_models_dir, plain_dir)
+    assert refresh_checksums(plain_dir, ["metadata.joblib"]) is None
+    assert not (plain_dir / CHECKSUMS_FILE).exists()
+
+
+def test_classifier_load_records_artifact_timings(models_dir):
+    """Test the classifier exposes per-artifact load times and can warm up."""
+    classifier = SpamClassifier(models_dir=str(models_dir), loader_threads=2)
+    classifier.load()
+    classifier.warm_up()
+
+    assert sorted(classifier.load_timings) == sorted(ARTIFACTS)
+    assert classifier.label_encoder is not None
+
+
+def test_warm_up_requires_loaded_model():
+    """Test warm-up is refused before load()."""
+    with pytest.raises(RuntimeError, match="not loaded"):
+        SpamClassifier(models_dir="tests/fixtures/models").warm_up()
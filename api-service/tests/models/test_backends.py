@@ -0,0 +1,105 @@
+"""
+Unit tests for the inference backends and the ONNX export.
+"""
+
+import shutil
+
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("skl2onnx")
+
+from app.models import OnnxBackend, SklearnBackend, SpamClassifier, create_backend  # noqa: E402
+from app.models.onnx_export import compare_backends, export_onnx  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def onnx_models_dir(tmp_path_factory, trained_models_dir):
+    """Copy of the trained artifacts with exported ONNX graphs."""
+    models_dir = tmp_path_factory.mktemp("onnx_models") / "models"
+    shutil.copytree(trained_models_dir, models_dir)
+    assert export_onnx(str(models_dir)) == {"model.onnx": "tokens", "scorer.onnx": "scorer"}
+    return models_dir
+
+
+def load(models_dir, backend):
+    classifier = SpamClassifier(models_dir=str(models_dir), backend=backend)
+    classifier.load()
+    return classifier
+
+
+def test_onnx_matches_sklearn(onnx_models_dir, training_corpus):
+    """Test both ONNX graphs reproduce scikit-learn probabilities."""
+    messages, _ = training_corpus
+    messages = messages + ["", "the and of", "FREE money!!! Claim now, winner"]
+    sklearn_classifier = load(onnx_models_dir, SklearnBackend())
+    onnx_classifier = load(onnx_models_dir, OnnxBackend())
+
+    expected = sklearn_classifier.predict_spam_probabilities(messages)
+    np.testing.assert_allclose(
+        onnx_classifier.predict_spam_probabilities(messages), expected, atol=1e-5
+    )
+    # Token graph (short messages) and scorer graph (long-message mode)
+    message = {"message": messages[1]}
+    for method in ("classify", "classify_long"):
+        onnx_result = getattr(onnx_classifier, method)(message)
+        sklearn_result = getattr(sklearn_classifier, method)(message)
+        assert onnx_result["probability_spam"] == pytest.approx(
+            sklearn_result["probability_spam"], abs=1e-4
+        )
+    assert onnx_classifier.model_version != sklearn_classifier.model_version
+
+
+def test_compare_backends_reports_parity_and_latency(onnx_models_dir, training_corpus):
+    """Test the benchmark compares predictions and latency of both backends."""
+    messages, _ = training_corpus
+    report = compare_backends(str(onnx_models_dir), messages[:100], intra_op_threads=2)
+
+    assert report["agreement"]["agreement"] == 1.0
+    assert report["agreement"]["max_abs_diff"] < 1e-5
+    assert report["sklearn"]["backend"]["name"] == "sklearn"
+    assert report["onnx"]["backend"]["intra_op_threads"] == 2
+    for name in ("sklearn", "onnx"):
+        assert report[name]["latency"]["p99_ms"] > 0
+        assert report[name]["latency"]["batch_messages_per_second"] > 0
+
+
+def test_model_info_describes_backend(onnx_models_dir):
+    """Test the active runtime is reported with the model information."""
+    info = load(onnx_models_dir, create_backend("onnx", intra_op_threads=0)).get_model_info()
+    assert info["backend"]["name"] == "onnx"
+    assert info["backend"]["runtime"].startswith("onnxruntime")
+    assert info["backend"]["intra_op_threads"] == 0
+    assert info["backend"]["token_graph"] is True
+
+    info = load(onnx_models_dir, None).get_model_info()
+    assert info["backend"]["name"] == "sklearn"
+
+
+def test_onnx_without_token_graph_uses_scorer(onnx_models_dir, tmp_path, training_corpus):
+    """Test the scorer graph serves every message when model.onnx is absent."""
+    messages, _ = training_corpus
+    shutil.copytree(onnx_models_dir, tmp_path / "models")
+    (tmp_path / "models" / "model.onnx").unlink()
+
+    classifier = load(tmp_path / "models", OnnxBackend())
+    assert classifier.backend.describe()["token_graph"] is False
+    np.testing.assert_allclose(
+        classifier.predict_spam_probabilities(messages[:50]),
+        load(onnx_models_dir, None).predict_spam_probabilities(messages[:50]),
+        atol=1e-5,
+    )
+
+
+def test_onnx_requires_exported_scorer(trained_models_dir):
+    """Test loading the ONNX backend without exported graphs fails clearly."""
+    with pytest.raises(RuntimeError, match="export_onnx.py"):
+        load(trained_models_dir, OnnxBackend())
+
+
+def test_create_backend_rejects_unknown_name():
+    """Test backend names are validated."""
+    assert isinstance(create_backend("sklearn"), SklearnBackend)
+    with pytest.raises(ValueError):
+        create_backend("tensorrt")
@@ -0,0 +1,140 @@
+"""
+Unit tests for the streaming drift monitor.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.models.drift import (
+    DriftMonitor,
+    VocabularyCoverage,
+    population_stability_index,
+    reference_statistics,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope="module")
+def reference(training_corpus, fitted_vectorizer):
+    """Reference statistics of the training corpus."""
+    messages, labels = training_corpus
+    probabilities = [0.9 if label == "spam" else 0.1 for label in labels]
+    return reference_statistics(messages, probabilities, fitted_vectorizer)
+
+
+def test_vocabulary_coverage(fitted_vectorizer):
+    """Test OOV ratio ignores stop words and caps inspected tokens."""
+    coverage = VocabularyCoverage(fitted_vectorizer, max_tokens=4)
+    known = next(iter(fitted_vectorizer.vocabulary_))
+    assert coverage.oov_ratio(f"the {known} and {known}") == 0.0
+    assert coverage.oov_ratio(f"{known} zorblax quuxify") == pytest.approx(2 / 3)
+    assert coverage.oov_ratio(f"{known} {known} {known} {known} zorblax") == 0.0
+    assert coverage.oov_ratio("the and of") is None
+
+    with pytest.raises(ValueError):
+        VocabularyCoverage(object())
+
+
+def test_reference_statistics(reference, training_corpus):
+    """Test reference histograms count every training message."""
+    messages, labels = training_corpus
+    histograms = reference["histograms"]
+    assert reference["samples"] == len(messages)
+    assert sum(histograms["probability_spam"]) == len(messages)
+    assert histograms["spam_rate"] == [labels.count("ham"), labels.count("spam")]
+    assert sum(histograms["message_length"]) == len(messages)
+    assert histograms["oov_ratio"][0] > 0.9 * len(messages)
+
+
+def test_population_stability_index():
+    """Test PSI is zero for equal distributions and grows with the shift."""
+    assert population_stability_index([10, 20, 30], [1, 2, 3]) == pytest.approx(0.0)
+    small = population_stability_index([50, 50], [55, 45])
+    large = population_stability_index([50, 50], [90, 10])
+    assert 0 < small < 0.1 < 0.25 < large
+    expected = (0.9 - 0.5) * math.log(0.9 / 0.5) + (0.1 - 0.5) * math.log(0.1 / 0.5)
+    assert large == pytest.approx(expected)
+
+
+def test_training_like_traffic_is_stable(reference, training_corpus, fitted_vectorizer):
+    """Test traffic distributed like the training data reports no drift."""
+    messages, labels = training_corpus
+    monitor = DriftMonitor(min_samples=50)
+    monitor.bind(fitted_vectorizer, reference)
+    for message, label in zip(messages, labels):
+        monitor.observe(message, 0.9 if label == "spam" else 0.1)
+
+    report = monitor.report()
+    assert report["status"] == "stable"
+    assert report["observed"] == len(messages)
+    assert report["spam_rate"] == report["reference_spam_rate"] == 0.5
+    assert all(feature["psi"] < 0.1 for feature in report["features"].values())
+
+
+def test_shifted_traffic_is_reported(reference, fitted_vectorizer):
+    """Test unseen vocabulary, longer messages and a spam surge are detected."""
+    monitor = DriftMonitor(min_samples=50)
+    monitor.bind(fitted_vectorizer, reference)
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        words = rng.choice(["zorblax", "quuxify", "blorptastic", "free"], size=300)
+        monitor.observe(" ".join(words), float(rng.uniform(0.6, 1.0)))
+
+    report = monitor.report()
+    assert report["status"] == "drift"
+    assert report["spam_rate"] == 1.0
+    features = report["features"]
+    assert {name: features[name]["status"] for name in features} == {
+        "probability_spam": "drift",
+        "oov_ratio": "drift",
+        "message_length": "drift",
+        "spam_rate": "drift",
+    }
+    assert len(features["probability_spam"]["current"]) == 20
+
+
+def test_rolling_window_expires_old_slots(reference, fitted_vectorizer, training_corpus):
+    """Test observations leave the window after window_seconds."""
+    clock = FakeClock()
+    monitor = DriftMonitor(window_seconds=60, slots=6, min_samples=1, clock=clock)
+    monitor.bind(fitted_vectorizer, reference)
+    message = training_corpus[0][0]
+
+    monitor.observe(message, 0.9)
+    clock.now += 30
+    monitor.observe(message, 0.1)
+    assert monitor.report()["observed"] == 2
+
+    clock.now += 35
+    assert monitor.report()["observed"] == 1
+    clock.now += 3600
+    report = monitor.report()
+    assert report["observed"] == 0
+    assert report["status"] == "insufficient_data"
+
+
+def test_report_without_reference(fitted_vectorizer):
+    """Test a model exported without reference statistics still tracks traffic."""
+    monitor = DriftMonitor(min_samples=1)
+    monitor.bind(fitted_vectorizer, None)
+    monitor.observe("free prize", 0.8)
+    report = monitor.report()
+    assert report["status"] == "no_reference"
+    assert report["spam_rate"] == 1.0
+    assert report["features"]["probability_spam"]["psi"] is None
+
+    # Vectorizers without a word analyzer only skip the OOV statistic
+    monitor.bind(object(), None)
+    monitor.observe("free prize", 0.8)
+    assert monitor.report()["features"]["oov_ratio"]["observations"] == 0
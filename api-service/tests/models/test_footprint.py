@@ -0,0 +1,47 @@
+"""
+Unit tests for the deep memory footprint of model artifacts.
+"""
+
+import sys
+
+import numpy as np
+
+from app.models import SpamClassifier
+from app.models.footprint import artifact_footprint, deep_sizeof
+
+
+def test_deep_sizeof_follows_references_once():
+    """Test containers, attributes and array buffers are counted, shared objects once."""
+    array = np.zeros(10000)
+    assert deep_sizeof(array) >= array.nbytes
+    # A view does not own its buffer: the data is counted through it
+    assert deep_sizeof(array[::2]) >= array[::2].nbytes
+
+    shared = list(range(1000, 2000))
+    holder = {"a": shared, "b": shared}
+    assert deep_sizeof(holder) < 2 * deep_sizeof(shared)
+    assert deep_sizeof(holder) > sys.getsizeof(holder) + sys.getsizeof(shared)
+
+    seen = set()
+    assert deep_sizeof(shared, seen) > 0
+    assert deep_sizeof(holder, seen) == sys.getsizeof(holder) + sum(map(sys.getsizeof, "ab"))
+
+
+def test_artifact_footprint_splits_parts(trained_models_dir):
+    """Test each artifact reports its fitted parts with their real sizes."""
+    classifier = SpamClassifier(models_dir=str(trained_models_dir))
+    classifier.load()
+    footprint = artifact_footprint(classifier)
+    artifacts = footprint["artifacts"]
+
+    vectorizer = artifacts["vectorizer"]
+    assert vectorizer["type"] == "TfidfVectorizer"
+    assert vectorizer["parts"]["idf_"] >= classifier.vectorizer.idf_.nbytes
+    assert vectorizer["parts"]["vocabulary_"] > vectorizer["parts"]["idf_"]
+
+    folds = classifier.model.calibrated_classifiers_
+    assert len(folds) == 3
+    for index, fold in enumerate(folds):
+        assert artifacts["model"]["parts"][f"fold_{index}.coef_"] >= fold.estimator.coef_.nbytes
+    assert artifacts["label_encoder"]["bytes"] > 0
+    assert footprint["total_bytes"] == sum(entry["bytes"] for entry in artifacts.values())
@@ -0,0 +1,129 @@
+"""
+Unit tests for the stateless hashed TF-IDF vectorizer.
+"""
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.preprocessing import LabelEncoder
+from sklearn.svm import LinearSVC
+
+from app.models import HashedTfidfVectorizer, SklearnBackend, SpamClassifier
+from app.models.long_text import ChunkedTfidfVectorizer
+from app.models.pruning import prune_models_dir
+
+
+@pytest.fixture(scope="module")
+def hashed_vectorizer(training_corpus):
+    """Hashed vectorizer fitted with the notebook parameters."""
+    messages, _ = training_corpus
+    return HashedTfidfVectorizer(n_features=2**18, stop_words="english").fit(messages)
+
+
+@pytest.fixture(scope="module")
+def hashed_models_dir(tmp_path_factory, training_corpus, hashed_vectorizer):
+    """Artifacts of the hashed variant, without a tfidf_vectorizer.joblib."""
+    messages, labels = training_corpus
+    encoder = LabelEncoder().fit(labels)
+    model = CalibratedClassifierCV(LinearSVC(random_state=42), method="sigmoid", cv=3)
+    model.fit(hashed_vectorizer.transform(messages), encoder.transform(labels))
+
+    models_dir = tmp_path_factory.mktemp("hashed_models")
+    joblib.dump(model, models_dir / "best_model_temp.joblib")
+    joblib.dump(hashed_vectorizer, models_dir / "hashing_vectorizer.joblib")
+    joblib.dump(encoder, models_dir / "label_encoder.joblib")
+    joblib.dump(
+        {"base_model_type": "LinearSVC", "vectorizer_type": "HashedTfidfVectorizer"},
+        models_dir / "metadata.joblib",
+    )
+    return models_dir
+
+
+def test_transform_matches_vocabulary_tfidf(hashed_vectorizer, fitted_vectorizer, training_corpus):
+    """Test hashed TF-IDF equals vocabulary TF-IDF up to column order when nothing collides."""
+    messages, _ = training_corpus
+    assert len(hashed_vectorizer.columns_) == len(fitted_vectorizer.vocabulary_)
+
+    hashed = hashed_vectorizer.transform(messages[:50]).toarray()
+    reference = fitted_vectorizer.transform(messages[:50]).toarray()
+    order = [
+        hashed_vectorizer.feature_index(term)
+        for term in fitted_vectorizer.get_feature_names_out()
+    ]
+    np.testing.assert_allclose(hashed[:, order], reference)
+
+
+def test_feature_index_unknown_term(hashed_vectorizer):
+    """Test terms outside the selected buckets have no column."""
+    assert hashed_vectorizer.feature_index("zzzunseenterm") is None
+
+
+def test_max_features_and_sublinear_tf(training_corpus):
+    """Test bucket selection keeps the most frequent buckets."""
+    messages, _ = training_corpus
+    vectorizer = HashedTfidfVectorizer(max_features=10, min_df=0.01, max_df=50, sublinear_tf=True)
+    X = vectorizer.fit_transform(messages)
+    assert X.shape == (len(messages), 10)
+    np.testing.assert_allclose(np.sqrt(X.multiply(X).sum(axis=1)).A.ravel()[X.getnnz(axis=1) > 0], 1.0)
+
+
+def test_fit_and_transform_errors():
+    """Test empty selections and unfitted use raise."""
+    with pytest.raises(ValueError, match="not fitted"):
+        HashedTfidfVectorizer().transform(["hello"])
+    with pytest.raises(ValueError, match="min_df"):
+        HashedTfidfVectorizer(min_df=5).fit(["one message", "another message"])
+
+
+def test_chunked_vectorizer_supports_hashing(hashed_vectorizer, training_corpus):
+    """Test long-message mode gives the same vector without a vocabulary."""
+    message = " ".join(training_corpus[0][:20])
+    chunked = ChunkedTfidfVectorizer(hashed_vectorizer, window_chars=64)
+    result, report = chunked.transform(message)
+    np.testing.assert_allclose(result.toarray(), hashed_vectorizer.transform([message]).toarray())
+    assert report["windows"] > 1
+
+
+def test_classifier_loads_hashed_variant(hashed_models_dir, training_corpus):
+    """Test SpamClassifier detects and serves the hashed variant."""
+    messages, _ = training_corpus
+    classifier = SpamClassifier(models_dir=str(hashed_models_dir))
+    classifier.load()
+
+    assert classifier.vectorizer_file == "hashing_vectorizer.joblib"
+    assert not hasattr(classifier.vectorizer, "vocabulary_")
+    result = classifier.classify({"message": messages[1]})
+    assert result["prediction"] == "spam"
+    assert result["model_info"]["vectorizer"] == "HashedTfidfVectorizer"
+    assert classifier.get_model_info()["vectorizer_type"] == "HashedTfidfVectorizer"
+    assert classifier.classify_long({"message": messages[0]})["prediction"] == "ham"
+
+
+def test_prune_hashed_variant(hashed_models_dir, training_corpus, tmp_path):
+    """Test pruning drops buckets and keeps the hashed artifact name."""
+    messages, _ = training_corpus
+    report = prune_models_dir(
+        str(hashed_models_dir), str(tmp_path), messages[:100], threshold=0.05, min_agreement=0.95
+    )
+    assert report["written"] is True
+    pruned = joblib.load(tmp_path / "hashing_vectorizer.joblib")
+    assert len(pruned.columns_) == report["features_after"] < report["features_before"]
+
+
+def test_hashed_variant_in_float32(hashed_models_dir, training_corpus):
+    """Test the hashed variant serves in float32 with float64 predictions."""
+    messages, _ = training_corpus
+    baseline = SpamClassifier(models_dir=str(hashed_models_dir))
+    baseline.load()
+    reduced = SpamClassifier(
+        models_dir=str(hashed_models_dir), backend=SklearnBackend("float32")
+    )
+    reduced.load()
+
+    assert reduced.vectorizer.transform(messages[:5]).dtype == np.float32
+    assert np.allclose(
+        reduced.predict_spam_probabilities(messages),
+        baseline.predict_spam_probabilities(messages),
+        atol=1e-5,
+    )
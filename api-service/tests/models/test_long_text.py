@@ -0,0 +1,132 @@
+"""
+Unit tests for chunked long-message vectorization.
+"""
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app.models.long_text import ChunkedTfidfVectorizer
+
+
+@pytest.fixture
+def long_document(training_corpus):
+    """Long document made of many corpus messages."""
+    messages, _ = training_corpus
+    return " \n".join(messages * 3)
+
+
+@pytest.mark.parametrize("window_chars", [16, 64, 1000, 1_000_000])
+def test_transform_matches_whole_document(fitted_vectorizer, long_document, window_chars):
+    """Test chunked transform equals TfidfVectorizer on the whole text."""
+    chunked = ChunkedTfidfVectorizer(
+        fitted_vectorizer, window_chars=window_chars, max_tokens=10**9
+    )
+    matrix, report = chunked.transform(long_document)
+    expected = fitted_vectorizer.transform([long_document])
+
+    assert report["truncated"] is False
+    assert np.allclose(matrix.toarray(), expected.toarray())
+
+
+@pytest.mark.parametrize("truncation", ["head", "head_tail"])
+def test_transform_within_budget_is_exact(fitted_vectorizer, long_document, truncation):
+    """Test documents fitting the budget are not truncated."""
+    total = len(fitted_vectorizer.build_analyzer()(long_document.replace("\n", " ")))
+    chunked = ChunkedTfidfVectorizer(
+        fitted_vectorizer, window_chars=500, max_tokens=total, truncation=truncation
+    )
+    matrix, report = chunked.transform(long_document)
+    expected = fitted_vectorizer.transform([long_document])
+    assert report["truncated"] is False
+    assert np.allclose(matrix.toarray(), expected.toarray())
+
+
+@pytest.fixture
+def numbered_vectorizer():
+    """Unigram vectorizer over numbered tokens for truncation checks."""
+    words = [f"w{i:04d}" for i in range(1000)]
+    return TfidfVectorizer().fit([" ".join(words)]), words
+
+
+@pytest.mark.parametrize("max_tokens", [10, 101, 999])
+def test_head_tail_truncation(numbered_vectorizer, max_tokens):
+    """Test head_tail keeps the first and last tokens within budget."""
+    vectorizer, words = numbered_vectorizer
+    chunked = ChunkedTfidfVectorizer(vectorizer, window_chars=60, max_tokens=max_tokens)
+    matrix, report = chunked.transform(" ".join(words))
+
+    head = words[: max_tokens // 2]
+    tail = words[len(words) - (max_tokens - max_tokens // 2) :]
+    expected = vectorizer.transform([" ".join(head + tail)])
+    assert report["truncated"] is True
+    assert report["tokens_used"] == max_tokens
+    assert np.allclose(matrix.toarray(), expected.toarray())
+
+
+def test_head_truncation(numbered_vectorizer):
+    """Test head policy keeps only the first tokens."""
+    vectorizer, words = numbered_vectorizer
+    chunked = ChunkedTfidfVectorizer(
+        vectorizer, window_chars=60, max_tokens=25, truncation="head"
+    )
+    matrix, report = chunked.transform(" ".join(words))
+    expected = vectorizer.transform([" ".join(words[:25])])
+    assert report["policy"] == "head"
+    assert report["truncated"] is True
+    assert report["tokens_used"] == 25
+    assert report["chars_total"] == len(" ".join(words))
+    assert report["windows"] == 3
+    assert np.allclose(matrix.toarray(), expected.toarray())
+
+
+def test_transform_without_whitespace_and_options():
+    """Test hard cuts and sublinear/binary/l1 options are applied."""
+    vectorizer = TfidfVectorizer(sublinear_tf=True, norm="l1", use_idf=False)
+    vectorizer.fit(["alpha beta alpha"])
+    chunked = ChunkedTfidfVectorizer(vectorizer, window_chars=6, max_tokens=100)
+    matrix, _ = chunked.transform("alpha beta alpha")
+    assert np.allclose(matrix.toarray(), vectorizer.transform(["alpha beta alpha"]).toarray())
+
+    _, report = ChunkedTfidfVectorizer(vectorizer, window_chars=3).transform("alphabeta")
+    assert report["windows"] == 3
+
+    binary = TfidfVectorizer(binary=True).fit(["alpha beta"])
+    matrix, _ = ChunkedTfidfVectorizer(binary).transform("alpha alpha beta")
+    assert np.allclose(matrix.toarray(), binary.transform(["alpha alpha beta"]).toarray())
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"truncation": "middle"}, {"window_chars": 0}, {"max_tokens": 0}],
+)
+def test_invalid_parameters(fitted_vectorizer, kwargs):
+    """Test invalid configuration is rejected."""
+    with pytest.raises(ValueError):
+        ChunkedTfidfVectorizer(fitted_vectorizer, **kwargs)
+
+
+def test_char_analyzer_rejected():
+    """Test non-word analyzers are rejected."""
+    vectorizer = TfidfVectorizer(analyzer="char").fit(["abc"])
+    with pytest.raises(ValueError):
+        ChunkedTfidfVectorizer(vectorizer)
+
+
+def test_classify_long(classifier_mock, fitted_vectorizer, long_document):
+    """Test SpamClassifier.classify_long returns truncation report."""
+    classifier_mock.vectorizer = fitted_vectorizer
+    result = classifier_mock.classify_long(
+        {"message": long_document}, threshold=0.5, max_tokens=50
+    )
+    assert result["prediction"] == "spam"
+    assert result["truncation"]["truncated"] is True
+    assert result["truncation"]["tokens_used"] == 50
+
+
+def test_classify_long_validation(classifier_mock, classifier_unloaded):
+    """Test classify_long rejects empty messages and unloaded models."""
+    with pytest.raises(ValueError):
+        classifier_mock.classify_long({"message": ""})
+    with pytest.raises(RuntimeError):
+        classifier_unloaded.classify_long({"message": "hello there"})
@@ -0,0 +1,131 @@
+"""
+Unit tests for near-duplicate index.
+"""
+
+import pytest
+
+from app.models.near_duplicate import NearDuplicateIndex, normalize_tokens, simhash, similarity
+
+CAMPAIGN = (
+    "Dear {name}, you have been selected to receive a $1000 gift card! "
+    "Claim your reward before it expires at {url} using code {code}. "
+    "This exclusive offer is only available to our valued customers today."
+)
+
+
+def test_normalize_tokens_masks_variable_parts():
+    """Test URLs, addresses and digit tokens are masked."""
+    tokens = normalize_tokens("Visit http://x.io/a?id=9 or mail bob@x.io code AB12")
+    assert "urltoken" in tokens
+    assert "emailtoken" in tokens
+    assert "numtoken" in tokens
+    assert "ab12" not in tokens
+
+
+def test_simhash_similar_for_campaign_variants():
+    """Test personalized variants produce near-identical sketches."""
+    a = simhash(CAMPAIGN.format(name="Alice", url="http://t.co/a1", code="X91"))
+    b = simhash(CAMPAIGN.format(name="Bob", url="http://t.co/zz7", code="Q42"))
+    assert similarity(a, b) >= 0.85
+
+
+def test_simhash_differs_for_unrelated_messages():
+    """Test unrelated messages produce distant sketches."""
+    a = simhash(CAMPAIGN.format(name="Alice", url="http://t.co/a1", code="X91"))
+    b = simhash("Hi team, the quarterly planning meeting moved to Thursday afternoon.")
+    assert similarity(a, b) < 0.75
+
+
+def test_messages_without_tokens_bypass_the_index(classifier_mock):
+    """Test messages without word tokens get no sketch and never share predictions."""
+    assert simhash("!!! ???") is None
+    classifier_mock.near_duplicate_index = NearDuplicateIndex(threshold=0.95)
+
+    classifier_mock.classify({"message": "!!! ???"})
+    second = classifier_mock.classify({"message": "$$$ ..."})
+
+    assert second["near_duplicate"] is False
+    assert len(classifier_mock.near_duplicate_index) == 0
+    assert classifier_mock.vectorizer.transform.call_count == 2
+
+
+def test_index_lookup_and_add():
+    """Test index returns cached probabilities for similar sketches."""
+    index = NearDuplicateIndex(threshold=0.95, capacity=10)
+    sketch = simhash(CAMPAIGN.format(name="Alice", url="http://t.co/a1", code="X91"))
+    assert index.lookup(sketch) is None
+
+    index.add(sketch, 0.97, 0.03)
+    assert index.lookup(sketch ^ 0b101) == (0.97, 0.03)
+    assert index.lookup(sketch ^ 0b1111111) is None
+    assert index.stats()["hits"] == 1
+    assert index.stats()["misses"] == 2
+
+
+def test_index_evicts_least_recently_used():
+    """Test capacity is bounded and oldest entries are evicted."""
+    index = NearDuplicateIndex(threshold=1.0, capacity=2)
+    index.add(1, 0.1, 0.9)
+    index.add(2, 0.2, 0.8)
+    index.lookup(1)
+    index.add(4, 0.4, 0.6)
+
+    assert len(index) == 2
+    assert index.lookup(2) is None
+    assert index.lookup(1) == (0.1, 0.9)
+
+
+def test_index_add_existing_sketch_updates_value():
+    """Test adding an existing sketch replaces its probabilities."""
+    index = NearDuplicateIndex(threshold=1.0, capacity=2)
+    index.add(7, 0.1, 0.9)
+    index.add(7, 0.6, 0.4)
+    assert len(index) == 1
+    assert index.lookup(7) == (0.6, 0.4)
+
+
+@pytest.mark.parametrize("kwargs", [{"threshold": 0.2}, {"threshold": 0.8}, {"capacity": 0}])
+def test_index_invalid_parameters(kwargs):
+    """Test invalid configuration is rejected."""
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(**kwargs)
+
+
+def test_classify_reuses_near_duplicate(classifier_mock):
+    """Test classifier skips the model for near-duplicate messages."""
+    classifier_mock.near_duplicate_index = NearDuplicateIndex(threshold=0.85)
+
+    first = classifier_mock.classify(
+        {"message": CAMPAIGN.format(name="Alice", url="http://t.co/a1", code="X91")}
+    )
+    second = classifier_mock.classify(
+        {"message": CAMPAIGN.format(name="Bob", url="http://t.co/zz7", code="Q42")},
+        threshold=0.99,
+    )
+
+    assert first["near_duplicate"] is False
+    assert second["near_duplicate"] is True
+    assert second["probability_spam"] == first["probability_spam"]
+    assert second["is_spam"] is False
+    assert classifier_mock.vectorizer.transform.call_count == 1
+
+
+def test_classify_batch_shares_the_near_duplicate_index(classifier_mock):
+    """Test batched and single classification look up and feed the same index."""
+    classifier_mock.near_duplicate_index = NearDuplicateIndex(threshold=0.85)
+    variants = [
+        CAMPAIGN.format(name=name, url=f"http://t.co/{code}", code=code)
+        for name, code in (("Alice", "a1"), ("Bob", "b2"), ("Carol", "c3"))
+    ]
+
+    single = classifier_mock.classify({"message": variants[0]})
+    batched = classifier_mock.classify_batch(variants[1:], [0.5, 0.5])
+    assert [result["near_duplicate"] for result in batched] == [True, True]
+    assert all(result["probability_spam"] == single["probability_spam"] for result in batched)
+    assert classifier_mock.vectorizer.transform.call_count == 1
+
+    # A batch teaches the index too
+    classifier_mock.near_duplicate_index = NearDuplicateIndex(threshold=0.85)
+    classifier_mock.classify_batch(variants[:1], [0.5])
+    assert len(classifier_mock.near_duplicate_index) == 1
+    assert classifier_mock.classify({"message": variants[2]})["near_duplicate"] is True
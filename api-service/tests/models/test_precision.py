@@ -0,0 +1,79 @@
+"""
+Unit tests for reduced-precision serving.
+"""
+
+import joblib
+import numpy as np
+import pytest
+
+from app.models import SklearnBackend, SpamClassifier
+from app.models.precision import coefficient_bytes, convert_models_dir, serving_version
+
+
+def load(models_dir, precision):
+    classifier = SpamClassifier(models_dir=str(models_dir), backend=SklearnBackend(precision))
+    classifier.load()
+    return classifier
+
+
+def test_float32_end_to_end(trained_models_dir, training_corpus):
+    """Test vectorization, decision functions and calibration run in float32."""
+    messages, _ = training_corpus
+    baseline = load(trained_models_dir, "float64")
+    reduced = load(trained_models_dir, "float32")
+
+    X = reduced.vectorizer.transform(messages)
+    assert X.dtype == np.float32
+    assert reduced.vectorizer.idf_.dtype == np.float32
+    for fold in reduced.model.calibrated_classifiers_:
+        assert fold.estimator.decision_function(X).dtype == np.float32
+        assert fold.calibrators[0].predict(fold.estimator.decision_function(X)).dtype == np.float32
+    assert coefficient_bytes(reduced.model) * 2 == coefficient_bytes(baseline.model)
+
+    difference = np.abs(
+        reduced.predict_spam_probabilities(messages) - baseline.predict_spam_probabilities(messages)
+    )
+    assert difference.max() < 1e-5
+    assert reduced.classify_long({"message": messages[0]})["prediction"] == "ham"
+    assert reduced.get_model_info()["backend"]["precision"] == "float32"
+
+    reduced.reload_model()
+    assert reduced.model.calibrated_classifiers_[0].estimator.coef_.dtype == np.float32
+
+
+def test_convert_models_dir_with_float16_coefficients(
+    trained_models_dir, training_corpus, tmp_path
+):
+    """Test converted artifacts are verified, stored in float16 and served in float32."""
+    messages, _ = training_corpus
+    report = convert_models_dir(
+        str(trained_models_dir), str(tmp_path), messages[:200], coefficient_dtype="float16"
+    )
+
+    assert report["written"] is True
+    assert report["agreement"]["agreement"] >= 0.999
+    assert report["coefficient_bytes_stored"] * 4 == report["coefficient_bytes_before"]
+    assert report["coefficient_bytes_served"] * 2 == report["coefficient_bytes_before"]
+    stored = joblib.load(tmp_path / "best_model_temp.joblib")
+    assert stored.calibrated_classifiers_[0].estimator.coef_.dtype == np.float16
+    assert joblib.load(tmp_path / "metadata.joblib")["precision"] == {
+        "dtype": "float32", "coefficients": "float16",
+    }
+
+    served = load(tmp_path, "float32")
+    assert served.model.calibrated_classifiers_[0].estimator.coef_.dtype == np.float32
+    assert served.classify({"message": messages[1]})["prediction"] == "spam"
+
+
+def test_invalid_precision():
+    """Test unsupported precisions are rejected."""
+    with pytest.raises(ValueError, match="precision"):
+        SklearnBackend("float16")
+
+
+def test_serving_version():
+    """Test converted float32 artifacts are not suffixed twice."""
+    assert serving_version("v1", "float64") == "v1"
+    assert serving_version("v1", "float32") == "v1+float32"
+    assert serving_version("v1+float32", "float32") == "v1+float32"
+    assert serving_version("v1+float32-float16", "float32") == "v1+float32-float16"
@@ -0,0 +1,150 @@
+"""
+Unit tests for the signature pre-filter.
+"""
+
+import os
+import timeit
+
+import pytest
+
+from app.models.prefilter import (
+    ALLOWLISTED_TEMPLATE,
+    FILTER_FILES,
+    SPAM_BODY,
+    SPAM_URL,
+    BloomFilter,
+    PreFilter,
+    body_signature,
+    build_filters,
+    template_signature,
+    url_signatures,
+)
+
+SPAM = "WINNER!!  You have won a $1000 prize. Claim at http://www.Prize-Claim.biz/win?id=77 now"
+RECEIPT = "Your order #{order} of ${total} has shipped. Track it at https://shop.example/t/{order}"
+
+
+@pytest.fixture
+def filters_dir(tmp_path):
+    """Directory with filters built from one spam message and one template."""
+    build_filters(
+        tmp_path,
+        spam_messages=[SPAM, "Free ringtones at http://bit.ly/abc"],
+        allow_messages=[RECEIPT.format(order=1001, total=25)],
+        ham_messages=["Slides: http://bit.ly/abc"],
+    )
+    return tmp_path
+
+
+def test_signatures_normalize_variable_parts():
+    """Test body, URL and template signatures ignore spacing, tracking and numbers."""
+    assert body_signature(SPAM) == body_signature(SPAM.replace("  ", " ") + "\n")
+    assert body_signature(SPAM) != body_signature(SPAM.lower())
+    assert url_signatures("see HTTPS://WWW.Prize-Claim.biz/win/?utm=x#top.") == [
+        b"prize-claim.biz/win"
+    ]
+    assert template_signature(RECEIPT.format(order=1, total=9)) == template_signature(
+        RECEIPT.format(order=42, total=310)
+    )
+
+
+def test_bloom_filter_round_trip(tmp_path):
+    """Test a saved filter is read back memory-mapped with the same members."""
+    bloom = BloomFilter.for_capacity(1000, 1e-4)
+    for i in range(1000):
+        bloom.add(f"item {i}".encode())
+    assert bloom.false_positive_rate <= 1e-4
+    bloom.save(tmp_path / "items.bloom")
+
+    loaded = BloomFilter.load(tmp_path / "items.bloom")
+    assert loaded.count == 1000
+    assert all(f"item {i}".encode() in loaded for i in range(1000))
+    false_positives = sum(f"other {i}".encode() in loaded for i in range(20000))
+    assert false_positives <= 10
+    with pytest.raises(TypeError):
+        loaded.bits[0] = 1  # read-only map
+
+    (tmp_path / "bad.bloom").write_bytes(b"not a filter at all, no header here")
+    with pytest.raises(ValueError, match="not a Bloom filter"):
+        BloomFilter.load(tmp_path / "bad.bloom")
+
+
+def test_prefilter_decisions(filters_dir):
+    """Test known spam and allowlisted templates are decided, other messages are not."""
+    prefilter = PreFilter(str(filters_dir))
+    prefilter.load()
+
+    assert prefilter.check(SPAM) == (True, SPAM_BODY)
+    assert prefilter.check("Last chance: https://prize-claim.biz/win/") == (True, SPAM_URL)
+    assert prefilter.check(RECEIPT.format(order=5512, total=99)) == (False, ALLOWLISTED_TEMPLATE)
+    # URLs also seen in ham are not spam signatures
+    assert prefilter.check("Here are the notes http://bit.ly/abc") is None
+    assert prefilter.check("Lunch at noon?") is None
+    stats = prefilter.stats()
+    assert stats["checks"] == 5
+    assert stats["hits"] == {SPAM_BODY: 1, SPAM_URL: 1, ALLOWLISTED_TEMPLATE: 1}
+    assert stats["filters"][SPAM_URL]["items"] == 1
+
+
+def test_prefilter_reloads_updated_files(filters_dir):
+    """Test rebuilt filter files are picked up without a restart."""
+    prefilter = PreFilter(str(filters_dir), reload_interval=0.0)
+    prefilter.load()
+    assert prefilter.check("Lunch at noon?") is None
+
+    build_filters(filters_dir, spam_messages=["Lunch at noon?"])
+    assert prefilter.check("Lunch at noon?") == (True, SPAM_BODY)
+    assert prefilter.check(SPAM) is None
+
+    os.remove(filters_dir / FILTER_FILES[SPAM_BODY])
+    assert prefilter.check("Lunch at noon?") is None
+    assert prefilter.reloads == 3
+
+
+def test_prefilter_skips_overfilled_filters(filters_dir, caplog):
+    """Test filters above the configured false positive rate are not used."""
+    bloom = BloomFilter(64, 1)
+    for i in range(500):
+        bloom.add(str(i).encode())
+    bloom.save(filters_dir / FILTER_FILES[SPAM_BODY])
+
+    prefilter = PreFilter(str(filters_dir), max_false_positive_rate=1e-6)
+    prefilter.load()
+    assert SPAM_BODY not in prefilter.stats()["filters"]
+    assert prefilter.check("42") is None
+    assert "not used" in caplog.text
+
+
+def test_lookup_cheaper_than_vectorization(filters_dir, fitted_vectorizer):
+    """Test a pre-filter miss costs far less than vectorizing the message."""
+    prefilter = PreFilter(str(filters_dir))
+    prefilter.load()
+    message = "Hi team, the quarterly planning meeting moved to Thursday afternoon. " * 5
+
+    lookup = min(timeit.repeat(lambda: prefilter.check(message), number=200, repeat=3))
+    vectorize = min(
+        timeit.repeat(lambda: fitted_vectorizer.transform([message]), number=200, repeat=3)
+    )
+    assert lookup * 3 < vectorize
+
+
+def test_classify_uses_prefilter(classifier_mock, filters_dir):
+    """Test pre-filter hits skip the model and report who decided."""
+    classifier_mock.prefilter = PreFilter(str(filters_dir))
+    classifier_mock.prefilter.load()
+
+    spam = classifier_mock.classify({"message": SPAM}, threshold=0.99)
+    ham = classifier_mock.classify({"message": RECEIPT.format(order=7, total=3)}, threshold=0.0)
+    other = classifier_mock.classify({"message": "Lunch at noon?"})
+
+    assert (spam["is_spam"], spam["decided_by"], spam["probability_spam"]) == (
+        True, SPAM_BODY, 1.0
+    )
+    assert (ham["is_spam"], ham["decided_by"], ham["confidence"]) == (
+        False, ALLOWLISTED_TEMPLATE, 1.0
+    )
+    assert other["decided_by"] == "model"
+    classifier_mock.backend.model.predict_proba.assert_called_once()
+
+    batch = classifier_mock.classify_batch([SPAM, "Lunch at noon?"], [0.5, 0.5])
+    assert [result["decided_by"] for result in batch] == [SPAM_BODY, "model"]
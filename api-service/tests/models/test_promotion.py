@@ -0,0 +1,125 @@
+"""
+Unit tests for the model promotion performance gate.
+"""
+
+import shutil
+
+import joblib
+import pytest
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.preprocessing import LabelEncoder
+from sklearn.svm import LinearSVC
+
+from app.models import HashedTfidfVectorizer, SpamClassifier
+from app.models.artifacts import file_sha256, read_checksums
+from app.models.promotion import DEFAULT_BUDGETS, check_budgets, promote_models
+
+
+def side(mean_ms=1.0, p99_ms=2.0, throughput=1000.0, rss_mb=200, load_seconds=0.5):
+    return {
+        "load_seconds": load_seconds,
+        "rss_bytes": rss_mb * 1024 * 1024,
+        "latency": {
+            "mean_ms": mean_ms,
+            "p50_ms": mean_ms,
+            "p99_ms": p99_ms,
+            "batch_messages_per_second": throughput,
+        },
+    }
+
+
+def test_three_times_slower_candidate_is_refused():
+    """Test slowdown against production and absolute budgets are both enforced."""
+    production = side()
+    assert check_budgets(side(), production, {"agreement": 1.0}, DEFAULT_BUDGETS) == []
+
+    violations = check_budgets(
+        side(mean_ms=3.0, throughput=330.0), production, {"agreement": 1.0}, DEFAULT_BUDGETS
+    )
+    assert len(violations) == 2
+    assert "3.00x production" in violations[0]
+
+    violations = check_budgets(
+        side(p99_ms=80.0, rss_mb=2048, load_seconds=12.0), None, None, DEFAULT_BUDGETS
+    )
+    assert len(violations) == 3
+
+
+def test_promotion_records_benchmark_in_metadata(trained_models_dir, training_corpus, tmp_path):
+    """Test a candidate within budgets replaces production with its benchmark and checksums."""
+    messages, _ = training_corpus
+    target = tmp_path / "models"
+    shutil.copytree(trained_models_dir, target)
+
+    report = promote_models(str(trained_models_dir), str(target), messages[:50])
+
+    assert report["promoted"] and report["violations"] == []
+    assert report["agreement"]["agreement"] == 1.0
+    benchmark = joblib.load(target / "metadata.joblib")["deployment_benchmark"]
+    assert benchmark["production"]["latency"]["p99_ms"] > 0
+    assert benchmark["candidate"]["rss_bytes"] > 0
+    assert "probabilities" not in benchmark["candidate"]
+    checksums = read_checksums(target)
+    assert checksums["metadata.joblib"] == file_sha256(target / "metadata.joblib")
+
+
+def test_refused_candidate_leaves_production_untouched(
+    trained_models_dir, training_corpus, tmp_path
+):
+    """Test exceeding a budget writes nothing unless forced."""
+    messages, _ = training_corpus
+    target = tmp_path / "models"
+
+    report = promote_models(
+        str(trained_models_dir), str(target), messages[:20], budgets={"max_p99_ms": 0.0}
+    )
+    assert not report["promoted"]
+    assert report["production"] is None
+    assert not target.exists()
+
+    with pytest.raises(FileNotFoundError):
+        promote_models(str(tmp_path), str(target), messages[:20])
+
+
+def test_hashed_candidate_replaces_vectorizer_and_onnx_graphs(
+    trained_models_dir, training_corpus, tmp_path
+):
+    """Test the vectorizer and ONNX graphs of production are replaced, not left stale."""
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("skl2onnx")
+    from app.models.onnx_export import export_onnx
+
+    messages, labels = training_corpus
+    target = tmp_path / "models"
+    shutil.copytree(trained_models_dir, target)
+    export_onnx(str(target))
+
+    candidate = tmp_path / "candidate"
+    candidate.mkdir()
+    vectorizer = HashedTfidfVectorizer(n_features=2**18, stop_words="english").fit(messages)
+    encoder = LabelEncoder().fit(labels)
+    model = CalibratedClassifierCV(LinearSVC(random_state=42), method="sigmoid", cv=3)
+    model.fit(vectorizer.transform(messages), encoder.transform(labels))
+    joblib.dump(model, candidate / "best_model_temp.joblib")
+    joblib.dump(vectorizer, candidate / "hashing_vectorizer.joblib")
+    joblib.dump(encoder, candidate / "label_encoder.joblib")
+    joblib.dump({"base_model_type": "LinearSVC"}, candidate / "metadata.joblib")
+
+    report = promote_models(
+        str(candidate),
+        str(target),
+        messages[:30],
+        budgets={"max_slowdown": 100.0, "min_agreement": 0.0},
+        backend="onnx",
+    )
+
+    assert report["promoted"] and report["backend"] == "onnx"
+    assert "hashing_vectorizer.joblib" in report["files"]
+    assert not (target / "tfidf_vectorizer.joblib").exists()
+    assert not (target / "model.onnx").exists()
+    assert sorted(read_checksums(target)) == sorted(report["files"])
+    assert read_checksums(target)["scorer.onnx"] == file_sha256(target / "scorer.onnx")
+
+    classifier = SpamClassifier(models_dir=str(target))
+    classifier.load()
+    assert classifier.vectorizer_file == "hashing_vectorizer.joblib"
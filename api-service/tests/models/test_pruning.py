@@ -0,0 +1,119 @@
+"""
+Unit tests for vocabulary pruning and coefficient sparsification.
+"""
+
+import joblib
+import numpy as np
+import pytest
+
+from app.models.benchmark import (
+    compare_models,
+    load_classifier,
+    load_corpus,
+    loaded_size,
+    prediction_agreement,
+)
+from app.models.pruning import (
+    dense_coef,
+    linear_estimators,
+    prune,
+    prune_models_dir,
+    select_features,
+)
+
+
+def test_select_features_uses_max_weight_across_folds(trained_models_dir):
+    """Test a feature is kept if any fold weights it above the threshold."""
+    model = joblib.load(trained_models_dir / "best_model_temp.joblib")
+    weights = np.vstack([np.abs(dense_coef(e)) for e in linear_estimators(model)])
+    threshold = float(np.median(weights.max(axis=0)))
+
+    keep = select_features(model, threshold)
+    assert keep.sum() == (weights.max(axis=0) >= threshold).sum()
+    assert 0 < keep.sum() < len(keep)
+
+
+def test_prune_keeps_vectorizer_and_model_consistent(trained_models_dir, training_corpus):
+    """Test pruned artifacts transform and score with the reduced width."""
+    messages, _ = training_corpus
+    classifier, _ = load_classifier(trained_models_dir)
+    keep = select_features(classifier.model, 0.1)
+
+    vectorizer, model = prune(classifier.vectorizer, classifier.model, keep, sparsify_threshold=0.2)
+    X = vectorizer.transform(messages[:20])
+    assert X.shape[1] == keep.sum() == len(vectorizer.vocabulary_)
+    assert model.predict_proba(X).shape == (20, 2)
+    assert all(hasattr(e.coef_, "toarray") for e in linear_estimators(model))
+    assert not hasattr(vectorizer, "stop_words_")
+    # Originals are untouched.
+    assert len(classifier.vectorizer.vocabulary_) == len(keep)
+
+
+def test_prune_models_dir_writes_verified_artifacts(trained_models_dir, training_corpus, tmp_path):
+    """Test pruned artifacts are written with a report when agreement holds."""
+    messages, _ = training_corpus
+    output = tmp_path / "pruned"
+
+    report = prune_models_dir(
+        str(trained_models_dir), str(output), messages[:100], threshold=0.05, min_agreement=0.95
+    )
+
+    assert report["written"] is True
+    assert report["features_after"] < report["features_before"]
+    assert report["bytes_after"] < report["bytes_before"]
+    assert set(report["latency_after"]) == {"mean_ms", "p50_ms", "p99_ms", "batch_messages_per_second"}
+    metadata = joblib.load(output / "metadata.joblib")
+    assert metadata["pruning"]["original_features"] == report["features_before"]
+    assert (output / "label_encoder.joblib").exists()
+
+    pruned, _ = load_classifier(output)
+    assert pruned.classify({"message": messages[1]})["prediction"] == "spam"
+
+
+def test_prune_models_dir_refuses_low_agreement(trained_models_dir, training_corpus, tmp_path):
+    """Test nothing is written when pruning changes predictions too much."""
+    messages, _ = training_corpus
+    output = tmp_path / "pruned"
+
+    model = joblib.load(trained_models_dir / "best_model_temp.joblib")
+    weights = np.vstack([np.abs(dense_coef(e)) for e in linear_estimators(model)])
+    threshold = float(np.sort(weights.max(axis=0))[-2])
+
+    report = prune_models_dir(
+        str(trained_models_dir), str(output), messages[:100], threshold=threshold, sparsify=True
+    )
+
+    assert report["written"] is False
+    assert report["agreement"]["agreement"] < 0.999
+    assert not output.exists()
+
+    with pytest.raises(ValueError, match="No feature"):
+        prune_models_dir(str(trained_models_dir), str(output), messages[:100], threshold=100.0)
+
+
+def test_prediction_agreement():
+    """Test agreement and probability differences are reported."""
+    report = prediction_agreement(np.array([0.9, 0.2, 0.6]), np.array([0.8, 0.3, 0.4]))
+    assert report["agreement"] == pytest.approx(2 / 3, abs=1e-6)
+    assert report["max_abs_diff"] == pytest.approx(0.2)
+
+
+def test_compare_models_and_load_corpus(trained_models_dir, tmp_path):
+    """Test two artifact directories are benchmarked on a CSV corpus."""
+    csv_path = tmp_path / "emails.csv"
+    csv_path.write_text("message,label\nfree prize now,spam\n,ham\nteam meeting notes,ham\n")
+    messages, labels = load_corpus(str(csv_path))
+    assert messages == ["free prize now", "team meeting notes"]
+    assert labels == ["spam", "ham"]
+    assert load_corpus(str(csv_path), limit=1)[0] == ["free prize now"]
+
+    report = compare_models(str(trained_models_dir), str(trained_models_dir), messages)
+    assert report["agreement"]["agreement"] == 1.0
+    assert report["baseline"]["total_bytes"] == report["candidate"]["total_bytes"]
+
+
+def test_loaded_size(trained_models_dir):
+    """Test deserialization heap size and time are measured."""
+    size, seconds = loaded_size(str(trained_models_dir / "tfidf_vectorizer.joblib"))
+    assert size > 0
+    assert seconds >= 0
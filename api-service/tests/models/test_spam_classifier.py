@@ -252,3 +252,37 @@ def test_load_with_label_encoder():
         assert classifier.metadata == mock_metadata
         assert classifier.is_loaded is True
 
+
+def test_model_version_from_artifacts(trained_models_dir, tmp_path):
+    """Test the model version is a content hash unless metadata sets one."""
+    classifier = SpamClassifier(models_dir=str(trained_models_dir))
+    classifier.load()
+    assert len(classifier.model_version) == 12
+    assert classifier.classify({"message": "hello"})["model_info"]["version"] == (
+        classifier.model_version
+    )
+    assert classifier.get_model_info()["model_version"] == classifier.model_version
+
+    for path in trained_models_dir.iterdir():
+        (tmp_path / path.name).write_bytes(path.read_bytes())
+    metadata = joblib.load(tmp_path / "metadata.joblib")
+    joblib.dump({**metadata, "model_version": "2024.06"}, tmp_path / "metadata.joblib")
+    classifier = SpamClassifier(models_dir=str(tmp_path))
+    classifier.load()
+    assert classifier.model_version == "2024.06"
+
+
+def test_classify_batch_matches_classify(trained_models_dir, training_corpus):
+    """Test batched results equal per-message results, thresholds included."""
+    messages, _ = training_corpus
+    classifier = SpamClassifier(models_dir=str(trained_models_dir))
+    classifier.load()
+    thresholds = [0.2, 0.5, 0.9]
+    results = classifier.classify_batch(messages[:3], thresholds)
+
+    assert results == [
+        classifier.classify({"message": message}, threshold=threshold)
+        for message, threshold in zip(messages[:3], thresholds)
+    ]
+    with pytest.raises(RuntimeError):
+        SpamClassifier(models_dir="tests/fixtures/models").classify_batch(["x"], [0.5])
@@ -0,0 +1,108 @@
+"""
+Unit tests for the scripted training pipeline.
+"""
+
+import numpy as np
+import pytest
+
+from app.models import SpamClassifier
+from app.models.training import (
+    VECTORIZER_PARAMS,
+    FeatureCache,
+    _InlineExecutor,
+    candidates,
+    config_key,
+    corpus_digest,
+    load_matrix,
+    save_matrix,
+    search,
+    train,
+    vectorizer_grid,
+)
+
+SMALL_VECTORIZER = {**VECTORIZER_PARAMS, "max_features": 200}
+
+
+def test_matrix_round_trip_is_memory_mapped(tmp_path, fitted_vectorizer, training_corpus):
+    """Test cached matrices are read back equal and backed by memory maps."""
+    messages, _ = training_corpus
+    matrix = fitted_vectorizer.transform(messages)
+    save_matrix(matrix, tmp_path / "matrix")
+
+    loaded = load_matrix(tmp_path / "matrix")
+    # Read-only views of the mapped files, not copies
+    assert not loaded.data.flags.writeable and not loaded.indices.flags.writeable
+    assert (loaded != matrix).nnz == 0
+
+
+def test_feature_cache_reuses_vectorized_corpus(tmp_path, training_corpus):
+    """Test each vectorizer configuration is vectorized once."""
+    messages, labels = training_corpus
+    corpus = corpus_digest(messages, labels)
+    train_rows = np.arange(300)
+    cache = FeatureCache(tmp_path)
+
+    first = cache.features(messages, corpus, train_rows, SMALL_VECTORIZER)
+    again = cache.features(messages, corpus, train_rows, SMALL_VECTORIZER)
+    other = cache.features(messages, corpus, train_rows, {**SMALL_VECTORIZER, "min_df": 3})
+
+    assert first == again != other
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert load_matrix(first).shape[0] == len(messages)
+
+
+def test_halving_narrows_candidates(tmp_path, training_corpus):
+    """Test successive halving scores fewer candidates on more rows each round."""
+    messages, labels = training_corpus
+    y = np.array([label == "spam" for label in labels], dtype=int)
+    rows = np.arange(len(messages))
+    features = {
+        config_key(SMALL_VECTORIZER): FeatureCache(tmp_path).features(
+            messages, corpus_digest(messages, labels), rows, SMALL_VECTORIZER
+        )
+    }
+    candidate_list = candidates([SMALL_VECTORIZER], [0.01, 0.1, 1.0, 10.0])
+
+    halving = search(
+        _InlineExecutor(), features, y, rows, candidate_list,
+        strategy="halving", factor=2, min_samples=100, cv=3,
+    )
+    grid = search(_InlineExecutor(), features, y, rows, candidate_list, strategy="grid", cv=3)
+
+    assert [len(r["scores"]) for r in halving["rounds"]] == [4, 2, 1]
+    assert [r["samples"] for r in halving["rounds"]] == [100, 200, 400]
+    # Fewer rows fitted overall, even with a round per candidate count
+    work = [sum(r["samples"] * len(r["scores"]) for r in s["rounds"]) for s in (halving, grid)]
+    assert work == [1200, 1600]
+    assert grid["fits"] == 12
+    assert len(grid["rounds"]) == 1
+    with pytest.raises(ValueError, match="Unknown search strategy"):
+        search(_InlineExecutor(), features, y, rows, candidate_list, strategy="random")
+
+
+def test_train_writes_deployable_artifacts(tmp_path, training_corpus):
+    """Test the pipeline writes the artifacts served by the API, on a process pool."""
+    messages, labels = training_corpus
+    kwargs = dict(
+        vectorizers=vectorizer_grid([100, 200], [2]),
+        c_values=[0.1, 1.0],
+        min_samples=150,
+        n_jobs=2,
+        cv=3,
+    )
+    report = train(messages, labels, tmp_path / "artifacts", tmp_path / "cache", **kwargs)
+
+    assert report["cache_misses"] == 2
+    assert report["test_f1"] > 0.9
+    classifier = SpamClassifier(models_dir=str(tmp_path / "artifacts"))
+    classifier.load()
+    assert classifier.classify({"message": "free money claim your prize"})["is_spam"]
+    metadata = classifier.metadata
+    assert metadata["base_model_params"]["C"] == report["best"]["svc"]["C"]
+    assert metadata["search"]["strategy"] == "halving"
+    assert "drift_reference" in metadata
+
+    # A second run reuses the cached matrices
+    again = train(messages, labels, tmp_path / "artifacts", tmp_path / "cache", **kwargs)
+    assert (again["cache_hits"], again["cache_misses"]) == (2, 0)
+    assert again["best"] == report["best"]
@@ -0,0 +1,128 @@
+"""
+Unit tests for admin router.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import DriftMonitor, SpamClassifier
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    return TestClient(app)
+
+
+def test_drift_report(client, trained_models_dir, training_corpus):
+    """Test classified messages feed the drift report."""
+    classifier = SpamClassifier(
+        models_dir=str(trained_models_dir), drift_monitor=DriftMonitor(min_samples=5)
+    )
+    classifier.load()
+    messages, _ = training_corpus
+    with patch("app.core.classifier", classifier):
+        for message in messages[:10]:
+            assert client.post("/api/v1/predict", json={"message": message}).status_code == 200
+        client.post("/api/v1/predict/long", json={"message": messages[10]})
+        response = client.get("/api/v1/admin/drift")
+
+    assert response.status_code == 200
+    data = response.json()
+    # The test artifacts were exported without reference statistics
+    assert data["status"] == "no_reference"
+    assert data["observed"] == 11
+    assert data["features"]["oov_ratio"]["observations"] == 11
+    assert data["features"]["probability_spam"]["reference"] is None
+
+
+def test_drift_report_disabled(client, classifier_mock):
+    """Test 503 when drift monitoring is disabled."""
+    with patch("app.core.classifier", classifier_mock):
+        response = client.get("/api/v1/admin/drift")
+    assert response.status_code == 503
+
+
+def test_model_registry_stats(client, classifier_mock):
+    """Test served requests are reported per model."""
+    with patch("app.core.classifier", classifier_mock):
+        assert client.post("/api/v1/predict", json={"message": "Meeting at 10am"}).status_code == 200
+        response = client.get("/api/v1/admin/models")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["policy"] == "primary"
+    assert data["models"][0]["name"] == "primary"
+    assert data["models"][0]["served"] >= 1
+    assert data["shadow_queue"]["shed"] == 0
+
+
+def test_tenants(client):
+    """Test tenants and pool counters are reported without API keys."""
+    from app.services import ClassifierPool, TenantDirectory
+
+    directory = TenantDirectory(
+        {"sales": {"models_dir": "models_sales", "threshold": 0.8, "api_keys": ["secret"]}}
+    )
+    pool = ClassifierPool(lambda models_dir: SpamClassifier(models_dir=models_dir))
+    with patch("app.core.tenant_directory", directory), patch("app.core.tenant_pool", pool):
+        response = client.get("/api/v1/admin/tenants")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["tenants"] == [{"tenant_id": "sales", "models_dir": "models_sales", "threshold": 0.8}]
+    assert "secret" not in response.text
+    assert data["pool"]["loaded"] == 0 and data["pool"]["evictions"] == 0
+
+
+def test_memory_report(client, trained_models_dir):
+    """Test the memory report covers artifacts, process memory and tracing status."""
+    classifier = SpamClassifier(models_dir=str(trained_models_dir))
+    classifier.load()
+    with patch("app.core.classifier", classifier):
+        response = client.get("/api/v1/admin/memory")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["artifacts"]["vectorizer"]["parts"]["vocabulary_"] > 0
+    assert "fold_0.coef_" in data["artifacts"]["model"]["parts"]
+    assert "rss_bytes" in data["process"]
+    assert data["tracemalloc"]["tracing"] is False
+
+
+def test_memory_diff(client):
+    """Test tracemalloc diffs need a snapshot and stop with it."""
+    assert client.get("/api/v1/admin/memory/diff").status_code == 409
+    try:
+        snapshot = client.post("/api/v1/admin/memory/snapshot")
+        assert snapshot.status_code == 200
+        assert snapshot.json()["baseline"] is True
+        response = client.get("/api/v1/admin/memory/diff", params={"top": 3})
+        assert response.status_code == 200
+        assert len(response.json()["top"]) <= 3
+    finally:
+        stopped = client.delete("/api/v1/admin/memory/snapshot")
+    assert stopped.json()["tracing"] is False
+    assert client.get("/api/v1/admin/memory/diff").status_code == 409
+
+
+def test_scheduler_stats(client, classifier_mock):
+    """Test predictions are scheduled by lane and reported per lane."""
+    from app.services import InferenceScheduler
+
+    assert client.get("/api/v1/admin/scheduler").status_code == 503  # disabled by default
+    scheduler = InferenceScheduler(workers=2, heavy_workers=1)
+    with patch("app.core.classifier", classifier_mock), \
+         patch("app.core.inference_scheduler", scheduler):
+        assert client.post("/api/v1/predict", json={"message": "Meeting at 10am"}).status_code == 200
+        response = client.get("/api/v1/admin/scheduler")
+    scheduler.close()
+
+    assert response.status_code == 200
+    lanes = response.json()["lanes"]
+    assert lanes["interactive"]["completed"] >= 1
+    assert lanes["interactive"]["latency_ms"]["p50"] >= 0
+    assert set(lanes) == {"interactive", "bulk"}
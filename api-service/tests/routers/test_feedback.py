@@ -0,0 +1,70 @@
+"""
+Unit tests for feedback router.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import settings
+from app.main import app
+from app.services.feedback import FeedbackLog, FeedbackStore, FeedbackTrainer
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def feedback(tmp_path, classifier_mock):
+    """Enabled feedback log and trainer on a temporary store."""
+    store = FeedbackStore(str(tmp_path / "feedback.sqlite3"))
+    store.open()
+    log = FeedbackLog(store, flush_interval=0.01)
+    trainer = FeedbackTrainer(store, classifier_mock)
+    with patch("app.core.feedback_log", log), \
+         patch("app.core.feedback_trainer", trainer), \
+         patch("app.core.classifier", classifier_mock), \
+         patch.object(settings, "feedback_enabled", True):
+        yield log
+
+
+def test_submit_feedback(client, feedback):
+    """Test feedback is accepted and stored asynchronously."""
+    feedback.start()
+    response = client.post(
+        "/api/v1/feedback", json={"message": "Claim your prize", "label": "spam"}
+    )
+    feedback.stop()
+
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    stats = client.get("/api/v1/admin/feedback").json()
+    assert stats["stored"] == stats["pending"] == 1
+    assert stats["updates_published"] == 0
+    assert stats["last_update"] is None
+
+
+def test_submit_feedback_queue_full(client, feedback):
+    """Test 503 when the feedback queue is full."""
+    with patch.object(feedback, "record", return_value=False):
+        response = client.post("/api/v1/feedback", json={"message": "Hi", "label": "ham"})
+    assert response.status_code == 503
+
+
+def test_submit_feedback_invalid_label(client, feedback):
+    """Test labels other than spam/ham are rejected."""
+    response = client.post("/api/v1/feedback", json={"message": "Hi", "label": "maybe"})
+    assert response.status_code == 422
+
+
+def test_feedback_disabled(client):
+    """Test 503 when feedback is disabled."""
+    with patch.object(settings, "feedback_enabled", False):
+        assert client.post(
+            "/api/v1/feedback", json={"message": "Hi", "label": "ham"}
+        ).status_code == 503
+        assert client.get("/api/v1/admin/feedback").status_code == 503
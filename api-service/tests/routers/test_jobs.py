@@ -0,0 +1,93 @@
+"""
+Unit tests for batch job router.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import settings
+from app.main import app
+from app.models import SpamClassifier
+from app.services import JobRunner, JobStore
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def jobs(tmp_path, trained_models_dir):
+    """Enable jobs with a temporary store; workers are run synchronously."""
+    classifier = SpamClassifier(models_dir=str(trained_models_dir))
+    classifier.load()
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    store.open()
+    runner = JobRunner(store, classifier, chunk_size=4)
+    with patch("app.core.job_store", store), patch("app.core.job_runner", runner), \
+         patch.object(settings, "jobs_enabled", True):
+        yield runner
+
+
+def test_job_lifecycle(client, jobs, training_corpus):
+    """Test submit, poll and download of a batch job."""
+    messages, labels = training_corpus
+    response = client.post("/api/v1/jobs", json={"messages": messages[:10], "threshold": 0.5})
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+    assert job["total"] == 10
+    assert job["progress"] == 0.0
+
+    jobs.run_pending()
+
+    response = client.get(f"/api/v1/jobs/{job['job_id']}")
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert response.json()["progress"] == 1.0
+
+    response = client.get(f"/api/v1/jobs/{job['job_id']}/results")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["x-job-status"] == "completed"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["index"] for row in rows] == list(range(10))
+    assert [row["prediction"] for row in rows] == labels[:10]
+
+    response = client.get(f"/api/v1/jobs/{job['job_id']}/results", params={"offset": 8})
+    assert [json.loads(line)["index"] for line in response.text.splitlines()] == [8, 9]
+
+
+def test_job_not_found(client, jobs):
+    """Test unknown job ids return 404."""
+    assert client.get("/api/v1/jobs/missing").status_code == 404
+    assert client.get("/api/v1/jobs/missing/results").status_code == 404
+
+
+def test_job_validation_and_limits(client, jobs):
+    """Test empty uploads are rejected and the message limit enforced."""
+    assert client.post("/api/v1/jobs", json={"messages": []}).status_code == 422
+    assert client.post("/api/v1/jobs", json={"messages": ["ok", "  "]}).status_code == 422
+
+    with patch.object(settings, "jobs_max_messages", 2):
+        response = client.post("/api/v1/jobs", json={"messages": ["a", "b", "c"]})
+    assert response.status_code == 413
+
+    from pydantic import ValidationError
+
+    from app.schemas import JobCreate
+    from app.schemas.email import LONG_MESSAGE_MAX_CHARS
+
+    with pytest.raises(ValidationError):
+        JobCreate(messages=["x" * (LONG_MESSAGE_MAX_CHARS + 1)])
+
+
+def test_jobs_disabled(client):
+    """Test job endpoints return 503 when jobs are disabled."""
+    with patch.object(settings, "jobs_enabled", False):
+        assert client.post("/api/v1/jobs", json={"messages": ["hello"]}).status_code == 503
+        assert client.get("/api/v1/jobs/any").status_code == 503
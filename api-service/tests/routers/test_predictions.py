@@ -147,3 +147,326 @@ def test_predict_invalid_json(client):
     )
     assert response.status_code == 422
 
+
+def test_predict_eml(client, classifier_mock):
+    """Test POST /api/v1/predict/eml with a raw multipart email."""
+    raw = (
+        b"Subject: Claim your prize\r\n"
+        b"Content-Type: multipart/mixed; boundary=XYZ\r\n\r\n"
+        b"--XYZ\r\nContent-Type: text/html\r\n\r\n<p>Free <b>money</b></p>\r\n"
+        b"--XYZ\r\nContent-Type: image/png\r\n\r\nbinary\r\n--XYZ--\r\n"
+    )
+    with patch("app.core.classifier", classifier_mock):
+        response = client.post(
+            "/api/v1/predict/eml?threshold=0.6",
+            content=raw,
+            headers={"Content-Type": "message/rfc822"},
+        )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["prediction"] == "spam"
+    assert data["extraction"]["subject"] == "Claim your prize"
+    assert data["extraction"]["text_parts"] == 1
+    classifier_mock.vectorizer.transform.assert_called_once_with(
+        ["Claim your prize\nFree money"]
+    )
+
+
+def test_predict_eml_without_text(client, classifier_mock):
+    """Test POST /api/v1/predict/eml with no text parts."""
+    with patch("app.core.classifier", classifier_mock):
+        response = client.post(
+            "/api/v1/predict/eml", content=b"Content-Type: image/png\r\n\r\nxxxx"
+        )
+    assert response.status_code == 400
+
+
+def test_predict_eml_too_large(client, classifier_mock):
+    """Test POST /api/v1/predict/eml rejects payloads above the raw limit."""
+    from app.core import settings
+
+    with patch("app.core.classifier", classifier_mock), patch.object(
+        settings, "eml_max_raw_bytes", 10
+    ):
+        response = client.post(
+            "/api/v1/predict/eml", content=b"Subject: hi\r\n\r\nhello world"
+        )
+
+        def chunks():
+            yield b"Subject: hi\r\n\r\n"
+            yield b"hello world, this is long"
+
+        streamed = client.post("/api/v1/predict/eml", content=chunks())
+    assert response.status_code == 413
+    assert streamed.status_code == 413
+
+
+def test_predict_long_message(client, classifier_mock, fitted_vectorizer):
+    """Test POST /api/v1/predict/long accepts messages above 5000 chars."""
+    from app.core import settings
+
+    classifier_mock.vectorizer = fitted_vectorizer
+    message = "free money claim your prize now " * 1000
+    with patch("app.core.classifier", classifier_mock), patch.object(
+        settings, "long_message_max_tokens", 100
+    ):
+        response = client.post(
+            "/api/v1/predict/long",
+            json={"message": message, "max_tokens": 5000, "truncation": "head"},
+        )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["prediction"] == "spam"
+    assert data["truncation"]["policy"] == "head"
+    assert data["truncation"]["tokens_used"] == 100
+    assert data["truncation"]["truncated"] is True
+
+
+def test_predict_long_invalid_truncation(client):
+    """Test POST /api/v1/predict/long rejects unknown truncation policies."""
+    response = client.post(
+        "/api/v1/predict/long",
+        json={"message": "free money claim now", "truncation": "middle"},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("path", ["/api/v1/predict", "/api/v1/predict/long"])
+def test_predict_blank_message_rejected(client, path):
+    """Test whitespace-only messages fail validation on both single-message routes."""
+    response = client.post(path, json={"message": " \n\t " * 5})
+    assert response.status_code == 422
+
+
+@pytest.fixture
+def tenants(trained_models_dir):
+    """Tenant directory and pool: 'sales' has its own model, 'support' a threshold."""
+    from app.models import SpamClassifier
+    from app.services import ClassifierPool, TenantDirectory
+
+    directory = TenantDirectory(
+        {
+            "sales": {
+                "models_dir": str(trained_models_dir), "threshold": 0.99, "api_keys": ["sales-key"]
+            },
+            "support": {"threshold": 0.0},
+        }
+    )
+    pool = ClassifierPool(lambda models_dir: SpamClassifier(models_dir=models_dir))
+    with patch("app.core.tenant_directory", directory), patch("app.core.tenant_pool", pool):
+        yield pool
+    pool.close()
+
+
+def test_predict_with_tenant_model_and_threshold(client, classifier_mock, tenants):
+    """Test a tenant API key selects its model and default threshold."""
+    with patch("app.core.classifier", classifier_mock):
+        response = client.post(
+            "/api/v1/predict",
+            json={"message": "Free money! Claim your prize now"},
+            headers={"X-API-Key": "sales-key"},
+        )
+        explicit = client.post(
+            "/api/v1/predict",
+            json={"message": "Free money! Claim your prize now", "threshold": 0.0},
+            headers={"X-API-Key": "sales-key"},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["model_info"]["tenant"] == "sales"
+    assert data["model_info"]["version"] != classifier_mock.model_version
+    assert data["prediction"] == "ham"  # threshold 0.99
+    assert explicit.json()["prediction"] == "spam"
+    assert classifier_mock.vectorizer.transform.call_count == 0
+    assert tenants.stats()["loads"] == 1
+
+
+def test_predict_tenant_header_uses_primary_model(client, classifier_mock, tenants):
+    """Test a tenant without its own model keeps the primary and applies its threshold."""
+    classifier_mock.model.classes_ = np.array(["ham", "spam"])
+    classifier_mock.model.predict_proba.return_value = np.array([[0.88, 0.12]])
+    with patch("app.core.classifier", classifier_mock):
+        response = client.post(
+            "/api/v1/predict",
+            json={"message": "Meeting moved to Thursday"},
+            headers={"X-Tenant-ID": "support"},
+        )
+
+    assert response.status_code == 200
+    assert response.json()["is_spam"] is True  # threshold 0.0
+    assert response.json()["model_info"]["tenant"] == "support"
+
+
+def test_predict_unknown_tenant(client, classifier_mock, tenants):
+    """Test 403 for an unknown API key."""
+    with patch("app.core.classifier", classifier_mock):
+        response = client.post(
+            "/api/v1/predict", json={"message": "Hello there friend"}, headers={"X-API-Key": "x"}
+        )
+    assert response.status_code == 403
+
+
+def test_predict_api_key_without_tenants_uses_primary(client, classifier_mock):
+    """Test an X-API-Key set by a gateway is ignored when no tenants are configured."""
+    from app.services import TenantDirectory
+
+    with patch("app.core.classifier", classifier_mock), \
+         patch("app.core.tenant_directory", TenantDirectory({})):
+        response = client.post(
+            "/api/v1/predict",
+            json={"message": "Free money! Claim your prize now"},
+            headers={"X-API-Key": "gateway-key", "X-Tenant-ID": "anyone"},
+        )
+    assert response.status_code == 200
+    assert "tenant" not in response.json()["model_info"]
+
+
+def test_predict_tenant_model_load_failure(client, classifier_mock, tenants):
+    """Test 503 when a tenant's model cannot be loaded."""
+    with patch("app.core.classifier", classifier_mock), \
+         patch.object(tenants, "classifier_factory", lambda models_dir: SpamClassifierStub()):
+        response = client.post(
+            "/api/v1/predict",
+            json={"message": "Hello there friend"},
+            headers={"X-API-Key": "sales-key"},
+        )
+    assert response.status_code == 503
+    assert "sales" in response.json()["detail"]
+
+
+class SpamClassifierStub:
+    """Classifier whose artifacts are missing."""
+
+    def load(self):
+        raise RuntimeError("Error loading model: missing artifacts")
+
+
+@pytest.fixture
+def loaded_classifier(trained_models_dir):
+    """Real classifier (batch scoring needs a fitted vectorizer)."""
+    from app.models import SpamClassifier
+
+    classifier = SpamClassifier(models_dir=str(trained_models_dir))
+    classifier.load()
+    with patch("app.core.classifier", classifier):
+        yield classifier
+
+
+def test_predict_msgpack_response(client, classifier_mock):
+    """Test Accept: application/msgpack returns the same result as MessagePack."""
+    import msgpack
+
+    with patch("app.core.classifier", classifier_mock):
+        response = client.post(
+            "/api/v1/predict",
+            json={"message": "Free money! Claim your prize now"},
+            headers={"Accept": "application/msgpack"},
+        )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    data = msgpack.unpackb(response.content)
+    assert data["prediction"] == "spam"
+    assert data["model_info"]["type"] == "LogisticRegression"
+
+
+def test_predict_msgpack_refused_in_accept_gets_json(client, classifier_mock):
+    """Test Accept is negotiated by quality, not by substring, on single predictions."""
+    with patch("app.core.classifier", classifier_mock):
+        response = client.post(
+            "/api/v1/predict",
+            json={"message": "Free money! Claim your prize now"},
+            headers={"Accept": "application/msgpack;q=0, application/json"},
+        )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["prediction"] == "spam"
+
+
+def test_predict_batch_rows_and_columnar(client, loaded_classifier, training_corpus):
+    """Test both batch layouts carry the results of /predict, in input order."""
+    messages, _ = training_corpus
+    response = client.post("/api/v1/predict/batch", json={"messages": messages[:20]})
+    columnar = client.post(
+        "/api/v1/predict/batch?layout=columnar", json={"messages": messages[:20]}
+    )
+
+    assert response.status_code == columnar.status_code == 200
+    rows = response.json()
+    assert rows["count"] == 20
+    expected = [loaded_classifier.classify({"message": message}) for message in messages[:20]]
+    assert [row["probability_spam"] for row in rows["results"]] == [
+        result["probability_spam"] for result in expected
+    ]
+    table = columnar.json()
+    assert table["prediction"] == [row["prediction"] for row in rows["results"]]
+    assert table["model_info"] == rows["results"][0]["model_info"]
+
+
+def test_predict_batch_msgpack_compressed(client, loaded_classifier, training_corpus):
+    """Test MessagePack in and out, compressed above the size threshold."""
+    import msgpack
+
+    messages, _ = training_corpus
+    response = client.post(
+        "/api/v1/predict/batch?layout=columnar",
+        content=msgpack.packb({"messages": messages, "threshold": 0.3}),
+        headers={
+            "Content-Type": "application/msgpack",
+            "Accept": "application/msgpack",
+            "Accept-Encoding": "gzip",
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    # httpx decodes gzip transparently
+    table = msgpack.unpackb(response.content)
+    assert table["count"] == len(messages)
+    assert int(response.headers["content-length"]) < len(response.content)
+
+
+def test_predict_batch_tenant(client, loaded_classifier, tenants, training_corpus):
+    """Test a tenant's threshold applies to the whole batch."""
+    messages, _ = training_corpus
+    response = client.post(
+        "/api/v1/predict/batch",
+        json={"messages": messages[:4]},
+        headers={"X-Tenant-ID": "support"},
+    )
+    results = response.json()["results"]
+    assert all(result["is_spam"] for result in results)
+    assert {result["model_info"]["tenant"] for result in results} == {"support"}
+
+
+@pytest.mark.parametrize(
+    "content, content_type, status_code",
+    [
+        (b"messages=hello", "application/x-www-form-urlencoded", 415),
+        (b"{not json", "application/json", 400),
+        (b'{"messages": ["short"]}', "application/json", 422),
+        (b'{"messages": []}', "application/json", 422),
+    ],
+)
+def test_predict_batch_invalid_bodies(client, loaded_classifier, content, content_type,
+                                      status_code):
+    """Test unsupported, malformed and invalid batch bodies."""
+    response = client.post(
+        "/api/v1/predict/batch", content=content, headers={"Content-Type": content_type}
+    )
+    assert response.status_code == status_code
+
+
+def test_predict_batch_size_limit(client, loaded_classifier):
+    """Test 413 above PREDICT_BATCH_MAX_MESSAGES."""
+    with patch("app.core.settings.predict_batch_max_messages", 2):
+        response = client.post(
+            "/api/v1/predict/batch", json={"messages": ["free money now!!"] * 3}
+        )
+    assert response.status_code == 413
+
+
+def test_predict_batch_model_not_loaded(client, classifier_unloaded):
+    """Test 503 while the model is not loaded."""
+    with patch("app.core.classifier", classifier_unloaded):
+        response = client.post("/api/v1/predict/batch", json={"messages": ["free money now!!"]})
+    assert response.status_code == 503
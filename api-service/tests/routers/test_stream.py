@@ -0,0 +1,130 @@
+"""
+Unit tests for the WebSocket classification channel.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.main import app
+from app.models import SpamClassifier
+from app.services import MicroBatcher
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def loaded(trained_models_dir):
+    """Loaded classifier served as the primary one."""
+    classifier = SpamClassifier(models_dir=str(trained_models_dir))
+    classifier.load()
+    batcher = MicroBatcher(max_wait=0.005)
+    with patch("app.core.classifier", classifier), patch("app.core.micro_batcher", batcher):
+        yield classifier
+    batcher.close()
+
+
+def receive_all(websocket, count):
+    frames = [websocket.receive_json() for _ in range(count)]
+    return {frame["id"]: frame for frame in frames}
+
+
+def test_pipelined_requests_are_answered_by_id(client, loaded, training_corpus):
+    """Test many requests on one connection are answered with their correlation ids."""
+    messages, _ = training_corpus
+    with client.websocket_connect("/api/v1/ws/predict") as websocket:
+        for i, message in enumerate(messages[:30]):
+            websocket.send_json({"id": f"r{i}", "message": message, "threshold": 0.4})
+        frames = receive_all(websocket, 30)
+
+    assert set(frames) == {f"r{i}" for i in range(30)}
+    for i, message in enumerate(messages[:30]):
+        expected = loaded.classify({"message": message}, threshold=0.4)
+        assert frames[f"r{i}"]["result"]["prediction"] == expected["prediction"]
+
+
+def test_invalid_frames_get_error_answers(client, loaded):
+    """Test invalid frames are answered with a 400 error without closing the socket."""
+    with client.websocket_connect("/api/v1/ws/predict") as websocket:
+        websocket.send_text("not json")
+        websocket.send_json({"id": 1, "message": "short"})
+        websocket.send_json({"id": 2, "message": "free money click here", "threshold": 2})
+        websocket.send_json({"id": 3, "message": "free money click here"})
+        frames = [websocket.receive_json() for _ in range(4)]
+
+    errors = [frame for frame in frames if "error" in frame]
+    assert sorted(str(frame["id"]) for frame in errors) == ["1", "2", "None"]
+    assert all(frame["error"]["status"] == 400 for frame in errors)
+    assert next(frame for frame in frames if frame["id"] == 3)["result"]["prediction"] == "spam"
+
+
+def test_binary_frames_get_error_answers(client, loaded):
+    """Test a binary frame is answered with a 400 error and the channel keeps working."""
+    with client.websocket_connect("/api/v1/ws/predict") as websocket:
+        websocket.send_bytes(b'{"id": 1, "message": "free money click here"}')
+        error = websocket.receive_json()
+        websocket.send_json({"id": 2, "message": "free money click here"})
+        answer = websocket.receive_json()
+
+    assert error["id"] is None
+    assert error["error"]["status"] == 400
+    assert answer["result"]["prediction"] == "spam"
+
+
+def test_invalid_threshold_from_the_batcher_answers_400(client, loaded):
+    """Test a ValueError raised while scoring is a client error, not a 500."""
+    with patch("app.core.micro_batcher.classify", side_effect=ValueError("bad threshold")):
+        with client.websocket_connect("/api/v1/ws/predict") as websocket:
+            websocket.send_json({"id": 1, "message": "free money click here"})
+            frame = websocket.receive_json()
+    assert frame == {"id": 1, "error": {"status": 400, "detail": "Invalid data: bad threshold"}}
+
+
+def test_outstanding_requests_are_capped(client, loaded, training_corpus):
+    """Test a connection keeps working with one outstanding request at a time."""
+    messages, _ = training_corpus
+    with patch("app.core.settings.ws_max_outstanding", 1):
+        with client.websocket_connect("/api/v1/ws/predict") as websocket:
+            for i, message in enumerate(messages[:5]):
+                websocket.send_json({"id": i, "message": message})
+            frames = receive_all(websocket, 5)
+    assert sorted(frames) == [0, 1, 2, 3, 4]
+
+
+def test_unloaded_model_answers_503(client, classifier_unloaded):
+    """Test requests are answered with 503 while the model is not loaded."""
+    with patch("app.core.classifier", classifier_unloaded):
+        with client.websocket_connect("/api/v1/ws/predict") as websocket:
+            websocket.send_json({"id": "a", "message": "free money click here"})
+            frame = websocket.receive_json()
+    assert frame == {"id": "a", "error": {"status": 503, "detail": "Model not loaded"}}
+
+
+def test_unknown_tenant_is_rejected(client, loaded):
+    """Test the handshake is refused for unknown tenant credentials."""
+    from app.services import TenantDirectory
+
+    directory = TenantDirectory({"sales": {"api_keys": ["sales-key"]}})
+    with patch("app.core.tenant_directory", directory), pytest.raises(WebSocketDisconnect) as error:
+        with client.websocket_connect("/api/v1/ws/predict", headers={"X-API-Key": "nope"}):
+            pass
+    assert error.value.code == 1008
+
+
+def test_channel_closes_with_1012_when_worker_stops(client, loaded):
+    """Test an open channel stops reading and closes with 'service restart' on drain."""
+    from app.services import DrainCoordinator
+
+    stopping = DrainCoordinator()
+    stopping.stop_admission()
+    with patch("app.core.drain_coordinator", stopping):
+        with client.websocket_connect("/api/v1/ws/predict") as websocket:
+            with pytest.raises(WebSocketDisconnect) as error:
+                websocket.receive_json()
+    assert error.value.code == 1012
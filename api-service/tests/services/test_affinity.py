@@ -0,0 +1,217 @@
+"""
+Unit tests for cache-affinity routing across API instances.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app import proxy
+from app.services.affinity import AffinityRouter, HashRing, routing_key
+from app.services.prediction_cache import normalize_message
+
+MESSAGES = [f"message number {i} about a free prize" for i in range(60)]
+
+
+class Instance:
+    """In-process API instance with its own prediction cache."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.cache = {}
+        self.batches = []
+        self.ready = True
+        self.draining = False
+        self.app = FastAPI()
+        self.app.get("/ready")(self.readiness)
+        self.app.post("/api/v1/predict")(self.predict)
+        self.app.post("/api/v1/predict/batch")(self.predict_batch)
+
+    def score(self, message: str) -> dict:
+        key = normalize_message(message)
+        cached = key in self.cache
+        self.cache[key] = 0.9
+        return {
+            "message": message,
+            "prediction": "spam",
+            "is_spam": True,
+            "confidence": 0.9,
+            "probability_spam": 0.9,
+            "probability_ham": 0.1,
+            "near_duplicate": False,
+            "decided_by": "cache" if cached else "model",
+            "model_info": {"instance": self.name},
+        }
+
+    async def readiness(self):
+        if not self.ready:
+            return Response(status_code=503)
+        return {"ready": True}
+
+    async def predict(self, request: Request):
+        if self.draining:
+            return Response(status_code=503, headers={"Retry-After": "1"})
+        return self.score((await request.json())["message"])
+
+    async def predict_batch(self, request: Request):
+        messages = (await request.json())["messages"]
+        self.batches.append(messages)
+        results = [self.score(message) for message in messages]
+        return {"count": len(results), "results": results}
+
+
+def refuse(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectError("connection refused", request=request)
+
+
+@pytest.fixture
+def instances():
+    return [Instance(f"http://api-{i}") for i in range(3)]
+
+
+def make_router(instances, unreachable=()):
+    mounts = {instance.name: httpx.ASGITransport(app=instance.app) for instance in instances}
+    mounts.update({url: httpx.MockTransport(refuse) for url in unreachable})
+    return AffinityRouter([*mounts], unhealthy_after=2, mounts=mounts)
+
+
+@pytest.fixture
+def router(instances):
+    return make_router(instances)
+
+
+@pytest.fixture
+def client(router):
+    with patch.object(proxy, "affinity_router", router):
+        yield TestClient(proxy.app)
+
+
+def test_ring_moves_only_the_keys_of_an_added_instance():
+    """Test adding a fourth instance moves about a quarter of the keys, all to it."""
+    keys = [routing_key(f"key {i}") for i in range(4000)]
+    three = HashRing(["a", "b", "c"])
+    four = HashRing(["a", "b", "c", "d"])
+
+    moved = [key for key in keys if next(three.walk(key)) != next(four.walk(key))]
+    assert all(next(four.walk(key)) == "d" for key in moved)
+    assert 0.15 < len(moved) / len(keys) < 0.35
+    assert sum(three.shares().values()) == pytest.approx(1.0, abs=1e-3)
+    # Fallback order of the other instances is unchanged too
+    assert list(three.walk(keys[0])) == [node for node in four.walk(keys[0]) if node != "d"]
+
+
+def test_repeated_messages_hit_the_same_instance_cache(client, instances):
+    """Test a message is always routed to one instance, whitespace aside."""
+    for message in MESSAGES:
+        first = client.post("/api/v1/predict", json={"message": message})
+        again = client.post("/api/v1/predict", json={"message": f"  {message}\n"})
+        assert first.json()["decided_by"] == "model"
+        assert again.json()["decided_by"] == "cache"
+        assert first.headers["x-backend"] == again.headers["x-backend"]
+
+    assert sum(len(instance.cache) for instance in instances) == len(MESSAGES)
+    assert all(instance.cache for instance in instances)
+
+
+def test_batch_is_split_by_owner_and_merged_in_order(client, router, instances):
+    """Test each instance scores only the messages it owns, returned in input order."""
+    response = client.post("/api/v1/predict/batch", json={"messages": MESSAGES})
+
+    assert response.status_code == 200
+    assert [result["message"] for result in response.json()["results"]] == MESSAGES
+    for instance in instances:
+        assert len(instance.batches) == 1
+        assert all(
+            router.owner(routing_key(message)).url == instance.name
+            for message in instance.batches[0]
+        )
+    assert router.stats()["split_batches"] == 1
+
+    response = client.post(
+        "/api/v1/predict/batch", params={"layout": "columnar"}, json={"messages": MESSAGES}
+    )
+    assert response.json()["count"] == len(MESSAGES)
+    assert response.json()["decided_by"] == ["cache"] * len(MESSAGES)
+    # Each instance reports its own model_info, so it stays per message
+    assert [info["instance"] for info in response.json()["model_info"]] == [
+        router.owner(routing_key(message)).url for message in MESSAGES
+    ]
+
+
+def test_sub_batches_carry_only_validated_messages(client, instances):
+    """Test instances receive the validated (stripped) messages, not the raw payload."""
+    padded = [f"  {message}\n" for message in MESSAGES]
+    response = client.post(
+        "/api/v1/predict/batch", json={"messages": padded, "threshold": 0.3, "extra": "x"}
+    )
+
+    assert response.status_code == 200
+    assert [result["message"] for result in response.json()["results"]] == MESSAGES
+    assert sorted(message for instance in instances for message in instance.batches[0]) == sorted(
+        MESSAGES
+    )
+
+
+def test_unready_instance_leaves_the_ring_until_ready(client, router, instances):
+    """Test an instance failing readiness has its keys rebalanced, and only its keys."""
+    owners = {message: router.owner(routing_key(message)).url for message in MESSAGES}
+    instances[0].ready = False
+    asyncio.run(router.check_health())
+    assert router.backends[instances[0].name].healthy
+    asyncio.run(router.check_health())
+    assert not router.backends[instances[0].name].healthy
+
+    for message in MESSAGES:
+        backend = client.post("/api/v1/predict", json={"message": message}).headers["x-backend"]
+        if owners[message] == instances[0].name:
+            assert backend != instances[0].name
+        else:
+            assert backend == owners[message]
+    assert not instances[0].cache
+
+    instances[0].ready = True
+    asyncio.run(router.check_health())
+    assert {message: router.owner(routing_key(message)).url for message in MESSAGES} == owners
+
+
+def test_draining_and_unreachable_instances_fail_over(instances):
+    """Test requests handed back or refused are sent to the next instance on the ring."""
+    router = make_router(instances, unreachable=["http://api-down"])
+    instances[0].draining = True
+    with patch.object(proxy, "affinity_router", router):
+        client = TestClient(proxy.app)
+        for message in MESSAGES:
+            response = client.post("/api/v1/predict", json={"message": message})
+            assert response.status_code == 200
+            assert response.headers["x-backend"] not in (instances[0].name, "http://api-down")
+
+        stats = client.get("/router/stats").json()
+        assert stats["healthy"] == 2
+        assert stats["failovers"] == 2
+        assert stats["backends"]["http://api-down"]["ejections"] == 1
+        assert client.get("/ready").status_code == 200
+
+
+def test_pool_timeout_returns_503_without_ejecting(instances):
+    """Test a saturated router pool is reported as 503 and leaves the instances in the ring."""
+
+    def saturated(request: httpx.Request) -> httpx.Response:
+        raise httpx.PoolTimeout("no free connection", request=request)
+
+    router = AffinityRouter(
+        [instance.name for instance in instances],
+        mounts={instance.name: httpx.MockTransport(saturated) for instance in instances},
+    )
+    with patch.object(proxy, "affinity_router", router):
+        response = TestClient(proxy.app).post("/api/v1/predict", json={"message": MESSAGES[0]})
+
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
+    stats = router.stats()
+    assert stats["healthy"] == len(instances)
+    assert stats["pool_timeouts"] == 1
+    assert stats["failovers"] == 0
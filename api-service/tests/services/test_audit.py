@@ -0,0 +1,93 @@
+"""
+Unit tests for the classification audit log.
+"""
+
+import hashlib
+import json
+import sqlite3
+
+import pytest
+
+from app.services.audit import AUDIT_COLUMNS, AuditLog, message_digest
+
+RESULT = {
+    "prediction": "spam",
+    "is_spam": True,
+    "probability_spam": 0.93,
+    "probability_ham": 0.07,
+    "near_duplicate": False,
+    "decided_by": "model",
+    "model_info": {"type": "LinearSVC", "version": "abc123def456"},
+}
+
+
+def test_message_digest():
+    """Test messages are identified by their SHA-256 only."""
+    assert message_digest("Free money") == hashlib.sha256(b"Free money").hexdigest()
+    assert message_digest("café") != message_digest("cafe")
+
+
+def test_jsonl_backend_writes_decisions(tmp_path):
+    """Test decisions are written to JSONL without the message text."""
+    path = tmp_path / "audit" / "predictions.jsonl"
+    audit = AuditLog(str(path), flush_interval=0.01)
+    audit.start()
+    assert audit.log("predict", "Free money now", 0.6, RESULT, 1.23456)
+    assert audit.log("predict/long", "Meeting notes", 0.5, RESULT, 2.0)
+    audit.stop()
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [record["endpoint"] for record in records] == ["predict", "predict/long"]
+    record = records[0]
+    assert set(record) == set(AUDIT_COLUMNS)
+    assert record["message_sha256"] == message_digest("Free money now")
+    assert record["prediction"] == "spam"
+    assert record["probability_spam"] == 0.93
+    assert record["threshold"] == 0.6
+    assert record["model_version"] == "abc123def456"
+    assert record["latency_ms"] == 1.235
+    assert record["decided_by"] == "model"
+    assert "Free money" not in path.read_text(encoding="utf-8")
+    assert audit.stats() == {"written": 2, "dropped": 0, "queued": 0}
+
+
+def test_sqlite_backend_commits_batches(tmp_path):
+    """Test the SQLite backend stores one row per decision."""
+    path = tmp_path / "audit.sqlite3"
+    audit = AuditLog(str(path), backend="sqlite", batch_size=50, flush_interval=0.01)
+    audit.start()
+    for i in range(120):
+        audit.log("predict", f"message {i}", 0.5, RESULT, float(i))
+    audit.stop()
+
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute(
+            "SELECT message_sha256, threshold, model_version, latency_ms, decided_by "
+            "FROM audit_log ORDER BY ts"
+        ).fetchall()
+    assert len(rows) == 120
+    assert rows[5] == (message_digest("message 5"), 0.5, "abc123def456", 5.0, "model")
+
+
+def test_sqlite_backend_adds_decided_by_to_existing_table(tmp_path):
+    """Test a database created without decided_by is migrated on open."""
+    path = tmp_path / "audit.sqlite3"
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE audit_log (ts REAL, endpoint TEXT, message_sha256 TEXT, "
+            "prediction TEXT, probability_spam REAL, probability_ham REAL, threshold REAL, "
+            "model_version TEXT, latency_ms REAL, near_duplicate INTEGER)"
+        )
+    audit = AuditLog(str(path), backend="sqlite", flush_interval=0.01)
+    audit.start()
+    audit.log("predict", "hello", 0.5, RESULT, 1.0)
+    audit.stop()
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT decided_by FROM audit_log").fetchall() == [("model",)]
+
+
+def test_invalid_backend_is_rejected(tmp_path):
+    """Test an unknown backend is rejected."""
+    with pytest.raises(ValueError):
+        AuditLog(str(tmp_path / "audit"), backend="kafka")
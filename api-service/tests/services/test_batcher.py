@@ -0,0 +1,75 @@
+"""
+Unit tests for the adaptive micro-batcher.
+"""
+
+import asyncio
+
+import pytest
+
+from app.models import SpamClassifier
+from app.services.batcher import MicroBatcher
+
+
+@pytest.fixture
+def loaded(trained_models_dir):
+    """Loaded classifier."""
+    classifier = SpamClassifier(models_dir=str(trained_models_dir))
+    classifier.load()
+    return classifier
+
+
+async def classify_all(batcher, classifier, messages, threshold=0.5):
+    return await asyncio.gather(
+        *(batcher.classify(classifier, message, threshold) for message in messages)
+    )
+
+
+def test_concurrent_requests_share_batches(loaded, training_corpus):
+    """Test concurrent requests are scored together and answered in their order."""
+    messages, _ = training_corpus
+    batcher = MicroBatcher(max_batch_size=8, max_wait=0.01)
+    results = asyncio.run(classify_all(batcher, loaded, messages[:20]))
+    batcher.close()
+
+    assert results == [loaded.classify({"message": message}) for message in messages[:20]]
+    stats = batcher.stats()
+    assert stats["requests"] == 20
+    assert stats["batches"] == 3
+    assert stats["mean_batch_size"] == round(20 / 3, 2)
+    assert stats["pending"] == 0
+
+
+def test_each_classifier_gets_its_own_batches(loaded, trained_models_dir):
+    """Test requests for different classifiers are never mixed in one batch."""
+    other = SpamClassifier(models_dir=str(trained_models_dir))
+    other.load()
+    batcher = MicroBatcher(max_wait=0.005)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.classify(loaded, "free money click now", 0.5),
+            batcher.classify(other, "free money click now", 0.0),
+        )
+
+    first, second = asyncio.run(scenario())
+    batcher.close()
+    assert second["is_spam"] is True
+    assert first["probability_spam"] == second["probability_spam"]
+    assert batcher.stats()["batches"] == 2
+
+
+def test_errors_reach_every_request_of_the_batch():
+    """Test a failing batch raises for each of its requests."""
+    batcher = MicroBatcher(max_wait=0.001)
+    unloaded = SpamClassifier(models_dir="tests/fixtures/models")
+
+    async def scenario():
+        return await asyncio.gather(
+            *(batcher.classify(unloaded, "free money", 0.5) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(scenario())
+    batcher.close()
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert batcher.stats()["mean_batch_ms"] >= 0
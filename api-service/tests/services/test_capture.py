@@ -0,0 +1,136 @@
+"""
+Unit tests for sampled traffic capture.
+"""
+
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services.capture import TrafficCaptureMiddleware, TrafficRecorder, redact
+
+
+class ListRecorder:
+    """Recorder keeping entries in memory."""
+
+    def __init__(self):
+        self.entries = []
+
+    def record(self, entry):
+        self.entries.append(entry)
+        return True
+
+
+def build_client(recorder, **kwargs):
+    """Test client for a tiny app wrapped by the capture middleware."""
+    app = FastAPI()
+
+    @app.post("/api/v1/predict")
+    def predict(payload: dict):
+        return {
+            "prediction": "spam",
+            "probability_spam": 0.9,
+            "model_info": {"version": "abc123"},
+        }
+
+    @app.post("/other")
+    def other():
+        return {}
+
+    app.add_middleware(TrafficCaptureMiddleware, recorder=recorder, **kwargs)
+    return TestClient(app)
+
+
+def read_lines(path):
+    """Parse a JSONL file."""
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_redact_modes():
+    """Test PII masking and full redaction keep the text shape."""
+    text = "Mail bob.smith@corp.io or visit https://win.example.org/x?id=7 call 555-0100"
+    assert redact(text, "none") == text
+    masked = redact(text, "pii")
+    assert "bob.smith" not in masked and "win.example" not in masked
+    assert "555" not in masked
+    assert masked.startswith("Mail user@example.com or visit http://example.com/ call 000-0000")
+    assert redact("Win 10 prizes!", "full") == "xxx xx xxxxxx!"
+
+
+def test_recorder_writes_and_rotates(tmp_path):
+    """Test records are written as JSONL and files rotate at max_bytes."""
+    path = tmp_path / "capture" / "traffic.jsonl"
+    recorder = TrafficRecorder(str(path), max_bytes=200, backups=2, flush_interval=0.01)
+    recorder.start()
+    for i in range(12):
+        assert recorder.record({"ts": i, "body": "x" * 40})
+    recorder.stop()
+
+    assert recorder.stats() == {"written": 12, "dropped": 0, "queued": 0}
+    files = [path, path.with_name("traffic.jsonl.1"), path.with_name("traffic.jsonl.2")]
+    assert all(f.exists() for f in files)
+    assert not path.with_name("traffic.jsonl.3").exists()
+    assert all(f.stat().st_size <= 200 for f in files)
+    # The newest records are in the active file, older ones in .1 then .2
+    assert read_lines(path)[-1]["ts"] == 11
+    assert read_lines(files[2])[0]["ts"] < read_lines(files[1])[0]["ts"] < read_lines(path)[0]["ts"]
+
+
+def test_recorder_drops_when_queue_is_full(tmp_path):
+    """Test records are dropped and counted instead of blocking."""
+    recorder = TrafficRecorder(str(tmp_path / "traffic.jsonl"), queue_size=2)
+    assert recorder.record({"ts": 1})
+    assert recorder.record({"ts": 2})
+    assert not recorder.record({"ts": 3})
+    assert recorder.stats() == {"written": 0, "dropped": 1, "queued": 2}
+    recorder.stop()
+
+
+def test_middleware_records_sampled_predictions():
+    """Test prediction requests are recorded with body, status and response."""
+    recorder = ListRecorder()
+    client = build_client(recorder, sample_rate=1.0, redaction="pii")
+
+    response = client.post("/api/v1/predict?threshold=0.7", json={"message": "Call 555 now"})
+    assert response.status_code == 200
+    assert response.json()["prediction"] == "spam"
+    client.post("/other")
+    client.get("/api/v1/predict")
+
+    assert len(recorder.entries) == 1
+    entry = recorder.entries[0]
+    assert entry["method"] == "POST"
+    assert entry["path"] == "/api/v1/predict"
+    assert entry["query"] == "threshold=0.7"
+    assert entry["content_type"] == "application/json"
+    assert entry["status"] == 200
+    assert entry["ts"] <= time.time()
+    assert entry["latency_ms"] >= 0
+    assert json.loads(entry["body"]) == {"message": "Call 000 now"}
+    assert entry["response"] == {
+        "prediction": "spam",
+        "probability_spam": 0.9,
+        "model_version": "abc123",
+    }
+
+
+def test_middleware_sampling_and_body_limit():
+    """Test sample_rate=0 records nothing and large bodies are kept out."""
+    recorder = ListRecorder()
+    client = build_client(recorder, sample_rate=0.0)
+    client.post("/api/v1/predict", json={"message": "hello"})
+    assert recorder.entries == []
+
+    client = build_client(recorder, sample_rate=1.0, redaction="none", max_body_bytes=10)
+    client.post("/api/v1/predict", json={"message": "a long message body"})
+    entry = recorder.entries[0]
+    assert "body" not in entry
+    assert entry["body_bytes"] > 10
+
+
+def test_middleware_rejects_unknown_redaction():
+    """Test an invalid redaction mode is rejected."""
+    with pytest.raises(ValueError):
+        TrafficCaptureMiddleware(None, ListRecorder(), redaction="partial")
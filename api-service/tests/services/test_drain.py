@@ -0,0 +1,176 @@
+"""
+Unit tests for the graceful drain on shutdown.
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.models import SpamClassifier
+from app.services import BatchingSink, MicroBatcher
+from app.services.drain import DRAINING, STOPPING, DrainCoordinator, DrainMiddleware, drain_sink
+from app.services.scheduler import InferenceScheduler
+
+
+@pytest.fixture
+def coordinator():
+    return DrainCoordinator(grace_period=5.0, readiness_delay=0.0)
+
+
+@pytest.fixture
+def client(coordinator):
+    """App with one inference route and one other route behind the drain middleware."""
+    app = FastAPI()
+
+    @app.post("/api/v1/predict")
+    async def predict():
+        return {"inflight": coordinator.inflight}
+
+    @app.get("/api/v1/model/info")
+    async def info():
+        return {}
+
+    @app.websocket("/api/v1/ws/predict")
+    async def stream(websocket: WebSocket):
+        await websocket.accept()
+        await websocket.close()
+
+    app.add_middleware(DrainMiddleware, coordinator=coordinator)
+    return TestClient(app)
+
+
+class GatedWriter:
+    """Writer whose first batch blocks until the gate opens."""
+
+    def __init__(self):
+        self.records = []
+        self.writing = threading.Event()
+        self.gate = threading.Event()
+
+    def write_batch(self, records):
+        self.writing.set()
+        self.gate.wait(5)
+        self.records.extend(records)
+
+    def close(self):
+        pass
+
+
+def test_readiness_fails_before_work_is_refused(coordinator):
+    """Test draining keeps admitting work; stopping refuses it and notifies channels."""
+    stopped = []
+    coordinator.on_stop(lambda: stopped.append(True))
+
+    coordinator.begin()
+    assert coordinator.state == DRAINING
+    assert not coordinator.ready and coordinator.admit()
+    coordinator.release()
+
+    coordinator.stop_admission()
+    assert coordinator.state == STOPPING
+    assert stopped == [True]
+    assert not coordinator.admit()
+    assert coordinator.stats()["rejected"] == 1
+
+    coordinator.reset()
+    assert coordinator.ready and coordinator.admitting
+
+
+def test_inference_work_is_handed_back_while_stopping(client, coordinator):
+    """Test refused requests get 503 with Retry-After; other routes are still served."""
+    response = client.post("/api/v1/predict")
+    assert response.json() == {"inflight": 1}
+    assert coordinator.inflight == 0
+
+    coordinator.stop_admission()
+    response = client.post("/api/v1/predict")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert response.headers["connection"] == "close"
+    assert client.get("/api/v1/model/info").status_code == 200
+    with pytest.raises(WebSocketDisconnect) as error:
+        with client.websocket_connect("/api/v1/ws/predict"):
+            pass
+    assert error.value.code == 1013
+    assert coordinator.stats()["admitted"] == 1
+    assert coordinator.stats()["rejected"] == 2
+
+
+def test_wait_idle_waits_for_admitted_work(coordinator):
+    """Test wait_idle returns once in-flight work is released, False on timeout."""
+    async def main():
+        coordinator.admit()
+        assert not await coordinator.wait_idle(0.05)
+        asyncio.get_running_loop().call_later(0.05, coordinator.release)
+        return await coordinator.wait_idle(1.0)
+
+    assert asyncio.run(main())
+
+
+def test_scheduler_drain_finishes_queue_or_cancels_it():
+    """Test queued requests run during the drain; those left at timeout are cancelled."""
+    gate = threading.Event()
+
+    async def main(release):
+        scheduler = InferenceScheduler(workers=1, heavy_workers=0)
+        blocker = asyncio.ensure_future(scheduler.run(0, gate.wait, 5))
+        queued = [asyncio.ensure_future(scheduler.run(10, lambda: "done")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        if release:
+            gate.set()
+        report = await scheduler.drain(0.2)
+        gate.set()
+        await blocker
+        results = await asyncio.gather(*queued, return_exceptions=True)
+        scheduler.close()
+        return report, results
+
+    report, results = asyncio.run(main(release=False))
+    assert report == {"queued": 3, "cancelled": 3}
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+    gate.clear()
+    report, results = asyncio.run(main(release=True))
+    assert report == {"queued": 3, "cancelled": 0}
+    assert results == ["done"] * 3
+
+
+def test_batcher_drain_scores_pending_requests_now(trained_models_dir):
+    """Test pending requests are scored without waiting for their batch to fill."""
+    classifier = SpamClassifier(models_dir=str(trained_models_dir))
+    classifier.load()
+
+    async def main():
+        batcher = MicroBatcher(max_batch_size=64, max_wait=60.0)
+        pending = [
+            asyncio.ensure_future(batcher.classify(classifier, "free money click here", 0.5))
+            for _ in range(4)
+        ]
+        await asyncio.sleep(0)
+        report = await batcher.drain(5.0)
+        results = await asyncio.gather(*pending)
+        batcher.close()
+        return report, results
+
+    report, results = asyncio.run(main())
+    assert report == {"queued": 4, "cancelled": 0}
+    assert len(results) == 4
+
+
+def test_drain_sink_reports_flushed_records():
+    """Test records queued at shutdown are written on stop and reported."""
+    writer = GatedWriter()
+    sink = BatchingSink(writer, flush_interval=60.0)
+    sink.start()
+    sink.submit({"i": 0})
+    writer.writing.wait(5)
+    for i in range(1, 5):
+        sink.submit({"i": i})
+    threading.Timer(0.05, writer.gate.set).start()
+
+    assert drain_sink(sink, 5.0) == {"queued": 4, "written": 5, "dropped": 0, "left": 0}
+    assert [record["i"] for record in writer.records] == list(range(5))
@@ -0,0 +1,161 @@
+"""
+Unit tests for feedback storage and background incremental model updates.
+"""
+
+import csv
+import fcntl
+import shutil
+from unittest.mock import patch
+
+import joblib
+import pytest
+
+from app.models import SpamClassifier
+from app.models.artifacts import read_checksums, write_checksums
+from app.services.feedback import FeedbackLog, FeedbackStore, FeedbackTrainer, run_update
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Open feedback store in a temporary directory."""
+    store = FeedbackStore(str(tmp_path / "feedback" / "feedback.sqlite3"), holdout_every=5)
+    store.open()
+    return store
+
+
+@pytest.fixture
+def models_dir(tmp_path, trained_models_dir):
+    """Writable copy of the trained artifacts (updates replace the model)."""
+    return shutil.copytree(trained_models_dir, tmp_path / "models")
+
+
+def add_feedback(store, messages, labels):
+    store.write_batch(
+        [{"ts": 0.0, "message": m, "label": label} for m, label in zip(messages, labels)]
+    )
+
+
+def write_csv(path, messages, labels):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["message", "label"])
+        writer.writerows(zip(messages, labels))
+    return str(path)
+
+
+def test_store_splits_training_and_holdout_rows(store):
+    """Test every Nth row is held out and trained rows are no longer pending."""
+    add_feedback(store, [f"message {i}" for i in range(12)], ["spam", "ham"] * 6)
+
+    pending = store.pending(limit=100)
+    assert [row[0] for row in pending] == [1, 2, 3, 4, 6, 7, 8, 9, 11, 12]
+    assert [row[0] for row in store.holdout(limit=100)] == [10, 5]
+    # The oldest rows come first when the limit applies, so backlogs drain in order
+    assert [row[0] for row in store.pending(limit=3)] == [1, 2, 3]
+    store.mark_trained(3)
+    assert [row[0] for row in store.pending(limit=3)] == [4, 6, 7]
+
+    store.mark_trained(8)
+    assert [row[0] for row in store.pending(limit=100)] == [9, 11, 12]
+    assert store.stats() == {
+        "stored": 12, "pending": 3, "holdout": 2, "last_id": 12, "trained_through": 8,
+    }
+
+
+def test_feedback_log_writes_in_background(store):
+    """Test recorded feedback reaches the store through the batching sink."""
+    log = FeedbackLog(store, flush_interval=0.01)
+    log.start()
+    assert log.record("win a prize", "spam", model_version="v1")
+    log.stop()
+
+    assert store.stats()["stored"] == 1
+    assert store.pending(limit=10)[0][1:] == ("win a prize", "spam")
+
+
+def test_update_is_published_atomically(store, models_dir, training_corpus):
+    """Test an update that keeps holdout accuracy replaces the served artifacts."""
+    messages, labels = training_corpus
+    add_feedback(store, messages[:200], labels[:200])
+    before = write_checksums(models_dir, ["best_model_temp.joblib", "metadata.joblib"])
+
+    report = run_update(str(models_dir), str(store.path), max_regression=0.05)
+
+    assert report["status"] == "published"
+    assert report["trained_rows"] == 160
+    assert report["holdout_rows"] == 40
+    assert store.stats()["trained_through"] == report["trained_through"] == 199
+    metadata = joblib.load(models_dir / "metadata.joblib")
+    assert metadata["feedback_updates"] == 1
+    # The manifest follows the replaced artifacts, so verified loads still pass
+    assert read_checksums(models_dir).keys() == before.keys()
+    assert read_checksums(models_dir) != before
+    assert not list(models_dir.glob(".*.tmp"))
+
+    classifier = SpamClassifier(models_dir=str(models_dir))
+    classifier.load()
+    assert classifier.classify({"message": messages[1]})["prediction"] == labels[1]
+
+    # Nothing new to train on
+    assert run_update(str(models_dir), str(store.path))["status"] == "skipped"
+
+
+def test_regressing_update_is_rejected(store, models_dir, tmp_path, training_corpus):
+    """Test mislabelled feedback that hurts holdout accuracy is not published."""
+    messages, labels = training_corpus
+    flipped = ["ham" if label == "spam" else "spam" for label in labels]
+    add_feedback(store, messages[:200], flipped[:200])
+    holdout_path = write_csv(tmp_path / "holdout.csv", messages[200:], labels[200:])
+    model_bytes = (models_dir / "best_model_temp.joblib").read_bytes()
+
+    report = run_update(
+        str(models_dir), str(store.path), holdout_path=holdout_path, epochs=20, eta0=0.5
+    )
+
+    assert report["status"] == "rejected"
+    assert report["candidate_accuracy"] < report["current_accuracy"]
+    assert (models_dir / "best_model_temp.joblib").read_bytes() == model_bytes
+    assert store.stats()["trained_through"] == 0
+
+
+def test_trainer_swaps_in_published_model(store, models_dir, training_corpus):
+    """Test the trainer runs an update and serves the published model."""
+    messages, labels = training_corpus
+    classifier = SpamClassifier(models_dir=str(models_dir))
+    classifier.load()
+    served, served_version = classifier.model, classifier.model_version
+    trainer = FeedbackTrainer(store, classifier, min_new=50, max_regression=0.05)
+    trainer._model_stamp = trainer._stamp()
+
+    def inline_update():
+        return run_update(str(models_dir), str(store.path), **trainer.update_kwargs)
+
+    with patch.object(trainer, "_submit", side_effect=inline_update):
+        add_feedback(store, messages[:20], labels[:20])
+        assert trainer.run_once() is None  # not enough new feedback
+        add_feedback(store, messages[20:200], labels[20:200])
+        report = trainer.run_once()
+        # The same rows are not attempted twice
+        assert trainer.run_once() is None
+
+    assert report["status"] == "published"
+    assert classifier.model is not served
+    # Cached predictions of the previous model are not reused
+    assert classifier.model_version != served_version
+    assert trainer.stats()["updates_published"] == trainer.stats()["models_swapped"] == 1
+    assert classifier.classify({"message": messages[3]})["prediction"] == labels[3]
+
+
+def test_trainer_skips_while_another_process_trains(store, models_dir, training_corpus):
+    """Test only the holder of the file lock runs an update."""
+    messages, labels = training_corpus
+    classifier = SpamClassifier(models_dir=str(models_dir))
+    classifier.load()
+    trainer = FeedbackTrainer(store, classifier, min_new=1)
+    add_feedback(store, messages[:10], labels[:10])
+
+    lock_path = store.path.with_name(store.path.name + ".lock")
+    with open(lock_path, "w") as lock, patch.object(trainer, "_submit") as submit:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        assert trainer.run_once() is None
+    submit.assert_not_called()
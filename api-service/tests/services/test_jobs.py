@@ -0,0 +1,148 @@
+"""
+Unit tests for the SQLite-backed batch job store and runner.
+"""
+
+import time
+
+import pytest
+
+from app.models import SpamClassifier
+from app.services.jobs import JobRunner, JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Open job store in a temporary directory."""
+    store = JobStore(str(tmp_path / "jobs" / "jobs.sqlite3"))
+    store.open()
+    return store
+
+
+def wait_for(store, jobs, timeout=10):
+    """Wait until all jobs are completed or the timeout expires."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if all(store.get_job(job["id"])["status"] == "completed" for job in jobs):
+            return
+        time.sleep(0.02)
+
+
+@pytest.fixture(scope="module")
+def classifier(trained_models_dir):
+    """Classifier loaded from real artifacts."""
+    classifier = SpamClassifier(models_dir=str(trained_models_dir))
+    classifier.load()
+    return classifier
+
+
+def test_job_is_processed_in_chunks(store, classifier, training_corpus):
+    """Test a job is scored chunk by chunk and results are stored in order."""
+    messages, labels = training_corpus
+    job = store.create_job(messages[:25], threshold=0.5)
+    assert job["status"] == "queued"
+    assert job["total"] == 25
+
+    runner = JobRunner(store, classifier, chunk_size=10)
+    assert runner.run_pending() == 1
+
+    job = store.get_job(job["id"])
+    assert job["status"] == "completed"
+    assert job["processed"] == 25
+    results = list(store.iter_results(job["id"], page_size=7))
+    assert [seq for seq, _, _ in results] == list(range(25))
+    assert [is_spam for _, is_spam, _ in results] == [label == "spam" for label in labels[:25]]
+    assert job["spam_count"] == sum(is_spam for _, is_spam, _ in results)
+    assert store.pending_messages(job["id"], 100) == []
+    assert [seq for seq, _, _ in store.iter_results(job["id"], offset=20)] == [20, 21, 22, 23, 24]
+
+
+def test_long_messages_are_scored_under_a_token_budget(store, classifier, training_corpus):
+    """Test messages above max_chars go through classify_long, the rest in one batch."""
+    messages, _ = training_corpus
+    long_message = " ".join(messages[:200])
+    job = store.create_job([messages[0], long_message, messages[1]], threshold=0.5)
+
+    runner = JobRunner(store, classifier, max_chars=1000, long_options={"max_tokens": 500})
+    assert runner.run_pending() == 1
+
+    probabilities = [probability for _, _, probability in store.iter_results(job["id"])]
+    expected = classifier.classify_long({"message": long_message}, max_tokens=500)
+    assert probabilities[1] == pytest.approx(expected["probability_spam"])
+    assert probabilities[0::2] == pytest.approx(
+        classifier.predict_spam_probabilities(messages[:2]).tolist()
+    )
+
+
+def test_interrupted_job_resumes(store, classifier, training_corpus):
+    """Test a job left running by a crash resumes from the last committed chunk."""
+    messages, _ = training_corpus
+    job = store.create_job(messages[:30], threshold=0.5)
+    claimed = store.claim_next()
+    pending = store.pending_messages(claimed["id"], 10)
+    store.save_results(claimed["id"], [(seq, False, 0.1) for seq, _ in pending])
+    # Simulated crash: the job stays 'running' with 10 of 30 results.
+
+    assert store.requeue_stale(older_than=60) == 0
+    runner = JobRunner(store, classifier, chunk_size=8, poll_interval=0.05, lease_seconds=0)
+    runner.start()
+    try:
+        wait_for(store, [job])
+    finally:
+        runner.stop()
+
+    job = store.get_job(job["id"])
+    assert job["status"] == "completed"
+    assert job["processed"] == 30
+    assert len(list(store.iter_results(job["id"]))) == 30
+
+
+def test_duplicate_chunk_is_counted_once(store, training_corpus):
+    """Test results saved twice for the same messages do not inflate progress."""
+    job = store.create_job(training_corpus[0][:4], threshold=0.5)
+    results = [(0, True, 0.9), (1, False, 0.2)]
+    store.save_results(job["id"], results)
+    job = store.save_results(job["id"], results)
+    assert job["processed"] == 2
+    assert job["spam_count"] == 1
+    assert job["status"] == "queued"
+
+
+def test_stopping_requeues_job(store, classifier, training_corpus):
+    """Test a stopping worker leaves its job queued for the next start."""
+    job = store.create_job(training_corpus[0][:5], threshold=0.5)
+    runner = JobRunner(store, classifier)
+    runner._stop.set()
+    runner._process(store.claim_next())
+    assert store.get_job(job["id"])["status"] == "queued"
+    assert runner.run_pending() == 0
+
+
+def test_failed_job_records_error(store, training_corpus):
+    """Test classification errors mark the job as failed."""
+    job = store.create_job(training_corpus[0][:5], threshold=0.5)
+    runner = JobRunner(store, SpamClassifier(models_dir="missing"))
+    runner.run_pending()
+
+    job = store.get_job(job["id"])
+    assert job["status"] == "failed"
+    assert "not loaded" in job["error"]
+
+
+def test_background_workers_process_jobs(store, classifier, training_corpus):
+    """Test started workers pick up jobs after notify()."""
+    runner = JobRunner(store, classifier, workers=2, poll_interval=0.05)
+    runner.start()
+    try:
+        jobs = [store.create_job(training_corpus[0][:50], threshold=0.5) for _ in range(3)]
+        runner.notify()
+        wait_for(store, jobs)
+    finally:
+        runner.stop()
+
+    assert all(store.get_job(job["id"])["processed"] == 50 for job in jobs)
+
+
+def test_unknown_job(store):
+    """Test missing jobs return None."""
+    assert store.get_job("missing") is None
+    assert store.claim_next() is None
@@ -0,0 +1,71 @@
+"""
+Unit tests for process memory introspection.
+"""
+
+import sys
+
+import pytest
+
+from app.models import NearDuplicateIndex, SpamClassifier
+from app.services.memory import MemoryTracer, memory_report, process_memory
+from app.services.sink import BatchingSink
+
+
+class NullWriter:
+    def write_batch(self, records):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_process_memory():
+    """Test resident and shared memory are read from /proc."""
+    memory = process_memory()
+    assert memory["rss_bytes"] > 0
+    assert memory["peak_rss_bytes"] >= memory["rss_bytes"]
+
+
+def test_tracer_diff_against_baseline():
+    """Test diffs need a baseline and report the sites that grew."""
+    tracer = MemoryTracer()
+    assert tracer.diff() is None
+    assert tracer.snapshot()["baseline"] is True
+    try:
+        grown = [bytearray(1024) for _ in range(2000)]
+        diff = tracer.diff(top=5)
+    finally:
+        status = tracer.stop()
+
+    assert diff["tracing"] is True
+    assert len(diff["top"]) <= 5
+    top = diff["top"][0]
+    assert top["size_diff_bytes"] >= 1024 * len(grown)
+    assert "test_memory.py" in top["location"]
+    assert status == {
+        "tracing": False, "baseline": False, "traced_bytes": 0, "traced_peak_bytes": 0,
+    }
+    assert tracer.diff() is None
+
+
+def test_memory_report_components(trained_models_dir):
+    """Test artifacts, caches and queues are reported for a loaded classifier."""
+    classifier = SpamClassifier(
+        models_dir=str(trained_models_dir), near_duplicate_index=NearDuplicateIndex(capacity=100)
+    )
+    classifier.load()
+    classifier.classify({"message": "Meeting moved to Thursday"})
+    sink = BatchingSink(NullWriter(), queue_size=10, name="test")
+    sink.submit({"message": "x" * 10000})
+
+    report = memory_report(classifier, sinks={"audit_log": sink, "traffic_capture": None})
+
+    assert set(report["artifacts"]) == {"vectorizer", "model", "label_encoder", "metadata"}
+    assert report["artifacts_total_bytes"] > 0
+    components = report["components"]
+    assert components["near_duplicate_index"]["entries"] == 1
+    assert components["audit_log"]["queued"] == 1
+    assert components["audit_log"]["bytes"] > 10000
+    assert "traffic_capture" not in components
+    assert report["components_total_bytes"] >= components["audit_log"]["bytes"]
@@ -0,0 +1,185 @@
+"""
+Unit tests for MIME text extraction.
+"""
+
+import base64
+
+from app.services.mime import MimeTextExtractor, html_to_text
+
+
+def build_message(attachment_size=1024):
+    """Build a multipart email with alternative text, an attachment and HTML."""
+    attachment = base64.encodebytes(b"\x00" * attachment_size)
+    html_part = base64.encodebytes(
+        b"<html><style>p{}</style><script>var x='<b>';</script>"
+        b"<p>Click &amp; <b>claim</b></p><!-- hidden --></html>"
+    )
+    return (
+        b"From: promo@example.com\r\n"
+        b"Subject: =?utf-8?q?Gr=C3=A1tis?= prize\r\n"
+        b"MIME-Version: 1.0\r\n"
+        b"Content-Type: multipart/mixed; boundary=OUTER\r\n"
+        b"\r\n"
+        b"preamble\r\n"
+        b"--OUTER\r\n"
+        b"Content-Type: multipart/alternative; boundary=INNER\r\n"
+        b"\r\n"
+        b"--INNER\r\n"
+        b"Content-Type: text/plain; charset=utf-8\r\n"
+        b"Content-Transfer-Encoding: quoted-printable\r\n"
+        b"\r\n"
+        b"Win a fr=C3=A9e prize now!\r\n"
+        b"--INNER\r\n"
+        b"Content-Type: text/html\r\n"
+        b"\r\n"
+        b"<p>duplicate alternative</p>\r\n"
+        b"--INNER--\r\n"
+        b"--OUTER\r\n"
+        b"Content-Type: application/pdf\r\n"
+        b"Content-Transfer-Encoding: base64\r\n"
+        b"\r\n" + attachment + b"\r\n"
+        b"--OUTER\r\n"
+        b"Content-Type: text/html; charset=utf-8\r\n"
+        b"Content-Transfer-Encoding: base64\r\n"
+        b"\r\n" + html_part + b"\r\n"
+        b"--OUTER--\r\n"
+        b"epilogue\r\n"
+    )
+
+
+def extract(raw, chunk_size=4096, **kwargs):
+    """Feed raw bytes in chunks and return the extraction result."""
+    extractor = MimeTextExtractor(**kwargs)
+    for start in range(0, len(raw), chunk_size):
+        extractor.feed(raw[start : start + chunk_size])
+    return extractor.close()
+
+
+def test_html_to_text_strips_markup():
+    """Test tags, scripts, styles, comments and entities are handled."""
+    text = html_to_text(
+        "<div>Hello&nbsp;<b>World</b><script>alert('<p>')</script>"
+        "<style>.a{}</style><!-- note --></div>"
+    )
+    assert text == "Hello World"
+
+
+def test_html_to_text_unclosed_constructs():
+    """Test unterminated comments and scripts are dropped and unterminated tags kept."""
+    assert html_to_text("text <!-- open") == "text"
+    assert html_to_text("text <script>var a") == "text"
+    assert html_to_text("text <b") == "text <b"
+
+
+def test_html_to_text_keeps_literal_less_than():
+    """Test a '<' that cannot open a tag does not swallow the following text."""
+    assert html_to_text("price < 5 dollars, buy now") == "price < 5 dollars, buy now"
+    assert html_to_text("<p>price < 5 dollars</p> <b>now</b>") == "price < 5 dollars now"
+    assert html_to_text("1 &lt; 2 <") == "1 < 2 <"
+
+
+def test_extract_multipart_message():
+    """Test text parts are decoded and other parts skipped."""
+    result = extract(build_message())
+    assert result["subject"] == "Grátis prize"
+    assert result["text"] == "Grátis prize\nWin a frée prize now!\nClick & claim"
+    assert result["parts"] == 6
+    assert result["text_parts"] == 2
+    assert result["truncated"] is False
+
+
+def test_extract_large_attachment_is_streamed(chunk_size=65536):
+    """Test a large attachment does not change the extracted text."""
+    result = extract(build_message(attachment_size=5_000_000), chunk_size=chunk_size)
+    assert "Click & claim" in result["text"]
+    assert result["text_bytes"] < 200
+
+
+def test_extract_single_part_plain_text():
+    """Test non-multipart messages without trailing newline."""
+    result = extract(b"Subject: Hi\n\nSee you tomorrow at the office", chunk_size=5)
+    assert result["text"] == "Hi\nSee you tomorrow at the office"
+    assert result["parts"] == 1
+
+
+def test_extract_non_text_single_part_stops_early():
+    """Test parsing stops once a single non-text part is reached."""
+    extractor = MimeTextExtractor()
+    extractor.feed(b"Content-Type: image/png\r\n\r\n" + b"x" * 1000)
+    assert extractor.done is True
+    extractor.feed(b"ignored")
+    assert extractor.close()["text"] == ""
+
+
+def test_extract_text_budget_truncates():
+    """Test decoded text is capped by the byte budget."""
+    raw = b"Content-Type: text/plain\n\n" + b"spam " * 1000
+    result = extract(raw, max_text_bytes=100)
+    assert result["text_bytes"] == 100
+    assert result["truncated"] is True
+
+
+def test_extract_part_limit():
+    """Test extraction stops at the part limit."""
+    parts = b"".join(
+        b"--B\nContent-Type: text/plain\n\npart %d\n" % i for i in range(10)
+    )
+    raw = b"Content-Type: multipart/mixed; boundary=B\n\n" + parts + b"--B--\n"
+    result = extract(raw, max_parts=3)
+    assert result["truncated"] is True
+    assert result["text"] == "part 0\npart 1"
+
+
+def test_extract_depth_limit():
+    """Test nested multiparts beyond the depth limit are skipped."""
+    raw = (
+        b"Content-Type: multipart/mixed; boundary=A\n\n"
+        b"--A\nContent-Type: multipart/mixed; boundary=B\n\n"
+        b"--B\nContent-Type: text/plain\n\ntoo deep\n--B--\n"
+        b"--A\nContent-Type: text/plain\n\nvisible\n--A--\n"
+    )
+    result = extract(raw, max_depth=1)
+    assert result["text"] == "visible"
+    assert result["truncated"] is True
+
+
+def test_extract_nested_message_and_attachment():
+    """Test message/rfc822 parts are followed and text attachments ignored."""
+    raw = (
+        b"Content-Type: multipart/mixed; boundary=A\n\n"
+        b"--A\nContent-Type: text/plain\nContent-Disposition: attachment\n\nignored\n"
+        b"--A\nContent-Type: message/rfc822\n\n"
+        b"Subject: inner\nContent-Type: text/plain; charset=bogus-charset\n\nforwarded body\n"
+        b"--A--\n"
+    )
+    result = extract(raw)
+    assert result["text"] == "forwarded body"
+    assert result["parts"] == 4
+
+
+def test_extract_overlong_lines_and_bad_base64():
+    """Test overlong lines are truncated and invalid base64 is tolerated."""
+    raw = (
+        b"Content-Type: multipart/mixed; boundary=A\n\n"
+        b"--A\nContent-Type: application/zip\n\n" + b"z" * 5000 + b"\n"
+        b"--A\nContent-Type: text/plain\nContent-Transfer-Encoding: base64\n\n!!!!\n"
+        b"--A\nContent-Type: text/plain\n\n" + b"w" * 3000 + b" tail\n--A--\n"
+    )
+    result = extract(raw, chunk_size=700, max_line_bytes=1000)
+    assert result["text"] == "w" * 1000
+
+
+def test_extract_overlong_text_line_reports_truncation():
+    """Test cutting a text line sets truncated, whether or not its end was buffered."""
+    raw = b"Content-Type: text/plain\n\n" + b"w" * 3000 + b" tail\nnext line\n"
+    for chunk_size in (len(raw), 700):
+        result = extract(raw, chunk_size=chunk_size, max_line_bytes=1000)
+        assert result["text"] == "w" * 1000 + "next line"
+        assert result["truncated"] is True
+
+    attachment = (
+        b"Content-Type: multipart/mixed; boundary=A\n\n"
+        b"--A\nContent-Type: application/zip\n\n" + b"z" * 5000 + b"\n"
+        b"--A\nContent-Type: text/plain\n\nbody\n--A--\n"
+    )
+    assert extract(attachment, chunk_size=700, max_line_bytes=1000)["truncated"] is False
@@ -0,0 +1,114 @@
+"""
+Unit tests for the persistent prediction cache.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.models import SklearnBackend, SpamClassifier
+from app.services.prediction_cache import PredictionCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """SQLite cache file."""
+    return str(tmp_path / "cache" / "predictions.sqlite3")
+
+
+def test_entries_survive_restart(cache_path):
+    """Test entries written by one instance are read by the next one."""
+    cache = PredictionCache(cache_path, flush_interval=0.01)
+    key = cache.key("v1", "Free   money\nnow")
+    assert cache.get(key) is None  # database not created yet
+    cache.start()
+    cache.put(key, 0.9, 0.1)
+    cache.stop()
+
+    restarted = PredictionCache(cache_path)
+    assert restarted.get(restarted.key("v1", "Free money now")) == (0.9, 0.1)
+    assert restarted.get(restarted.key("v2", "Free money now")) is None
+    stats = restarted.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_workers_share_the_database(cache_path):
+    """Test a second instance (another worker) sees entries while the first one writes."""
+    writer = PredictionCache(cache_path, flush_interval=0.01)
+    reader = PredictionCache(cache_path)
+    writer.start()
+    reader.start()
+    writer.put(writer.key("v1", "hello there"), 0.2, 0.8)
+    writer.stop()
+    assert reader.get(reader.key("v1", "hello there")) == (0.2, 0.8)
+    reader.stop()
+
+
+def test_least_recently_used_entries_are_evicted(cache_path):
+    """Test the number of entries is bounded, keeping recently used ones."""
+    cache = PredictionCache(cache_path, max_entries=20, batch_size=1, flush_interval=0.01)
+    cache.start()
+    keys = [cache.key("v1", f"message {i}") for i in range(30)]
+    for key in keys[:20]:
+        cache.put(key, 0.5, 0.5)
+    cache.stop()
+    cache.start()
+    assert cache.get(keys[0]) is not None  # refreshes its recency
+    for key in keys[20:]:
+        cache.put(key, 0.5, 0.5)
+    cache.stop()
+
+    stored = [key for key in keys if cache.get(key) is not None]
+    assert len(stored) <= 20
+    assert keys[0] in stored and keys[1] not in stored
+    assert cache.stats()["evicted"] > 0
+
+
+def test_classifier_reads_the_cache_below_inference(cache_path, trained_models_dir):
+    """Test a restarted classifier answers cached messages without running the model."""
+    cache = PredictionCache(cache_path, flush_interval=0.01)
+    cache.start()
+    classifier = SpamClassifier(models_dir=str(trained_models_dir), prediction_cache=cache)
+    classifier.load()
+    first = classifier.classify({"message": "free money click now"})
+    batch = classifier.classify_batch(["free money click now", "team meeting notes"], [0.5, 0.5])
+    cache.stop()
+
+    restarted = SpamClassifier(
+        models_dir=str(trained_models_dir), prediction_cache=PredictionCache(cache_path)
+    )
+    restarted.load()
+    with patch.object(restarted.backend, "predict_proba", side_effect=AssertionError):
+        assert restarted.classify({"message": "free money  click now"}) == first
+        assert restarted.classify_batch(
+            ["free money click now", "team meeting notes"], [0.5, 0.5]
+        ) == batch
+
+    restarted.model_version = "retrained"
+    with patch.object(restarted.backend, "predict_proba", side_effect=AssertionError):
+        with pytest.raises(AssertionError):
+            restarted.classify({"message": "free money click now"})
+
+
+def test_serving_precision_is_part_of_the_key(cache_path, trained_models_dir):
+    """Test a float32 worker does not reuse predictions cached by a float64 worker."""
+    cache = PredictionCache(cache_path, flush_interval=0.01)
+    cache.start()
+    classifier = SpamClassifier(models_dir=str(trained_models_dir), prediction_cache=cache)
+    classifier.load()
+    classifier.classify({"message": "free money click now"})
+    cache.stop()
+
+    reduced = SpamClassifier(
+        models_dir=str(trained_models_dir),
+        backend=SklearnBackend("float32"),
+        prediction_cache=PredictionCache(cache_path),
+    )
+    reduced.load()
+    assert reduced.model_version == classifier.model_version
+    with patch.object(reduced.backend, "predict_proba", side_effect=AssertionError):
+        with pytest.raises(AssertionError):
+            reduced.classify({"message": "free money click now"})
+        with pytest.raises(AssertionError):
+            reduced.classify_batch(["free money click now"], [0.5])
+
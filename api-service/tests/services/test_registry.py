@@ -0,0 +1,137 @@
+"""
+Unit tests for the model registry (A/B and shadow routing).
+"""
+
+import pytest
+
+from app.models import SpamClassifier
+from app.services.registry import LatencyWindow, ModelRegistry
+
+
+def factory(models_dir):
+    return SpamClassifier(models_dir=models_dir)
+
+
+@pytest.fixture
+def primary(trained_models_dir):
+    """Loaded primary classifier."""
+    classifier = SpamClassifier(models_dir=str(trained_models_dir))
+    classifier.load()
+    return classifier
+
+
+def classify(message, threshold=0.5):
+    return lambda selected: selected.classify({"message": message}, threshold=threshold)
+
+
+def test_primary_policy_serves_everything(primary, training_corpus):
+    """Test without entries the primary answers and no shadow work is queued."""
+    messages, _ = training_corpus
+    registry = ModelRegistry(factory)
+    for message in messages[:5]:
+        registry.serve(primary, message, 0.5, classify(message))
+
+    stats = registry.stats()
+    assert stats["policy"] == "primary"
+    assert [model["name"] for model in stats["models"]] == ["primary"]
+    assert stats["models"][0]["served"] == 5
+    assert stats["models"][0]["latency_ms"]["p99"] > 0
+    assert stats["shadow_queue"] == {"scored": 0, "shed": 0, "queued": 0}
+
+
+def test_ab_routing_is_weighted_and_stable(primary, trained_models_dir, training_corpus):
+    """Test A/B variants receive about their weight, always for the same messages."""
+    messages, _ = training_corpus
+    registry = ModelRegistry(
+        factory, [{"name": "b", "models_dir": str(trained_models_dir), "role": "ab", "weight": 0.3}]
+    )
+    registry.load()
+    routed = [registry.select(primary, message).name for message in messages]
+    assert 0.2 < routed.count("b") / len(routed) < 0.4
+    assert routed == [registry.select(primary, message).name for message in messages]
+
+    variant = next(message for message, name in zip(messages, routed) if name == "b")
+    result = registry.serve(primary, variant, 0.5, classify(variant))
+    assert result["model_info"]["version"] == registry.variants[0].classifier.model_version
+    assert registry.stats()["policy"] == "ab"
+    assert registry.variants[0].served == 1
+
+
+def test_shadow_scoring_tracks_agreement(primary, trained_models_dir, training_corpus):
+    """Test shadow models score served requests in the background."""
+    messages, _ = training_corpus
+    registry = ModelRegistry(
+        factory,
+        [{"name": "candidate", "models_dir": str(trained_models_dir), "role": "shadow"}],
+        flush_interval=0.01,
+    )
+    registry.load()
+    for message in messages[:40]:
+        result = registry.serve(primary, message, 0.5, classify(message))
+        assert result["model_info"]["version"] == primary.model_version
+    registry.serve(primary, messages[40], 0.5, classify(messages[40]), shadow=False)
+    registry.stop()
+
+    stats = registry.stats()
+    assert stats["policy"] == "shadow"
+    primary_stats, shadow_stats = stats["models"]
+    assert primary_stats["served"] == 41
+    assert shadow_stats["role"] == "shadow"
+    assert shadow_stats["scored"] == 40
+    # Same artifacts: identical labels, differences only from result rounding
+    assert shadow_stats["agreement"] == 1.0
+    assert shadow_stats["mean_abs_diff"] < 1e-4
+    assert shadow_stats["latency_ms"]["mean"] > 0
+    assert stats["shadow_queue"] == {"scored": 40, "shed": 0, "queued": 0}
+
+
+def test_shadow_requests_are_shed_when_queue_is_full(primary, trained_models_dir):
+    """Test a full shadow queue sheds work instead of delaying the request."""
+    registry = ModelRegistry(
+        factory,
+        [{"name": "candidate", "models_dir": str(trained_models_dir), "role": "shadow"}],
+        queue_size=2,
+    )
+    # Worker not started: nothing drains the queue
+    for i in range(5):
+        registry.serve(primary, f"free money {i}", 0.5, classify(f"free money {i}"))
+    assert registry.stats()["shadow_queue"] == {"scored": 0, "shed": 3, "queued": 2}
+
+
+def test_shadow_sample_rate(primary, trained_models_dir):
+    """Test sample_rate=0 disables shadow scoring."""
+    registry = ModelRegistry(
+        factory,
+        [{"name": "candidate", "models_dir": str(trained_models_dir), "role": "shadow"}],
+        sample_rate=0.0,
+    )
+    registry.serve(primary, "free money", 0.5, classify("free money"))
+    assert registry.stats()["shadow_queue"]["queued"] == 0
+
+
+@pytest.mark.parametrize(
+    "entries",
+    [
+        [{"name": "b", "models_dir": "models_b", "role": "canary"}],
+        [{"name": "b", "role": "shadow"}],
+        [{"name": "primary", "models_dir": "models_b", "role": "shadow"}],
+        [{"name": "b", "models_dir": "models_b", "role": "ab", "weight": 0}],
+        [
+            {"name": "b", "models_dir": "models_b", "role": "ab", "weight": 0.6},
+            {"name": "c", "models_dir": "models_c", "role": "ab", "weight": 0.6},
+        ],
+    ],
+)
+def test_invalid_entries_are_rejected(entries):
+    """Test entries are validated when the registry is built."""
+    with pytest.raises(ValueError):
+        ModelRegistry(factory, entries)
+
+
+def test_latency_window_keeps_recent_values():
+    """Test the latency window is bounded."""
+    window = LatencyWindow(size=3)
+    assert window.summary() is None
+    for value in (100.0, 1.0, 2.0, 3.0):
+        window.add(value)
+    assert window.summary() == {"mean": 2.0, "p50": 2.0, "p99": 2.98}
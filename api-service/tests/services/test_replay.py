@@ -0,0 +1,176 @@
+"""
+Unit tests for replay of captured traffic.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.services.replay import (
+    compare_predictions,
+    http_sender,
+    load_capture,
+    recorded_results,
+    replay,
+    summarize,
+    write_results,
+)
+
+
+def make_records(count, interval=0.01):
+    """Capture records spaced by interval seconds."""
+    return [
+        {
+            "ts": 1000.0 + i * interval,
+            "method": "POST",
+            "path": "/api/v1/predict",
+            "query": "",
+            "content_type": "application/json",
+            "body": json.dumps({"message": f"message {i}"}),
+            "status": 200,
+            "response": {"prediction": "ham", "probability_spam": 0.1, "model_version": "v1"},
+        }
+        for i in range(count)
+    ]
+
+
+async def fake_send(record):
+    """Sender answering spam for even-numbered messages."""
+    await asyncio.sleep(0)
+    number = int(json.loads(record["body"])["message"].split()[1])
+    probability = 0.9 if number % 2 == 0 else 0.2
+    return 200, {
+        "prediction": "spam" if probability >= 0.5 else "ham",
+        "probability_spam": probability,
+        "model_info": {"version": "v2"},
+    }
+
+
+def test_replay_modes_respect_pacing():
+    """Test original pacing takes the recorded span and speedup divides it."""
+    records = make_records(6, interval=0.04)
+
+    results, duration = asyncio.run(replay(fake_send, records, mode="original"))
+    assert duration >= 0.2
+    assert [result["index"] for result in results] == list(range(6))
+    assert results[0]["model_version"] == "v2"
+
+    _, duration = asyncio.run(replay(fake_send, records, mode="speedup", speedup=10))
+    assert duration < 0.15
+
+    results, _ = asyncio.run(replay(fake_send, records, mode="max-rate", concurrency=2))
+    assert all(result["lag_ms"] == 0.0 for result in results)
+
+    with pytest.raises(ValueError):
+        asyncio.run(replay(fake_send, records, mode="burst"))
+
+
+def test_replay_limits_concurrency():
+    """Test no more than `concurrency` requests are in flight."""
+    in_flight = {"now": 0, "max": 0}
+
+    async def slow_send(record):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.005)
+        in_flight["now"] -= 1
+        return 200, {}
+
+    asyncio.run(replay(slow_send, make_records(20), mode="max-rate", concurrency=3))
+    assert in_flight["max"] == 3
+
+
+def test_replay_records_errors():
+    """Test sender exceptions are reported as failed requests."""
+
+    async def failing_send(record):
+        raise ConnectionError("refused")
+
+    results, duration = asyncio.run(replay(failing_send, make_records(3), mode="max-rate"))
+    assert all(result["status"] == 0 for result in results)
+    assert results[0]["error"] == "refused"
+
+    summary = summarize(results, duration)
+    assert summary["errors"] == 3
+    assert summary["status_counts"] == {"0": 3}
+
+
+def test_summarize_percentiles():
+    """Test throughput and latency percentiles."""
+    results = [{"status": 200, "latency_ms": float(ms), "lag_ms": 0.0} for ms in range(1, 101)]
+    summary = summarize(results, duration=2.0)
+    assert summary["requests"] == 100
+    assert summary["errors"] == 0
+    assert summary["throughput_rps"] == 50.0
+    assert summary["latency_ms"]["p50"] == pytest.approx(50.5)
+    assert summary["latency_ms"]["p99"] == pytest.approx(99.01)
+    assert summary["latency_ms"]["max"] == 100.0
+    assert summarize([], 0.0)["throughput_rps"] == 0.0
+
+
+def test_compare_against_recorded_responses():
+    """Test label changes between the captured and replayed predictions."""
+    records = make_records(10)
+    results, _ = asyncio.run(replay(fake_send, records, mode="max-rate"))
+
+    comparison = compare_predictions(recorded_results(records), results, top=3)
+    assert comparison["baseline_versions"] == ["v1"]
+    assert comparison["candidate_versions"] == ["v2"]
+    assert comparison["compared"] == 10
+    assert comparison["label_changes"] == 5
+    assert comparison["agreement"] == 0.5
+    assert comparison["max_abs_diff"] == pytest.approx(0.8)
+    assert len(comparison["largest_diffs"]) == 3
+    assert comparison["largest_diffs"][0]["candidate"] == ["spam", 0.9]
+
+    assert compare_predictions([], [])["agreement"] is None
+
+
+def test_load_capture_and_write_results(tmp_path):
+    """Test capture files are merged by timestamp and bodiless records skipped."""
+    records = make_records(4)
+    older = tmp_path / "traffic.jsonl.1"
+    newer = tmp_path / "traffic.jsonl"
+    older.write_text("".join(json.dumps(r) + "\n" for r in records[:2]), encoding="utf-8")
+    bodiless = dict(records[3])
+    del bodiless["body"]
+    newer.write_text(
+        "\n".join(json.dumps(r) for r in (records[2], bodiless)) + "\n\n", encoding="utf-8"
+    )
+
+    loaded = load_capture([str(newer), str(older)])
+    assert [record["ts"] for record in loaded] == [r["ts"] for r in records[:3]]
+    assert len(load_capture([str(newer), str(older)], limit=2)) == 2
+
+    output = tmp_path / "out" / "results.jsonl"
+    write_results(str(output), [{"index": 0, "status": 200}])
+    assert json.loads(output.read_text()) == {"index": 0, "status": 200}
+
+
+def test_http_sender_replays_through_asgi():
+    """Test the httpx sender re-sends body, query string and content type."""
+    app = FastAPI()
+    seen = []
+
+    @app.post("/api/v1/predict")
+    def predict(payload: dict, threshold: float = 0.5):
+        seen.append((payload, threshold))
+        return {"prediction": "ham", "probability_spam": 0.3, "model_info": {"version": "v3"}}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://replay") as client:
+            records = make_records(2)
+            records[1]["query"] = "threshold=0.8"
+            return await replay(http_sender(client), records, mode="max-rate")
+
+    started = time.perf_counter()
+    results, _ = asyncio.run(run())
+    assert time.perf_counter() - started < 5
+    assert seen == [({"message": "message 0"}, 0.5), ({"message": "message 1"}, 0.8)]
+    assert [result["model_version"] for result in results] == ["v3", "v3"]
+    assert results[0]["probability_spam"] == 0.3
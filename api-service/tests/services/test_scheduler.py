@@ -0,0 +1,89 @@
+"""
+Unit tests for the cost-aware inference scheduler.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services.scheduler import BULK, INTERACTIVE, InferenceScheduler
+
+
+def run_order(scheduler, requests, delay=0.0):
+    """Schedule (name, cost) requests behind a blocked thread; return the run order."""
+    order = []
+    gate = threading.Event()
+
+    async def main():
+        blocker = asyncio.ensure_future(scheduler.run(0, gate.wait, 5))
+        await asyncio.sleep(0.01)
+        tasks = []
+        for name, cost in requests:
+            tasks.append(asyncio.ensure_future(scheduler.run(cost, order.append, name)))
+            await asyncio.sleep(delay)
+        await asyncio.sleep(0.01)
+        gate.set()
+        await asyncio.gather(blocker, *tasks)
+
+    asyncio.run(main())
+    scheduler.close()
+    return order
+
+
+def test_shortest_expected_job_first():
+    """Test queued requests run cheapest first, not in arrival order."""
+    scheduler = InferenceScheduler(workers=1, heavy_workers=0)
+    order = run_order(scheduler, [("long", 5000), ("medium", 800), ("short", 20)])
+    assert order == ["short", "medium", "long"]
+
+
+def test_aging_prevents_starvation():
+    """Test a request that waited long enough runs before newer cheaper ones."""
+    scheduler = InferenceScheduler(workers=1, heavy_workers=0, aging_rate=1000.0)
+    # 0.1 s of wait is worth 100 characters
+    order = run_order(scheduler, [("long", 50), ("short", 0), ("later", 0)], delay=0.1)
+    assert order == ["long", "short", "later"]
+
+
+def test_heavy_requests_use_their_own_threads():
+    """Test a blocked bulk request does not delay interactive ones."""
+    scheduler = InferenceScheduler(workers=1, heavy_workers=1, heavy_cost=1000)
+    gate = threading.Event()
+
+    async def main():
+        bulk = asyncio.ensure_future(scheduler.run(5000, gate.wait, 5))
+        await asyncio.sleep(0.01)
+        result = await asyncio.wait_for(scheduler.run(10, lambda: "fast"), 1.0)
+        stats = scheduler.stats()
+        gate.set()
+        await bulk
+        return result, stats
+
+    result, stats = asyncio.run(main())
+    scheduler.close()
+    assert result == "fast"
+    assert stats["shared_pool"] is False
+    assert stats["workers"][BULK]["running"] == 1
+    assert stats["lanes"][INTERACTIVE]["completed"] == 1
+    assert stats["lanes"][INTERACTIVE]["latency_ms"]["p99"] < 1000
+    assert stats["lanes"][BULK]["requests"] == 1
+
+
+def test_errors_reach_the_caller():
+    """Test inference errors propagate and are counted per lane."""
+    scheduler = InferenceScheduler()
+
+    def fail():
+        raise ValueError("model not loaded")
+
+    async def main():
+        with pytest.raises(ValueError, match="model not loaded"):
+            await scheduler.run(10, fail)
+        return await scheduler.run(10, lambda: "ok")
+
+    assert asyncio.run(main()) == "ok"
+    scheduler.close()
+    lane = scheduler.stats()["lanes"][INTERACTIVE]
+    assert (lane["requests"], lane["completed"], lane["failed"]) == (2, 1, 1)
+    assert InferenceScheduler.estimate_cost("abc", "de") == 5
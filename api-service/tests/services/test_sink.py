@@ -0,0 +1,126 @@
+"""
+Unit tests for the bounded batching sink.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.services.sink import BatchingSink
+
+
+class ListWriter:
+    """Writer keeping batches in memory, optionally blocking or failing."""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.closed = False
+        self.fail = fail
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def write_batch(self, records):
+        self.gate.wait(5)
+        if self.fail:
+            raise OSError("disk full")
+        self.batches.append(list(records))
+
+    def close(self):
+        self.closed = True
+
+
+def test_records_are_written_in_batches():
+    """Test queued records are grouped into batches of at most batch_size."""
+    writer = ListWriter()
+    writer.gate.clear()
+    sink = BatchingSink(writer, batch_size=4, flush_interval=0.01)
+    sink.start()
+    assert sink.submit({"n": 0})
+    time.sleep(0.05)
+    for i in range(1, 10):
+        assert sink.submit({"n": i})
+    writer.gate.set()
+    sink.stop()
+
+    assert writer.closed
+    assert [record["n"] for batch in writer.batches for record in batch] == list(range(10))
+    assert [len(batch) for batch in writer.batches] == [1, 4, 4, 1]
+    assert sink.stats() == {"written": 10, "dropped": 0, "queued": 0}
+
+
+def test_drop_policy_never_waits():
+    """Test a full queue drops records immediately under the 'drop' policy."""
+    sink = BatchingSink(ListWriter(), queue_size=2, policy="drop")
+    assert sink.submit({"n": 1}) and sink.submit({"n": 2})
+    start = time.perf_counter()
+    assert not sink.submit({"n": 3})
+    assert time.perf_counter() - start < 0.01
+    assert sink.stats() == {"written": 0, "dropped": 1, "queued": 2}
+
+
+def test_block_policy_waits_for_space():
+    """Test 'block' waits up to block_timeout, then drops."""
+    sink = BatchingSink(ListWriter(), queue_size=1, policy="block", block_timeout=0.05)
+    assert sink.submit({"n": 1})
+    start = time.perf_counter()
+    assert not sink.submit({"n": 2})
+    assert time.perf_counter() - start >= 0.05
+    assert sink.dropped == 1
+
+    # A writer draining the queue frees space for a blocked producer
+    sink.block_timeout = 2.0
+    sink.start()
+    assert sink.submit({"n": 3})
+    sink.stop()
+    assert sink.stats() == {"written": 2, "dropped": 1, "queued": 0}
+
+
+def test_write_failures_are_counted_as_dropped():
+    """Test a failing writer does not stop the sink and its batch is counted."""
+    writer = ListWriter(fail=True)
+    sink = BatchingSink(writer, flush_interval=0.01)
+    sink.start()
+    sink.submit({"n": 1})
+    sink.stop()
+    assert sink.stats() == {"written": 0, "dropped": 1, "queued": 0}
+    assert writer.closed
+
+
+def test_concurrent_drops_are_all_counted():
+    """Test drops from many producer threads are counted exactly."""
+    sink = BatchingSink(ListWriter(), queue_size=1, policy="drop")
+    sink.submit({"n": 0})
+
+    def produce():
+        for i in range(2000):
+            sink.submit({"n": i})
+
+    threads = [threading.Thread(target=produce) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sink.stats()["dropped"] == 8 * 2000
+
+
+def test_stop_does_not_hang_on_a_full_queue():
+    """Test stop() gives up after its timeout when a stuck writer keeps the queue full."""
+    writer = ListWriter()
+    writer.gate.clear()
+    sink = BatchingSink(writer, queue_size=1, flush_interval=0.01)
+    sink.start()
+    sink.submit({"n": 1})
+    time.sleep(0.05)
+    sink.submit({"n": 2})
+
+    start = time.perf_counter()
+    sink.stop(timeout=0.1)
+    assert time.perf_counter() - start < 1.0
+    writer.gate.set()
+
+
+def test_invalid_policy_is_rejected():
+    """Test an unknown full-queue policy is rejected."""
+    with pytest.raises(ValueError):
+        BatchingSink(ListWriter(), policy="wait")
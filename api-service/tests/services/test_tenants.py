@@ -0,0 +1,166 @@
+"""
+Unit tests for tenant resolution and the LRU classifier pool.
+"""
+
+import asyncio
+import shutil
+import threading
+import time
+
+import pytest
+
+from app.models import SpamClassifier
+from app.services.tenants import ClassifierPool, TenantDirectory, classifier_bytes
+
+
+class CountingFactory:
+    """Classifier factory counting (and optionally delaying or failing) loads."""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.calls = []
+        self.delay = delay
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def __call__(self, models_dir):
+        with self._lock:
+            self.calls.append(models_dir)
+        time.sleep(self.delay)
+        if self.fail:
+            return SpamClassifier(models_dir="/nonexistent")
+        return SpamClassifier(models_dir=models_dir)
+
+
+@pytest.fixture
+def model_dirs(tmp_path, trained_models_dir):
+    """Three copies of the trained artifacts."""
+    dirs = []
+    for name in ("a", "b", "c"):
+        shutil.copytree(trained_models_dir, tmp_path / name)
+        dirs.append(str(tmp_path / name))
+    return dirs
+
+
+def test_tenants_sharing_artifacts_share_one_instance(model_dirs):
+    """Test equivalent paths resolve to the same pooled classifier."""
+    factory = CountingFactory()
+    pool = ClassifierPool(factory)
+    first = asyncio.run(pool.acquire(model_dirs[0]))
+    second = asyncio.run(pool.acquire(model_dirs[0] + "/../a"))
+
+    assert first is second and first.is_loaded
+    assert len(factory.calls) == 1
+    stats = pool.stats()
+    assert (stats["hits"], stats["misses"], stats["loads"]) == (1, 1, 1)
+    assert stats["bytes"] == classifier_bytes(first) > 0
+
+
+def test_pinned_classifier_is_never_loaded_or_evicted(model_dirs, trained_models_dir):
+    """Test the primary classifier is served from the pinned entry."""
+    primary = SpamClassifier(models_dir=str(trained_models_dir))
+    factory = CountingFactory()
+    pool = ClassifierPool(factory, max_models=1, pinned={str(trained_models_dir): primary})
+    assert asyncio.run(pool.acquire(str(trained_models_dir))) is primary
+    asyncio.run(pool.acquire(model_dirs[0]))
+    asyncio.run(pool.acquire(model_dirs[1]))
+    assert asyncio.run(pool.acquire(str(trained_models_dir))) is primary
+    assert pool.stats()["pinned"] == 1
+    assert pool.stats()["loaded"] == 1
+
+
+def test_least_recently_used_classifier_is_evicted(model_dirs):
+    """Test the pool keeps at most max_models, evicting the least recently used."""
+    factory = CountingFactory()
+    pool = ClassifierPool(factory, max_models=2)
+    a, b, c = model_dirs
+    asyncio.run(pool.acquire(a))
+    asyncio.run(pool.acquire(b))
+    asyncio.run(pool.acquire(a))  # b is now the least recently used
+    asyncio.run(pool.acquire(c))
+
+    stats = pool.stats()
+    assert stats["evictions"] == 1
+    assert [path.rsplit("/", 1)[-1] for path in stats["models_dirs"]] == ["a", "c"]
+    asyncio.run(pool.acquire(b))
+    assert len(factory.calls) == 4
+
+
+def test_memory_bound_evicts_by_artifact_bytes(model_dirs):
+    """Test max_bytes bounds the pool, always keeping the newest classifier."""
+    pool = ClassifierPool(CountingFactory(), max_bytes=1)
+    for path in model_dirs:
+        asyncio.run(pool.acquire(path))
+    stats = pool.stats()
+    assert stats["loaded"] == 1
+    assert stats["evictions"] == 2
+
+
+def test_cold_tenant_does_not_block_others(model_dirs):
+    """Test a slow load is shared by its waiters while warm tenants are served."""
+    factory = CountingFactory()
+    pool = ClassifierPool(factory)
+    warm = asyncio.run(pool.acquire(model_dirs[0]))
+    factory.delay = 0.3
+
+    async def scenario():
+        cold = [asyncio.ensure_future(pool.acquire(model_dirs[1])) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        start = time.perf_counter()
+        assert await pool.acquire(model_dirs[0]) is warm
+        warm_seconds = time.perf_counter() - start
+        loaded = await asyncio.gather(*cold)
+        return warm_seconds, loaded
+
+    warm_seconds, loaded = asyncio.run(scenario())
+    assert warm_seconds < 0.05
+    assert loaded[0] is loaded[1] is loaded[2]
+    assert len(factory.calls) == 2
+    assert pool.stats()["misses"] == 4
+
+
+def test_failed_load_is_reported_and_retried(model_dirs):
+    """Test a failed load raises for its waiters and a later request retries."""
+    factory = CountingFactory(fail=True)
+    pool = ClassifierPool(factory)
+    with pytest.raises(RuntimeError):
+        asyncio.run(pool.acquire(model_dirs[0]))
+    assert pool.stats()["load_failures"] == 1
+
+    factory.fail = False
+    assert asyncio.run(pool.acquire(model_dirs[0])).is_loaded
+    pool.close()
+    assert asyncio.run(pool.acquire(model_dirs[1])).is_loaded
+
+
+def test_tenant_directory_resolution():
+    """Test tenants are found by API key first, then by tenant id."""
+    directory = TenantDirectory(
+        {
+            "sales": {"models_dir": "models_sales", "threshold": 0.8, "api_keys": ["k1", "k2"]},
+            "support": {},
+        }
+    )
+    assert directory.resolve("k2", "support")["tenant_id"] == "sales"
+    assert directory.resolve(None, "support") == {
+        "tenant_id": "support", "models_dir": None, "threshold": None
+    }
+    assert directory.resolve(None, None) is None
+    with pytest.raises(KeyError):
+        directory.resolve("unknown", None)
+    with pytest.raises(KeyError):
+        directory.resolve(None, "marketing")
+    # Tenancy is off without tenants: credentials are ignored
+    assert TenantDirectory({}).resolve("unknown", "marketing") is None
+
+
+@pytest.mark.parametrize(
+    "tenants",
+    [
+        {"sales": {"threshold": 1.5}},
+        {"sales": {"api_keys": ["k"]}, "support": {"api_keys": ["k"]}},
+    ],
+)
+def test_invalid_tenants_are_rejected(tenants):
+    """Test thresholds and API keys are validated."""
+    with pytest.raises(ValueError):
+        TenantDirectory(tenants)
@@ -0,0 +1,93 @@
+"""
+Unit tests for response/request wire formats.
+"""
+
+import gzip
+import json
+
+import msgpack
+import pytest
+
+from app.services import wire
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, wire.JSON),
+        ("*/*", wire.JSON),
+        ("application/msgpack", wire.MSGPACK),
+        ("application/x-msgpack;q=0.9, application/json;q=0.5", wire.MSGPACK),
+        ("application/json, application/msgpack", wire.JSON),
+        ("application/msgpack;q=0, text/html", wire.JSON),
+    ],
+)
+def test_media_type_negotiation(accept, expected):
+    """Test the best supported media type in Accept is chosen, JSON otherwise."""
+    assert wire.negotiate_media_type(accept) == expected
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip, deflate", "gzip"),
+        ("gzip, zstd", "zstd"),
+        ("zstd;q=0.5, gzip", "gzip"),
+        ("*", "zstd"),
+        ("gzip;q=0", None),
+    ],
+)
+def test_encoding_negotiation(accept_encoding, expected):
+    """Test zstd is preferred over gzip unless the client ranks it lower."""
+    assert wire.negotiate_encoding(accept_encoding) == expected
+
+
+def test_request_bodies_are_decoded_by_content_type():
+    """Test JSON and MessagePack bodies decode to the same payload."""
+    payload = {"messages": ["free money now!!"], "threshold": 0.7}
+    assert wire.decode_request(json.dumps(payload).encode(), None) == payload
+    assert wire.decode_request(msgpack.packb(payload), "application/x-msgpack") == payload
+    with pytest.raises(wire.UnsupportedMediaType):
+        wire.decode_request(b"messages=x", "application/x-www-form-urlencoded")
+    with pytest.raises(ValueError):
+        wire.decode_request(b"\xc1", "application/msgpack")
+    with pytest.raises(ValueError):
+        wire.decode_request(b"{", "application/json")
+
+
+def test_large_responses_are_compressed():
+    """Test bodies above min_bytes are compressed with the negotiated encoding."""
+    payload = {"probability_spam": [0.1234] * 500}
+    body, headers = wire.encode_response(payload, "application/json", "gzip", min_bytes=1024)
+    assert headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body)) == payload
+
+    body, headers = wire.encode_response(payload, "application/msgpack", "gzip", min_bytes=None)
+    assert "Content-Encoding" not in headers
+    assert headers["Content-Type"] == wire.MSGPACK
+    assert msgpack.unpackb(body)["probability_spam"] == pytest.approx(payload["probability_spam"])
+
+
+def test_columnar_layout():
+    """Test results are transposed into one array per field."""
+    results = [
+        {"prediction": label, "is_spam": label == "spam", "confidence": 0.9,
+         "probability_spam": p, "probability_ham": 1 - p, "near_duplicate": False,
+         "decided_by": "model",
+         "model_info": {"version": "v1"}}
+        for label, p in (("spam", 0.9), ("ham", 0.1))
+    ]
+    table = wire.columnar(results)
+    assert table["count"] == 2
+    assert table["prediction"] == ["spam", "ham"]
+    assert table["probability_spam"] == [0.9, 0.1]
+    assert table["model_info"] == {"version": "v1"}
+    assert wire.columnar([])["model_info"] is None
+
+    # Results of different models keep their own model_info
+    results[1]["model_info"] = {"version": "v2", "variant": "challenger"}
+    assert wire.columnar(results)["model_info"] == [
+        {"version": "v1"}, {"version": "v2", "variant": "challenger"}
+    ]
@@ -60,6 +60,33 @@ def test_redoc_endpoint(client):
     assert response.status_code == 200
 
 
-
-
-
+def test_health_reports_audit_counters(client):
+    """Test /health exposes audit log counters when auditing is enabled."""
+    from unittest.mock import MagicMock, patch
+
+    audit_log = MagicMock()
+    audit_log.stats.return_value = {"written": 10, "dropped": 2, "queued": 0}
+    with patch("app.core.audit_log", audit_log):
+        response = client.get("/health")
+    assert response.json()["audit"] == {"written": 10, "dropped": 2, "queued": 0}
+    assert client.get("/health").json()["audit"] is None
+
+
+def test_readiness_fails_while_draining(client):
+    """Test /ready answers 503 once the worker drains; /health reports it still alive."""
+    from unittest.mock import patch
+
+    from app.core import drain_coordinator
+
+    with patch("app.core.classifier.is_loaded", True):
+        assert client.get("/ready").json()["status"] == "ready"
+        drain_coordinator.begin()
+        try:
+            assert client.get("/ready").status_code == 503
+            health = client.get("/health")
+            assert health.status_code == 200
+            assert health.json()["status"] == "draining"
+            # Still admitted until admission stops
+            assert client.post("/api/v1/predict", json={}).status_code != 503
+        finally:
+            drain_coordinator.reset()
@@ -0,0 +1,127 @@
+"""
+Benchmark do índice de quase-duplicatas.
+
+Gera variantes personalizadas (nome, URL de rastreio, token aleatório) de
+mensagens do dataset e mede, para cada threshold de similaridade, a taxa de
+acerto do índice, a latência por mensagem e a concordância com o modelo.
+"""
+
+import argparse
+import csv
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "api-service"))
+
+from app.models import NearDuplicateIndex, SpamClassifier  # noqa: E402
+from app.models.near_duplicate import simhash  # noqa: E402
+
+NAMES = ["Alice", "Bruno", "Carla", "Diego", "Elisa", "Fabio", "Gabi", "Hugo"]
+
+
+def load_messages(corpus_path: Path, limit: int):
+    """Carrega mensagens do CSV (coluna 'message')."""
+    with open(corpus_path, newline="", encoding="utf-8") as f:
+        messages = [row["message"] for row in csv.DictReader(f) if row.get("message")]
+    random.shuffle(messages)
+    return messages[:limit]
+
+
+def make_variants(messages, variants_per_message: int):
+    """Cria variantes de campanha personalizando cada mensagem base."""
+    traffic = []
+    for message in messages:
+        for _ in range(variants_per_message):
+            token = "".join(random.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=8))
+            traffic.append(
+                f"Hi {random.choice(NAMES)}, {message} "
+                f"http://track.example.com/{token} ref {token.upper()}"
+            )
+    random.shuffle(traffic)
+    return traffic
+
+
+def percentile(values, q):
+    """Percentil simples (valores ordenados)."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(classifier, traffic, threshold=None):
+    """Classifica o tráfego e retorna latências e probabilidades."""
+    classifier.near_duplicate_index = (
+        NearDuplicateIndex(threshold=threshold, capacity=len(traffic)) if threshold else None
+    )
+    latencies, probabilities = [], []
+    for message in traffic:
+        start = time.perf_counter()
+        result = classifier.classify({"message": message})
+        latencies.append((time.perf_counter() - start) * 1000)
+        probabilities.append(result["probability_spam"])
+    return latencies, probabilities
+
+
+def benchmark(models_dir: Path, corpus_path: Path, limit: int, variants: int, thresholds):
+    """Executa o benchmark e imprime a tabela de resultados."""
+    classifier = SpamClassifier(models_dir=str(models_dir))
+    classifier.load()
+
+    traffic = make_variants(load_messages(corpus_path, limit), variants)
+
+    start = time.perf_counter()
+    for message in traffic:
+        simhash(message)
+    sketch_ms = (time.perf_counter() - start) * 1000 / len(traffic)
+
+    base_latencies, base_probabilities = run(classifier, traffic)
+
+    print("=" * 80)
+    print("BENCHMARK DE QUASE-DUPLICATAS")
+    print("=" * 80)
+    print(f"\nMensagens: {len(traffic)} ({limit} bases x {variants} variantes)")
+    print(f"Custo do sketch: {sketch_ms:.3f} ms/mensagem")
+    print(
+        f"Modelo (sem índice): média {sum(base_latencies) / len(base_latencies):.3f} ms, "
+        f"p99 {percentile(base_latencies, 0.99):.3f} ms"
+    )
+    print(
+        f"\n{'threshold':>10} {'hit rate':>10} {'média ms':>10} {'p99 ms':>10} "
+        f"{'concordância':>13} {'max |dp|':>10}"
+    )
+
+    for threshold in thresholds:
+        latencies, probabilities = run(classifier, traffic, threshold)
+        stats = classifier.near_duplicate_index.stats()
+        agreement = sum(
+            (a >= 0.5) == (b >= 0.5) for a, b in zip(probabilities, base_probabilities)
+        ) / len(traffic)
+        max_diff = max(abs(a - b) for a, b in zip(probabilities, base_probabilities))
+        print(
+            f"{threshold:>10.2f} {stats['hit_rate']:>10.2%} "
+            f"{sum(latencies) / len(latencies):>10.3f} {percentile(latencies, 0.99):>10.3f} "
+            f"{agreement:>13.2%} {max_diff:>10.4f}"
+        )
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models-dir", type=Path, default=PROJECT_ROOT / "api-service" / "models"
+    )
+    parser.add_argument(
+        "--corpus", type=Path, default=PROJECT_ROOT / "notebooks" / "data" / "emails.csv"
+    )
+    parser.add_argument("--messages", type=int, default=200, help="Mensagens base")
+    parser.add_argument("--variants", type=int, default=10, help="Variantes por mensagem")
+    parser.add_argument(
+        "--thresholds", type=float, nargs="+", default=[0.85, 0.9, 0.95, 1.0]
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    benchmark(args.models_dir, args.corpus, args.messages, args.variants, args.thresholds)
@@ -0,0 +1,70 @@
+"""
+Gera os filtros de Bloom do pré-filtro da API (PREFILTER_ENABLED=true).
+
+A partir de CSVs com colunas 'message' e 'label', grava em --output-dir:
+
+- spam_bodies.bloom: corpos de mensagens confirmadas como spam
+- spam_urls.bloom: URLs normalizadas dessas mensagens (exceto as que
+  também aparecem em ham, como encurtadores e sites grandes)
+- allow_templates.bloom: assinaturas de templates transacionais confiáveis
+
+Os arquivos são substituídos atomicamente; a API os recarrega sem restart
+(a cada PREFILTER_RELOAD_INTERVAL segundos).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "api-service"))
+
+from app.core.config import settings  # noqa: E402
+from app.models.benchmark import load_corpus  # noqa: E402
+from app.models.prefilter import build_filters  # noqa: E402
+
+
+def read_messages(paths, label=None):
+    """Mensagens dos CSVs (apenas as do rótulo informado, se houver coluna label)."""
+    messages = []
+    for path in paths:
+        texts, labels = load_corpus(str(path))
+        messages.extend(
+            text for text, row_label in zip(texts, labels)
+            if label is None or not row_label or row_label == label
+        )
+    return messages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--spam", type=Path, nargs="+", required=True, help="CSV(s) com spam confirmado"
+    )
+    parser.add_argument(
+        "--allow", type=Path, nargs="*", default=[], help="CSV(s) com exemplos de templates"
+    )
+    parser.add_argument(
+        "--ham", type=Path, nargs="*", default=[],
+        help="CSV(s) com ham; URLs presentes nele não entram no filtro de URLs",
+    )
+    parser.add_argument(
+        "--output-dir", type=Path, default=PROJECT_ROOT / "api-service" / settings.prefilter_dir
+    )
+    parser.add_argument(
+        "--fp-rate", type=float, default=settings.prefilter_false_positive_rate,
+        help="Taxa de falsos positivos de cada filtro",
+    )
+    args = parser.parse_args()
+
+    counts = build_filters(
+        args.output_dir,
+        spam_messages=read_messages(args.spam, label="spam"),
+        allow_messages=read_messages(args.allow, label="ham"),
+        ham_messages=read_messages(args.ham, label="ham"),
+        false_positive_rate=args.fp_rate,
+    )
+    for name, count in counts.items():
+        size = (args.output_dir / name).stat().st_size
+        print(f"{name:<24} {count:>9} assinaturas  {size / 1024:>9.1f} KB")
+    print(f"\n[OK] Filtros gravados em {args.output_dir} (falsos positivos <= {args.fp_rate:g})")
@@ -0,0 +1,95 @@
+"""
+Conversão dos artefatos para precisão reduzida (float32).
+
+Grava uma cópia dos artefatos em que o vetorizador gera matrizes float32 e
+os coeficientes, interceptos e a calibração de cada fold ficam em float32
+(ou coeficientes em float16 com --coefficients float16, convertidos para
+float32 na carga). Os artefatos só são gravados se os rótulos previstos
+concordarem com o predict_proba em float64 no conjunto de validação.
+
+Sirva os artefatos convertidos com INFERENCE_PRECISION=float32.
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "api-service"))
+
+from app.models.benchmark import load_corpus  # noqa: E402
+from app.models.precision import COEFFICIENT_DTYPES, convert_models_dir  # noqa: E402
+
+
+def print_report(report):
+    """Imprime o relatório de conversão."""
+    print("=" * 80)
+    print(f"CONVERSÃO PARA {report['precision'].upper()}")
+    print("=" * 80)
+    print(f"\nCoeficientes armazenados em {report['coefficient_dtype']}")
+    print(
+        f"Artefatos: {report['bytes_before'] / 1024:.1f} KB -> "
+        f"{report['bytes_after'] / 1024:.1f} KB"
+    )
+    print(
+        f"Coeficientes: {report['coefficient_bytes_before'] / 1024:.1f} KB -> "
+        f"{report['coefficient_bytes_stored'] / 1024:.1f} KB no disco, "
+        f"{report['coefficient_bytes_served'] / 1024:.1f} KB em memória"
+    )
+    print(
+        f"Carregamento: {report['load_seconds_before']:.4f} s -> "
+        f"{report['load_seconds_after']:.4f} s"
+    )
+    before, after = report["latency_before"], report["latency_after"]
+    for key, label in (("mean_ms", "média"), ("p50_ms", "p50"), ("p99_ms", "p99")):
+        print(f"Latência {label}: {before[key]:.3f} ms -> {after[key]:.3f} ms")
+    print(
+        f"Throughput em lote: {before['batch_messages_per_second']:.0f} -> "
+        f"{after['batch_messages_per_second']:.0f} mensagens/s"
+    )
+    agreement = report["agreement"]
+    print(
+        f"\nConcordância com float64: {agreement['agreement']:.4%} "
+        f"(max |dp| {agreement['max_abs_diff']:.2e}, média {agreement['mean_abs_diff']:.2e})"
+    )
+    print("\n" + "=" * 80)
+    if report["written"]:
+        print("ARTEFATOS CONVERTIDOS GRAVADOS! (INFERENCE_PRECISION=float32)")
+    else:
+        print("[AVISO] Concordância abaixo do mínimo. Nenhum artefato gravado.")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models-dir", type=Path, default=PROJECT_ROOT / "api-service" / "models"
+    )
+    parser.add_argument(
+        "--output-dir", type=Path, default=PROJECT_ROOT / "api-service" / "models_float32"
+    )
+    parser.add_argument(
+        "--holdout", type=Path, default=PROJECT_ROOT / "notebooks" / "data" / "emails.csv",
+        help="CSV com coluna 'message' usado na verificação",
+    )
+    parser.add_argument("--holdout-size", type=int, default=1000, help="Mensagens de validação")
+    parser.add_argument(
+        "--coefficients", choices=COEFFICIENT_DTYPES[1:], default="float32",
+        help="Precisão dos coeficientes armazenados",
+    )
+    parser.add_argument("--min-agreement", type=float, default=0.999)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    messages, _ = load_corpus(str(args.holdout))
+    random.Random(args.seed).shuffle(messages)
+    holdout = messages[: args.holdout_size]
+
+    report = convert_models_dir(
+        str(args.models_dir), str(args.output_dir), holdout,
+        precision="float32", coefficient_dtype=args.coefficients,
+        min_agreement=args.min_agreement,
+    )
+    print_report(report)
+    sys.exit(0 if report["written"] else 1)
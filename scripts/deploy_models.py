@@ -1,66 +1,164 @@
 """
 Script para deploy de modelos.
 
-Copia modelos treinados dos notebooks para api-service.
-Apenas modelos finais de produção.
+Promove os modelos treinados dos notebooks para api-service. Antes de
+substituir os artefatos de produção, o candidato e a produção atual são
+carregados com SpamClassifier, cada um num processo novo (como um worker da
+API), e medidos no mesmo corpus de referência: tempo de carga, RSS de pico
+do worker, latência por mensagem (p50/p99), throughput em lote e
+concordância de rótulos com a produção. O deploy é recusado se algum
+orçamento for excedido (ou se o candidato for mais lento que a produção
+além de --max-slowdown); com --force, o candidato é promovido mesmo assim
+e isso fica registrado. Os dois lados são medidos com o backend de
+inferência da API (INFERENCE_BACKEND, ou --backend); com onnx, ou se a
+produção já tem grafos ONNX, os grafos são reexportados do candidato, e
+grafos ou vetorizadores que o candidato não traz são removidos do destino.
+O resultado é gravado em metadata['deployment_benchmark'], junto com
+checksums.json (SHA-256 de cada artefato promovido, verificado pela API ao
+carregar os modelos).
 """
 
-import shutil
+import argparse
+import random
+import sys
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "api-service"))
 
-def deploy_models():
-    """Copia modelos finais dos notebooks para api-service."""
-    project_root = Path(__file__).parent.parent
+from app.core.config import settings  # noqa: E402
+from app.models.artifacts import CHECKSUMS_FILE  # noqa: E402
+from app.models.benchmark import load_corpus  # noqa: E402
+from app.models.promotion import DEFAULT_BUDGETS, artifact_files, promote_models  # noqa: E402
 
-    source_dir = project_root / "notebooks" / "artifacts"
-    target_dir = project_root / "api-service" / "models"
 
-    target_dir.mkdir(exist_ok=True)
+def print_side(name, side):
+    """Imprime as medidas de um diretório de artefatos."""
+    latency = side["latency"]
+    print(f"\n{name} ({side['model_version'] or 'sem versão'})")
+    print(f"  Carregamento:   {side['load_seconds']:.3f} s")
+    print(f"  RSS do worker:  {side['rss_bytes'] / 1024 / 1024:.0f} MB")
+    print(
+        f"  Latência:       média {latency['mean_ms']:.3f} ms, p50 {latency['p50_ms']:.3f} ms, "
+        f"p99 {latency['p99_ms']:.3f} ms"
+    )
+    print(f"  Lote:           {latency['batch_messages_per_second']:.0f} mensagens/s")
 
-    models_to_copy = [
-        "best_model_temp.joblib",
-        "tfidf_vectorizer.joblib",
-        "label_encoder.joblib",  # Necessário para LinearSVC
-        "metadata.joblib",  # Metadados do modelo
-    ]
 
+def print_report(report):
+    """Imprime o benchmark e a decisão do gate."""
     print("=" * 80)
-    print("DEPLOY DE MODELOS ML SPAM CLASSIFIER")
+    print("GATE DE PERFORMANCE")
     print("=" * 80)
-    print(f"\nOrigem: {source_dir.absolute()}")
-    print(f"Destino: {target_dir.absolute()}")
-    print(f"\nModelos para deploy: {len(models_to_copy)}")
-
-    copied_count = 0
-    not_found_count = 0
+    print(f"\nCorpus de referência: {report['corpus_size']} mensagens")
+    print(f"Backend de inferência: {report['backend']}")
+    print_side("Candidato", report["candidate"])
+    if report["production"] is not None:
+        print_side("Produção", report["production"])
+        agreement = report["agreement"]
+        print(
+            f"\nConcordância com a produção: {agreement['agreement']:.4%} "
+            f"(max |dp| {agreement['max_abs_diff']:.2e})"
+        )
+    else:
+        print("\nSem modelo em produção: apenas os orçamentos absolutos foram verificados")
+    for violation in report["violations"]:
+        print(f"\n[ERRO] {violation}")
 
-    for model_file in models_to_copy:
-        source_path = source_dir / model_file
-        target_path = target_dir / model_file
 
-        if not source_path.exists():
-            print(f"\n[ERRO] NÃO ENCONTRADO: {model_file}")
-            not_found_count += 1
-            continue
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--source-dir", type=Path, default=PROJECT_ROOT / "notebooks" / "artifacts"
+    )
+    parser.add_argument(
+        "--target-dir", type=Path, default=PROJECT_ROOT / "api-service" / "models"
+    )
+    parser.add_argument(
+        "--corpus", type=Path, default=PROJECT_ROOT / "notebooks" / "data" / "emails.csv",
+        help="CSV com coluna 'message' usado no benchmark",
+    )
+    parser.add_argument("--corpus-size", type=int, default=1000, help="Mensagens de referência")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--max-p99-ms", type=float, default=DEFAULT_BUDGETS["max_p99_ms"],
+        help="Latência p99 máxima por mensagem",
+    )
+    parser.add_argument(
+        "--max-rss-mb", type=float, default=DEFAULT_BUDGETS["max_rss_mb"],
+        help="RSS máximo de um worker com o modelo carregado",
+    )
+    parser.add_argument(
+        "--max-load-seconds", type=float, default=DEFAULT_BUDGETS["max_load_seconds"],
+        help="Tempo máximo de carga dos artefatos",
+    )
+    parser.add_argument(
+        "--max-slowdown", type=float, default=DEFAULT_BUDGETS["max_slowdown"],
+        help="Latência média e throughput em lote máximos relativos à produção",
+    )
+    parser.add_argument(
+        "--min-agreement", type=float, default=DEFAULT_BUDGETS["min_agreement"],
+        help="Concordância mínima de rótulos com a produção",
+    )
+    parser.add_argument(
+        "--backend", choices=("sklearn", "onnx"), default=settings.inference_backend,
+        help="Backend de inferência usado no benchmark (padrão: INFERENCE_BACKEND)",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Promove mesmo com orçamentos excedidos"
+    )
+    args = parser.parse_args()
 
-        shutil.copy2(source_path, target_path)
-        size_mb = target_path.stat().st_size / (1024 * 1024)
+    print("=" * 80)
+    print("DEPLOY DE MODELOS ML SPAM CLASSIFIER")
+    print("=" * 80)
+    print(f"\nOrigem: {args.source_dir.absolute()}")
+    print(f"Destino: {args.target_dir.absolute()}")
 
-        print(f"\n[OK] COPIADO: {model_file}")
-        print(f"  Tamanho: {size_mb:.2f} MB")
-        copied_count += 1
+    missing = [
+        name for name in artifact_files(args.source_dir) if not (args.source_dir / name).exists()
+    ]
+    if missing:
+        for name in missing:
+            print(f"\n[ERRO] NÃO ENCONTRADO: {name}")
+        print("\n[AVISO] Treine os modelos primeiro (make train-models).")
+        sys.exit(1)
+    if not args.corpus.exists():
+        print(f"\n[ERRO] Corpus de referência não encontrado: {args.corpus}")
+        sys.exit(1)
+
+    messages, _ = load_corpus(str(args.corpus))
+    random.Random(args.seed).shuffle(messages)
+    report = promote_models(
+        str(args.source_dir),
+        str(args.target_dir),
+        messages[: args.corpus_size],
+        budgets={
+            "max_p99_ms": args.max_p99_ms,
+            "max_rss_mb": args.max_rss_mb,
+            "max_load_seconds": args.max_load_seconds,
+            "max_slowdown": args.max_slowdown,
+            "min_agreement": args.min_agreement,
+        },
+        force=args.force,
+        backend=args.backend,
+        precision=settings.inference_precision,
+        intra_op_threads=settings.onnx_intra_op_threads,
+    )
+    print_report(report)
 
     print("\n" + "=" * 80)
-    if copied_count == len(models_to_copy):
-        print("DEPLOY CONCLUÍDO!")
+    if not report["promoted"]:
+        print("DEPLOY RECUSADO: nenhum artefato de produção foi alterado.")
     else:
-        print(f"DEPLOY PARCIAL: {copied_count}/{len(models_to_copy)} modelos copiados")
-        if not_found_count > 0:
-            print(f"[AVISO] {not_found_count} modelo(s) não encontrado(s). Treine os modelos primeiro.")
+        if report["forced"]:
+            print("[AVISO] Orçamentos excedidos; promovido com --force (registrado no metadata).")
+        for name in report["files"]:
+            size_mb = (args.target_dir / name).stat().st_size / (1024 * 1024)
+            print(f"[OK] {name}: {size_mb:.2f} MB")
+        print(f"[OK] {CHECKSUMS_FILE}")
+        print("DEPLOY CONCLUÍDO!")
     print("=" * 80)
-    print("\nModelos prontos em: api-service/models/")
-
-
-if __name__ == "__main__":
-    deploy_models()
+    if report["promoted"]:
+        print("\nModelos prontos em: api-service/models/")
+    sys.exit(0 if report["promoted"] else 1)
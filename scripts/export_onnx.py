@@ -0,0 +1,80 @@
+"""
+Exportação do modelo para ONNX.
+
+Converte o vetorizador TF-IDF e o LinearSVC calibrado de um diretório de
+modelos em grafos ONNX (model.onnx e scorer.onnx) gravados ao lado dos
+artefatos joblib, usados com INFERENCE_BACKEND=onnx. Em seguida compara os
+backends sklearn e onnx nas mesmas mensagens: concordância das predições,
+latência por mensagem e throughput em lote.
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "api-service"))
+
+from app.models.benchmark import load_corpus  # noqa: E402
+from app.models.onnx_export import compare_backends, export_onnx  # noqa: E402
+
+
+def print_report(written, report):
+    """Imprime os arquivos gerados e a comparação entre backends."""
+    print("=" * 80)
+    print("EXPORTAÇÃO ONNX")
+    print("=" * 80)
+    for name, role in written.items():
+        print(f"[OK] {name} ({role})")
+
+    print(f"\n{'Backend':<10} {'Carga (s)':>10} {'média ms':>10} {'p50 ms':>10} "
+          f"{'p99 ms':>10} {'lote msg/s':>12}")
+    for name in ("sklearn", "onnx"):
+        latency = report[name]["latency"]
+        print(
+            f"{name:<10} {report[name]['load_seconds']:>10.4f} {latency['mean_ms']:>10.3f} "
+            f"{latency['p50_ms']:>10.3f} {latency['p99_ms']:>10.3f} "
+            f"{latency['batch_messages_per_second']:>12.0f}"
+        )
+    print(f"\nRuntime ONNX: {report['onnx']['backend']}")
+
+    agreement = report["agreement"]
+    print(
+        f"\nConcordância: {agreement['agreement']:.4%} "
+        f"(max |dp| {agreement['max_abs_diff']:.2e}, média {agreement['mean_abs_diff']:.2e})"
+    )
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models-dir", type=Path, default=PROJECT_ROOT / "api-service" / "models"
+    )
+    parser.add_argument(
+        "--holdout", type=Path, default=PROJECT_ROOT / "notebooks" / "data" / "emails.csv",
+        help="CSV com coluna 'message' usado na comparação",
+    )
+    parser.add_argument("--holdout-size", type=int, default=2000, help="Mensagens comparadas")
+    parser.add_argument("--threads", type=int, default=1, help="Threads intra-op do ONNX Runtime")
+    parser.add_argument("--min-agreement", type=float, default=0.999)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    try:
+        written = export_onnx(str(args.models_dir))
+    except ImportError:
+        print("[ERRO] Instale as dependências de exportação: pip install skl2onnx onnx")
+        sys.exit(1)
+
+    messages, _ = load_corpus(str(args.holdout))
+    random.Random(args.seed).shuffle(messages)
+    report = compare_backends(
+        str(args.models_dir), messages[: args.holdout_size], intra_op_threads=args.threads
+    )
+
+    print_report(written, report)
+    if report["agreement"]["agreement"] < args.min_agreement:
+        print("[AVISO] Concordância abaixo do mínimo. Não use INFERENCE_BACKEND=onnx.")
+        sys.exit(1)
@@ -0,0 +1,114 @@
+"""
+Relatório de memória do modelo e da API.
+
+Sem --url, carrega os artefatos de --models-dir como a API faz e mostra o
+tamanho profundo de cada um (vocabulário, IDF, coeficientes de cada fold
+calibrado, label encoder) e a memória do processo. Com --url, consulta
+GET /api/v1/admin/memory de uma API em execução (cada requisição é atendida
+por um worker); com --diff N, tira um snapshot do tracemalloc, espera N
+segundos e mostra os pontos de alocação que mais cresceram. Sem --url, o
+diff cobre o carregamento dos artefatos.
+"""
+
+import argparse
+import json
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "api-service"))
+
+
+def mb(value):
+    """Bytes formatados em MB (ou '-' se indisponível)."""
+    return "-" if value is None else f"{value / 1024 / 1024:10.2f} MB"
+
+
+def request(url, method="GET"):
+    """Requisição JSON à API."""
+    with urllib.request.urlopen(urllib.request.Request(url, method=method), timeout=60) as r:
+        return json.loads(r.read())
+
+
+def print_report(report):
+    """Imprime artefatos, componentes e memória do processo."""
+    print("=" * 80)
+    print(f"ARTEFATOS DO MODELO (pid {report['pid']})")
+    print("=" * 80)
+    for name, artifact in report["artifacts"].items():
+        if artifact is None:
+            print(f"{name:<28} (runtime nativo: veja o RSS do processo)")
+            continue
+        print(f"{name:<28} {mb(artifact['bytes'])}  {artifact['type']}")
+        for part, size in sorted(artifact["parts"].items(), key=lambda item: -item[1]):
+            print(f"  {part:<26} {mb(size)}")
+    print(f"{'Total':<28} {mb(report['artifacts_total_bytes'])}")
+
+    if report.get("components"):
+        print("\n" + "=" * 80)
+        print("CACHES E FILAS")
+        print("=" * 80)
+        for name, component in report["components"].items():
+            extra = ", ".join(f"{k}={v}" for k, v in component.items() if k != "bytes")
+            print(f"{name:<28} {mb(component['bytes'])}  {extra}")
+        print(f"{'Total':<28} {mb(report['components_total_bytes'])}")
+
+    print("\n" + "=" * 80)
+    print("PROCESSO")
+    print("=" * 80)
+    for name, value in {**report["process"], **report["container"]}.items():
+        print(f"{name:<28} {mb(value)}")
+
+
+def print_diff(diff):
+    """Imprime os pontos de alocação que mais cresceram."""
+    print("\n" + "=" * 80)
+    print(f"TRACEMALLOC: top {len(diff['top'])} em {diff['baseline_age_seconds']:.1f}s")
+    print("=" * 80)
+    for stat in diff["top"]:
+        print(
+            f"{stat['size_diff_bytes'] / 1024:+12.1f} KB  {stat['count_diff']:+8d} alocações  "
+            f"{stat['location']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models-dir", type=Path, default=PROJECT_ROOT / "api-service" / "models"
+    )
+    parser.add_argument(
+        "--url", help="URL base de uma API em execução (ex.: http://localhost:8000)"
+    )
+    parser.add_argument(
+        "--diff", type=float, default=0,
+        help="Segundos entre snapshot e diff do tracemalloc (sem --url, mede o carregamento)",
+    )
+    parser.add_argument("--top", type=int, default=20, help="Pontos de alocação no diff")
+    args = parser.parse_args()
+
+    if args.url:
+        base = args.url.rstrip("/") + "/api/v1/admin/memory"
+        print_report(request(base))
+        if args.diff:
+            request(f"{base}/snapshot", method="POST")
+            try:
+                time.sleep(args.diff)
+                print_diff(request(f"{base}/diff?top={args.top}"))
+            finally:
+                request(f"{base}/snapshot", method="DELETE")
+    else:
+        from app.models import SpamClassifier
+        from app.services.memory import MemoryTracer, memory_report
+
+        tracer = MemoryTracer()
+        if args.diff:
+            tracer.snapshot()
+        classifier = SpamClassifier(models_dir=str(args.models_dir))
+        classifier.load()
+        print_report(memory_report(classifier, sinks={}))
+        if args.diff:
+            print_diff(tracer.diff(top=args.top))
+            tracer.stop()
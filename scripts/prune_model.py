@@ -0,0 +1,103 @@
+"""
+Poda de vocabulário e esparsificação de coeficientes.
+
+Remove do vetorizador e do modelo as features cujo peso absoluto fica abaixo
+do threshold em todos os folds calibrados do LinearSVC. Os artefatos podados
+só são gravados se a concordância das predições num conjunto de validação
+atingir o mínimo exigido.
+
+O conjunto de validação (--holdout-csv) é obrigatório e deve conter apenas
+mensagens fora do treino: o modelo de produção é treinado com 100% de
+notebooks/data/emails.csv, então medir a concordância nesse corpus mediria
+mensagens que o modelo já viu, onde a poda pesa menos.
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "api-service"))
+TRAINING_CORPUS = PROJECT_ROOT / "notebooks" / "data" / "emails.csv"
+
+from app.models.benchmark import load_corpus  # noqa: E402
+from app.models.pruning import prune_models_dir  # noqa: E402
+
+
+def print_report(report, threshold, sparsify):
+    """Imprime o relatório de poda."""
+    print("=" * 80)
+    print("PODA DE VOCABULÁRIO")
+    print("=" * 80)
+    print(f"\nThreshold: {threshold} | Esparsificação: {'sim' if sparsify else 'não'}")
+    print(f"Features: {report['features_before']} -> {report['features_after']}")
+    print(
+        f"Artefatos: {report['bytes_before'] / 1024:.1f} KB -> "
+        f"{report['bytes_after'] / 1024:.1f} KB"
+    )
+    print(
+        f"Carregamento: {report['load_seconds_before']:.4f} s -> "
+        f"{report['load_seconds_after']:.4f} s"
+    )
+    before, after = report["latency_before"], report["latency_after"]
+    for key, label in (("mean_ms", "média"), ("p50_ms", "p50"), ("p99_ms", "p99")):
+        print(f"Latência {label}: {before[key]:.3f} ms -> {after[key]:.3f} ms")
+    print(
+        f"Throughput em lote: {before['batch_messages_per_second']:.0f} -> "
+        f"{after['batch_messages_per_second']:.0f} mensagens/s"
+    )
+    agreement = report["agreement"]
+    print(
+        f"\nConcordância: {agreement['agreement']:.4%} "
+        f"(max |dp| {agreement['max_abs_diff']:.4f}, média {agreement['mean_abs_diff']:.4f})"
+    )
+    print("\n" + "=" * 80)
+    if report["written"]:
+        print("ARTEFATOS PODADOS GRAVADOS!")
+    else:
+        print("[AVISO] Concordância abaixo do mínimo. Nenhum artefato gravado.")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models-dir", type=Path, default=PROJECT_ROOT / "api-service" / "models"
+    )
+    parser.add_argument(
+        "--output-dir", type=Path, default=PROJECT_ROOT / "api-service" / "models_pruned"
+    )
+    parser.add_argument(
+        "--holdout-csv", type=Path, required=True,
+        help="CSV com coluna 'message' de mensagens fora do treino, usado na verificação",
+    )
+    parser.add_argument("--holdout-size", type=int, default=1000, help="Mensagens de validação")
+    parser.add_argument("--threshold", type=float, default=0.01, help="Peso absoluto mínimo")
+    parser.add_argument(
+        "--sparsify", action="store_true",
+        help="Zera também pesos abaixo do threshold em cada fold (coeficientes esparsos)",
+    )
+    parser.add_argument("--min-agreement", type=float, default=0.999)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.holdout_csv.resolve() == TRAINING_CORPUS.resolve():
+        print(f"[ERRO] {args.holdout_csv} é o corpus de treino; use mensagens fora do treino.")
+        sys.exit(1)
+
+    messages, _ = load_corpus(str(args.holdout_csv))
+    random.Random(args.seed).shuffle(messages)
+    holdout = messages[: args.holdout_size]
+
+    try:
+        report = prune_models_dir(
+            str(args.models_dir), str(args.output_dir), holdout,
+            threshold=args.threshold, sparsify=args.sparsify, min_agreement=args.min_agreement,
+        )
+    except ValueError as e:
+        print(f"[ERRO] {e}")
+        sys.exit(1)
+
+    print_report(report, args.threshold, args.sparsify)
+    sys.exit(0 if report["written"] else 1)
@@ -0,0 +1,165 @@
+"""
+Replay de tráfego capturado para testes de capacidade.
+
+Lê arquivos JSONL gravados pelo middleware de captura (CAPTURE_ENABLED=true)
+e reenvia as requisições para a API, em processo (app.main:app via ASGI) ou
+por HTTP. Modos de ritmo:
+
+- original: respeita os intervalos originais entre requisições
+- speedup:  intervalos originais divididos por --speedup (ex.: 5x)
+- max-rate: o mais rápido possível, limitado por --concurrency
+
+Reporta throughput, percentis de latência e diferenças de predição entre duas
+versões de modelo (--compare-url / --compare-models-dir) ou, sem segundo
+alvo, contra as respostas registradas na captura.
+
+Exemplos:
+    python scripts/replay_traffic.py api-service/data/capture/traffic.jsonl*
+    python scripts/replay_traffic.py traffic.jsonl --models-dir models \\
+        --compare-models-dir models_pruned --mode max-rate
+    python scripts/replay_traffic.py traffic.jsonl --url http://localhost:8000 \\
+        --mode speedup --speedup 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "api-service"))
+
+# O replay em processo não deve gravar nova captura nem iniciar jobs.
+os.environ["CAPTURE_ENABLED"] = "false"
+os.environ["JOBS_ENABLED"] = "false"
+
+from app.services.replay import (  # noqa: E402
+    REPLAY_MODES,
+    compare_predictions,
+    http_sender,
+    load_capture,
+    recorded_results,
+    replay,
+    summarize,
+    write_results,
+)
+
+
+async def run_http(url, records, args):
+    """Replay contra uma API rodando (HTTP)."""
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+        return await replay(http_sender(client), records, args.mode, args.speedup, args.concurrency)
+
+
+async def run_in_process(models_dir, records, args):
+    """Replay em processo contra app.main:app, carregando o modelo de models_dir."""
+    from app.core import classifier, settings, startup_event
+    from app.main import app
+
+    classifier.models_dir = Path(models_dir or settings.models_dir)
+    if not classifier.is_loaded:
+        await startup_event()
+    else:
+        classifier.load()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://replay") as client:
+        return await replay(http_sender(client), records, args.mode, args.speedup, args.concurrency)
+
+
+def print_summary(title, summary):
+    """Imprime throughput e latência de uma execução."""
+    latency = summary["latency_ms"]
+    print(f"\n{title}")
+    print(f"  Requisições: {summary['requests']} (erros: {summary['errors']}, "
+          f"status: {summary['status_counts']})")
+    print(f"  Duração: {summary['duration_s']:.2f} s | Throughput: "
+          f"{summary['throughput_rps']:.1f} req/s")
+    print(f"  Latência (ms): média {latency['mean']:.2f} | p50 {latency['p50']:.2f} | "
+          f"p90 {latency['p90']:.2f} | p99 {latency['p99']:.2f} | max {latency['max']:.2f}")
+    if summary["max_schedule_lag_ms"]:
+        print(f"  Atraso máximo no agendamento: {summary['max_schedule_lag_ms']:.1f} ms")
+
+
+def print_comparison(title, comparison):
+    """Imprime as diferenças de predição entre duas versões."""
+    print(f"\n{title}")
+    print(f"  Versões: {comparison['baseline_versions']} -> {comparison['candidate_versions']}")
+    if not comparison["compared"]:
+        print("  [AVISO] Nenhuma predição comparável.")
+        return
+    print(f"  Comparadas: {comparison['compared']} | Mudanças de rótulo: "
+          f"{comparison['label_changes']} | Concordância: {comparison['agreement']:.4%}")
+    print(f"  |dp| máximo: {comparison['max_abs_diff']:.4f} | médio: "
+          f"{comparison['mean_abs_diff']:.4f}")
+    for diff in comparison["largest_diffs"][:5]:
+        print(f"    #{diff['index']}: {diff['baseline']} -> {diff['candidate']}")
+
+
+async def main(args):
+    records = load_capture(args.capture, limit=args.limit)
+    if not records:
+        print("[ERRO] Nenhuma requisição reproduzível nos arquivos de captura.")
+        return 1
+
+    print("=" * 80)
+    print("REPLAY DE TRÁFEGO")
+    print("=" * 80)
+    print(f"\nRequisições: {len(records)} | Modo: {args.mode}"
+          + (f" ({args.speedup}x)" if args.mode == "speedup" else "")
+          + f" | Concorrência: {args.concurrency}")
+
+    target = args.url or "em processo"
+    if args.url:
+        results, duration = await run_http(args.url, records, args)
+    else:
+        results, duration = await run_in_process(args.models_dir, records, args)
+    summary = summarize(results, duration)
+    print_summary(f"Alvo: {target}", summary)
+    report = {"summary": summary}
+
+    if args.compare_url or args.compare_models_dir:
+        if args.compare_url:
+            candidate, duration = await run_http(args.compare_url, records, args)
+        else:
+            candidate, duration = await run_in_process(args.compare_models_dir, records, args)
+        report["candidate_summary"] = summarize(candidate, duration)
+        print_summary(f"Alvo de comparação: {args.compare_url or args.compare_models_dir}",
+                      report["candidate_summary"])
+        report["comparison"] = compare_predictions(results, candidate)
+        print_comparison("Diferenças de predição (alvo -> comparação)", report["comparison"])
+    else:
+        report["comparison"] = compare_predictions(recorded_results(records), results)
+        print_comparison("Diferenças de predição (captura -> alvo)", report["comparison"])
+
+    if args.output:
+        write_results(args.output, results)
+        with open(f"{args.output}.report.json", "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResultados gravados em {args.output}")
+    print("=" * 80)
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("capture", nargs="+", help="Arquivos JSONL de captura")
+    parser.add_argument("--url", help="URL base da API (HTTP); sem ela, replay em processo")
+    parser.add_argument("--models-dir", help="Modelos para o replay em processo")
+    parser.add_argument("--compare-url", help="Segunda API para comparar predições")
+    parser.add_argument("--compare-models-dir", help="Segundo modelo (em processo)")
+    parser.add_argument("--mode", choices=REPLAY_MODES, default="original")
+    parser.add_argument("--speedup", type=float, default=1.0, help="Fator do modo speedup")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--limit", type=int, default=0, help="Máximo de requisições (0 = todas)")
+    parser.add_argument("--output", help="JSONL com o resultado de cada requisição")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args)))
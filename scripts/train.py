@@ -0,0 +1,100 @@
+"""
+Pipeline de treinamento em script (notebooks 01, 03 e 04).
+
+Gera em notebooks/artifacts os mesmos artefatos que scripts/deploy_models.py
+copia para a API (best_model_temp.joblib, tfidf_vectorizer.joblib,
+label_encoder.joblib e metadata.joblib). As matrizes TF-IDF de cada
+configuração do vetorizador ficam em cache no disco (arrays CSR lidos com
+memory-map) e são reutilizadas entre folds, candidatos e execuções; a busca
+do LinearSVC roda num pool de processos, com grid completo ou successive
+halving.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "api-service"))
+
+from app.models.benchmark import load_corpus  # noqa: E402
+from app.models.training import C_VALUES, VECTORIZER_PARAMS, train, vectorizer_grid  # noqa: E402
+
+
+def print_report(report, output_dir):
+    """Imprime as rodadas da busca e as métricas do modelo final."""
+    print("=" * 80)
+    print(f"BUSCA ({report['strategy']}): {report['candidates']} candidatos, {report['fits']} fits")
+    print("=" * 80)
+    for index, round_report in enumerate(report["rounds"]):
+        print(
+            f"\nRodada {index}: {len(round_report['scores'])} candidato(s), "
+            f"{round_report['samples']} mensagens, {round_report['seconds']:.1f}s"
+        )
+        for score in round_report["scores"][:5]:
+            vectorizer = score["vectorizer"]
+            print(
+                f"  C={score['svc']['C']:<6} max_features={vectorizer['max_features']:<6} "
+                f"ngram_range={tuple(vectorizer['ngram_range'])}  F1 CV={score['cv_f1']:.4f}"
+            )
+
+    best = report["best"]
+    print("\n" + "=" * 80)
+    print(f"Melhor: C={best['svc']['C']} vetorizador={best['vectorizer']}")
+    print(f"Teste:  acurácia={report['test_accuracy']:.4f}  precisão={report['test_precision']:.4f}"
+          f"  recall={report['test_recall']:.4f}  F1={report['test_f1']:.4f}")
+    print(f"Final:  F1 CV={report['cv_f1_mean']:.4f} ± {report['cv_f1_std']:.4f}")
+    print(f"Cache de features: {report['cache_hits']} hit(s), {report['cache_misses']} miss(es)"
+          f" ({report['vectorize_seconds']:.1f}s vetorizando)")
+    print(f"Tempo total: {report['total_seconds']:.1f}s")
+    print("=" * 80)
+    print(f"\n[OK] Artefatos gravados em {output_dir}")
+    print("Próximo passo: make deploy-models")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--data", type=Path, default=PROJECT_ROOT / "notebooks" / "data" / "emails.csv"
+    )
+    parser.add_argument(
+        "--output-dir", type=Path, default=PROJECT_ROOT / "notebooks" / "artifacts"
+    )
+    parser.add_argument(
+        "--cache-dir", type=Path, default=PROJECT_ROOT / "notebooks" / "cache" / "features",
+        help="Cache de matrizes TF-IDF por configuração do vetorizador",
+    )
+    parser.add_argument(
+        "--search", choices=("halving", "grid"), default="halving", help="Estratégia de busca"
+    )
+    parser.add_argument("--C", type=float, nargs="+", default=list(C_VALUES))
+    parser.add_argument(
+        "--max-features", type=int, nargs="+", default=[VECTORIZER_PARAMS["max_features"]]
+    )
+    parser.add_argument(
+        "--ngram-max", type=int, nargs="+", default=[VECTORIZER_PARAMS["ngram_range"][1]]
+    )
+    parser.add_argument("--factor", type=int, default=3, help="Fator do successive halving")
+    parser.add_argument(
+        "--min-samples", type=int, default=2000, help="Mensagens da primeira rodada (halving)"
+    )
+    parser.add_argument("--jobs", type=int, default=4, help="Processos da busca")
+    parser.add_argument("--cv", type=int, default=5, help="Folds de validação cruzada")
+    parser.add_argument("--limit", type=int, default=0, help="Usar apenas N mensagens")
+    args = parser.parse_args()
+
+    messages, labels = load_corpus(str(args.data), limit=args.limit)
+    report = train(
+        messages,
+        labels,
+        args.output_dir,
+        args.cache_dir,
+        vectorizers=vectorizer_grid(args.max_features, args.ngram_max),
+        c_values=args.C,
+        strategy=args.search,
+        factor=args.factor,
+        min_samples=args.min_samples,
+        n_jobs=args.jobs,
+        cv=args.cv,
+    )
+    print_report(report, args.output_dir)
@@ -0,0 +1,190 @@
+"""
+Treinamento da variante stateless com feature hashing.
+
+Equivalente em script ao notebook 04, trocando o TfidfVectorizer por
+HashedTfidfVectorizer: em produção não há vocabulário em memória, apenas a
+função de hash e os arrays de colunas e IDF.
+
+Antes de gravar os artefatos, treina as duas variantes no mesmo split
+(80/20 estratificado, como no notebook 01) e imprime um relatório de
+acurácia, memória, tempo de carregamento e throughput.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.model_selection import cross_val_predict, train_test_split
+from sklearn.preprocessing import LabelEncoder
+from sklearn.svm import LinearSVC
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "api-service"))
+
+from app.models.benchmark import load_corpus, loaded_size  # noqa: E402
+from app.models.drift import reference_statistics  # noqa: E402
+from app.models.hashing import HashedTfidfVectorizer  # noqa: E402
+
+# Mesmos parâmetros do TfidfVectorizer do notebook 01
+VECTORIZER_PARAMS = {
+    "max_features": 5000,
+    "min_df": 2,
+    "max_df": 0.95,
+    "ngram_range": (1, 2),
+    "stop_words": "english",
+}
+
+
+def build_model(svc_params):
+    """Modelo final do notebook 04: LinearSVC calibrado (predict_proba)."""
+    return CalibratedClassifierCV(LinearSVC(**svc_params), method="sigmoid", cv=5)
+
+
+def evaluate(name, vectorizer, svc_params, X_train, X_test, y_train, y_test):
+    """Treina uma variante e mede acurácia, memória, carregamento e throughput."""
+    start = time.perf_counter()
+    model = build_model(svc_params).fit(vectorizer.fit_transform(X_train), y_train)
+    training_seconds = time.perf_counter() - start
+
+    batch_seconds = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        y_pred = model.predict(vectorizer.transform(X_test))
+        batch_seconds = min(batch_seconds, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for message in X_test[:500]:
+        model.predict_proba(vectorizer.transform([message]))
+    single_ms = (time.perf_counter() - start) * 1000 / min(len(X_test), 500)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "vectorizer.joblib"
+        joblib.dump(vectorizer, path)
+        file_bytes = path.stat().st_size
+        heap_bytes, load_seconds = loaded_size(str(path))
+
+    return {
+        "name": name,
+        "accuracy": accuracy_score(y_test, y_pred),
+        "precision": precision_score(y_test, y_pred),
+        "recall": recall_score(y_test, y_pred),
+        "f1": f1_score(y_test, y_pred),
+        "training_seconds": training_seconds,
+        "file_bytes": file_bytes,
+        "heap_bytes": heap_bytes,
+        "load_seconds": load_seconds,
+        "single_ms": single_ms,
+        "batch_per_second": len(X_test) / batch_seconds,
+    }
+
+
+def print_report(results):
+    """Imprime a comparação entre as variantes."""
+    print("=" * 80)
+    print("COMPARAÇÃO: VOCABULÁRIO vs FEATURE HASHING")
+    print("=" * 80)
+    rows = [
+        ("Acurácia", "accuracy", "{:.4f}"),
+        ("Precisão", "precision", "{:.4f}"),
+        ("Recall", "recall", "{:.4f}"),
+        ("F1-Score", "f1", "{:.4f}"),
+        ("Treino (s)", "training_seconds", "{:.2f}"),
+        ("Vetorizador em disco (KB)", "file_bytes", "{:.1f}"),
+        ("Vetorizador em memória (KB)", "heap_bytes", "{:.1f}"),
+        ("Carregamento (ms)", "load_seconds", "{:.2f}"),
+        ("Latência unitária (ms)", "single_ms", "{:.3f}"),
+        ("Throughput lote (msg/s)", "batch_per_second", "{:.0f}"),
+    ]
+    print(f"\n{'':<30} {results[0]['name']:>16} {results[1]['name']:>16}")
+    for label, key, fmt in rows:
+        scale = 1 / 1024 if key.endswith("bytes") else 1000 if key == "load_seconds" else 1
+        values = [fmt.format(result[key] * scale) for result in results]
+        print(f"{label:<30} {values[0]:>16} {values[1]:>16}")
+    print("=" * 80)
+
+
+def train_final(output_dir, X_full, y_full, n_features, svc_params, report):
+    """Treina com 100% dos dados (como o notebook 04) e grava os artefatos."""
+    label_encoder = LabelEncoder()
+    y_encoded = label_encoder.fit_transform(y_full)
+
+    vectorizer = HashedTfidfVectorizer(n_features=n_features, **VECTORIZER_PARAMS)
+    X_full_hashed = vectorizer.fit_transform(X_full)
+    model = build_model(svc_params).fit(X_full_hashed, y_encoded)
+
+    # Referência do monitor de drift com probabilidades out-of-fold
+    spam_idx = list(label_encoder.classes_).index("spam")
+    oof_probabilities = cross_val_predict(
+        build_model(svc_params), X_full_hashed, y_encoded, cv=5, method="predict_proba"
+    )[:, spam_idx]
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(model, output_dir / "best_model_temp.joblib")
+    joblib.dump(vectorizer, output_dir / "hashing_vectorizer.joblib")
+    joblib.dump(label_encoder, output_dir / "label_encoder.joblib")
+    joblib.dump(
+        {
+            "model_type": "CalibratedClassifierCV(LinearSVC)",
+            "base_model_type": "LinearSVC",
+            "base_model_params": svc_params,
+            "calibration_method": "sigmoid",
+            "vectorizer_type": "HashedTfidfVectorizer",
+            "vectorizer_params": {"n_features": n_features, **VECTORIZER_PARAMS},
+            "training_samples": len(y_full),
+            "trained_date": datetime.now().isoformat(),
+            "features_count": len(vectorizer.columns_),
+            "optimization_accuracy": report["accuracy"],
+            "optimization_precision": report["precision"],
+            "optimization_recall": report["recall"],
+            "optimization_f1": report["f1"],
+            "label_encoder": True,
+            "label_mapping": dict(
+                zip(label_encoder.classes_, label_encoder.transform(label_encoder.classes_))
+            ),
+            "has_predict_proba": True,
+            "drift_reference": reference_statistics(X_full, oof_probabilities, vectorizer),
+        },
+        output_dir / "metadata.joblib",
+    )
+    print(f"\n[OK] Artefatos gravados em {output_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--data", type=Path, default=PROJECT_ROOT / "notebooks" / "data" / "emails.csv"
+    )
+    parser.add_argument(
+        "--output-dir", type=Path, default=PROJECT_ROOT / "notebooks" / "artifacts_hashing"
+    )
+    parser.add_argument("--n-features", type=int, default=2**20, help="Buckets de hash")
+    parser.add_argument("--C", type=float, default=1.0, help="Regularização do LinearSVC")
+    parser.add_argument(
+        "--report-only", action="store_true", help="Apenas compara, sem gravar artefatos"
+    )
+    args = parser.parse_args()
+
+    messages, labels = load_corpus(str(args.data))
+    y = LabelEncoder().fit_transform(labels)
+    X_train, X_test, y_train, y_test = train_test_split(
+        messages, y, test_size=0.2, random_state=42, stratify=y
+    )
+    svc_params = {"C": args.C, "random_state": 42, "max_iter": 2000, "dual": False}
+
+    results = [
+        evaluate("vocabulário", TfidfVectorizer(**VECTORIZER_PARAMS), svc_params,
+                 X_train, X_test, y_train, y_test),
+        evaluate("hashing", HashedTfidfVectorizer(n_features=args.n_features, **VECTORIZER_PARAMS),
+                 svc_params, X_train, X_test, y_train, y_test),
+    ]
+    print_report(results)
+
+    if not args.report_only:
+        train_final(args.output_dir, messages, labels, args.n_features, svc_params, results[1])